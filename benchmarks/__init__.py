@@ -0,0 +1,35 @@
+"""
+Offline performance benchmarks for the prompt, queue and persistence hot paths.
+
+Benchmarks (one result per synthetic conversation size):
+
+- ``prompt_build``      PromptEngine.build_xml_prompt over N history messages
+- ``history_format``    PromptEngine._format_history_xml alone
+- ``queue_admission``   AgentTaskQueueService._process_message_sync
+                        (dedup, prompt build, task insert)
+- ``message_append``    the single-update append of add_message
+                        (build_messages + append_messages) on a
+                        conversation already holding N messages
+- ``watcher_pickup``    insert of a pending task -> claimed by
+                        UniversalMongoWatcher.poll_once, with N finished
+                        tasks in the collection
+- ``task_logging``      the log events of one task (submit, prompt,
+                        pickup, completion, history) per log mode: disabled,
+                        default and production (one result per mode,
+                        sizes do not apply)
+
+Runs against mongomock by default; set ``BENCH_MONGO_URI`` to use a
+throwaway local mongod instead (the queue path writes to its
+``conductor_state`` database).
+
+Usage:
+    python -m benchmarks                                # all, sizes 10,100,1000,10000
+    python -m benchmarks --sizes 10,100 --only prompt_build,history_format
+    python -m benchmarks --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks --update-baseline              # rewrite the stored baseline
+
+With a baseline the run exits with status 1 when a benchmark's p50 grows
+past the threshold (``--threshold``, default 0.25 = +25%, overridable per
+benchmark in the baseline's ``thresholds``). Baselines are only comparable
+on the machine (and backend) that produced them.
+"""
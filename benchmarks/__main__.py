@@ -0,0 +1,100 @@
+"""
+Benchmark runner: ``python -m benchmarks --help``.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import harness, synthetic  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _sizes(value: str):
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", type=_sizes, default=list(synthetic.DEFAULT_SIZES),
+                        help="comma-separated conversation sizes (default: 10,100,1000,10000)")
+    parser.add_argument("--only", default="", help="comma-separated benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per benchmark and size")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs before timing")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--no-compare", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                        help="allowed p50 growth before failing (0.25 = +25%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write these results as the new baseline (keeps its thresholds)")
+    parser.add_argument("--log-level", default="WARNING", help="log level of the code under test")
+    return parser.parse_args(argv)
+
+
+def run(args) -> int:
+    # Spans are still created; exporting them would only add background noise
+    os.environ.setdefault("CONDUCTOR_TRACE_EXPORTER", "none")
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    # Imported after logging is configured: the modules log on import
+    from benchmarks.cases import BENCHMARKS, BenchContext
+
+    selected = [name for name in args.only.split(",") if name] or list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        print(f"unknown benchmark(s): {', '.join(sorted(unknown))}; available: {', '.join(BENCHMARKS)}")
+        return 2
+
+    client, backend = synthetic.mongo_client()
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="conductor-bench-") as workdir:
+        # PromptEngine logs every prompt to ./prompts_log: keep it out of the tree
+        os.chdir(workdir)
+        try:
+            ctx = BenchContext(workdir, client, args.repeat, args.warmup, args.seed)
+            for name in selected:
+                print(f"running {name} ...", file=sys.stderr)
+                results.update(BENCHMARKS[name](ctx, args.sizes))
+        finally:
+            os.chdir(cwd)
+
+    env = harness.environment(backend)
+    baseline = None
+    if not args.no_compare and os.path.exists(args.baseline):
+        baseline = harness.load_results(args.baseline)
+    comparison = harness.compare(results, baseline, args.threshold) if baseline else None
+
+    print(harness.format_table(results, comparison))
+    if args.output:
+        harness.write_results(args.output, results, env)
+    if args.update_baseline:
+        previous = harness.load_results(args.baseline) if os.path.exists(args.baseline) else {}
+        harness.write_results(args.baseline, results, env, previous.get("thresholds"))
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if baseline and baseline.get("environment", {}).get("backend") != backend:
+        print(f"note: baseline was recorded on {baseline.get('environment', {}).get('backend')}, "
+              f"this run used {backend}")
+    regressions = [row for row in comparison or [] if row["regression"]]
+    for row in regressions:
+        print(f"REGRESSION {row['name']}: p50 {row['baseline']:.3f} -> {row['current']:.3f} ms "
+              f"({row['change']:+.0%}, threshold {row['threshold']:+.0%})")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    sys.exit(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+The benchmarks. Each takes a ``BenchContext`` and returns
+``{"<benchmark>[n=<size>]": stats}`` for every requested size.
+
+External collaborators (MongoDB, agent storage, the LLM) are replaced
+with in-process equivalents so only the code under test is timed:
+MongoDB by the context's client, agent storage by a filesystem agent
+home, the LLM by a stub returning immediately.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Sequence
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from benchmarks.harness import measure
+from benchmarks.mongomock_compat import compatible_bulk_write
+from src.core.services.agent_task_queue_service import AgentTaskMessage, AgentTaskQueueService
+from src.core.services.conversation_service import ConversationService, build_messages
+from src.infrastructure.conversation_writes import append_messages
+from src.infrastructure.task_ordering import ordering_fields
+
+AGENT_ID = "Bench_Agent"
+DATABASE = "conductor_bench"
+# MongoTaskClient and the queue consumer always use this database
+TASKS_DATABASE = "conductor_state"
+
+WATCHER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "poc", "container_to_host", "claude-mongo-watcher.py",
+)
+
+
+@dataclass
+class BenchContext:
+    workdir: str
+    client: Any
+    repeat: int = 20
+    warmup: int = 2
+    seed: int = synthetic.DEFAULT_SEED
+
+    @property
+    def agent_home(self) -> str:
+        home = os.path.join(self.workdir, "agents", AGENT_ID)
+        if not os.path.isdir(home):
+            synthetic.write_agent(os.path.join(self.workdir, "agents"), AGENT_ID, self.seed)
+        return home
+
+    def measure(self, operation, setup=None):
+        return measure(operation, self.repeat, self.warmup, setup)
+
+
+def _name(benchmark: str, size: int) -> str:
+    return f"{benchmark}[n={size}]"
+
+
+def load_engine(home: str, history: List[Dict[str, Any]], profile=None):
+    """PromptEngine with the static context loaded and ``history`` as cached history."""
+    from src.core.prompt_engine import PromptEngine
+
+    engine = PromptEngine(home, profile=profile)
+    engine._load_agent_config()
+    engine._validate_agent_config()
+    engine._load_agent_persona()
+    engine._load_agent_playbook()
+    engine._compile_static_context()
+    engine.conversation_history_cache = history
+    return engine
+
+
+# ----------------------------------------------------------------------
+# Prompt build
+# ----------------------------------------------------------------------
+
+def prompt_build(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    results = {}
+    for size in sizes:
+        engine = load_engine(ctx.agent_home, synthetic.messages(size, ctx.seed))
+        results[_name("prompt_build", size)] = ctx.measure(
+            lambda: engine.build_xml_prompt([], "Resuma o estado atual do deploy.")
+        )
+    return results
+
+
+def history_format(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    results = {}
+    for size in sizes:
+        engine = load_engine(ctx.agent_home, [])
+        history = synthetic.messages(size, ctx.seed)
+        results[_name("history_format", size)] = ctx.measure(lambda: engine._format_history_xml(history))
+    return results
+
+
+# ----------------------------------------------------------------------
+# Queue admission (consumer side of POST /agents/enqueue)
+# ----------------------------------------------------------------------
+
+class OfflineQueueService(AgentTaskQueueService):
+    """AgentTaskQueueService whose database, agent lookup and prompt source are local."""
+
+    def __init__(self, db, home: str):
+        super().__init__()
+        self._db = db
+        self._home = home
+
+    def _get_mongo_db(self):
+        return self._db
+
+    def _get_agent_definition(self, agent_id):
+        return SimpleNamespace(timeout=300)
+
+    def _get_provider(self, agent_def):
+        return "claude"
+
+    def _build_prompt(self, agent_id, input_text, conversation_id, screenplay_id, profile=None):
+        # Same work as discovery.get_full_prompt: fresh engine, history read from Mongo
+        conversation = self._db.conversations.find_one({"conversation_id": conversation_id}) or {}
+        engine = load_engine(self._home, conversation.get("messages", []), profile)
+        return engine.build_xml_prompt([], input_text)
+
+
+def queue_admission(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    db = ctx.client[TASKS_DATABASE]
+    if type(ctx.client).__module__.startswith("mongomock"):
+        # mongomock can't run pymongo>=4.9 bulk ops (prompt segment upserts)
+        from src.infrastructure.prompt_segments import SEGMENTS_COLLECTION
+        compatible_bulk_write(db[SEGMENTS_COLLECTION])
+    service = OfflineQueueService(db, ctx.agent_home)
+    results = {}
+    # Segmented prompt storage, as the baseline was recorded
+    with patch.dict(os.environ, {"MONGO_URI": "mongodb://benchmark", "TASK_PROMPT_STORAGE": "segments"}), \
+            patch("src.core.services.mongo_task_client.MongoClient", lambda *a, **k: ctx.client):
+        for size in sizes:
+            conversation_id = f"bench-queue-{size}"
+            db.conversations.delete_many({"conversation_id": conversation_id})
+            db.conversations.insert_one(synthetic.conversation(conversation_id, size, ctx.seed))
+
+            def message():
+                return AgentTaskMessage(
+                    agent_id=AGENT_ID, input="Verifique a fila.", instance_id="bench-instance",
+                    conversation_id=conversation_id, screenplay_id="bench-screenplay",
+                )
+
+            results[_name("queue_admission", size)] = ctx.measure(
+                lambda msg: _expect(service._process_message_sync(msg), "ok"), setup=message,
+            )
+    return results
+
+
+def _expect(value, expected):
+    if value != expected:
+        raise RuntimeError(f"benchmark operation returned {value!r}, expected {expected!r}")
+    return value
+
+
+# ----------------------------------------------------------------------
+# Message append
+# ----------------------------------------------------------------------
+
+def message_append(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    with patch.dict(os.environ, {"MONGO_DATABASE": DATABASE}), \
+            patch("src.core.services.conversation_service.MongoClient", lambda *a, **k: ctx.client):
+        # Indexes as in production
+        conversations = ConversationService().conversations
+
+    # The update AsyncConversationService.add_message sends, on the sync client
+    agent = {"agent_id": AGENT_ID, "instance_id": "bench-instance", "name": AGENT_ID, "emoji": "🤖"}
+    results = {}
+    for size in sizes:
+        conversation_id = f"bench-append-{size}"
+
+        def reset():
+            conversations.delete_many({"conversation_id": conversation_id})
+            conversations.insert_one(synthetic.conversation(conversation_id, size, ctx.seed))
+
+        reset()
+        # Each append grows the array: reset every few calls so size stays ~N
+        counter = {"calls": 0}
+
+        def setup():
+            counter["calls"] += 1
+            if counter["calls"] % 10 == 0:
+                reset()
+
+        def append():
+            timestamp = datetime.utcnow().isoformat()
+            messages, participant = build_messages("pergunta", "resposta", agent, timestamp)
+            return append_messages(conversations, conversation_id, messages, timestamp, participant)
+
+        results[_name("message_append", size)] = ctx.measure(
+            lambda: _expect_sequence(append()),
+            setup=setup,
+        )
+    return results
+
+
+def _expect_sequence(sequence):
+    if not sequence:
+        raise RuntimeError("add_message did not append")
+    return sequence
+
+
+# ----------------------------------------------------------------------
+# Watcher pickup
+# ----------------------------------------------------------------------
+
+class _DeferredExecutor:
+    """Accepts tasks without running them: only the pickup is timed."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def load_watcher_module():
+    """claude-mongo-watcher.py (hyphenated file name) as a module."""
+    watcher_dir = os.path.dirname(WATCHER_PATH)
+    if watcher_dir not in sys.path:
+        sys.path.insert(0, watcher_dir)
+    spec = importlib.util.spec_from_file_location("claude_mongo_watcher", WATCHER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def watcher_pickup(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    module = load_watcher_module()
+    results = {}
+    for size in sizes:
+        database = f"{DATABASE}_watcher_{size}"
+        ctx.client.drop_database(database)
+        watcher = module.UniversalMongoWatcher(
+            database=database, max_workers=1, fifo_mode="per_agent",
+            worker_id="bench-watcher", client=ctx.client,
+        )
+        watcher.executor.shutdown(wait=False)
+        watcher.executor = _DeferredExecutor()
+        watcher.mcp_service = None
+        if size:
+            watcher.collection.insert_many(synthetic.finished_tasks(size))
+
+        def insert_pending():
+            # Previous pickup done: release it as a finished task would
+            for task_id in list(watcher.inflight_ids):
+                watcher.collection.update_one({"_id": task_id}, {"$set": {"status": "completed"}})
+                watcher._release_exclusion(task_id)
+                watcher.inflight_ids.discard(task_id)
+            watcher.active_futures.clear()
+            watcher.collection.insert_one({
+                "agent_id": AGENT_ID, "prompt": "<prompt/>", "cwd": "/tmp",
+                "status": "pending", "created_at": synthetic.EPOCH,
+                **ordering_fields(None, None, synthetic.EPOCH),
+            })
+
+        results[_name("watcher_pickup", size)] = ctx.measure(
+            lambda: _expect(watcher.poll_once(), 1), setup=insert_pending,
+        )
+        ctx.client.drop_database(database)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Task logging
+# ----------------------------------------------------------------------
+
+# mode -> (root level, CONDUCTOR_LOG_MODE, detail sample rate)
+LOGGING_MODES = {
+    "disabled": (logging.WARNING, "default", 1.0),
+    "default": (logging.INFO, "default", 1.0),
+    "production": (logging.INFO, "production", 0.01),
+}
+
+
+def _log_task(logger, task_id: str):
+    """The events one task emits from submit to completion."""
+    from src.infrastructure.structured_logging import detail_sampled, log_event
+
+    log_event(logger, "provider.resolved", agent_id=AGENT_ID, provider="claude", source="agent")
+    log_event(logger, "prompt.built", agent_id=AGENT_ID, history_messages=100, history_from_cache=True,
+              include_history=True, prompt_chars=48_000)
+    if detail_sampled(task_id):
+        log_event(logger, "task.submit_detail", task_id=task_id, caller="bench.py:1 in bench()", cwd="/tmp",
+                  timeout=600, idempotency_key=None, parent_task_id=None)
+    log_event(logger, "task.submitted", task_id=task_id, agent_id=AGENT_ID, provider="claude", source="api",
+              instance_id="instance-1", conversation_id="conversation-1", screenplay_id=None,
+              prompt_segmented=True)
+    if detail_sampled(task_id):
+        log_event(logger, "watcher.task_fields", task_id=task_id, thread="worker-0", instance_id="instance-1",
+                  keys="_id,agent_id,cwd,instance_id,prompt,status")
+    log_event(logger, "watcher.task_started", task_id=task_id, thread="worker-0", agent_id=AGENT_ID,
+              instance_id="instance-1", provider="claude", cwd="/tmp", timeout=600, mcp_configs="",
+              prompt_chars=48_000)
+    log_event(logger, "watcher.llm_finished", task_id=task_id, provider="claude", exit_code=0,
+              duration_s=12.5, output_chars=2_400, stream=False)
+    log_event(logger, "history.appended", agent_id=AGENT_ID, instance_id="instance-1", history_id="h-1",
+              user_input_chars=120, ai_response_chars=2_400)
+    log_event(logger, "watcher.task_completed", task_id=task_id, thread="worker-0", agent_id=AGENT_ID,
+              instance_id="instance-1", exit_code=0, duration_s=12.5, result_chars=2_400)
+
+
+def task_logging(ctx: BenchContext, sizes: Sequence[int]) -> Dict[str, Dict]:
+    """Per-task logging overhead on the calling thread, per log mode (sizes do not apply)."""
+    from src.infrastructure.structured_logging import configure_log_mode, shutdown_log_mode
+
+    root = logging.getLogger()
+    saved = (root.level, list(root.handlers))
+    logger = logging.getLogger("benchmarks.task_logging")
+    counter = iter(range(10**9))
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        for mode, (level, log_mode, rate) in LOGGING_MODES.items():
+            handler = logging.StreamHandler(devnull)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+            root.handlers = [handler]
+            root.setLevel(level)
+            configure_log_mode(log_mode, rate)
+            try:
+                results[f"task_logging[mode={mode}]"] = ctx.measure(
+                    lambda task_id: _log_task(logger, task_id),
+                    setup=lambda: f"task-{next(counter)}",
+                )
+            finally:
+                shutdown_log_mode()
+                root.setLevel(saved[0])
+                root.handlers = saved[1]
+    return results
+
+
+BENCHMARKS = {
+    "prompt_build": prompt_build,
+    "history_format": history_format,
+    "queue_admission": queue_admission,
+    "message_append": message_append,
+    "watcher_pickup": watcher_pickup,
+    "task_logging": task_logging,
+}
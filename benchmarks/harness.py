@@ -0,0 +1,143 @@
+"""
+Timing, result files and baseline comparison for the benchmark suite.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer/scheduler noise, never regressions
+NOISE_FLOOR_MS = 0.05
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples`` (fraction in [0, 1])."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples_s: List[float]) -> Dict[str, float]:
+    """Latency statistics (ms) of per-operation timings given in seconds."""
+    samples = [sample * 1000 for sample in samples_s]
+    mean = statistics.fmean(samples)
+    return {
+        "runs": len(samples),
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(percentile(samples, 0.5), 4),
+        "p95_ms": round(percentile(samples, 0.95), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "ops_per_s": round(1000 / mean, 2) if mean else None,
+    }
+
+
+def measure(
+    operation: Callable[[], Any],
+    repeat: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, float]:
+    """
+    Time ``operation`` ``repeat`` times after ``warmup`` untimed calls.
+
+    ``setup`` (untimed) runs before every call and its return value, if
+    not None, is passed to ``operation``.
+    """
+    def call():
+        argument = setup() if setup else None
+        started = time.perf_counter()
+        operation() if argument is None else operation(argument)
+        return time.perf_counter() - started
+
+    for _ in range(warmup):
+        call()
+    return summarize([call() for _ in range(repeat)])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment(backend: str) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "backend": backend,
+    }
+
+
+def write_results(path: str, results: Dict[str, Dict], env: Dict[str, Any], thresholds=None):
+    document = {"environment": env, "results": results}
+    if thresholds:
+        document["thresholds"] = thresholds
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "p50_ms",
+) -> List[Dict[str, Any]]:
+    """
+    One row per benchmark present in both runs, slowest change first.
+
+    ``regression`` is set when ``metric`` grew by more than the threshold
+    (``baseline["thresholds"]`` by full name, e.g. ``prompt_build[n=100]``,
+    or by benchmark, e.g. ``prompt_build``; else ``threshold``) and by more than
+    NOISE_FLOOR_MS in absolute terms.
+    """
+    thresholds = baseline.get("thresholds") or {}
+    rows = []
+    for name, current in results.items():
+        previous = (baseline.get("results") or {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        limit = thresholds.get(name, thresholds.get(name.split("[")[0], threshold))
+        ratio = current[metric] / previous[metric]
+        rows.append({
+            "name": name,
+            "baseline": previous[metric],
+            "current": current[metric],
+            "change": round(ratio - 1, 4),
+            "threshold": limit,
+            "regression": ratio - 1 > limit and current[metric] - previous[metric] > NOISE_FLOOR_MS,
+        })
+    return sorted(rows, key=lambda row: row["change"], reverse=True)
+
+
+def format_table(results: Dict[str, Dict], comparison: Optional[List[Dict]] = None) -> str:
+    changes = {row["name"]: row for row in comparison or []}
+    lines = [f"{'benchmark':<34}{'p50 ms':>11}{'p95 ms':>11}{'ops/s':>11}{'vs base':>10}"]
+    for name, stats in results.items():
+        row = changes.get(name)
+        change = f"{row['change']:+.0%}{' !' if row['regression'] else ''}" if row else ""
+        lines.append(
+            f"{name:<34}{stats['p50_ms']:>11.3f}{stats['p95_ms']:>11.3f}"
+            f"{stats['ops_per_s'] or 0:>11.1f}{change:>10}"
+        )
+    return "\n".join(lines)
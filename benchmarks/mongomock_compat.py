@@ -0,0 +1,28 @@
+"""
+mongomock 4.x can't consume the bulk operations of pymongo>=4.9:
+UpdateOne/ReplaceOne hand its bulk builder a ``sort`` argument it doesn't
+know. ``compatible_bulk_write`` teaches the builder to accept (and ignore)
+it, so ``collection.bulk_write`` runs on mongomock itself; the code being
+measured or tested never passes ``sort`` to a write.
+
+Shared by the benchmarks (offline mongomock runs) and the test suite
+(tests/mongomock_compat.py re-exports it).
+"""
+
+
+def _accept_sort(method):
+    def add(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+
+    return add
+
+
+def compatible_bulk_write(collection):
+    """Make mongomock's bulk_write accept pymongo>=4.9 operations; returns ``collection``."""
+    from mongomock.collection import BulkOperationBuilder
+
+    if not getattr(BulkOperationBuilder, "_accepts_sort", False):
+        BulkOperationBuilder.add_update = _accept_sort(BulkOperationBuilder.add_update)
+        BulkOperationBuilder.add_replace = _accept_sort(BulkOperationBuilder.add_replace)
+        BulkOperationBuilder._accepts_sort = True
+    return collection
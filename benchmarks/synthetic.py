@@ -0,0 +1,118 @@
+"""
+Deterministic synthetic data: agents, personas, conversations and tasks.
+
+Everything derives from a seeded ``random.Random`` so two runs build
+byte-identical fixtures.
+"""
+
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_SEED = 1234
+
+_WORDS = (
+    "agente conversa roteiro deploy pipeline erro timeout mongo fila prompt "
+    "histórico resposta tarefa watcher lease claim índice consulta cache "
+    "latência throughput delegação placeholder persona playbook instrução "
+    "the quick review of the build failed because the test suite timed out"
+).split()
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def persona(rng: random.Random, paragraphs: int = 12) -> str:
+    body = "\n\n".join(text(rng, 60) for _ in range(paragraphs))
+    return f"# Persona: {{{{agent_name}}}}\n\nYou are {{{{agent_name}}}}, {{{{agent_description}}}}.\n\n{body}\n"
+
+
+def definition(agent_id: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": agent_id,
+        "name": agent_id.replace("_", " "),
+        "description": text(rng, 12),
+        "prompt": text(rng, 80),
+        "version": "1.0.0",
+        "available_tools": ["Read", "Write", "Bash"],
+    }
+
+
+def write_agent(root: str, agent_id: str, seed: int = DEFAULT_SEED) -> Path:
+    """Filesystem agent home (definition.yaml + persona.md) loadable by PromptEngine."""
+    rng = random.Random(f"{seed}:{agent_id}")
+    home = Path(root) / agent_id
+    home.mkdir(parents=True, exist_ok=True)
+    with open(home / "definition.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(definition(agent_id, rng), f, allow_unicode=True)
+    (home / "persona.md").write_text(persona(rng), encoding="utf-8")
+    return home
+
+
+def messages(count: int, seed: int = DEFAULT_SEED, agent_id: str = "Bench_Agent") -> List[Dict[str, Any]]:
+    """``count`` conversation messages alternating user/bot, oldest first."""
+    rng = random.Random(f"{seed}:messages:{count}")
+    result = []
+    for n in range(count):
+        timestamp = (EPOCH + timedelta(seconds=30 * n)).isoformat()
+        message = {"id": f"msg-{n}", "content": text(rng, rng.randint(20, 120)), "timestamp": timestamp}
+        if n % 2 == 0:
+            message["type"] = "user"
+        else:
+            message["type"] = "bot"
+            message["agent"] = {"agent_id": agent_id, "instance_id": "bench-instance",
+                                "name": agent_id, "emoji": "🤖"}
+        result.append(message)
+    return result
+
+
+def conversation(conversation_id: str, count: int, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Conversation document holding ``count`` messages, counters included."""
+    history = messages(count, seed)
+    updated_at = history[-1]["timestamp"] if history else EPOCH.isoformat()
+    return {
+        "conversation_id": conversation_id,
+        "title": f"Benchmark {count}",
+        "created_at": EPOCH.isoformat(),
+        "updated_at": updated_at,
+        "active_agent": None,
+        "participants": [],
+        "messages": history,
+        "message_count": count,
+        "participant_count": 0,
+        "last_message_preview": None,
+        "screenplay_id": "bench-screenplay",
+    }
+
+
+def finished_tasks(count: int, agent_id: str = "Bench_Agent") -> List[Dict[str, Any]]:
+    """Completed task documents (the history a watcher scans past)."""
+    return [
+        {
+            "agent_id": agent_id,
+            "prompt": f"<prompt>{n}</prompt>",
+            "cwd": "/tmp",
+            "status": "completed",
+            "created_at": EPOCH + timedelta(seconds=n),
+            "completed_at": EPOCH + timedelta(seconds=n + 1),
+        }
+        for n in range(count)
+    ]
+
+
+def mongo_client():
+    """(client, backend label): ``BENCH_MONGO_URI`` if set, else an in-memory mongomock."""
+    uri = os.getenv("BENCH_MONGO_URI")
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri), "mongod"
+    import mongomock
+    return mongomock.MongoClient(), "mongomock"
@@ -13,13 +13,14 @@ import subprocess
 import logging
 import signal
 import threading
-from datetime import datetime, timezone
+import socket
+from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Set
 from concurrent.futures import ThreadPoolExecutor, Future
 from collections import defaultdict
 
 try:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, ReturnDocument
     from bson import ObjectId
 except ImportError:
     print("❌ PyMongo não encontrado. Instale com: pip install pymongo")
@@ -53,9 +54,69 @@ except ImportError:
     MCP_ON_DEMAND_AVAILABLE = False
     MCPContainerService = None
 
+# ============================================================================
+# Watcher Registry - Coordenação entre múltiplos watchers (multi-host)
+# ============================================================================
+from watcher_registry import WatcherRegistry
+
+# ============================================================================
+# Métricas compartilhadas (src/infrastructure/metrics.py, apenas stdlib)
+# ============================================================================
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from src.infrastructure.metrics import (
+    metrics as telemetry,
+    TASK_STAGE_SECONDS,
+    TASK_EXECUTION_SECONDS,
+    TASKS_TOTAL,
+    ACTIVE_TASKS,
+    TASK_QUEUE_WAIT_SECONDS,
+    TASK_DEADLINE_MISSED,
+)
+from src.infrastructure.prompt_segments import TASK_TTL_SECONDS, PromptSegmentStore, PromptSegmentMissing
+from src.infrastructure.http_clients import pooled_session
+from src.infrastructure.conversation_writes import (
+    append_operation,
+    apply_operations,
+    placeholder_operations,
+)
+from src.infrastructure.tracing import (
+    SPANS_COLLECTION,
+    TRACEPARENT_HEADER,
+    Span,
+    SpanContext,
+    exporter_from_env,
+    tracer,
+)
+from src.infrastructure.structured_logging import configure_log_mode, detail_sampled, log_event
+from src.infrastructure.task_ordering import (
+    CLAIM_SORT,
+    DEFAULT_AGING_SECONDS,
+    DEFAULT_PRIORITY,
+    age_pending,
+    backfill_ordering_fields,
+    ensure_ordering_indexes,
+    priority_class,
+)
+
 # Host onde os MCPs estão rodando (gateway) - usado como fallback
 MCP_HOST = os.environ.get("MCP_HOST", "localhost")
 
+# Lease de claim: tempo que uma task "processing" pertence a este watcher sem renovação.
+# Se o watcher morrer, outro watcher pode reclamar a task após a expiração.
+DEFAULT_LEASE_SECONDS = int(os.environ.get("WATCHER_LEASE_SECONDS", "120"))
+
+# Projeção usada na varredura de pendentes: nunca trazer o prompt antes do claim
+PENDING_SCAN_PROJECTION = {"_id": 1, "agent_id": 1, "priority": 1, "cwd": 1}
+
+# Páginas da varredura por ciclo: tasks com chave FIFO ocupada saem da página
+# seguinte, então um burst de um agente não esconde os demais
+MAX_SCAN_PAGES = 5
+
+# Intervalo de heartbeat no registro de watchers (collection `watchers`)
+DEFAULT_HEARTBEAT_INTERVAL = int(os.environ.get("WATCHER_HEARTBEAT_SECONDS", "10"))
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -67,6 +128,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _seconds_since(timestamp: Optional[datetime], now: Optional[datetime] = None) -> Optional[float]:
+    """Segundos entre um datetime do MongoDB (naive = UTC) e agora"""
+    if not isinstance(timestamp, datetime):
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return ((now or datetime.now(timezone.utc)) - timestamp).total_seconds()
+
+
 class UniversalMongoWatcher:
     def __init__(self,
                  mongo_uri: str = "mongodb://localhost:27017",
@@ -74,7 +144,12 @@ class UniversalMongoWatcher:
                  collection: str = "tasks",
                  gateway_url: str = "http://localhost:14199",
                  max_workers: int = 10,
-                 fifo_mode: str = "per_agent"):
+                 fifo_mode: str = "per_agent",
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 worker_id: str = None,
+                 heartbeat_interval: int = DEFAULT_HEARTBEAT_INTERVAL,
+                 aging_seconds: float = DEFAULT_AGING_SECONDS,
+                 client: MongoClient = None):
         """
         Inicializa o watcher MongoDB universal com suporte a paralelização
 
@@ -84,8 +159,14 @@ class UniversalMongoWatcher:
             collection: Nome da collection
             gateway_url: URL do conductor-gateway para atualização de estatísticas
             max_workers: Número máximo de workers paralelos (padrão: 10)
-            fifo_mode: Modo FIFO - "strict" (uma task por vez), "per_agent" (FIFO por agente),
+            fifo_mode: Modo FIFO - "strict" (uma task por vez em todo o cluster),
+                      "per_agent" (uma task por agente + cwd em todo o cluster),
                       "relaxed" (qualquer task pendente). Padrão: "per_agent"
+            lease_seconds: Duração do lease de uma task em processing (renovado enquanto roda)
+            worker_id: Identificador deste watcher (padrão: host:pid:sufixo aleatório)
+            heartbeat_interval: Intervalo de heartbeat no registro de watchers em segundos
+            aging_seconds: Espera pendente que sobe a prioridade de uma task em um nível (0 = sem aging)
+            client: MongoClient já criado (opcional, ex: testes com vários watchers)
         """
         self.mongo_uri = mongo_uri
         self.database_name = database
@@ -93,14 +174,35 @@ class UniversalMongoWatcher:
         self.gateway_url = gateway_url.rstrip('/')
         self.max_workers = max_workers
         self.fifo_mode = fifo_mode
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.aging_seconds = aging_seconds
+
+        # Tasks já reclamadas por este watcher (evita re-submeter a mesma task)
+        self.inflight_ids: Set[ObjectId] = set()
+        # Chaves de exclusão (lease em watcher_locks) mantidas por este watcher
+        self.held_keys: Dict[str, ObjectId] = {}
+        # Instante (monotonic) do claim de cada task, para latência pickup→first token
+        self.claimed_at: Dict[ObjectId, float] = {}
+        self.inflight_lock = threading.Lock()
+
+        # Watchers vivos no cluster (atualizado a cada heartbeat)
+        self.live_watchers_count = 1
+        self.last_lease_renewal = time.time()
+        self.last_heartbeat = 0.0
+        self.last_aging = 0.0
+
+        # Sessões HTTP com keep-alive (eventos/estatísticas no gateway, delegação na API)
+        self.gateway_http = pooled_session("gateway")
+        self.conductor_http = pooled_session("conductor")
 
         # Controle de paralelização
         self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TaskWorker")
         self.active_futures: Set[Future] = set()
         self.futures_lock = threading.Lock()
 
-        # Controle FIFO por agente
-        self.agent_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # Agentes em processamento neste watcher (exclusão entre watchers via registry)
         self.processing_agents: Set[str] = set()
         self.processing_agents_lock = threading.Lock()
 
@@ -122,7 +224,7 @@ class UniversalMongoWatcher:
         signal.signal(signal.SIGINT, self._signal_handler)
 
         try:
-            self.client = MongoClient(mongo_uri)
+            self.client = client or MongoClient(mongo_uri)
             self.db = self.client[database]
             self.collection = self.db[collection]
 
@@ -133,6 +235,20 @@ class UniversalMongoWatcher:
             # Criar índices se não existirem
             self._create_indexes()
 
+            # Spans de trace no mesmo database (collection `spans`)
+            tracer.configure(
+                service="conductor-watcher",
+                exporter=exporter_from_env(lambda: self.db[SPANS_COLLECTION]),
+            )
+
+            # Prompts segmentados por conteúdo (cache local de segmentos)
+            self.segment_store = PromptSegmentStore(self.db)
+
+            # Registrar watcher (heartbeats, capacidade e leases de chave)
+            self.registry = WatcherRegistry(self.db, self.worker_id, max_workers)
+            self.registry.ensure_indexes()
+            self.registry.register()
+
             # Inicializar MCP Container Service (on-demand)
             if MCP_ON_DEMAND_AVAILABLE:
                 self.mcp_service = MCPContainerService(self.db)
@@ -157,8 +273,12 @@ class UniversalMongoWatcher:
             # Índice composto para queries otimizadas (agent_id + status + created_at)
             self.collection.create_index([("agent_id", 1), ("status", 1), ("created_at", 1)])
 
-            # TTL Index para limpeza automática após 24h
-            self.collection.create_index("created_at", expireAfterSeconds=86400)
+            # Índices da varredura claim-first (pendentes na ordem de claim + leases expirados)
+            ensure_ordering_indexes(self.collection)
+            self.collection.create_index([("status", 1), ("lease_until", 1)])
+
+            # TTL Index para limpeza automática após 24h (prompt_segments expiram depois)
+            self.collection.create_index("created_at", expireAfterSeconds=TASK_TTL_SECONDS)
 
             logger.info("📊 Índices MongoDB criados/verificados")
         except Exception as e:
@@ -222,14 +342,17 @@ class UniversalMongoWatcher:
             }
 
             # Log payload para debug
-            logger.info(f"📡 [EVENT] Payload: screenplay_id={payload['data'].get('screenplay_id')}, conversation_id={payload['data'].get('conversation_id')}, instance_id={payload['data'].get('instance_id')}")
+            logger.debug(
+                "📡 [EVENT] Payload: screenplay_id=%s, conversation_id=%s, instance_id=%s",
+                event_data.get("screenplay_id"), event_data.get("conversation_id"), event_data.get("instance_id"),
+            )
 
             # Enviar para o Gateway
             url = f"{self.gateway_url}/api/internal/task-event"
-            response = requests.post(url, json=payload, timeout=5)
+            response = self.gateway_http.post(url, json=payload, timeout=5)
 
             if response.status_code == 200:
-                logger.info(f"📡 [EVENT] Evento {event_type} emitido para {agent_name}")
+                logger.info("📡 [EVENT] Evento %s emitido para %s", event_type, agent_name)
             else:
                 logger.warning(f"⚠️ [EVENT] Falha ao emitir evento: {response.status_code}")
 
@@ -245,38 +368,60 @@ class UniversalMongoWatcher:
         logger.info(f"🛑 Sinal {signum} recebido. Iniciando graceful shutdown...")
         self.shutdown_requested = True
 
-    def _can_process_agent(self, agent_id: str) -> bool:
+    def _exclusion_key(self, request: Dict) -> Optional[str]:
         """
-        Verifica se podemos processar uma task deste agente baseado no modo FIFO
+        Chave de exclusão mútua da task baseada no modo FIFO
+
+        A chave é adquirida como lease no MongoDB (watcher_locks), então a
+        exclusão vale entre todos os watchers, não só entre threads locais.
 
         Args:
-            agent_id: ID do agente
+            request: Referência da task (agent_id, cwd)
 
         Returns:
-            bool: True se pode processar, False caso contrário
+            str: Chave de exclusão, ou None se a task não tem restrição
         """
-        # FIFO DESABILITADO - Permitir execução paralela sem restrições
-        # TODO: Implementar FIFO por agent_id + cwd para evitar conflitos no mesmo diretório
-        # enquanto permite paralelismo em diretórios diferentes
-        return True
-
-        # --- CÓDIGO FIFO ORIGINAL (comentado) ---
-        # if self.fifo_mode == "strict":
-        #     # Modo strict: apenas uma task por vez em todo o sistema
-        #     with self.processing_agents_lock:
-        #         return len(self.processing_agents) == 0
-        #
-        # elif self.fifo_mode == "per_agent":
-        #     # Modo per_agent: uma task por agente
-        #     with self.processing_agents_lock:
-        #         return agent_id not in self.processing_agents
-        #
-        # else:  # "relaxed"
-        #     # Modo relaxed: sem restrição FIFO
-        #     return True
+        if self.fifo_mode == "strict":
+            # Modo strict: apenas uma task por vez em todo o sistema
+            return "fifo:global"
+        elif self.fifo_mode == "per_agent":
+            # Modo per_agent: uma task por agente no mesmo diretório,
+            # permitindo paralelismo do mesmo agente em diretórios diferentes
+            return f"fifo:agent:{request.get('agent_id', 'unknown')}:{request.get('cwd', '.')}"
+        # Modo relaxed: sem restrição FIFO
+        return None
+
+    def _exclusion_scope(self, request: Dict) -> Optional[Dict]:
+        """Filtro das tasks cobertas pela chave per_agent (None nos outros modos)"""
+        if self.fifo_mode != "per_agent":
+            return None
+        return {"agent_id": request.get("agent_id"), "cwd": request.get("cwd")}
+
+    def _acquire_exclusion(self, key: Optional[str], request_id: ObjectId,
+                           scope: Optional[Dict] = None) -> bool:
+        """Adquirir chave de exclusão local + lease no registry"""
+        if key is None:
+            return True
+        with self.inflight_lock:
+            if key in self.held_keys:
+                return False
+            if not self.registry.acquire_key(key, self.lease_seconds, scope=scope):
+                return False
+            self.held_keys[key] = request_id
+            return True
+
+    def _release_exclusion(self, request_id: ObjectId):
+        """Liberar a chave de exclusão associada a uma task"""
+        with self.inflight_lock:
+            keys = [k for k, rid in self.held_keys.items() if rid == request_id]
+            for key in keys:
+                del self.held_keys[key]
+        for key in keys:
+            self.registry.release_key(key)
 
     def _mark_agent_processing(self, agent_id: str):
         """Marca um agente como processando"""
+        ACTIVE_TASKS.inc(component="watcher")
         with self.processing_agents_lock:
             self.processing_agents.add(agent_id)
             with self.metrics_lock:
@@ -286,6 +431,7 @@ class UniversalMongoWatcher:
 
     def _unmark_agent_processing(self, agent_id: str):
         """Remove marca de processamento de um agente"""
+        ACTIVE_TASKS.dec(component="watcher")
         with self.processing_agents_lock:
             self.processing_agents.discard(agent_id)
             with self.metrics_lock:
@@ -293,6 +439,7 @@ class UniversalMongoWatcher:
 
     def _update_metrics(self, agent_id: str, success: bool, duration: float):
         """Atualiza métricas de execução"""
+        TASKS_TOTAL.inc(component="watcher", outcome="completed" if success else "error", agent_id=agent_id)
         with self.metrics_lock:
             self.metrics["total_tasks_processed"] += 1
             if not success:
@@ -399,11 +546,10 @@ class UniversalMongoWatcher:
             params.append(f"instance_id={instance_id}")
 
         url = f"{gateway_url}/mcp/config?{'&'.join(params)}"
-        logger.info(f"🔌 [MCP] Buscando config do Gateway: {url}")
+        logger.info("🔌 [MCP] Buscando config do Gateway: %s", url)
 
         try:
-            import requests
-            response = requests.get(url, timeout=10)
+            response = self.gateway_http.get(url, timeout=10)
 
             if response.status_code != 200:
                 logger.warning(f"⚠️  [MCP] Gateway retornou {response.status_code}: {response.text}")
@@ -413,7 +559,7 @@ class UniversalMongoWatcher:
 
             # Verificar se há MCPs configurados
             if not mcp_config.get("mcpServers"):
-                logger.info(f"📭 [MCP] Nenhum MCP configurado para agent={agent_id}, instance={instance_id}")
+                logger.info("📭 [MCP] Nenhum MCP configurado para agent=%s, instance=%s", agent_id, instance_id)
                 return None
 
             # Criar arquivo temporário
@@ -421,8 +567,7 @@ class UniversalMongoWatcher:
             try:
                 with os.fdopen(fd, 'w') as f:
                     json.dump(mcp_config, f, indent=2)
-                logger.info(f"📄 [MCP] Config do Gateway salva em {temp_path}")
-                logger.info(f"📄 [MCP] MCPs: {list(mcp_config['mcpServers'].keys())}")
+                logger.info("📄 [MCP] Config do Gateway salva em %s (MCPs: %s)", temp_path, list(mcp_config["mcpServers"]))
                 return temp_path
             except Exception as e:
                 logger.error(f"❌ [MCP] Erro ao criar arquivo de config: {e}")
@@ -439,7 +584,7 @@ class UniversalMongoWatcher:
         """Imprime métricas no log"""
         metrics = self.get_metrics()
         logger.info("=" * 80)
-        logger.info("📊 MÉTRICAS DE PARALELIZAÇÃO")
+        logger.info(f"📊 MÉTRICAS DE PARALELIZAÇÃO ({self.worker_id})")
         logger.info("=" * 80)
         logger.info(f"   Total de tasks processadas: {metrics['total_tasks_processed']}")
         logger.info(f"   Total de tasks com erro: {metrics['total_tasks_failed']}")
@@ -451,35 +596,135 @@ class UniversalMongoWatcher:
         logger.info(f"   Tasks por agente: {dict(metrics['tasks_by_agent'])}")
         if metrics['errors_by_agent']:
             logger.info(f"   Erros por agente: {dict(metrics['errors_by_agent'])}")
+        cluster = self.registry.aggregate_metrics()
+        logger.info(f"   Cluster: {cluster['watchers']} watchers, capacidade {cluster['capacity']}, "
+                    f"{cluster['concurrent_tasks_count']} tasks ativas, "
+                    f"{cluster['total_tasks_processed']} processadas, "
+                    f"sucesso {cluster['success_rate']:.1f}%")
         logger.info("=" * 80)
 
-    def get_pending_requests(self) -> List[Dict]:
-        """Buscar requests pendentes"""
+    def get_pending_requests(self, limit: int = 0, exclude_scopes: Optional[List[Dict]] = None,
+                             exclude_ids: Optional[Set[ObjectId]] = None) -> List[Dict]:
+        """
+        Buscar referências de tasks reclamáveis (somente _id/agent_id/priority).
+
+        Inclui tasks pendentes e tasks em processing cujo lease expirou
+        (watcher que as reclamou morreu). O prompt só é lido após o claim.
+        Ordem: prioridade (com aging) desc, deadline, created_at.
+
+        Args:
+            limit: Número máximo de referências (0 = sem limite)
+            exclude_scopes: Filtros de tasks a pular (chaves FIFO ocupadas)
+            exclude_ids: Tasks já vistas neste ciclo
+        """
         try:
-            return list(self.collection.find(
+            now = datetime.now(timezone.utc)
+            query = {"$or": [
                 {"status": "pending"},
-                sort=[("created_at", 1)]
-            ))
+                {"status": "processing", "lease_until": {"$lt": now}},
+            ]}
+            if exclude_scopes:
+                query["$nor"] = list(exclude_scopes)
+            if exclude_ids:
+                query["_id"] = {"$nin": list(exclude_ids)}
+            cursor = self.collection.find(
+                query,
+                PENDING_SCAN_PROJECTION,
+                sort=CLAIM_SORT,
+            )
+            if limit:
+                cursor = cursor.limit(limit)
+            return list(cursor)
         except Exception as e:
             logger.error(f"❌ Erro ao buscar requests: {e}")
             return []
 
-    def mark_as_processing(self, request_id: ObjectId) -> bool:
-        """Marcar request como processando"""
+    def claim_request(self, request_id: ObjectId) -> Optional[Dict]:
+        """
+        Reclamar atomicamente uma task com lease e retornar o documento completo.
+
+        O claim só tem sucesso se a task ainda estiver pendente ou com lease
+        expirado, então dois watchers nunca executam a mesma task.
+
+        Returns:
+            Dict: Documento completo da task (com prompt), ou None se outro watcher venceu
+        """
         try:
-            result = self.collection.update_one(
-                {"_id": request_id, "status": "pending"},
+            now = datetime.now(timezone.utc)
+            task = self.collection.find_one_and_update(
+                {"_id": request_id, "$or": [
+                    {"status": "pending"},
+                    {"status": "processing", "lease_until": {"$lt": now}},
+                ]},
                 {
                     "$set": {
                         "status": "processing",
-                        "started_at": datetime.now(timezone.utc)
-                    }
-                }
+                        "started_at": now,
+                        "lease_until": now + timedelta(seconds=self.lease_seconds),
+                        "worker_id": self.worker_id,
+                    },
+                    "$inc": {"claim_count": 1},
+                },
+                return_document=ReturnDocument.AFTER,
             )
-            return result.modified_count > 0
+            if task:
+                pickup = _seconds_since(task.get("created_at"), now)
+                if pickup is not None:
+                    TASK_STAGE_SECONDS.observe(
+                        pickup, stage="insert_to_pickup",
+                        agent_id=task.get("agent_id"), provider=task.get("provider", "claude"),
+                    )
+                    # Classe da prioridade submetida (sem aging)
+                    TASK_QUEUE_WAIT_SECONDS.observe(
+                        pickup, priority_class=priority_class(task.get("base_priority", task.get("priority"))),
+                    )
+                self._check_deadline(task, now)
+            if task and task.get("claim_count", 1) > 1:
+                logger.warning(f"♻️  Task {request_id} reclamada após lease expirado (claim #{task['claim_count']})")
+            return task
         except Exception as e:
-            logger.error(f"❌ Erro ao marcar como processing: {e}")
-            return False
+            logger.error(f"❌ Erro ao reclamar task: {e}")
+            return None
+
+    def _check_deadline(self, task: Dict, now: datetime):
+        """Contar (e avisar) tasks reclamadas depois do deadline"""
+        late = _seconds_since(task.get("deadline"), now)
+        if late is None or late <= 0:
+            return
+        TASK_DEADLINE_MISSED.inc(priority_class=priority_class(task.get("base_priority", task.get("priority"))))
+        logger.warning(f"⏰ Task {task['_id']} reclamada {late:.1f}s após o deadline")
+
+    def age_pending_tasks(self) -> int:
+        """Aging: subir um nível a prioridade das tasks pendentes há aging_seconds
+
+        Antes, tasks inseridas sem campos de ordem (outros clientes) recebem os padrões.
+        """
+        try:
+            backfill_ordering_fields(self.collection)
+            aged = age_pending(self.collection, self.aging_seconds)
+            if aged:
+                logger.info(f"⏫ Prioridade de {aged} task(s) pendente(s) elevada por aging")
+            return aged
+        except Exception as e:
+            logger.warning(f"⚠️  Erro no aging de prioridades: {e}")
+            return 0
+
+    def renew_leases(self) -> int:
+        """Renovar o lease das tasks em execução neste watcher"""
+        with self.inflight_lock:
+            inflight = list(self.inflight_ids)
+        if not inflight:
+            return 0
+        self.registry.renew_keys(self.lease_seconds)
+        try:
+            result = self.collection.update_many(
+                {"_id": {"$in": inflight}, "status": "processing", "worker_id": self.worker_id},
+                {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)}},
+            )
+            return result.modified_count
+        except Exception as e:
+            logger.warning(f"⚠️  Erro ao renovar leases: {e}")
+            return 0
 
     def complete_request(self, request_id: ObjectId, result: str,
                         exit_code: int, duration: float) -> bool:
@@ -487,8 +732,9 @@ class UniversalMongoWatcher:
         try:
             status = "completed" if exit_code == 0 else "error"
 
+            # Só completa se o lease ainda for deste watcher (outro pode ter reclamado)
             update_result = self.collection.update_one(
-                {"_id": request_id},
+                {"_id": request_id, "worker_id": self.worker_id},
                 {
                     "$set": {
                         "status": status,
@@ -496,7 +742,8 @@ class UniversalMongoWatcher:
                         "exit_code": exit_code,
                         "duration": duration,
                         "completed_at": datetime.now(timezone.utc)
-                    }
+                    },
+                    "$unset": {"lease_until": ""}
                 }
             )
             return update_result.modified_count > 0
@@ -524,30 +771,27 @@ class UniversalMongoWatcher:
                 "increment_count": True
             }
 
-            logger.info(f"📊 [STATISTICS] Atualizando estatísticas via API:")
-            logger.info(f"   - URL: {url}")
-            logger.info(f"   - Instance ID: {instance_id}")
-            logger.info(f"   - Duration: {duration_ms}ms")
-            logger.info(f"   - Exit Code: {exit_code}")
-
-            response = requests.patch(url, json=payload, timeout=5)
+            response = self.gateway_http.patch(url, json=payload, timeout=5)
 
             if response.status_code == 200:
                 response_data = response.json()
                 stats = response_data.get("statistics", {})
-                logger.info(f"✅ [STATISTICS] Estatísticas atualizadas com sucesso:")
-                logger.info(f"   - Task Count: {stats.get('task_count', 'N/A')}")
-                logger.info(f"   - Total Time: {stats.get('total_execution_time', 'N/A')}ms")
-                logger.info(f"   - Average Time: {stats.get('average_execution_time', 'N/A'):.2f}ms")
-                logger.info(f"   - Success Rate: {stats.get('success_rate', 'N/A'):.1f}%")
+                log_event(
+                    logger, "watcher.statistics_updated", instance_id=instance_id,
+                    duration_ms=duration_ms, exit_code=exit_code,
+                    task_count=stats.get("task_count"),
+                    average_ms=stats.get("average_execution_time"),
+                    success_rate=stats.get("success_rate"),
+                )
                 return True
             elif response.status_code == 404:
                 logger.warning(f"⚠️ [STATISTICS] Instância não encontrada: {instance_id}")
                 return False
             else:
-                logger.error(f"❌ [STATISTICS] Erro ao atualizar estatísticas:")
-                logger.error(f"   - Status Code: {response.status_code}")
-                logger.error(f"   - Response: {response.text[:500]}")
+                logger.error(
+                    "❌ [STATISTICS] Erro ao atualizar estatísticas: status=%s response=%.500s",
+                    response.status_code, response.text,
+                )
                 return False
 
         except requests.exceptions.Timeout:
@@ -632,7 +876,8 @@ class UniversalMongoWatcher:
                               instance_id: str = None,
                               task_id: str = None,
                               conversation_id: str = None,
-                              screenplay_id: str = None) -> tuple[str, int, float]:
+                              screenplay_id: str = None,
+                              claimed_at: float = None) -> tuple[str, int, float]:
         """
         Executar request para LLM (Claude, Gemini ou Cursor-Agent) baseado no provider.
 
@@ -647,11 +892,13 @@ class UniversalMongoWatcher:
             task_id: ID da task (para streaming context)
             conversation_id: ID da conversa (para streaming context)
             screenplay_id: ID do screenplay (para streaming context)
+            claimed_at: Instante (time.monotonic) do claim, para latência até o primeiro token
 
         Returns:
             tuple: (result, exit_code, duration)
         """
         start_time = time.time()
+        start_monotonic = time.monotonic()
         mcp_config_path = None  # Track temp file for cleanup
 
         try:
@@ -667,24 +914,6 @@ class UniversalMongoWatcher:
                     "Verifique o CWD configurado nas propriedades do Screenplay."
                 ), 1, time.time() - start_time
 
-            # Log do ambiente antes de montar comando
-            logger.info("=" * 80)
-            logger.info("🔍 DEBUG: Informações do ambiente")
-            logger.info(f"   Python: {sys.executable}")
-            logger.info(f"   CWD: {os.getcwd()}")
-            logger.info(f"   Target CWD: {cwd}")
-            logger.info(f"   USER: {os.environ.get('USER', 'N/A')}")
-            logger.info(f"   HOME: {os.environ.get('HOME', 'N/A')}")
-            logger.info(f"   PATH: {os.environ.get('PATH', 'N/A')[:200]}...")
-            logger.info(f"   agent_id: {agent_id}")
-            logger.info(f"   provider: {provider}")
-            logger.info(f"   mcp_configs: {mcp_configs}")
-
-            # Verificar se cursor-agent existe no PATH
-            import shutil
-            cursor_path = shutil.which("cursor-agent")
-            logger.info(f"   cursor-agent path: {cursor_path if cursor_path else '❌ NÃO ENCONTRADO'}")
-
             # Buscar MCP config do Gateway Registry
             mcp_config_path = None
             if provider == "claude":
@@ -703,7 +932,7 @@ class UniversalMongoWatcher:
                 # Usar MCP config do Gateway se disponível
                 if mcp_config_path:
                     command.extend(["--mcp-config", mcp_config_path])
-                    logger.info(f"🔌 [MCP] Claude CLI receberá --mcp-config {mcp_config_path}")
+                    logger.info("🔌 [MCP] Claude CLI receberá --mcp-config %s", mcp_config_path)
             elif provider == "gemini":
                 # Verificar se o prompt é muito longo para evitar "Argument list too long"
                 MAX_PROMPT_LENGTH = 50000
@@ -718,11 +947,14 @@ class UniversalMongoWatcher:
             else:
                 return f"Provider '{provider}' não suportado. Suportados: claude, gemini, cursor-agent", 1, time.time() - start_time
 
-            logger.info(f"🔧 Executando {provider} em {cwd}")
-            logger.info(f"📋 Comando completo: {' '.join(command)}")
-            logger.info(f"📏 Tamanho do prompt: {len(prompt)} chars")
-            logger.info(f"📝 Primeiros 200 chars do prompt: {prompt[:200]}")
-            logger.info("=" * 80)
+            # Ambiente, comando e início do prompt: só para a fração amostrada
+            if detail_sampled(task_id):
+                import shutil
+                log_event(
+                    logger, "watcher.llm_detail", task_id=task_id, command=" ".join(command),
+                    cursor_agent=shutil.which("cursor-agent"), process_cwd=os.getcwd(),
+                    path=os.environ.get("PATH", "")[:200], prompt_head=prompt[:200],
+                )
 
             # Task context for streaming
             task_context = {
@@ -741,7 +973,7 @@ class UniversalMongoWatcher:
                 if WS_STREAMING_AVAILABLE:
                     stream_ws = self._open_stream_ws(task_context)
 
-                logger.info(f"⏳ Iniciando subprocess.Popen() (ws={'connected' if stream_ws else 'off'})...")
+                logger.debug("⏳ Iniciando subprocess.Popen() (ws=%s)...", "connected" if stream_ws else "off")
                 process = subprocess.Popen(
                     command,
                     stdin=subprocess.PIPE,
@@ -760,6 +992,7 @@ class UniversalMongoWatcher:
                 output_lines = []
                 final_text = []
                 stream_stats = {"messages": 0, "tool_calls": 0, "tokens_in": 0, "tokens_out": 0}
+                first_token_seen = False
 
                 for line in iter(process.stdout.readline, ""):
                     line = line.strip()
@@ -781,6 +1014,13 @@ class UniversalMongoWatcher:
                     evt_type = event_wrapper.get("type", "")
 
                     if evt_type == "assistant":
+                        if not first_token_seen:
+                            first_token_seen = True
+                            TASK_STAGE_SECONDS.observe(
+                                time.monotonic() - (claimed_at or start_monotonic),
+                                stage="pickup_to_first_token",
+                                agent_id=agent_id, provider=provider,
+                            )
                         message = event_wrapper.get("message", {})
                         usage = message.get("usage", {})
                         stream_stats["messages"] += 1
@@ -817,16 +1057,19 @@ class UniversalMongoWatcher:
                 if stderr_output:
                     output += "\n" + stderr_output
 
-                logger.info(f"✅ {provider} concluído em {duration:.1f}s - exit code: {exit_code} (ws={'on' if stream_ws else 'off'})")
-                logger.info(f"📊 Stream stats: {stream_stats}")
-                logger.info(f"📄 Primeiros 500 chars do output:\n{output[:500]}")
-                logger.info("=" * 80)
+                log_event(
+                    logger, "watcher.llm_finished", task_id=task_id, provider=provider, exit_code=exit_code,
+                    duration_s=round(duration, 3), output_chars=len(output), stream=bool(stream_ws),
+                )
+                if detail_sampled(task_id):
+                    log_event(logger, "watcher.llm_output", task_id=task_id,
+                              stream_stats=json.dumps(stream_stats, default=str), output_head=output[:500])
 
                 return output, exit_code, duration
 
             else:
                 # === NON-CLAUDE: subprocess.run (Gemini, cursor-agent) ===
-                logger.info("⏳ Iniciando subprocess.run()...")
+                logger.debug("⏳ Iniciando subprocess.run()...")
                 result = subprocess.run(
                     command,
                     input=prompt,
@@ -840,11 +1083,13 @@ class UniversalMongoWatcher:
                 duration = time.time() - start_time
                 output = result.stdout + result.stderr
 
-                logger.info(f"✅ {provider} concluído em {duration:.1f}s - exit code: {result.returncode}")
-                logger.info(f"📤 Stdout length: {len(result.stdout)} chars")
-                logger.info(f"📤 Stderr length: {len(result.stderr)} chars")
-                logger.info(f"📄 Primeiros 500 chars do output:\n{output[:500]}")
-                logger.info("=" * 80)
+                log_event(
+                    logger, "watcher.llm_finished", task_id=task_id, provider=provider,
+                    exit_code=result.returncode, duration_s=round(duration, 3),
+                    output_chars=len(output), stream=False,
+                )
+                if detail_sampled(task_id):
+                    log_event(logger, "watcher.llm_output", task_id=task_id, output_head=output[:500])
 
                 return output, result.returncode, duration
 
@@ -896,57 +1141,82 @@ class UniversalMongoWatcher:
         agent_id = request.get("agent_id", "unknown")
         thread_name = threading.current_thread().name
 
+        # Span da execução no watcher, filho do span do consumer (task.trace)
+        trace_span = tracer.start_span(
+            "watcher.execute",
+            SpanContext.from_dict(request.get("trace")),
+            {
+                "task_id": str(request.get("_id", "")),
+                "agent_id": agent_id,
+                "provider": request.get("provider", "claude"),
+                "worker_id": self.worker_id,
+            },
+        )
+
         try:
             # Marcar agente como processando
             self._mark_agent_processing(agent_id)
-            logger.info(f"🚀 [{thread_name}] Iniciando processamento da task do agente {agent_id}")
+            logger.debug("🚀 [%s] Iniciando processamento da task do agente %s", thread_name, agent_id)
 
             # Processar a task
-            success = self.process_request(request)
+            success = self.process_request(request, trace_span)
 
+            trace_span.end(status="ok" if success else "error")
             return success
 
         except Exception as e:
             logger.error(f"❌ [{thread_name}] Erro ao processar task: {e}")
             import traceback
             logger.error(traceback.format_exc())
+            trace_span.end(status="error")
             return False
 
         finally:
-            # Desmarcar agente
+            # Desmarcar agente e liberar o slot de task reclamada
             self._unmark_agent_processing(agent_id)
-            logger.info(f"🏁 [{thread_name}] Finalizou processamento do agente {agent_id}")
-
-    def process_request(self, request: Dict) -> bool:
-        """Processar uma task individual"""
+            with self.inflight_lock:
+                self.inflight_ids.discard(request.get("_id"))
+                self.claimed_at.pop(request.get("_id"), None)
+            self._release_exclusion(request.get("_id"))
+            logger.debug("🏁 [%s] Finalizou processamento do agente %s", thread_name, agent_id)
+
+    def process_request(self, request: Dict, trace_span: Optional[Span] = None) -> bool:
+        """Processar uma task individual já reclamada (ver claim_request)"""
         request_id = request["_id"]
+        trace_context = trace_span.context if trace_span else SpanContext.from_dict(request.get("trace"))
+
+        # Tempo entre inserção no MongoDB e o claim por este watcher
+        created_at, started_at = request.get("created_at"), request.get("started_at")
+        if trace_context and isinstance(created_at, datetime) and isinstance(started_at, datetime):
+            tracer.record_span(
+                "watcher.pickup_wait", trace_context,
+                created_at.replace(tzinfo=created_at.tzinfo or timezone.utc).timestamp(),
+                started_at.replace(tzinfo=started_at.tzinfo or timezone.utc).timestamp(),
+                {"task_id": str(request_id)},
+            )
         agent_id = request.get("agent_id", "unknown")
         thread_name = threading.current_thread().name
 
-        # ========================================================================
-        # 🔍 PROVA EXPLÍCITA: Lendo instance_id da task
-        # ========================================================================
-        logger.info(f"🔍 [{thread_name}] [DEBUG] Lendo campos da task do MongoDB:")
-        logger.info(f"   - Task _id: {request_id}")
-        logger.info(f"   - Chaves disponíveis na task: {list(request.keys())}")
-        logger.info(f"   - Campo 'instance_id' existe? {'instance_id' in request}")
-
         instance_id = request.get("instance_id")  # ID da instância do agente
 
-        logger.info(f"   - instance_id LIDO: {repr(instance_id)}")
-        logger.info(f"   - instance_id TIPO: {type(instance_id)}")
-        logger.info(f"   - instance_id é None? {instance_id is None}")
-        logger.info(f"   - instance_id é truthy? {bool(instance_id)}")
-        logger.info("========================================================================")
-        # ========================================================================
+        # Campos lidos da task: só para a fração amostrada (CONDUCTOR_LOG_DETAIL_SAMPLE)
+        if detail_sampled(request_id):
+            log_event(
+                logger, "watcher.task_fields", task_id=str(request_id), thread=thread_name,
+                instance_id=instance_id, keys=",".join(sorted(request.keys())),
+            )
 
         provider = request.get("provider", "claude")
         cwd = request.get("cwd", ".")
         timeout = request.get("timeout", 1800)  # ✅ Alinhado com default da API (1800s = 30 minutos)
         mcp_configs = request.get("mcp_configs", [])  # Lista de MCPs (ex: ["prospector", "database"])
 
-        # Buscar campo 'prompt' com XML completo
-        prompt = request.get("prompt", "")
+        # Remontar o prompt XML completo (inline ou a partir de prompt_segments)
+        try:
+            prompt = self.segment_store.assemble(request)
+        except PromptSegmentMissing as e:
+            logger.error(f"❌ [{thread_name}] Task {request_id}: {e}")
+            prompt = ""
 
         if not prompt:
             logger.error(f"❌ [{thread_name}] Task {request_id} não possui campo 'prompt'")
@@ -954,25 +1224,22 @@ class UniversalMongoWatcher:
             self._update_metrics(agent_id, False, 0.0)
             return False
 
-        logger.info("=" * 80)
-        logger.info(f"📨 [{thread_name}] PROCESSANDO NOVA TASK")
-        logger.info(f"   ID: {request_id}")
-        logger.info(f"   Agent ID: {agent_id}")
-        logger.info(f"   Instance ID: {instance_id}")
-        logger.info(f"   Provider: {provider}")
-        logger.info(f"   CWD: {cwd}")
-        logger.info(f"   Timeout: {timeout}s")
-        logger.info(f"   MCP Configs: {mcp_configs}")
-        logger.info(f"   Prompt length: {len(prompt)} chars")
-        logger.info("=" * 80)
+        log_event(
+            logger, "watcher.task_started", task_id=str(request_id), thread=thread_name,
+            agent_id=agent_id, instance_id=instance_id, provider=provider, cwd=cwd, timeout=timeout,
+            mcp_configs=",".join(mcp_configs or []), prompt_chars=len(prompt),
+        )
 
         # ========================================================================
         # 🔌 MCP ON-DEMAND: Garantir que MCPs necessários estão rodando
+        # (apenas após o claim, para não repetir a verificação a cada ciclo)
         # ========================================================================
         if self.mcp_service:
             try:
-                logger.info(f"🔌 [{thread_name}] Verificando MCPs on-demand para agente '{agent_id}'...")
-                if not self.mcp_service.ensure_mcps_for_agent(agent_id, instance_id, timeout=60):
+                logger.debug("🔌 [%s] Verificando MCPs on-demand para agente '%s'...", thread_name, agent_id)
+                with tracer.span("mcp.ensure", trace_context, {"task_id": str(request_id)}):
+                    mcps_ready = self.mcp_service.ensure_mcps_for_agent(agent_id, instance_id, timeout=60)
+                if not mcps_ready:
                     error_msg = f"Falha ao iniciar MCPs necessários para agente '{agent_id}'"
                     logger.error(f"❌ [{thread_name}] {error_msg}")
                     self.complete_request(request_id, error_msg, 1, 0.0)
@@ -983,7 +1250,7 @@ class UniversalMongoWatcher:
                     request["result"] = error_msg
                     self.emit_task_event("task_error", request)
                     return False
-                logger.info(f"✅ [{thread_name}] MCPs on-demand verificados/iniciados com sucesso")
+                logger.debug("✅ [%s] MCPs on-demand verificados/iniciados com sucesso", thread_name)
             except Exception as e:
                 error_msg = f"Erro ao verificar MCPs on-demand: {e}"
                 logger.error(f"❌ [{thread_name}] {error_msg}")
@@ -999,11 +1266,6 @@ class UniversalMongoWatcher:
             logger.debug(f"⏭️  [{thread_name}] MCP on-demand desabilitado, pulando verificação")
         # ========================================================================
 
-        # Marcar como processando no MongoDB
-        if not self.mark_as_processing(request_id):
-            logger.warning(f"⚠️  [{thread_name}] Task {request_id} já está sendo processada")
-            return False
-
         # 📡 Emitir evento task_picked (watcher pegou o job da fila)
         # Incluir bound_mcps para que o BFF inicie SSE listeners nos sidecars
         request["status"] = "processing"
@@ -1011,6 +1273,7 @@ class UniversalMongoWatcher:
         self.emit_task_event("task_picked", request)
 
         # Executar LLM request
+        llm_span = tracer.start_span("llm.execute", trace_context, {"task_id": str(request_id), "provider": provider})
         result, exit_code, duration = self.execute_llm_request(
             provider=provider,
             prompt=prompt,
@@ -1021,36 +1284,37 @@ class UniversalMongoWatcher:
             instance_id=instance_id,
             task_id=str(request_id),
             conversation_id=request.get("conversation_id"),
-            screenplay_id=request.get("screenplay_id")
+            screenplay_id=request.get("screenplay_id"),
+            claimed_at=self.claimed_at.get(request_id)
         )
+        llm_span.set_attribute("exit_code", exit_code)
+        llm_span.end(status="ok" if exit_code == 0 else "error")
 
         # Salvar resultado
         success = self.complete_request(request_id, result, exit_code, duration)
 
         # Atualizar métricas
         self._update_metrics(agent_id, success and exit_code == 0, duration)
+        TASK_EXECUTION_SECONDS.observe(duration, agent_id=agent_id, provider=provider)
+        total = _seconds_since(request.get("enqueued_at") or request.get("created_at"))
+        if total is not None:
+            TASK_STAGE_SECONDS.observe(total, stage="total", agent_id=agent_id, provider=provider)
 
-        logger.info("=" * 80)
         if success:
-            status_emoji = "✅" if exit_code == 0 else "❌"
-            logger.info(f"{status_emoji} [{thread_name}] TASK COMPLETADA E SALVA NO MONGODB")
-            logger.info(f"   ID: {request_id}")
-            logger.info(f"   Agent ID: {agent_id}")
-            logger.info(f"   Instance ID: {instance_id}")
-            logger.info(f"   Exit code: {exit_code}")
-            logger.info(f"   Duração: {duration:.2f}s")
-            logger.info(f"   Resultado length: {len(result)} chars")
+            log_event(
+                logger, "watcher.task_completed", task_id=str(request_id), thread=thread_name,
+                agent_id=agent_id, instance_id=instance_id, exit_code=exit_code,
+                duration_s=round(duration, 3), result_chars=len(result),
+            )
 
             # Atualizar estatísticas do agente via API
             if instance_id:
                 duration_ms = duration * 1000  # Converter segundos para milissegundos
                 stats_updated = self.update_agent_statistics(instance_id, duration_ms, exit_code)
-                if stats_updated:
-                    logger.info(f"📊 [{thread_name}] Estatísticas do agente atualizadas com sucesso")
-                else:
-                    logger.warning(f"⚠️  [{thread_name}] Falha ao atualizar estatísticas do agente (não-crítico)")
+                if not stats_updated:
+                    logger.warning("⚠️  [%s] Falha ao atualizar estatísticas do agente (não-crítico)", thread_name)
             else:
-                logger.warning(f"⚠️  [{thread_name}] Task não possui instance_id, estatísticas não serão atualizadas")
+                logger.warning("⚠️  [%s] Task não possui instance_id, estatísticas não serão atualizadas", thread_name)
 
             # 📡 Emitir evento task_completed ou task_error
             request["status"] = "completed" if exit_code == 0 else "error"
@@ -1061,9 +1325,10 @@ class UniversalMongoWatcher:
             self.emit_task_event(event_type, request)
 
             # 💬 Update delegation bot placeholder in conversation (if this was a delegated task)
+            conversation_ops = []
             conversation_id = request.get("conversation_id")
             if conversation_id:
-                self._update_delegation_placeholder(
+                conversation_ops += self._update_delegation_placeholder(
                     conversation_id=conversation_id,
                     task_id=str(request_id),
                     result=result,
@@ -1071,24 +1336,24 @@ class UniversalMongoWatcher:
                     exit_code=exit_code,
                 )
 
-
             # 🔗 Auto-delegation: parse [DELEGATE] block and enqueue next agent
             if exit_code == 0:
-                self._handle_delegation(result, request)
+                conversation_ops += self._handle_delegation(result, request, trace_context)
+
+            # Placeholder + delegation messages go out in a single round trip
+            self._apply_conversation_ops(conversation_ops)
 
         else:
-            logger.error(f"❌ [{thread_name}] FALHA AO SALVAR RESULTADO NO MONGODB")
-            logger.error(f"   ID: {request_id}")
-            logger.error(f"   Agent ID: {agent_id}")
-            logger.error(f"   Instance ID: {instance_id}")
+            logger.error(
+                "❌ [%s] FALHA AO SALVAR RESULTADO NO MONGODB: id=%s agent_id=%s instance_id=%s",
+                thread_name, request_id, agent_id, instance_id,
+            )
 
             # 📡 Emitir evento task_error mesmo quando falha salvar
             request["status"] = "error"
             request["result"] = "Falha ao salvar resultado no MongoDB"
             self.emit_task_event("task_error", request)
 
-        logger.info("=" * 80)
-
         return success
 
     # Pre-compiled regex for delegation block parsing (tolerant of LLM formatting)
@@ -1108,16 +1373,21 @@ class UniversalMongoWatcher:
         r'\s*\[DELEGATE\].*?\[/DELEGATE\]\s*', re.DOTALL | re.IGNORECASE
     )
 
-    def _handle_delegation(self, result: str, request: Dict) -> None:
+    def _handle_delegation(self, result: str, request: Dict,
+                           trace_context: Optional[SpanContext] = None) -> List:
         """Parse [DELEGATE] block from agent output and enqueue next agent.
 
         Chain depth is enforced server-side by POST /agents/enqueue (HTTP 429).
         Auto-delegate is enforced server-side (HTTP 403).
         On rejection, the reason is appended to the task result in MongoDB.
+        The trace continues in the child task via the traceparent header.
+
+        Returns the conversation write operations for the delegation messages
+        (empty when nothing was delegated); the caller applies them.
         """
         match = self._DELEGATE_RE.search(result)
         if not match:
-            return
+            return []
 
         target_agent_id = match.group(1).strip()
         instance_id = (match.group(2) or "").strip() or None
@@ -1126,6 +1396,7 @@ class UniversalMongoWatcher:
         conversation_id = request.get("conversation_id")
         screenplay_id = request.get("screenplay_id")
         agent_id = request.get("agent_id", "unknown")
+        deadline = request.get("deadline")
 
         logger.info(
             f"🔗 [DELEGATION] {agent_id} requested delegation to {target_agent_id} "
@@ -1151,11 +1422,17 @@ class UniversalMongoWatcher:
                 "input": delegate_input,
                 "conversation_id": conversation_id,
                 "screenplay_id": screenplay_id,
-                "priority": 5,
+                # A cadeia herda a prioridade submetida e o deadline da task que delegou
+                "priority": request.get("base_priority", DEFAULT_PRIORITY),
+                "deadline": deadline.isoformat() if isinstance(deadline, datetime) else None,
                 "source": "agent_chain",
                 "parent_task_id": task_id,
             }
-            resp = requests.post(url, json=payload, timeout=30)
+            with tracer.span("watcher.delegate", trace_context,
+                             {"task_id": task_id, "target_agent_id": target_agent_id}) as delegate_span:
+                headers = {TRACEPARENT_HEADER: delegate_span.context.to_traceparent()} if trace_context else None
+                resp = self.conductor_http.post(url, json=payload, timeout=30, headers=headers)
+                delegate_span.set_attribute("http.status_code", resp.status_code)
             if resp.status_code == 200:
                 data = resp.json()
                 new_task_id = data.get("task_id", "")
@@ -1167,7 +1444,7 @@ class UniversalMongoWatcher:
 
                 # Add delegation messages to conversation so frontend can display them
                 if conversation_id:
-                    self._add_delegation_messages(
+                    return self._add_delegation_messages(
                         conversation_id=conversation_id,
                         source_agent_id=agent_id,
                         target_agent_id=target_agent_id,
@@ -1196,6 +1473,7 @@ class UniversalMongoWatcher:
                 )
         except Exception as e:
             logger.warning(f"⚠️ [DELEGATION] Failed to enqueue: {e}")
+        return []
 
     def _update_delegation_placeholder(
         self,
@@ -1204,36 +1482,15 @@ class UniversalMongoWatcher:
         result: str,
         status: str,
         exit_code: int,
-    ) -> None:
-        """Update a delegation bot placeholder with the task result.
+    ) -> List:
+        """Build the update filling a delegation bot placeholder with the task result.
 
-        Only updates messages with delegated=true to avoid touching
+        Only targets messages with delegated=true to avoid touching
         placeholders managed by the BFF (gateway).
         """
-        try:
-            conversations_col = self.db["conversations"]
-            now_ts = datetime.now(timezone.utc).isoformat()
-            content = result if status == "completed" else (result or f"Erro na execução (exit_code: {exit_code})")
-            update_result = conversations_col.update_one(
-                {
-                    "conversation_id": conversation_id,
-                    "messages.task_id": task_id,
-                    "messages.delegated": True,
-                },
-                {
-                    "$set": {
-                        "messages.$.content": content,
-                        "messages.$.status": status,
-                        "messages.$.completed_at": now_ts,
-                    }
-                },
-            )
-            if update_result.modified_count > 0:
-                logger.info(
-                    f"💬 [DELEGATION] Updated placeholder for task {task_id} in conversation {conversation_id}"
-                )
-        except Exception as e:
-            logger.warning(f"⚠️ [DELEGATION] Failed to update placeholder: {e}")
+        now_ts = datetime.now(timezone.utc).isoformat()
+        content = result if status == "completed" else (result or f"Erro na execução (exit_code: {exit_code})")
+        return placeholder_operations(conversation_id, task_id, content, status, now_ts)
 
     def _add_delegation_messages(
         self,
@@ -1245,10 +1502,9 @@ class UniversalMongoWatcher:
         new_task_id: str,
         chain_depth: int,
         max_chain_depth: int,
-    ) -> None:
-        """Add delegation notice + bot placeholder to conversation messages."""
+    ) -> List:
+        """Build the append of delegation notice + bot placeholder to conversation messages."""
         try:
-            conversations_col = self.db["conversations"]
             agents_col = self.db["agents"]
 
             # Look up target agent info for display
@@ -1258,54 +1514,155 @@ class UniversalMongoWatcher:
             )
             target_name = target_agent.get("name", target_agent_id) if target_agent else target_agent_id
             target_emoji = target_agent.get("emoji", "🤖") if target_agent else "🤖"
+        except Exception as e:
+            logger.warning(f"⚠️ [DELEGATION] Failed to look up target agent: {e}")
+            target_name, target_emoji = target_agent_id, "🤖"
+
+        now_ts = datetime.now(timezone.utc).isoformat()
+
+        # Delegation notice (system-like message showing the handoff)
+        delegation_msg = {
+            "id": str(uuid.uuid4()),
+            "type": "delegation",
+            "content": (
+                f"🔗 **{source_agent_id}** delegou para **{target_name}**"
+                f" (ciclo {chain_depth}/{max_chain_depth})\n\n"
+                f"> {delegate_input[:500]}"
+            ),
+            "timestamp": now_ts,
+            "source_agent_id": source_agent_id,
+            "target_agent_id": target_agent_id,
+        }
 
-            now_ts = datetime.now(timezone.utc).isoformat()
-
-            # Delegation notice (system-like message showing the handoff)
-            delegation_msg = {
-                "id": str(uuid.uuid4()),
-                "type": "delegation",
-                "content": (
-                    f"🔗 **{source_agent_id}** delegou para **{target_name}**"
-                    f" (ciclo {chain_depth}/{max_chain_depth})\n\n"
-                    f"> {delegate_input[:500]}"
-                ),
-                "timestamp": now_ts,
-                "source_agent_id": source_agent_id,
-                "target_agent_id": target_agent_id,
-            }
+        # Bot placeholder (will be updated when delegated task completes)
+        bot_placeholder = {
+            "id": str(uuid.uuid4()),
+            "type": "bot",
+            "content": "Executando delegação...",
+            "timestamp": now_ts,
+            "status": "pending",
+            "task_id": new_task_id,
+            "delegated": True,
+            "agent": {
+                "agent_id": target_agent_id,
+                "instance_id": target_instance_id or f"delegation-{new_task_id[:8]}",
+                "name": target_name,
+                "emoji": target_emoji,
+            },
+        }
 
-            # Bot placeholder (will be updated when delegated task completes)
-            bot_placeholder = {
-                "id": str(uuid.uuid4()),
-                "type": "bot",
-                "content": "Executando delegação...",
-                "timestamp": now_ts,
-                "status": "pending",
-                "task_id": new_task_id,
-                "delegated": True,
-                "agent": {
-                    "agent_id": target_agent_id,
-                    "instance_id": target_instance_id or f"delegation-{new_task_id[:8]}",
-                    "name": target_name,
-                    "emoji": target_emoji,
-                },
-            }
+        return [append_operation(conversation_id, [delegation_msg, bot_placeholder], now_ts)]
 
-            conversations_col.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$push": {"messages": {"$each": [delegation_msg, bot_placeholder]}},
-                    "$set": {"updated_at": now_ts},
-                },
-            )
+    def _apply_conversation_ops(self, operations: List) -> None:
+        """Send the pending conversation writes of a task in one ordered bulk_write."""
+        if not operations:
+            return
+        try:
+            result = apply_operations(self.db["conversations"], operations)
             logger.info(
-                f"💬 [DELEGATION] Added delegation messages to conversation {conversation_id} "
-                f"(task_id={new_task_id})"
+                f"💬 [DELEGATION] Applied {len(operations)} conversation writes "
+                f"(modified={result.modified_count})"
             )
         except Exception as e:
-            logger.warning(f"⚠️ [DELEGATION] Failed to add conversation messages: {e}")
+            logger.warning(f"⚠️ [DELEGATION] Failed to update conversation: {e}")
+
+
+    def send_heartbeat(self):
+        """Publicar heartbeat + métricas no registry e atualizar visão do cluster"""
+        with self.futures_lock:
+            active = len([f for f in self.active_futures if not f.done()])
+        self.registry.heartbeat(active, self.get_metrics(), telemetry=telemetry.snapshot())
+        self.live_watchers_count = max(1, self.registry.cluster_capacity()["watchers"])
+        self.last_heartbeat = time.time()
+
+    def poll_once(self) -> int:
+        """
+        Um ciclo de varredura: reclamar tasks até preencher os slots livres
+
+        Returns:
+            int: Número de tasks reclamadas e submetidas neste ciclo
+        """
+        if time.time() - self.last_heartbeat >= self.heartbeat_interval:
+            self.send_heartbeat()
+
+        # Aging: algumas vezes por período, para a espera não passar muito de aging_seconds por nível
+        aging_period = self.aging_seconds if self.aging_seconds > 0 else DEFAULT_AGING_SECONDS
+        if time.time() - self.last_aging >= aging_period / 4:
+            self.age_pending_tasks()
+            self.last_aging = time.time()
+
+        # Slots livres: só varrer o que podemos reclamar agora
+        with self.futures_lock:
+            self.active_futures = {f for f in self.active_futures if not f.done()}
+            free_slots = self.max_workers - len(self.active_futures)
+
+        # Janela de varredura cresce com o número de watchers, pois eles
+        # competem pelas mesmas tasks no topo da fila
+        scan_limit = free_slots * max(2, self.live_watchers_count)
+        submitted = 0
+
+        # Chaves per_agent já ocupadas (por qualquer watcher) ficam fora da varredura;
+        # as descobertas durante o ciclo saem da página seguinte
+        blocked_scopes = self.registry.held_scopes() if free_slots > 0 and self.fifo_mode == "per_agent" else []
+        seen: Set[ObjectId] = set()
+        pages = 0
+
+        while free_slots > 0 and pages < MAX_SCAN_PAGES:
+            refs = self.get_pending_requests(limit=scan_limit, exclude_scopes=blocked_scopes, exclude_ids=seen)
+            pages += 1
+            if not refs:
+                break
+            logger.info(f"📋 Encontradas {len(refs)} tasks reclamáveis")
+
+            # Reclamar e submeter tasks para processamento paralelo
+            for ref in refs:
+                seen.add(ref["_id"])
+                if free_slots <= 0:
+                    logger.info(f"⏸️  Máximo de {self.max_workers} workers atingido, aguardando...")
+                    break
+
+                with self.inflight_lock:
+                    if ref["_id"] in self.inflight_ids:
+                        continue
 
+                # Exclusão mútua entre watchers (lease de chave no MongoDB)
+                scope = self._exclusion_scope(ref)
+                if scope is not None and scope in blocked_scopes:
+                    continue
+                key = self._exclusion_key(ref)
+                if not self._acquire_exclusion(key, ref["_id"], scope):
+                    if scope is not None:
+                        blocked_scopes.append(scope)
+                    continue
+
+                # Claim atômico com lease: só então o prompt é lido
+                request = self.claim_request(ref["_id"])
+                if not request:
+                    self._release_exclusion(ref["_id"])
+                    continue
+
+                with self.inflight_lock:
+                    self.inflight_ids.add(request["_id"])
+                    self.claimed_at[request["_id"]] = time.monotonic()
+
+                with self.futures_lock:
+                    future = self.executor.submit(self._process_request_wrapper, request)
+                    self.active_futures.add(future)
+                free_slots -= 1
+                submitted += 1
+
+                logger.info(f"✅ Task {request['_id']} reclamada e submetida (workers ativos: {len(self.active_futures)}/{self.max_workers})")
+
+            # Página incompleta: não há mais tasks reclamáveis
+            if len(refs) < scan_limit:
+                break
+
+        # Renovar leases das tasks em execução
+        if time.time() - self.last_lease_renewal >= self.lease_seconds / 3:
+            self.renew_leases()
+            self.last_lease_renewal = time.time()
+
+        return submitted
 
     def run(self, poll_interval: float = 1.0, metrics_interval: int = 60):
         """
@@ -1323,6 +1680,8 @@ class UniversalMongoWatcher:
         logger.info(f"🎯 Suporte: Claude, Gemini, Cursor-Agent")
         logger.info(f"🔧 Max workers: {self.max_workers}")
         logger.info(f"📊 Modo FIFO: {self.fifo_mode}")
+        logger.info(f"🪪 Worker ID: {self.worker_id} (lease: {self.lease_seconds}s)")
+        logger.info(f"⏫ Aging de prioridade: +1 nível a cada {self.aging_seconds}s pendente")
         logger.info(f"📈 Métricas a cada: {metrics_interval}s")
         logger.info("")
         logger.info("📋 AMBIENTE DE EXECUÇÃO:")
@@ -1350,36 +1709,7 @@ class UniversalMongoWatcher:
         try:
             while not self.shutdown_requested:
                 try:
-                    # Buscar tasks pendentes
-                    requests = self.get_pending_requests()
-
-                    if requests:
-                        logger.info(f"📋 Encontradas {len(requests)} tasks pendentes")
-
-                        # Submeter tasks para processamento paralelo
-                        for request in requests:
-                            agent_id = request.get("agent_id", "unknown")
-
-                            # FIFO DESABILITADO - Sem verificação de agente processando
-                            # TODO: Reimplementar com FIFO por agent_id + cwd
-                            # if not self._can_process_agent(agent_id):
-                            #     logger.info(f"⏸️  Agente {agent_id} já está processando, aguardando...")
-                            #     continue
-
-                            # Verificar se há workers disponíveis
-                            with self.futures_lock:
-                                # Limpar futures completadas
-                                self.active_futures = {f for f in self.active_futures if not f.done()}
-
-                                if len(self.active_futures) >= self.max_workers:
-                                    logger.info(f"⏸️  Máximo de {self.max_workers} workers atingido, aguardando...")
-                                    break
-
-                                # Submeter task para processamento
-                                future = self.executor.submit(self._process_request_wrapper, request)
-                                self.active_futures.add(future)
-
-                            logger.info(f"✅ Task submetida para processamento (workers ativos: {len(self.active_futures)}/{self.max_workers})")
+                    self.poll_once()
 
                     # Limpar futures completadas periodicamente
                     with self.futures_lock:
@@ -1431,6 +1761,13 @@ class UniversalMongoWatcher:
             logger.info("🔄 Finalizando ThreadPoolExecutor...")
             self.executor.shutdown(wait=True, cancel_futures=False)
 
+            # Sair do registro de watchers (libera chaves de exclusão)
+            self.registry.deregister()
+            tracer.flush()
+
+            self.gateway_http.close()
+            self.conductor_http.close()
+
             # Fechar conexão MongoDB
             logger.info("🔌 Fechando conexão MongoDB...")
             self.client.close()
@@ -1464,11 +1801,22 @@ def main():
     parser.add_argument("--max-workers", type=int, default=10,
                        help="Número máximo de workers paralelos (padrão: 5)")
     parser.add_argument("--fifo-mode", choices=["strict", "per_agent", "relaxed"], default="per_agent",
-                       help="Modo FIFO: strict (uma task total), per_agent (FIFO por agente), relaxed (sem FIFO)")
+                       help="Modo FIFO (vale entre todos os watchers): strict (uma task total), per_agent (uma por agente+cwd), relaxed (sem FIFO)")
     parser.add_argument("--metrics-interval", type=int, default=60,
                        help="Intervalo para imprimir métricas em segundos (padrão: 60)")
+    parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS,
+                       help="Duração do lease de tasks em processing, renovado durante a execução (padrão: 120)")
+    parser.add_argument("--worker-id", default=None,
+                       help="Identificador deste watcher (padrão: host:pid:sufixo)")
+    parser.add_argument("--heartbeat-interval", type=int, default=DEFAULT_HEARTBEAT_INTERVAL,
+                       help="Intervalo de heartbeat no registro de watchers em segundos (padrão: 10)")
+    parser.add_argument("--aging-seconds", type=float, default=DEFAULT_AGING_SECONDS,
+                       help="Espera pendente que sobe a prioridade de uma task em um nível, 0 desativa "
+                            "(padrão: TASK_PRIORITY_AGING_SECONDS ou 60)")
 
     args = parser.parse_args()
+    # CONDUCTOR_LOG_MODE=production: JSON por linha, I/O de log numa thread própria
+    configure_log_mode()
 
     try:
         watcher = UniversalMongoWatcher(
@@ -1477,7 +1825,11 @@ def main():
             collection=args.collection,
             gateway_url=args.gateway_url,
             max_workers=args.max_workers,
-            fifo_mode=args.fifo_mode
+            fifo_mode=args.fifo_mode,
+            lease_seconds=args.lease_seconds,
+            worker_id=args.worker_id,
+            heartbeat_interval=args.heartbeat_interval,
+            aging_seconds=args.aging_seconds,
         )
 
         watcher.run(
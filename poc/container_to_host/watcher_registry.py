@@ -0,0 +1,256 @@
+"""
+Watcher Registry - Coordenação entre múltiplos watchers (multi-processo / multi-host).
+
+Este serviço é responsável por:
+1. Registrar cada watcher na collection `watchers` (host, pid, capacidade)
+2. Manter heartbeats com snapshot de métricas de cada watcher
+3. Exclusão mútua por chave (agente+cwd, global) via leases no MongoDB
+4. Agregar métricas de todos os watchers vivos
+
+Todo estado compartilhado fica no MongoDB, então N watchers em hosts
+diferentes podem consumir a mesma collection `tasks` sem coordenação local.
+"""
+
+import os
+import socket
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Dict
+
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Watcher sem heartbeat por mais que isso é considerado morto
+DEFAULT_HEARTBEAT_TTL_SECONDS = 30
+
+# Métricas numéricas somadas na agregação
+SUMMED_METRICS = (
+    "total_tasks_processed",
+    "total_tasks_failed",
+    "total_execution_time",
+    "concurrent_tasks_count",
+)
+
+# Métricas por agente mescladas (somadas por chave) na agregação
+PER_AGENT_METRICS = ("tasks_by_agent", "errors_by_agent")
+
+
+class WatcherRegistry:
+    """
+    Registro de watchers e leases de chave no MongoDB.
+
+    Collections:
+        watchers: um documento por watcher (_id = worker_id)
+        watcher_locks: um documento por chave de exclusão (_id = chave)
+    """
+
+    def __init__(self, db: Database, worker_id: str, capacity: int,
+                 heartbeat_ttl: int = DEFAULT_HEARTBEAT_TTL_SECONDS):
+        """
+        Inicializa o registro.
+
+        Args:
+            db: Database MongoDB
+            worker_id: Identificador único deste watcher
+            capacity: Número máximo de tasks simultâneas deste watcher
+            heartbeat_ttl: Segundos sem heartbeat até o watcher ser considerado morto
+        """
+        self.db = db
+        self.watchers = db["watchers"]
+        self.locks = db["watcher_locks"]
+        self.worker_id = worker_id
+        self.capacity = capacity
+        self.heartbeat_ttl = heartbeat_ttl
+
+    def ensure_indexes(self):
+        """Criar índices (heartbeat para listagem e TTL de limpeza de watchers mortos)"""
+        try:
+            self.watchers.create_index(
+                "last_heartbeat",
+                expireAfterSeconds=max(self.heartbeat_ttl * 20, 600),
+            )
+            self.locks.create_index("lease_until")
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao criar índices: {e}")
+
+    # ------------------------------------------------------------------
+    # Registro e heartbeat
+    # ------------------------------------------------------------------
+
+    def register(self):
+        """Registrar (ou re-registrar) este watcher"""
+        now = datetime.now(timezone.utc)
+        self.watchers.update_one(
+            {"_id": self.worker_id},
+            {
+                "$set": {
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                    "capacity": self.capacity,
+                    "active_tasks": 0,
+                    "status": "running",
+                    "last_heartbeat": now,
+                },
+                "$setOnInsert": {"started_at": now},
+            },
+            upsert=True,
+        )
+        logger.info(f"🪪 [REGISTRY] Watcher registrado: {self.worker_id} (capacidade: {self.capacity})")
+
+    def heartbeat(self, active_tasks: int, metrics: Optional[Dict] = None,
+                  telemetry: Optional[Dict] = None):
+        """
+        Atualizar heartbeat com tasks ativas e snapshot de métricas
+
+        Args:
+            active_tasks: Tasks em execução neste watcher
+            metrics: Contadores do watcher (get_metrics)
+            telemetry: Snapshot de src.infrastructure.metrics (histogramas de latência),
+                       agregado pela API em GET /system/metrics
+        """
+        update = {
+            "status": "running",
+            "active_tasks": active_tasks,
+            "last_heartbeat": datetime.now(timezone.utc),
+        }
+        if metrics is not None:
+            update["metrics"] = {
+                **{key: metrics.get(key, 0) for key in SUMMED_METRICS},
+                **{key: dict(metrics.get(key, {})) for key in PER_AGENT_METRICS},
+                "max_concurrent_tasks": metrics.get("max_concurrent_tasks", 0),
+            }
+        if telemetry is not None:
+            update["telemetry"] = telemetry
+        try:
+            self.watchers.update_one({"_id": self.worker_id}, {"$set": update}, upsert=True)
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro no heartbeat: {e}")
+
+    def deregister(self):
+        """Marcar watcher como parado e liberar todas as suas chaves"""
+        try:
+            self.watchers.update_one(
+                {"_id": self.worker_id},
+                {"$set": {"status": "stopped", "active_tasks": 0}},
+            )
+            self.locks.delete_many({"owner": self.worker_id})
+            logger.info(f"👋 [REGISTRY] Watcher desregistrado: {self.worker_id}")
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao desregistrar: {e}")
+
+    def live_watchers(self) -> List[Dict]:
+        """Listar watchers com heartbeat recente"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.heartbeat_ttl)
+        return list(self.watchers.find(
+            {"status": "running", "last_heartbeat": {"$gte": cutoff}}
+        ))
+
+    def cluster_capacity(self) -> Dict:
+        """Capacidade total e tasks ativas de todos os watchers vivos"""
+        live = self.live_watchers()
+        return {
+            "watchers": len(live),
+            "capacity": sum(w.get("capacity", 0) for w in live),
+            "active_tasks": sum(w.get("active_tasks", 0) for w in live),
+        }
+
+    def aggregate_metrics(self) -> Dict:
+        """Somar métricas dos watchers vivos (snapshot do último heartbeat)"""
+        live = self.live_watchers()
+        aggregated: Dict = {key: 0 for key in SUMMED_METRICS}
+        aggregated.update({key: {} for key in PER_AGENT_METRICS})
+        aggregated["max_concurrent_tasks"] = 0
+
+        for watcher in live:
+            metrics = watcher.get("metrics") or {}
+            for key in SUMMED_METRICS:
+                aggregated[key] += metrics.get(key, 0)
+            for key in PER_AGENT_METRICS:
+                for agent_id, count in (metrics.get(key) or {}).items():
+                    aggregated[key][agent_id] = aggregated[key].get(agent_id, 0) + count
+            aggregated["max_concurrent_tasks"] += metrics.get("max_concurrent_tasks", 0)
+
+        processed = aggregated["total_tasks_processed"]
+        aggregated["watchers"] = len(live)
+        aggregated["capacity"] = sum(w.get("capacity", 0) for w in live)
+        aggregated["average_execution_time"] = (
+            aggregated["total_execution_time"] / processed if processed > 0 else 0
+        )
+        aggregated["success_rate"] = (
+            100 * (processed - aggregated["total_tasks_failed"]) / processed
+            if processed > 0 else 100
+        )
+        return aggregated
+
+    # ------------------------------------------------------------------
+    # Leases de chave (exclusão mútua entre processos)
+    # ------------------------------------------------------------------
+
+    def acquire_key(self, key: str, lease_seconds: int, scope: Optional[Dict] = None) -> bool:
+        """
+        Adquirir lease exclusivo de uma chave.
+
+        Sucesso se a chave está livre, expirada ou já pertence a este watcher.
+        O _id único da collection garante que só um watcher vence a corrida.
+
+        Args:
+            scope: Filtro de tasks coberto pela chave (ex: agent_id + cwd),
+                   usado pelos watchers para pular essas tasks na varredura
+        """
+        now = datetime.now(timezone.utc)
+        update = {
+            "owner": self.worker_id,
+            "lease_until": now + timedelta(seconds=lease_seconds),
+            "acquired_at": now,
+        }
+        if scope is not None:
+            update["scope"] = scope
+        try:
+            self.locks.update_one(
+                {"_id": key, "$or": [
+                    {"owner": self.worker_id},
+                    {"lease_until": {"$lt": now}},
+                ]},
+                {"$set": update},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            # Chave existe com lease válido de outro watcher
+            return False
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao adquirir chave '{key}': {e}")
+            return False
+
+    def held_scopes(self) -> List[Dict]:
+        """Escopos (filtros de tasks) das chaves com lease válido, de qualquer watcher"""
+        try:
+            locks = self.locks.find(
+                {"lease_until": {"$gte": datetime.now(timezone.utc)}, "scope": {"$exists": True}},
+                {"scope": 1},
+            )
+            return [lock["scope"] for lock in locks]
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao listar chaves: {e}")
+            return []
+
+    def release_key(self, key: str):
+        """Liberar uma chave deste watcher"""
+        try:
+            self.locks.delete_one({"_id": key, "owner": self.worker_id})
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao liberar chave '{key}': {e}")
+
+    def renew_keys(self, lease_seconds: int) -> int:
+        """Renovar o lease de todas as chaves deste watcher"""
+        try:
+            result = self.locks.update_many(
+                {"owner": self.worker_id},
+                {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)}},
+            )
+            return result.modified_count
+        except Exception as e:
+            logger.warning(f"⚠️  [REGISTRY] Erro ao renovar chaves: {e}")
+            return 0
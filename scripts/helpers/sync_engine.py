@@ -22,6 +22,11 @@ from src.core.services.configuration_service import ConfigurationService
 from src.core.services.storage_service import StorageService
 from src.ports.state_repository import IStateRepository
 from src.config import Settings
+from src.infrastructure.storage.bulk_migration import (
+    BulkMigrationEngine,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_WORKERS,
+)
 
 
 class SyncEngine:
@@ -79,90 +84,56 @@ class SyncEngine:
         
         return source_repo, dest_repo
     
-    def migrate_agents(self, source_repo: IStateRepository, dest_repo: IStateRepository) -> dict:
-        """Transferir agentes entre repositórios com logs detalhados."""
-        print("🔄 Iniciando migração de agentes...")
-        
-        # Descobrir agentes
-        print("📊 Descobrindo agentes...")
+    def migrate_agents(self, source_repo: IStateRepository, dest_repo: IStateRepository,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS,
+                       checkpoint_path: Optional[str] = None, dry_run: bool = False,
+                       verify: bool = False, resume: bool = True) -> dict:
+        """Transferir agentes e histórico entre repositórios em lote (BulkMigrationEngine)."""
+        mode = " (dry-run)" if dry_run else ""
+        print(f"🔄 Iniciando migração de agentes{mode}...")
+        print(f"   📦 chunks de {chunk_size} agentes, {workers} workers")
+        if checkpoint_path:
+            print(f"   💾 Checkpoint: {checkpoint_path}")
+
+        def report(progress: dict):
+            print(
+                f"   ✓ {progress['agents']}/{progress['total_agents']} agentes, "
+                f"{progress['history_entries']:,} entradas de histórico "
+                f"({progress['agents_per_second']:.1f} agentes/s)"
+            )
+
+        engine = BulkMigrationEngine(
+            source_repo, dest_repo,
+            chunk_size=chunk_size,
+            workers=workers,
+            checkpoint_path=checkpoint_path,
+            progress=report,
+        )
         try:
-            agent_ids = source_repo.list_agents()
-            if not agent_ids:
-                print("   ⚠️  Nenhum agente encontrado no backend de origem")
-                return {"success": True, "agents_migrated": 0, "files_transferred": 0}
-            
-            print(f"   ✓ Encontrados {len(agent_ids)} agentes: {agent_ids}")
+            result = engine.run(dry_run=dry_run, verify=verify, resume=resume)
         except Exception as e:
-            print(f"   ❌ Erro ao listar agentes: {e}")
+            print(f"   ❌ Erro na migração: {e}")
             return {"success": False, "error": str(e)}
-        
-        # Transferir dados
-        print("\n📦 Transferindo dados:")
-        total_files = 0
-        migrated_agents = 0
-        
-        for agent_id in agent_ids:
-            print(f"   🤖 {agent_id}")
-            agent_files = 0
-            
-            try:
-                # Transferir definition.yaml
-                definition = source_repo.load_definition(agent_id)
-                if definition:
-                    dest_repo.save_definition(agent_id, definition)
-                    size = len(str(definition).encode('utf-8'))
-                    print(f"      ✓ definition.yaml ({size:,}B) → destino")
-                    agent_files += 1
-                
-                # Transferir persona.md
-                persona = source_repo.load_persona(agent_id)
-                if persona:
-                    dest_repo.save_persona(agent_id, persona)
-                    size = len(persona.encode('utf-8'))
-                    print(f"      ✓ persona.md ({size:,}B) → destino")
-                    agent_files += 1
-                else:
-                    print("      ⚠️  persona.md não encontrado, pulando...")
-                
-                # Transferir session.json
-                session = source_repo.load_session(agent_id)
-                if session:
-                    dest_repo.save_session(agent_id, session)
-                    size = len(str(session).encode('utf-8'))
-                    print(f"      ✓ session.json ({size:,}B) → destino")
-                    agent_files += 1
-                
-                # Transferir knowledge.json (se existir)
-                try:
-                    knowledge = source_repo.load_knowledge(agent_id)
-                    if knowledge:
-                        dest_repo.save_knowledge(agent_id, knowledge)
-                        size = len(str(knowledge).encode('utf-8'))
-                        print(f"      ✓ knowledge.json ({size:,}B) → destino")
-                        agent_files += 1
-                except AttributeError:
-                    # Método pode não existir em todas as implementações
-                    pass
-                
-                total_files += agent_files
-                migrated_agents += 1
-                
-            except Exception as e:
-                print(f"      ❌ Erro ao migrar {agent_id}: {e}")
-                continue
-        
-        duration = time.time() - self.start_time
-        
-        print(f"\n✅ Migração concluída!")
-        print(f"   📈 {migrated_agents} agentes, {total_files} arquivos transferidos")
-        print(f"   ⏱️  Tempo total: {duration:.1f}s")
-        
-        return {
-            "success": True,
-            "agents_migrated": migrated_agents,
-            "files_transferred": total_files,
-            "duration": duration
-        }
+
+        throughput = result["throughput"]
+        if result["agents_skipped"]:
+            print(f"   ⏭️  {result['agents_skipped']} agentes já migrados (checkpoint)")
+        print(f"\n✅ Migração concluída{mode}!")
+        print(f"   📈 {result['agents_scanned']} agentes, {result['history_entries']:,} entradas de histórico, "
+              f"{result['bytes']:,}B")
+        print(f"   🚀 {throughput['agents_per_second']} agentes/s, "
+              f"{throughput['history_entries_per_second']} entradas/s, "
+              f"{throughput['bytes_per_second']:,} B/s")
+        print(f"   ⏱️  Tempo total: {result['duration']:.1f}s")
+        if verify:
+            if result["verified"]:
+                print("   🔍 Verificação: origem e destino conferem")
+            else:
+                print(f"   ❌ Verificação: {len(result['mismatches'])} agentes divergentes")
+                for mismatch in result["mismatches"][:20]:
+                    print(f"      - {mismatch['agent_id']}: {', '.join(mismatch['fields'])}")
+
+        return result
     
     def update_config_if_needed(self, new_backend: str, no_config_update: bool) -> bool:
         """Atualizar config.yaml condicionalmente."""
@@ -220,7 +191,10 @@ class SyncEngine:
             print(f"   ❌ Erro ao atualizar config.yaml: {e}")
             return False
     
-    def run_migration(self, source: str, destination: str, path: Optional[str] = None, no_config_update: bool = False) -> bool:
+    def run_migration(self, source: str, destination: str, path: Optional[str] = None, no_config_update: bool = False,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS,
+                      checkpoint_path: Optional[str] = None, dry_run: bool = False,
+                      verify: bool = False, resume: bool = True) -> bool:
         """Executar migração completa."""
         print("="*60)
         print(f"🔄 Iniciando migração: {source} → {destination}")
@@ -241,9 +215,21 @@ class SyncEngine:
             return False
         
         # Executar migração
-        result = self.migrate_agents(source_repo, dest_repo)
+        result = self.migrate_agents(
+            source_repo, dest_repo,
+            chunk_size=chunk_size,
+            workers=workers,
+            checkpoint_path=checkpoint_path,
+            dry_run=dry_run,
+            verify=verify,
+            resume=resume,
+        )
         if not result["success"]:
             return False
+
+        if dry_run:
+            print("\n🔒 Dry-run: nenhum dado gravado, config.yaml preservado")
+            return True
         
         # Atualizar configuração se necessário
         if not self.update_config_if_needed(destination, no_config_update):
@@ -271,6 +257,9 @@ Exemplos de uso:
   
   # Backup para path externo
   %(prog)s --source filesystem --destination filesystem --path /backup/path
+
+  # Migração grande, retomável e verificada
+  %(prog)s --source filesystem --destination mongodb --checkpoint .migration.json --verify
         """
     )
     
@@ -281,6 +270,17 @@ Exemplos de uso:
     parser.add_argument("--path", help="Path específico para filesystem (origem ou destino)")
     parser.add_argument("--no-config-update", action="store_true",
                        help="Não atualizar config.yaml")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"Agentes por lote (padrão: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"Threads para I/O no filesystem (padrão: {DEFAULT_WORKERS})")
+    parser.add_argument("--checkpoint", help="Arquivo de checkpoint para retomar a migração")
+    parser.add_argument("--no-resume", action="store_true",
+                       help="Ignorar checkpoint existente e migrar tudo de novo")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Apenas ler a origem e reportar o volume, sem gravar")
+    parser.add_argument("--verify", action="store_true",
+                       help="Comparar origem e destino após a cópia")
     
     args = parser.parse_args()
     
@@ -295,7 +295,13 @@ Exemplos de uso:
         source=args.source,
         destination=args.destination,
         path=args.path,
-        no_config_update=args.no_config_update
+        no_config_update=args.no_config_update,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+        verify=args.verify,
+        resume=not args.no_resume,
     )
     
     return 0 if success else 1
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Fake LLM provider CLI for load tests: stands in for ``claude``,
+``gemini`` and ``cursor-agent`` without calling any model.
+
+The wrappers in ``scripts/loadtest/bin`` are named after the real
+executables; put that directory first on PATH of the process that runs
+the providers (watcher, API in local mode):
+
+    PATH=$PWD/scripts/loadtest/bin:$PATH python poc/container_to_host/claude-mongo-watcher.py
+
+Contracts mimicked:
+- claude ``--output-format stream-json``: NDJSON ``system`` / ``assistant``
+  (text chunks with usage) / ``result`` events, prompt on stdin
+- claude ``--output-format json``: a single ``result`` object
+- claude ``--print`` (text), cursor-agent: plain text, prompt on stdin
+- gemini: plain text, prompt in ``-p``
+- ``--version``
+
+Behaviour (environment):
+    FAKE_LLM_LATENCY_MS       total response time (default 500)
+    FAKE_LLM_JITTER_MS        uniform +/- jitter on the latency (default 0)
+    FAKE_LLM_FIRST_TOKEN_MS   time to the first assistant event (default latency/5)
+    FAKE_LLM_CHUNKS           assistant events in stream-json (default 3)
+    FAKE_LLM_OUTPUT_TOKENS    reported output tokens (default 200)
+    FAKE_LLM_FAIL_RATE        probability of exiting with status 1 (default 0)
+    FAKE_LLM_SEED             seed for jitter/failures (default: random)
+
+A directive in the prompt overrides these per request; the last one
+wins, since the prompt repeats earlier turns in its history:
+
+    [fake-llm latency_ms=200 tokens=50 fail=0 delegate=Agent_B>Agent_C]
+
+``delegate`` makes the answer end with a ``[DELEGATE]`` block for the
+first agent whose input carries the directive with the rest of the
+chain, so one root request produces a chain of len(delegate) tasks.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+
+VERSION = "1.0.0 (fake-llm)"
+PROVIDERS = ("claude", "gemini", "cursor-agent")
+
+DIRECTIVE_RE = re.compile(r"\[fake-llm\s+([^\]]*)\]")
+
+
+def parse_directive(prompt):
+    """Settings of the last ``[fake-llm ...]`` directive in the prompt."""
+    matches = DIRECTIVE_RE.findall(prompt or "")
+    if not matches:
+        return {}
+    settings = {}
+    for pair in matches[-1].split():
+        key, _, value = pair.partition("=")
+        settings[key.strip()] = value.strip()
+    return settings
+
+
+def settings_for(prompt, environ=None):
+    environ = os.environ if environ is None else environ
+    directive = parse_directive(prompt)
+
+    def number(key, env_name, default):
+        try:
+            return float(directive[key]) if key in directive else float(environ.get(env_name, default))
+        except ValueError:
+            return float(default)
+
+    latency = number("latency_ms", "FAKE_LLM_LATENCY_MS", 500)
+    return {
+        "latency_ms": latency,
+        "jitter_ms": number("jitter_ms", "FAKE_LLM_JITTER_MS", 0),
+        "first_token_ms": number("first_token_ms", "FAKE_LLM_FIRST_TOKEN_MS", latency / 5),
+        "chunks": max(1, int(number("chunks", "FAKE_LLM_CHUNKS", 3))),
+        "output_tokens": int(number("tokens", "FAKE_LLM_OUTPUT_TOKENS", 200)),
+        "fail_rate": number("fail", "FAKE_LLM_FAIL_RATE", 0),
+        "delegate": [agent for agent in directive.get("delegate", "").split(">") if agent],
+    }
+
+
+def delegate_block(chain):
+    """``[DELEGATE]`` block for chain[0], forwarding the rest of the chain."""
+    target, rest = chain[0], chain[1:]
+    directive = f" [fake-llm delegate={'>'.join(rest)}]" if rest else ""
+    return (
+        "[DELEGATE]\n"
+        f"target_agent_id: {target}\n"
+        f"input: Continue the load-test chain.{directive}\n"
+        "[/DELEGATE]"
+    )
+
+
+def answer_chunks(settings, prompt, count=1):
+    """Response text split into ``count`` chunks on word boundaries.
+
+    The watcher joins stream chunks with newlines, so the ``[DELEGATE]``
+    block always travels whole in the last chunk.
+    """
+    words = ["lorem"] * max(1, settings["output_tokens"] * 3 // 4)
+    words[0] = f"Fake response ({len(prompt)} prompt chars): {words[0]}"
+    size = -(-len(words) // max(1, count))
+    chunks = [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+    if settings["delegate"]:
+        chunks[-1] += "\n\n" + delegate_block(settings["delegate"])
+    return chunks
+
+
+def stream_events(chunks, settings, input_tokens, session_id, duration_ms, is_error=False):
+    """The stream-json NDJSON events of one response (without the delays)."""
+    per_chunk = max(1, settings["output_tokens"] // len(chunks))
+    events = [{
+        "type": "system", "subtype": "init", "session_id": session_id,
+        "model": "fake-llm", "tools": [], "mcp_servers": [],
+    }]
+    for index, chunk in enumerate(chunks):
+        events.append({
+            "type": "assistant",
+            "session_id": session_id,
+            "message": {
+                "id": f"msg_{session_id[:8]}_{index}",
+                "type": "message",
+                "role": "assistant",
+                "model": "fake-llm",
+                "content": [{"type": "text", "text": chunk}],
+                "usage": {"input_tokens": input_tokens if index == 0 else 0, "output_tokens": per_chunk},
+            },
+        })
+    events.append(result_event("\n".join(chunks), settings, input_tokens, session_id, duration_ms, is_error))
+    return events
+
+
+def result_event(text, settings, input_tokens, session_id, duration_ms, is_error=False):
+    return {
+        "type": "result",
+        "subtype": "error_during_execution" if is_error else "success",
+        "is_error": is_error,
+        "duration_ms": duration_ms,
+        "num_turns": 1,
+        "result": text,
+        "session_id": session_id,
+        "total_cost_usd": 0,
+        "usage": {"input_tokens": input_tokens, "output_tokens": settings["output_tokens"]},
+    }
+
+
+def parse_args(argv):
+    """(provider, output_format, prompt_arg, version) from a provider command line."""
+    provider = os.environ.get("FAKE_LLM_PROVIDER") or os.path.basename(argv[0])
+    output_format, prompt_arg, version = "text", None, False
+    args = list(argv[1:])
+    while args:
+        arg = args.pop(0)
+        if arg == "--as" and args:
+            provider = args.pop(0)
+        elif arg == "--output-format" and args:
+            output_format = args.pop(0)
+        elif arg in ("-p", "--prompt") and args and provider == "gemini":
+            prompt_arg = args.pop(0)
+        elif arg in ("--version", "-v"):
+            version = True
+    if provider not in PROVIDERS:
+        provider = "claude"
+    return provider, output_format, prompt_arg, version
+
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    provider, output_format, prompt_arg, version = parse_args(argv)
+    if version:
+        print(f"{VERSION} [{provider}]")
+        return 0
+
+    prompt = prompt_arg if prompt_arg is not None else sys.stdin.read()
+    settings = settings_for(prompt)
+    seed = os.environ.get("FAKE_LLM_SEED")
+    rng = random.Random(f"{seed}:{prompt}" if seed is not None else None)
+
+    started = time.monotonic()
+    latency = max(0.0, settings["latency_ms"] + rng.uniform(-1, 1) * settings["jitter_ms"]) / 1000
+    failed = rng.random() < settings["fail_rate"]
+    input_tokens = max(1, len(prompt) // 4)
+    session_id = str(uuid.uuid4())
+    duration_ms = int(latency * 1000)
+    streaming = provider == "claude" and output_format == "stream-json"
+    if failed:
+        chunks = ["Fake provider failure (FAKE_LLM_FAIL_RATE)"]
+    else:
+        chunks = answer_chunks(settings, prompt, settings["chunks"] if streaming else 1)
+
+    if streaming:
+        first_token = min(latency, settings["first_token_ms"] / 1000)
+        gap = (latency - first_token) / len(chunks)
+        for event in stream_events(chunks, settings, input_tokens, session_id, duration_ms, failed):
+            if event["type"] == "assistant":
+                time.sleep(first_token if event["message"]["id"].endswith("_0") else gap)
+            elif event["type"] == "result":
+                time.sleep(max(0.0, latency - (time.monotonic() - started)))
+            sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    else:
+        time.sleep(latency)
+        if provider == "claude" and output_format == "json":
+            print(json.dumps(result_event(chunks[0], settings, input_tokens, session_id,
+                                          duration_ms, is_error=failed), ensure_ascii=False))
+        else:
+            print(chunks[0])
+
+    if failed:
+        print("fake-llm: simulated failure", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Load generator for the API -> queue -> watcher -> completion path.
+
+Drives ``POST /agents/enqueue`` (open loop at ``--rate``) or
+``POST /conductor/execute`` (closed loop, ``--concurrency`` synchronous
+callers), then follows every request through the ``tasks`` collection
+until its delegation chain finishes and reports throughput and
+p50/p90/p99 per stage:
+
+    api        HTTP round trip of the submitting request
+    queue      enqueued_at -> created_at (consumer: guards, prompt build, insert)
+    pickup     created_at -> started_at (watcher claim)
+    execution  started_at -> completed_at (provider subprocess + persistence)
+    handoff    parent completed_at -> child enqueued_at (delegation hop)
+    e2e        request sent -> last task of the chain completed
+
+Everything runs on one box, so client and server clocks agree. Pair it
+with the fake provider so the numbers measure the platform, not a model:
+
+    PATH=$PWD/scripts/loadtest/bin:$PATH FAKE_LLM_LATENCY_MS=200 \\
+        python poc/container_to_host/claude-mongo-watcher.py &
+    python scripts/loadtest/loadgen.py --agent Load_Agent --rate 5 --duration 60 \\
+        --chain Load_Agent,Load_Agent
+
+``--chain`` is the delegation fan-out: each request asks the fake
+provider to delegate through those agents in turn (the watcher follows
+one [DELEGATE] block per answer, so fan-out is chain length).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.harness import percentile  # noqa: E402
+
+FINISHED_STATUSES = ("completed", "error")
+STAGES = ("api", "queue", "pickup", "execution", "handoff", "e2e")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default=os.getenv("CONDUCTOR_API_URL", "http://localhost:12199"))
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--mode", choices=("enqueue", "execute"), default="enqueue")
+    parser.add_argument("--agent", required=True, help="agent that receives every request")
+    parser.add_argument("--chain", default="", help="comma-separated agents each answer delegates to, in order")
+    parser.add_argument("--rate", type=float, default=1.0, help="requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load")
+    parser.add_argument("--requests", type=int, help="total requests (overrides --duration)")
+    parser.add_argument("--concurrency", type=int, default=4, help="synchronous callers in execute mode")
+    parser.add_argument("--llm-latency-ms", type=int, help="fake provider latency for the root task")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for chains after the load")
+    parser.add_argument("--settle", type=float, default=5.0,
+                        help="seconds without new tasks before a short chain counts as finished")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def directive(chain: List[str], latency_ms: Optional[int] = None) -> str:
+    """``[fake-llm ...]`` directive read by scripts/loadtest/fake_llm.py."""
+    settings = []
+    if latency_ms is not None:
+        settings.append(f"latency_ms={latency_ms}")
+    if chain:
+        settings.append(f"delegate={'>'.join(chain)}")
+    return f" [fake-llm {' '.join(settings)}]" if settings else ""
+
+
+def _utc(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _seconds(start, end) -> Optional[float]:
+    start, end = _utc(start), _utc(end)
+    if start is None or end is None:
+        return None
+    return (end - start).total_seconds()
+
+
+# ----------------------------------------------------------------------
+# Load
+# ----------------------------------------------------------------------
+
+def _new_request(index: int, args) -> Dict[str, Any]:
+    chain = [agent for agent in args.chain.split(",") if agent]
+    return {
+        "index": index,
+        "conversation_id": f"loadtest-{uuid.uuid4()}",
+        "screenplay_id": f"loadtest-{uuid.uuid4()}",
+        "instance_id": f"loadtest-{uuid.uuid4()}",
+        "input": f"Load test request {index}.{directive(chain, args.llm_latency_ms)}",
+    }
+
+
+async def _submit(client, args, request: Dict[str, Any]) -> Dict[str, Any]:
+    if args.mode == "enqueue":
+        url, timeout = f"{args.api}/agents/enqueue", 30.0
+        payload = {
+            "target_agent_id": args.agent, "input": request["input"],
+            "conversation_id": request["conversation_id"], "screenplay_id": request["screenplay_id"],
+        }
+    else:
+        url, timeout = f"{args.api}/conductor/execute", args.timeout
+        payload = {
+            "agent_id": args.agent, "input_text": request["input"],
+            "instance_id": request["instance_id"], "conversation_id": request["conversation_id"],
+            "screenplay_id": request["screenplay_id"], "timeout": int(args.timeout),
+        }
+    request["sent_at"] = datetime.now(timezone.utc)
+    started = time.monotonic()
+    try:
+        response = await client.post(url, json=payload, timeout=timeout)
+        request["http_status"] = response.status_code
+        if response.status_code >= 400:
+            request["error"] = response.text[:200]
+    except Exception as e:
+        request["http_status"] = None
+        request["error"] = f"{type(e).__name__}: {e}"
+    request["api_s"] = time.monotonic() - started
+    return request
+
+
+async def generate(args) -> List[Dict[str, Any]]:
+    import httpx
+
+    total = args.requests if args.requests is not None else max(1, int(args.rate * args.duration))
+    requests = [_new_request(index, args) for index in range(total)]
+    async with httpx.AsyncClient() as client:
+        if args.mode == "enqueue":
+            # Open loop: send on schedule whether or not earlier requests returned
+            start = time.monotonic()
+            pending = []
+            for request in requests:
+                delay = start + request["index"] / args.rate - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                pending.append(asyncio.create_task(_submit(client, args, request)))
+            await asyncio.gather(*pending)
+        else:
+            queue = asyncio.Queue()
+            for request in requests:
+                queue.put_nowait(request)
+            start = time.monotonic()
+
+            async def caller():
+                while not queue.empty():
+                    request = queue.get_nowait()
+                    delay = start + request["index"] / args.rate - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await _submit(client, args, request)
+
+            await asyncio.gather(*(caller() for _ in range(max(1, args.concurrency))))
+    return requests
+
+
+# ----------------------------------------------------------------------
+# Follow-up
+# ----------------------------------------------------------------------
+
+def chain_finished(tasks: List[Dict[str, Any]], expected: int, settle_s: float, now: datetime) -> bool:
+    """Whether a conversation's tasks are done: all finished, and either the
+    whole chain ran or nothing new appeared for ``settle_s`` (rejected or
+    failed delegation)."""
+    if not tasks or any(task.get("status") not in FINISHED_STATUSES for task in tasks):
+        return False
+    if len(tasks) >= expected:
+        return True
+    completed = [moment for moment in (_utc(task.get("completed_at")) for task in tasks) if moment]
+    return bool(completed) and (now - max(completed)).total_seconds() >= settle_s
+
+
+def collect(args, requests: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Task documents per conversation once every chain finished (or timeout)."""
+    from pymongo import MongoClient
+
+    tasks = MongoClient(args.mongo_uri, tz_aware=True).conductor_state.tasks
+    expected = 1 + len([agent for agent in args.chain.split(",") if agent])
+    waiting = {r["conversation_id"] for r in requests if r.get("http_status") and r["http_status"] < 400}
+    chains: Dict[str, List[Dict[str, Any]]] = {}
+    deadline = time.monotonic() + args.timeout
+    projection = {"prompt": 0, "result": 0}
+    while waiting and time.monotonic() < deadline:
+        by_conversation: Dict[str, List[Dict[str, Any]]] = {}
+        for task in tasks.find({"conversation_id": {"$in": list(waiting)}}, projection):
+            by_conversation.setdefault(task["conversation_id"], []).append(task)
+        now = datetime.now(timezone.utc)
+        for conversation_id, docs in by_conversation.items():
+            chains[conversation_id] = docs
+            if chain_finished(docs, expected, args.settle, now):
+                waiting.discard(conversation_id)
+        if waiting:
+            time.sleep(0.5)
+    for conversation_id in waiting:
+        chains.setdefault(conversation_id, [])
+    return chains
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+
+def stage_stats(samples_s: List[float]) -> Dict[str, Any]:
+    if not samples_s:
+        return {"count": 0}
+    samples = [sample * 1000 for sample in samples_s]
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 2),
+        "p50_ms": round(percentile(samples, 0.5), 2),
+        "p90_ms": round(percentile(samples, 0.9), 2),
+        "p99_ms": round(percentile(samples, 0.99), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def build_report(requests: List[Dict[str, Any]], chains: Dict[str, List[Dict[str, Any]]],
+                 expected_tasks: int) -> Dict[str, Any]:
+    """Throughput, status counts and per-stage percentiles of one run."""
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    statuses: Dict[str, int] = {}
+    http_errors = 0
+    complete_chains = 0
+    completions: List[datetime] = []
+
+    for request in requests:
+        if request.get("api_s") is not None:
+            samples["api"].append(request["api_s"])
+        if not request.get("http_status") or request["http_status"] >= 400:
+            http_errors += 1
+            continue
+        docs = chains.get(request["conversation_id"], [])
+        by_id = {str(doc["_id"]): doc for doc in docs}
+        for doc in docs:
+            statuses[doc.get("status", "unknown")] = statuses.get(doc.get("status", "unknown"), 0) + 1
+            for stage, start, end in (
+                ("queue", doc.get("enqueued_at"), doc.get("created_at")),
+                ("pickup", doc.get("created_at"), doc.get("started_at")),
+                ("execution", doc.get("started_at"), doc.get("completed_at")),
+            ):
+                value = _seconds(start, end)
+                if value is not None:
+                    samples[stage].append(value)
+            parent = by_id.get(str(doc.get("parent_task_id")))
+            if parent is not None:
+                value = _seconds(parent.get("completed_at"), doc.get("enqueued_at") or doc.get("created_at"))
+                if value is not None:
+                    samples["handoff"].append(value)
+
+        finished = [_utc(doc.get("completed_at")) for doc in docs if doc.get("status") == "completed"]
+        if len(finished) >= expected_tasks and all(finished):
+            complete_chains += 1
+            samples["e2e"].append(_seconds(request["sent_at"], max(finished)))
+        completions.extend(moment for moment in finished if moment)
+
+    sent = [request["sent_at"] for request in requests if request.get("sent_at")]
+    window = _seconds(min(sent), max(completions)) if sent and completions else None
+    return {
+        "requests": len(requests),
+        "http_errors": http_errors,
+        "chains_complete": complete_chains,
+        "chains_incomplete": len(requests) - http_errors - complete_chains,
+        "task_statuses": statuses,
+        "window_s": round(window, 3) if window else None,
+        "throughput": {
+            "chains_per_s": round(complete_chains / window, 3) if window else None,
+            "tasks_per_s": round(len(completions) / window, 3) if window else None,
+        },
+        "stages": {stage: stage_stats(values) for stage, values in samples.items()},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"requests {report['requests']}  http errors {report['http_errors']}  "
+        f"chains complete {report['chains_complete']}  incomplete {report['chains_incomplete']}",
+        f"task statuses {report['task_statuses']}",
+        f"throughput {report['throughput']['chains_per_s']} chains/s, "
+        f"{report['throughput']['tasks_per_s']} tasks/s over {report['window_s']} s",
+        "",
+        f"{'stage':<10} {'count':>6} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+    ]
+    for stage, stats in report["stages"].items():
+        if not stats["count"]:
+            lines.append(f"{stage:<10} {0:>6}")
+            continue
+        lines.append(
+            f"{stage:<10} {stats['count']:>6} {stats['p50_ms']:>10.1f} {stats['p90_ms']:>10.1f} "
+            f"{stats['p99_ms']:>10.1f} {stats['max_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    requests = asyncio.run(generate(args))
+    print(f"sent {len(requests)} requests, waiting for chains ...", file=sys.stderr)
+    chains = collect(args, requests)
+    expected = 1 + len([agent for agent in args.chain.split(",") if agent])
+    report = build_report(requests, chains, expected)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["chains_incomplete"] == 0 and report["http_errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 # src/api/routes/agents.py
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Query
 from typing import List, Dict, Any
 from pydantic import BaseModel
 from typing import Optional
@@ -9,6 +9,7 @@ import logging
 from src.container import container  # Usar instância global do container DI
 from src.api.models import AgentListResponse, AgentSummary, AgentDetailResponse, ValidationResult, AgentCreationRequest, AgentUpdateRequest, VALID_GROUPS, VALID_SQUADS
 from src.core.services.mongo_task_client import MongoTaskClient
+from src.core.prompt_profile import PromptProfile
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/agents", tags=["Agents"])
@@ -411,11 +412,19 @@ def get_agent_persona(agent_id: str = Path(..., description="ID do agente")):
 
 
 @router.post("/{agent_id}/execute", response_model=Dict[str, Any], summary="Executar um agente")
-def execute_agent(agent_id: str, request: AgentExecuteRequest):
+def execute_agent(
+    agent_id: str,
+    request: AgentExecuteRequest,
+    profile: bool = Query(False, description="Incluir na resposta o perfil da construção do prompt"),
+):
     """
     Executa um agente específico via MongoDB queue system.
 
     SAGA-004: Histórico por instance_id é gerenciado automaticamente via collection 'history'.
+
+    Com ?profile=1 a resposta traz `prompt_profile`: tempo por etapa de
+    load_context/build_xml_prompt e bytes por seção do prompt. A versão
+    compacta é sempre gravada na task.
     """
     if MongoTaskClient is None:
         raise HTTPException(status_code=503, detail="MongoDB client não está disponível")
@@ -459,6 +468,7 @@ def execute_agent(agent_id: str, request: AgentExecuteRequest):
         logger.info(f"   - is_councilor_execution: {request.is_councilor_execution}")
         logger.info(f"   - include_history final: {include_history}")
 
+        prompt_profile = PromptProfile(agent_id)
         xml_prompt = discovery_service.get_full_prompt(
             agent_id=agent_id,
             current_message=request.user_input,
@@ -468,7 +478,8 @@ def execute_agent(agent_id: str, request: AgentExecuteRequest):
             save_to_file=False,
             conversation_id=request.conversation_id,  # 🔥 REQUIRED: Pass conversation_id to get history
             screenplay_id=request.screenplay_id,  # 🔥 REQUIRED: Pass screenplay_id for project context
-            instance_id=request.instance_id  # 🔥 REQUIRED: Pass instance_id for isolated context
+            instance_id=request.instance_id,  # 🔥 REQUIRED: Pass instance_id for isolated context
+            profile=prompt_profile
         )
 
         # 🔍 DEBUG: Verificar se o prompt está correto
@@ -489,18 +500,22 @@ def execute_agent(agent_id: str, request: AgentExecuteRequest):
             conversation_id=request.conversation_id,  # 🔥 REQUIRED: Pass conversation_id to task
             screenplay_id=request.screenplay_id,  # 🔥 REQUIRED: Pass screenplay_id to task
             is_councilor_execution=request.is_councilor_execution,  # Councilor flag
-            councilor_config=request.councilor_config  # Councilor config (if applicable)
+            councilor_config=request.councilor_config,  # Councilor config (if applicable)
+            prompt_profile=prompt_profile.compact()
         )
 
         # Check if caller wants to wait for result or get task_id immediately
         if not request.wait_for_result:
             # Return task_id immediately for async/SSE pattern
             logger.info(f"✅ [AGENTS] Task {task_id} submitted, returning immediately (async mode)")
-            return {
+            response = {
                 "_id": task_id,
                 "status": "pending",
                 "message": "Task submitted successfully, use task_id to monitor progress"
             }
+            if profile:
+                response["prompt_profile"] = prompt_profile.to_dict()
+            return response
 
         # Default behavior: wait for result (blocking)
         logger.info(f"⏳ [AGENTS] Waiting for task {task_id} to complete (sync mode)")
@@ -509,6 +524,8 @@ def execute_agent(agent_id: str, request: AgentExecuteRequest):
         # SAGA-004: Histórico já foi salvo automaticamente pelo TaskExecutionService
         # com o instance_id correto na collection 'history'
 
+        if profile:
+            result_document["prompt_profile"] = prompt_profile.to_dict()
         return result_document
 
     except Exception as e:
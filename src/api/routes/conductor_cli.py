@@ -249,6 +249,7 @@ def _execute_agent_container_mongodb(request: ConductorExecuteRequest) -> Dict[s
 
     try:
         from src.container import container
+        from src.core.constants import Defaults
         from src.core.prompt_engine import PromptEngine
         from src.core.services.conversation_service import ConversationService
 
@@ -276,7 +277,9 @@ def _execute_agent_container_mongodb(request: ConductorExecuteRequest) -> Dict[s
             )
         else:
             logger.info(f"Loading global conversation history for agent: {agent_id}")
-            conversation_history = agent_discovery.get_conversation_history(agent_id)
+            conversation_history = agent_discovery.get_conversation_history(
+                agent_id, limit=Defaults.HISTORY_TAIL_LIMIT
+            )
 
         # Construir prompt completo usando PromptEngine (mesma forma que o CLI faz)
         agent_home = repository.get_agent_home_path(agent_id)
@@ -9,18 +9,31 @@ Ref: PLANO_REFATORACAO_CONVERSATION_ID.md - Fase 1
 Data: 2025-11-01
 """
 
-from fastapi import APIRouter, Body, HTTPException, Path, Query
+from fastapi import APIRouter, Body, Header, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
+import asyncio
+import json
 import logging
 
-from src.core.services.conversation_service import ConversationService
+from src.core.services.conversation_event_service import RESYNC, conversation_events
+from src.core.services.conversation_service import (
+    AsyncConversationService,
+    ConversationService,
+    encode_cursor,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
 
-# Instanciar o serviço de conversas
+# Instanciar o serviço de conversas (síncrono: índices, backfill de contadores)
 conversation_service = ConversationService()
+# Rotas usam a versão assíncrona (PyMongo async, sem threadpool)
+async_conversation_service = AsyncConversationService()
+
+# Intervalo de keep-alive do stream SSE (proxies fecham conexões ociosas)
+SSE_KEEPALIVE_SECONDS = 15
 
 
 # ==========================================
@@ -98,6 +111,7 @@ class ConversationSummary(BaseModel):
     updated_at: str
     message_count: int
     participant_count: int
+    last_message_preview: Optional[Dict[str, Any]] = None
     screenplay_id: Optional[str] = None
     display_order: Optional[int] = None  # 🔥 NOVO: Ordem de exibição customizada
 
@@ -107,7 +121,7 @@ class ConversationSummary(BaseModel):
 # ==========================================
 
 @router.post("/", response_model=CreateConversationResponse, summary="Criar nova conversa")
-def create_conversation(request: CreateConversationRequest):
+async def create_conversation(request: CreateConversationRequest):
     """
     Cria uma nova conversa.
 
@@ -120,7 +134,7 @@ def create_conversation(request: CreateConversationRequest):
     try:
         agent_info_dict = request.active_agent.dict() if request.active_agent else None
 
-        conversation_id = conversation_service.create_conversation(
+        conversation = await async_conversation_service.create_conversation(
             title=request.title,
             active_agent=agent_info_dict,
             screenplay_id=request.screenplay_id,
@@ -130,12 +144,6 @@ def create_conversation(request: CreateConversationRequest):
             auto_delegate=request.auto_delegate,
         )
 
-        # Buscar conversa criada para retornar dados completos
-        conversation = conversation_service.get_conversation_by_id(conversation_id)
-
-        if not conversation:
-            raise HTTPException(status_code=500, detail="Erro ao criar conversa")
-
         return CreateConversationResponse(
             conversation_id=conversation['conversation_id'],
             title=conversation['title'],
@@ -148,7 +156,7 @@ def create_conversation(request: CreateConversationRequest):
 
 
 @router.get("/{conversation_id}", response_model=ConversationDetail, summary="Obter conversa")
-def get_conversation(
+async def get_conversation(
     conversation_id: str = Path(..., description="ID da conversa")
 ):
     """
@@ -161,7 +169,7 @@ def get_conversation(
         Dados completos da conversa
     """
     try:
-        conversation = conversation_service.get_conversation_by_id(conversation_id)
+        conversation = await async_conversation_service.get_conversation_by_id(conversation_id)
 
         if not conversation:
             raise HTTPException(status_code=404, detail=f"Conversa não encontrada: {conversation_id}")
@@ -175,8 +183,72 @@ def get_conversation(
         raise HTTPException(status_code=500, detail=f"Erro ao buscar conversa: {str(e)}")
 
 
+def _sse_frame(event: Dict[str, Any]) -> str:
+    """Serializa um evento do hub no formato text/event-stream."""
+    lines = []
+    if event.get("id"):
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event['data'], ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(request: Request, subscription):
+    """Entrega os eventos da inscrição até o cliente desconectar."""
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            if subscription.overflowed:
+                # Cliente lento perdeu eventos: limpa a fila e pede refetch
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                yield _sse_frame({"id": None, "type": RESYNC, "data": {"conversation_id": subscription.conversation_id}})
+                continue
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse_frame(event)
+    finally:
+        conversation_events.unsubscribe(subscription)
+
+
+@router.get("/{conversation_id}/events", summary="Stream de eventos da conversa (SSE)")
+async def stream_conversation_events(
+    request: Request,
+    conversation_id: str = Path(..., description="ID da conversa"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Abre um stream server-sent events com as atualizações da conversa.
+
+    Eventos: message_appended, placeholder_updated, active_agent_changed,
+    task_status e resync (refazer GET /conversations/{id}). Reconectando
+    com o header Last-Event-ID, os eventos perdidos são reenviados.
+
+    Args:
+        conversation_id: ID da conversa
+        last_event_id: Último evento recebido (reconexão)
+
+    Returns:
+        StreamingResponse text/event-stream
+    """
+    exists = await async_conversation_service.conversation_exists(conversation_id)
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"Conversa não encontrada: {conversation_id}")
+
+    subscription = conversation_events.subscribe(conversation_id, last_event_id)
+    return StreamingResponse(
+        _event_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{conversation_id}/messages", summary="Adicionar mensagem à conversa")
-def add_message(
+async def add_message(
     conversation_id: str = Path(..., description="ID da conversa"),
     request: AddMessageRequest = ...
 ):
@@ -188,22 +260,22 @@ def add_message(
         request: Dados da mensagem
 
     Returns:
-        Confirmação de sucesso
+        Confirmação de sucesso e número de sequência da última mensagem
     """
     try:
         agent_info_dict = request.agent_info.dict() if request.agent_info else None
 
-        success = conversation_service.add_message(
+        sequence = await async_conversation_service.add_message(
             conversation_id=conversation_id,
             user_input=request.user_input,
             agent_response=request.agent_response,
             agent_info=agent_info_dict
         )
 
-        if not success:
+        if sequence is None:
             raise HTTPException(status_code=400, detail="Erro ao adicionar mensagem")
 
-        return {"success": True, "message": "Mensagem adicionada com sucesso"}
+        return {"success": True, "message": "Mensagem adicionada com sucesso", "sequence": sequence}
 
     except HTTPException:
         raise
@@ -213,7 +285,7 @@ def add_message(
 
 
 @router.put("/{conversation_id}/active-agent", summary="Alterar agente ativo")
-def set_active_agent(
+async def set_active_agent(
     conversation_id: str = Path(..., description="ID da conversa"),
     request: SetActiveAgentRequest = ...
 ):
@@ -228,7 +300,7 @@ def set_active_agent(
         Confirmação de sucesso
     """
     try:
-        success = conversation_service.set_active_agent(
+        success = await async_conversation_service.set_active_agent(
             conversation_id=conversation_id,
             agent_info=request.agent_info.dict()
         )
@@ -246,24 +318,28 @@ def set_active_agent(
 
 
 @router.get("/", summary="Listar conversas")
-def list_conversations(
+async def list_conversations(
     limit: int = Query(20, ge=1, le=100, description="Número de conversas a retornar"),
-    skip: int = Query(0, ge=0, description="Número de conversas a pular (paginação)"),
-    screenplay_id: Optional[str] = Query(None, description="Filtrar conversas por roteiro")
+    skip: int = Query(0, ge=0, description="Número de conversas a pular (paginação por offset, legado)"),
+    screenplay_id: Optional[str] = Query(None, description="Filtrar conversas por roteiro"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor pela página anterior")
 ):
     """
     Lista conversas recentes.
 
     Args:
         limit: Número máximo de conversas
-        skip: Paginação (offset)
+        skip: Paginação (offset); ignorado quando cursor é informado
         screenplay_id: Opcional, filtrar conversas de um roteiro específico
+        cursor: Opcional, continua a listagem após a página anterior
 
     Returns:
-        Lista de conversas com sumários
+        Lista de conversas com sumários e next_cursor (None na última página)
     """
     try:
-        conversations = conversation_service.list_conversations(limit=limit, skip=skip, screenplay_id=screenplay_id)
+        conversations = await async_conversation_service.list_conversations(
+            limit=limit, skip=skip, screenplay_id=screenplay_id, cursor=cursor
+        )
 
         # Mapear para sumários
         summaries = []
@@ -273,8 +349,9 @@ def list_conversations(
                 'title': conv['title'],
                 'created_at': conv['created_at'],
                 'updated_at': conv['updated_at'],
-                'message_count': len(conv.get('messages', [])),
-                'participant_count': len(conv.get('participants', []))
+                'message_count': conv.get('message_count', 0),
+                'participant_count': conv.get('participant_count', 0),
+                'last_message_preview': conv.get('last_message_preview')
             }
 
             # Adicionar campos opcionais
@@ -285,18 +362,23 @@ def list_conversations(
 
             summaries.append(ConversationSummary(**summary_dict))
 
+        next_cursor = encode_cursor(conversations[-1]) if len(conversations) == limit else None
+
         return {
             "total": len(summaries),
-            "conversations": summaries
+            "conversations": summaries,
+            "next_cursor": next_cursor
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Erro ao listar conversas: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro ao listar conversas: {str(e)}")
 
 
 @router.delete("/{conversation_id}", summary="Deletar conversa")
-def delete_conversation(
+async def delete_conversation(
     conversation_id: str = Path(..., description="ID da conversa")
 ):
     """
@@ -309,7 +391,7 @@ def delete_conversation(
         Confirmação de sucesso
     """
     try:
-        success = conversation_service.delete_conversation(conversation_id)
+        success = await async_conversation_service.delete_conversation(conversation_id)
 
         if not success:
             raise HTTPException(status_code=404, detail=f"Conversa não encontrada: {conversation_id}")
@@ -324,7 +406,7 @@ def delete_conversation(
 
 
 @router.get("/{conversation_id}/messages", summary="Obter mensagens da conversa")
-def get_conversation_messages(
+async def get_conversation_messages(
     conversation_id: str = Path(..., description="ID da conversa"),
     limit: Optional[int] = Query(None, ge=1, description="Limitar número de mensagens (mais recentes)")
 ):
@@ -339,7 +421,7 @@ def get_conversation_messages(
         Lista de mensagens
     """
     try:
-        messages = conversation_service.get_conversation_messages(
+        messages = await async_conversation_service.get_conversation_messages(
             conversation_id=conversation_id,
             limit=limit
         )
@@ -356,7 +438,7 @@ def get_conversation_messages(
 
 
 @router.patch("/{conversation_id}/title", summary="Atualizar título da conversa")
-def update_conversation_title(
+async def update_conversation_title(
     conversation_id: str = Path(..., description="ID da conversa"),
     new_title: str = Query(..., min_length=3, max_length=100, description="Novo título da conversa")
 ):
@@ -371,7 +453,7 @@ def update_conversation_title(
         Confirmação de sucesso
     """
     try:
-        success = conversation_service.update_conversation_title(
+        success = await async_conversation_service.update_conversation_title(
             conversation_id=conversation_id,
             new_title=new_title
         )
@@ -396,7 +478,7 @@ class UpdateContextRequest(BaseModel):
 
 
 @router.patch("/{conversation_id}/context", summary="Atualizar contexto da conversa")
-def update_conversation_context(
+async def update_conversation_context(
     conversation_id: str = Path(..., description="ID da conversa"),
     request: UpdateContextRequest = ...
 ):
@@ -411,7 +493,7 @@ def update_conversation_context(
         Confirmação de sucesso
     """
     try:
-        success = conversation_service.update_conversation_context(
+        success = await async_conversation_service.update_conversation_context(
             conversation_id=conversation_id,
             context=request.context
         )
@@ -435,7 +517,7 @@ class UpdateSettingsRequest(BaseModel):
 
 
 @router.patch("/{conversation_id}/settings", summary="Update conversation chain settings")
-def update_conversation_settings(
+async def update_conversation_settings(
     conversation_id: str = Path(..., description="ID da conversa"),
     request: UpdateSettingsRequest = Body(...),
 ):
@@ -447,7 +529,7 @@ def update_conversation_settings(
     - auto_delegate: if true, agents can auto-chain without waiting for human.
     """
     try:
-        success = conversation_service.update_conversation_settings(
+        success = await async_conversation_service.update_conversation_settings(
             conversation_id=conversation_id,
             max_chain_depth=request.max_chain_depth,
             auto_delegate=request.auto_delegate,
@@ -466,7 +548,7 @@ def update_conversation_settings(
 
 
 @router.patch("/reorder", summary="Atualizar ordem das conversas")
-def reorder_conversations(
+async def reorder_conversations(
     order_updates: dict
 ):
     """
@@ -493,7 +575,7 @@ def reorder_conversations(
 
         logger.info(f"🔄 [REORDER] Atualizando ordem de {len(updates)} conversas")
 
-        updated_count = conversation_service.update_conversation_order(updates)
+        updated_count = await async_conversation_service.update_conversation_order(updates)
 
         return {
             "success": True,
@@ -579,6 +661,9 @@ def migrate_screenplays_to_conversations():
                         "active_agent": None,
                         "participants": [],
                         "messages": [],
+                        "message_count": 0,
+                        "participant_count": 0,
+                        "last_message_preview": None,
                         "screenplay_id": screenplay_id
                     }
 
@@ -10,11 +10,13 @@ import logging
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from src.core.prompt_profile import PromptProfile
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Dispatch"])
@@ -34,6 +36,12 @@ class DispatchRequest(BaseModel):
     screenplay_id: Optional[str] = Field(
         None, description="Existing screenplay ID for project context. If omitted, a Pulse screenplay is created."
     )
+    priority: int = Field(
+        5, ge=0, le=9, description="Claim priority (0=lowest, 9=highest). Pulse escalations use 8."
+    )
+    deadline: Optional[datetime] = Field(
+        None, description="Optional deadline (ISO 8601, UTC if no offset); earlier deadlines go first within a priority."
+    )
 
 
 class DispatchResponse(BaseModel):
@@ -42,6 +50,7 @@ class DispatchResponse(BaseModel):
     conversation_id: str
     screenplay_id: str
     status: str = "pending"
+    prompt_profile: Optional[Dict[str, Any]] = None
 
 
 def _ensure_screenplay(screenplay_id: Optional[str], event_title: str = "Pulse Escalation") -> str:
@@ -94,7 +103,10 @@ def _ensure_conversation(conversation_id: Optional[str]) -> str:
     summary="Dispatch work to another agent",
     operation_id="dispatch_agent",
 )
-def dispatch_agent(request: DispatchRequest):
+def dispatch_agent(
+    request: DispatchRequest,
+    profile: bool = Query(False, description="Return the prompt build profile"),
+):
     """
     Dispatch work to a target agent, optionally sharing conversation context.
 
@@ -104,6 +116,9 @@ def dispatch_agent(request: DispatchRequest):
 
     The target agent will receive the `input` as its user message and will see
     the full conversation history if `conversation_id` is provided.
+
+    With `?profile=1` the response includes `prompt_profile` (per-stage
+    timings and per-section bytes of the prompt build).
     """
     try:
         from src.container import container
@@ -120,6 +135,7 @@ def dispatch_agent(request: DispatchRequest):
         conversation_id = _ensure_conversation(request.conversation_id)
 
         # Build prompt via discovery service (loads persona, playbook, history)
+        prompt_profile = PromptProfile(request.target_agent_id)
         xml_prompt = discovery.get_full_prompt(
             agent_id=request.target_agent_id,
             current_message=request.input,
@@ -129,6 +145,7 @@ def dispatch_agent(request: DispatchRequest):
             save_to_file=False,
             conversation_id=conversation_id,
             screenplay_id=screenplay_id,
+            profile=prompt_profile,
         )
 
         # Determine provider
@@ -161,6 +178,9 @@ def dispatch_agent(request: DispatchRequest):
             conversation_id=conversation_id,
             screenplay_id=screenplay_id,
             is_councilor_execution=False,  # NOT councilor → history IS loaded
+            prompt_profile=prompt_profile.compact(),
+            priority=request.priority,
+            deadline=request.deadline,
         )
 
         logger.info(
@@ -173,6 +193,7 @@ def dispatch_agent(request: DispatchRequest):
             target_agent_id=request.target_agent_id,
             conversation_id=conversation_id,
             screenplay_id=screenplay_id,
+            prompt_profile=prompt_profile.to_dict() if profile else None,
         )
 
     except HTTPException:
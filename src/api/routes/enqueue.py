@@ -11,16 +11,19 @@ Agents can call this endpoint to chain work recursively:
 If RabbitMQ is offline, returns HTTP 503 (fallback: use /agents/dispatch).
 """
 
-import asyncio
 import logging
 import os
 import uuid
+from datetime import datetime
 from typing import Optional
 
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from src.infrastructure.async_mongo import async_mongo
+from src.infrastructure.tracing import TRACEPARENT_HEADER, SpanContext, tracer
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Enqueue"])
@@ -49,6 +52,11 @@ class EnqueueRequest(BaseModel):
         le=9,
         description="Queue priority (0=lowest, 9=highest). Pulse escalations use 8.",
     )
+    deadline: Optional[datetime] = Field(
+        None,
+        description="Optional deadline (ISO 8601, UTC if no offset). Among tasks of the "
+        "same priority, earlier deadlines are claimed first.",
+    )
     source: str = Field(
         "dispatch_api",
         description="Origin of the task: dispatch_api | agent_chain | pulse",
@@ -79,7 +87,7 @@ class EnqueueResponse(BaseModel):
 MAX_CHAIN_DEPTH = int(os.getenv("MAX_CHAIN_DEPTH", "10"))
 
 
-def _get_conversation_settings(conversation_id: str) -> dict:
+async def _get_conversation_settings(conversation_id: str) -> dict:
     """Get per-conversation chain settings (max_chain_depth, auto_delegate).
 
     Returns dict with 'max_chain_depth' (int) and 'auto_delegate' (bool).
@@ -89,7 +97,7 @@ def _get_conversation_settings(conversation_id: str) -> dict:
         db = _get_mongo_db()
         if db is None:
             return {"max_chain_depth": MAX_CHAIN_DEPTH, "auto_delegate": True}
-        conv = db.conversations.find_one(
+        conv = await db.conversations.find_one(
             {"conversation_id": conversation_id},
             {"max_chain_depth": 1, "auto_delegate": 1},
         )
@@ -104,22 +112,14 @@ def _get_conversation_settings(conversation_id: str) -> dict:
         return {"max_chain_depth": MAX_CHAIN_DEPTH, "auto_delegate": False}
 
 
-_mongo_client = None
-
-
 def _get_mongo_db():
-    """Get a shared MongoDB database handle (module-level singleton)."""
-    global _mongo_client
-    mongo_uri = os.getenv("MONGO_URI")
-    if not mongo_uri:
+    """Get the shared async MongoDB database handle (None without MONGO_URI)."""
+    if not os.getenv("MONGO_URI"):
         return None
-    if _mongo_client is None:
-        from pymongo import MongoClient
-        _mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
-    return _mongo_client.conductor_state
+    return async_mongo.database("conductor_state")
 
 
-def _get_chain_depth(conversation_id: str) -> int:
+async def _get_chain_depth(conversation_id: str) -> int:
     """Count agent-chain tasks since the last human-initiated task.
 
     Human intervention (source != 'agent_chain') resets the counter.
@@ -135,7 +135,7 @@ def _get_chain_depth(conversation_id: str) -> int:
             {"source": 1},
         ).sort("created_at", -1)
         depth = 0
-        for task in cursor:
+        async for task in cursor:
             if task.get("source") == "agent_chain":
                 depth += 1
             else:
@@ -146,7 +146,7 @@ def _get_chain_depth(conversation_id: str) -> int:
         return 0
 
 
-def _inherit_from_parent(parent_task_id: str) -> dict:
+async def _inherit_from_parent(parent_task_id: str) -> dict:
     """Look up parent task and return its conversation_id and screenplay_id.
 
     This is the deterministic enforcement: when an agent chains work,
@@ -156,22 +156,23 @@ def _inherit_from_parent(parent_task_id: str) -> dict:
         db = _get_mongo_db()
         if db is None:
             return {}
-        task = db.tasks.find_one(
+        task = await db.tasks.find_one(
             {"_id": ObjectId(parent_task_id)},
-            {"conversation_id": 1, "screenplay_id": 1},
+            {"conversation_id": 1, "screenplay_id": 1, "trace": 1},
         )
         if not task:
             return {}
         return {
             "conversation_id": task.get("conversation_id"),
             "screenplay_id": task.get("screenplay_id"),
+            "trace": task.get("trace"),
         }
     except Exception as e:
         logger.warning("Parent task lookup failed: %s", e)
         return {}
 
 
-def _get_squad(conversation_id: str) -> list | None:
+async def _get_squad(conversation_id: str) -> list | None:
     """Get the squad from agent_instances for this conversation.
 
     Returns a list of agent_ids that are instantiated in this conversation,
@@ -183,7 +184,7 @@ def _get_squad(conversation_id: str) -> list | None:
         db = _get_mongo_db()
         if db is None:
             return None
-        agent_ids = db.agent_instances.distinct(
+        agent_ids = await db.agent_instances.distinct(
             "agent_id", {"conversation_id": conversation_id}
         )
         return agent_ids if agent_ids else None
@@ -198,7 +199,7 @@ def _get_squad(conversation_id: str) -> list | None:
     summary="Enqueue async work for an agent via RabbitMQ",
     operation_id="enqueue_agent",
 )
-async def enqueue_agent(request: EnqueueRequest):
+async def enqueue_agent(request: EnqueueRequest, http_request: Request = None):
     """
     Enqueue work for a target agent asynchronously via RabbitMQ.
 
@@ -210,7 +211,36 @@ async def enqueue_agent(request: EnqueueRequest):
     semantics with retry and DLQ support.
 
     If RabbitMQ is unavailable, returns HTTP 503 — fall back to /agents/dispatch.
+
+    Trace context: a ``traceparent`` header (sent by the watcher on delegation)
+    or the parent task's trace is continued; otherwise a new trace starts here.
     """
+    trace_parent = None
+    if http_request is not None:
+        trace_parent = SpanContext.from_traceparent(http_request.headers.get(TRACEPARENT_HEADER))
+
+    # Deterministic context inheritance: if parent_task_id is provided,
+    # force conversation_id and screenplay_id from the parent task.
+    # The _get_* helpers use PyMongo's async API (src.infrastructure.async_mongo),
+    # so they don't block the event loop or need a threadpool hop.
+    parent_ctx = {}
+    if request.parent_task_id:
+        parent_ctx = await _inherit_from_parent(request.parent_task_id)
+        trace_parent = trace_parent or SpanContext.from_dict(parent_ctx.get("trace"))
+
+    span = tracer.start_span("api.enqueue", trace_parent)
+    try:
+        return await _enqueue(request, parent_ctx, span)
+    except HTTPException as e:
+        span.set_attribute("http.status_code", e.status_code)
+        span.end(status="error")
+        raise
+    finally:
+        span.end()
+
+
+async def _enqueue(request: EnqueueRequest, parent_ctx: dict, span) -> EnqueueResponse:
+    """Guards, message construction and publish for enqueue_agent."""
     try:
         # Fail fast: validate agent exists
         from src.container import container
@@ -232,15 +262,10 @@ async def enqueue_agent(request: EnqueueRequest):
         task_id = str(ObjectId())
         idempotency_key = str(uuid.uuid4())
 
-        # Deterministic context inheritance: if parent_task_id is provided,
-        # force conversation_id and screenplay_id from the parent task.
-        # The agent cannot escape the squad this way.
-        # NOTE: All _get_* helpers use sync pymongo. We run them in a thread
-        # pool to avoid blocking the async event loop (pymongo heartbeat
-        # uses streaming protocol which can block for up to 10s).
+        # The agent cannot escape the squad: a child task stays in the
+        # parent's conversation/screenplay (parent_ctx, see enqueue_agent).
         screenplay_id = request.screenplay_id
         if request.parent_task_id:
-            parent_ctx = await asyncio.to_thread(_inherit_from_parent, request.parent_task_id)
             if parent_ctx.get("conversation_id"):
                 conversation_id = parent_ctx["conversation_id"]
                 if request.conversation_id and request.conversation_id != conversation_id:
@@ -259,7 +284,7 @@ async def enqueue_agent(request: EnqueueRequest):
 
         # Squad guard: only agents instantiated in this conversation can participate.
         # The squad is built automatically from agent_instances (frontend Add Agent).
-        squad = await asyncio.to_thread(_get_squad, conversation_id)
+        squad = await _get_squad(conversation_id)
         if squad and request.target_agent_id not in squad:
             logger.warning(
                 "Agent %s not in conversation %s squad: %s",
@@ -276,7 +301,7 @@ async def enqueue_agent(request: EnqueueRequest):
             )
 
         # Per-conversation settings (max_chain_depth, auto_delegate)
-        conv_settings = await asyncio.to_thread(_get_conversation_settings, conversation_id)
+        conv_settings = await _get_conversation_settings(conversation_id)
         limit = conv_settings["max_chain_depth"]
 
         # auto_delegate guard: if disabled, only the first enqueue (from
@@ -298,7 +323,7 @@ async def enqueue_agent(request: EnqueueRequest):
                 ),
             )
 
-        chain_depth = await asyncio.to_thread(_get_chain_depth, conversation_id)
+        chain_depth = await _get_chain_depth(conversation_id)
         if chain_depth >= limit:
             logger.warning(
                 "Chain depth limit reached (%d/%d) for conversation %s. "
@@ -325,10 +350,19 @@ async def enqueue_agent(request: EnqueueRequest):
             screenplay_id=screenplay_id,
             input=request.input,
             priority=request.priority,
+            deadline=request.deadline.isoformat() if request.deadline else None,
             source=request.source,
             parent_task_id=request.parent_task_id,
             idempotency_key=idempotency_key,
+            traceparent=span.context.to_traceparent(),
         )
+        span.attributes.update({
+            "task_id": task_id,
+            "agent_id": request.target_agent_id,
+            "source": request.source,
+            "parent_task_id": request.parent_task_id or "",
+            "chain_depth": chain_depth + 1,
+        })
 
         # Publish to RabbitMQ
         published = await agent_task_queue_service.publish(msg)
@@ -15,6 +15,7 @@ Operations:
 - Get statistics
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -22,7 +23,8 @@ from enum import Enum
 
 from fastapi import APIRouter, HTTPException, Query, Path
 from pydantic import BaseModel, Field
-import os
+from src.core.services.mcp_registry_index import mcp_registry_index
+from src.infrastructure.async_mongo import async_mongo
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/mcp-registry", tags=["MCP Registry"])
@@ -123,15 +125,8 @@ class MCPStatsResponse(BaseModel):
 # ============================================================================
 
 def _get_mcp_collection():
-    """Get the mcp_registry collection from MongoDB."""
-    from pymongo import MongoClient
-
-    mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017')
-    db_name = os.getenv('MONGO_DATABASE', 'conductor_state')
-
-    client = MongoClient(mongo_uri)
-    db = client[db_name]
-    return db['mcp_registry']
+    """Get the (async) mcp_registry collection from the shared MongoDB pool."""
+    return async_mongo.collection('mcp_registry')
 
 
 def _doc_to_entry(doc: dict) -> MCPEntry:
@@ -159,7 +154,7 @@ def _doc_to_entry(doc: dict) -> MCPEntry:
 # ============================================================================
 
 @router.get("/", response_model=MCPListResponse, summary="List all MCP servers")
-def list_mcps(
+async def list_mcps(
     type: Optional[MCPType] = Query(None, description="Filter by type (internal/external)"),
     category: Optional[str] = Query(None, description="Filter by category"),
     status: Optional[MCPStatus] = Query(None, description="Filter by status"),
@@ -183,7 +178,7 @@ def list_mcps(
         elif healthy_only:
             query["status"] = MCPStatus.HEALTHY.value
 
-        docs = list(collection.find(query).sort("name", 1))
+        docs = await collection.find(query).sort("name", 1).to_list(length=None)
 
         items = [_doc_to_entry(doc) for doc in docs]
 
@@ -206,7 +201,7 @@ def list_mcps(
 
 
 @router.get("/stats", response_model=MCPStatsResponse, summary="Get registry statistics")
-def get_stats():
+async def get_stats():
     """Get statistics about the MCP registry."""
     try:
         collection = _get_mcp_collection()
@@ -220,7 +215,7 @@ def get_stats():
             }
         ]
 
-        results = list(collection.aggregate(pipeline))
+        results = await (await collection.aggregate(pipeline)).to_list(length=None)
 
         stats = {
             "total": 0,
@@ -253,12 +248,12 @@ def get_stats():
 
 
 @router.get("/categories", summary="List all MCP categories")
-def list_categories():
+async def list_categories():
     """List all unique categories in the registry."""
     try:
         collection = _get_mcp_collection()
 
-        categories = collection.distinct("metadata.category")
+        categories = await collection.distinct("metadata.category")
         # Filter out None/empty
         categories = [c for c in categories if c]
 
@@ -277,6 +272,8 @@ def resolve_mcps(names: List[str]):
     """
     Resolve a list of MCP names to their SSE endpoint URLs.
 
+    Served from the in-memory registry index (no MongoDB round trip).
+
     Args:
         names: List of MCP names to resolve
 
@@ -284,30 +281,7 @@ def resolve_mcps(names: List[str]):
         Dict with resolved URLs and list of not found names
     """
     try:
-        collection = _get_mcp_collection()
-
-        resolved = {}
-        not_found = []
-
-        for name in names:
-            doc = collection.find_one({"name": name})
-            if doc and doc.get("status") != MCPStatus.UNHEALTHY.value:
-                # Prefer host_url for external access
-                url = doc.get("host_url") or doc["url"]
-                auth = doc.get("auth")
-
-                if auth:
-                    separator = "&" if "?" in url else "?"
-                    url = f"{url}{separator}auth={auth}"
-
-                resolved[name] = url
-            else:
-                not_found.append(name)
-
-        return {
-            "resolved": resolved,
-            "not_found": not_found
-        }
+        return mcp_registry_index.resolve(names)
 
     except Exception as e:
         logger.error(f"Error resolving MCPs: {e}", exc_info=True)
@@ -315,7 +289,7 @@ def resolve_mcps(names: List[str]):
 
 
 @router.post("/cleanup", summary="Cleanup stale MCP entries")
-def cleanup_stale(
+async def cleanup_stale(
     max_age_hours: int = Query(24, description="Max hours since last heartbeat")
 ):
     """
@@ -329,7 +303,7 @@ def cleanup_stale(
         from datetime import timedelta
         threshold = datetime.utcnow() - timedelta(hours=max_age_hours)
 
-        result = collection.delete_many({
+        result = await collection.delete_many({
             "type": MCPType.EXTERNAL.value,
             "last_heartbeat": {"$lt": threshold}
         })
@@ -337,6 +311,7 @@ def cleanup_stale(
         removed = result.deleted_count
 
         if removed > 0:
+            await asyncio.to_thread(mcp_registry_index.reload)
             logger.info(f"✅ Cleaned up {removed} stale MCP entries")
 
         return {"removed": removed}
@@ -351,12 +326,12 @@ def cleanup_stale(
 # ============================================================================
 
 @router.get("/{name}", response_model=MCPEntry, summary="Get MCP details")
-def get_mcp(name: str = Path(..., description="MCP name")):
+async def get_mcp(name: str = Path(..., description="MCP name")):
     """Get details of a specific MCP server by name."""
     try:
         collection = _get_mcp_collection()
 
-        doc = collection.find_one({"name": name})
+        doc = await collection.find_one({"name": name})
         if not doc:
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
 
@@ -370,7 +345,7 @@ def get_mcp(name: str = Path(..., description="MCP name")):
 
 
 @router.post("/", response_model=MCPEntry, status_code=201, summary="Create/Register MCP server")
-def create_mcp(request: MCPCreateRequest):
+async def create_mcp(request: MCPCreateRequest):
     """
     Create or register a new MCP server.
 
@@ -381,7 +356,7 @@ def create_mcp(request: MCPCreateRequest):
         collection = _get_mcp_collection()
 
         # Check if internal MCP exists with same name
-        existing = collection.find_one({"name": request.name})
+        existing = await collection.find_one({"name": request.name})
         if existing and existing.get("type") == MCPType.INTERNAL.value and request.type == MCPType.EXTERNAL:
             raise HTTPException(
                 status_code=409,
@@ -401,13 +376,14 @@ def create_mcp(request: MCPCreateRequest):
             "tools_count": 0,
             "last_heartbeat": now if request.type == MCPType.EXTERNAL else None,
             "registered_at": now,
+            "updated_at": now,
             "docker_compose_path": request.docker_compose_path,
             "auto_shutdown_minutes": request.auto_shutdown_minutes,
             "metadata": request.metadata.model_dump() if request.metadata else {}
         }
 
         # Upsert - update if exists, insert if not
-        collection.update_one(
+        await collection.update_one(
             {"name": request.name},
             {"$set": entry},
             upsert=True
@@ -416,7 +392,8 @@ def create_mcp(request: MCPCreateRequest):
         logger.info(f"✅ MCP registered/updated: {request.name} at {request.url}")
 
         # Fetch and return the created/updated entry
-        doc = collection.find_one({"name": request.name})
+        doc = await collection.find_one({"name": request.name})
+        mcp_registry_index.put(doc)
         return _doc_to_entry(doc)
 
     except HTTPException:
@@ -427,7 +404,7 @@ def create_mcp(request: MCPCreateRequest):
 
 
 @router.put("/{name}", response_model=MCPEntry, summary="Update MCP server")
-def update_mcp(
+async def update_mcp(
     name: str = Path(..., description="MCP name"),
     request: MCPUpdateRequest = ...
 ):
@@ -439,7 +416,7 @@ def update_mcp(
     try:
         collection = _get_mcp_collection()
 
-        existing = collection.find_one({"name": name})
+        existing = await collection.find_one({"name": name})
         if not existing:
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
 
@@ -466,7 +443,10 @@ def update_mcp(
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        collection.update_one(
+        # Watermark for incremental registry readers (MCP mesh sweep)
+        update_data["updated_at"] = datetime.utcnow()
+
+        await collection.update_one(
             {"name": name},
             {"$set": update_data}
         )
@@ -474,7 +454,8 @@ def update_mcp(
         logger.info(f"✅ MCP updated: {name} - fields: {list(update_data.keys())}")
 
         # Fetch and return updated entry
-        doc = collection.find_one({"name": name})
+        doc = await collection.find_one({"name": name})
+        mcp_registry_index.put(doc)
         return _doc_to_entry(doc)
 
     except HTTPException:
@@ -485,7 +466,7 @@ def update_mcp(
 
 
 @router.delete("/{name}", status_code=204, summary="Delete MCP server")
-def delete_mcp(name: str = Path(..., description="MCP name")):
+async def delete_mcp(name: str = Path(..., description="MCP name")):
     """
     Delete an MCP server from the registry.
 
@@ -494,7 +475,7 @@ def delete_mcp(name: str = Path(..., description="MCP name")):
     try:
         collection = _get_mcp_collection()
 
-        existing = collection.find_one({"name": name})
+        existing = await collection.find_one({"name": name})
         if not existing:
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
 
@@ -504,11 +485,12 @@ def delete_mcp(name: str = Path(..., description="MCP name")):
                 detail=f"Cannot delete '{name}': internal MCPs cannot be removed"
             )
 
-        result = collection.delete_one({"name": name})
+        result = await collection.delete_one({"name": name})
 
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
 
+        mcp_registry_index.discard(name)
         logger.info(f"✅ MCP deleted: {name}")
 
     except HTTPException:
@@ -531,23 +513,11 @@ def heartbeat(
     Update heartbeat timestamp for an MCP server.
 
     Sidecars should call this periodically to indicate they're alive.
+    The heartbeat is applied in memory and written to MongoDB in the
+    index's next batched flush.
     """
     try:
-        collection = _get_mcp_collection()
-
-        update = {
-            "last_heartbeat": datetime.utcnow(),
-            "status": MCPStatus.HEALTHY.value
-        }
-        if tools_count is not None:
-            update["tools_count"] = tools_count
-
-        result = collection.update_one(
-            {"name": name},
-            {"$set": update}
-        )
-
-        if result.matched_count == 0:
+        if not mcp_registry_index.record_heartbeat(name, tools_count):
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
 
     except HTTPException:
@@ -562,40 +532,15 @@ def check_health(name: str = Path(..., description="MCP name")):
     """
     Check the health status of an MCP server.
 
-    Returns current status based on last heartbeat.
+    Returns current status based on last heartbeat (stale after 90 seconds).
+    Read from the in-memory registry index; the index's background sweeper
+    is what persists the unhealthy status.
     """
     try:
-        collection = _get_mcp_collection()
-
-        doc = collection.find_one({"name": name})
-        if not doc:
+        health = mcp_registry_index.health(name)
+        if health is None:
             raise HTTPException(status_code=404, detail=f"MCP '{name}' not found")
-
-        # Check if heartbeat is stale (> 90 seconds)
-        last_heartbeat = doc.get("last_heartbeat")
-        is_stale = False
-        seconds_since_heartbeat = None
-
-        if last_heartbeat:
-            delta = datetime.utcnow() - last_heartbeat
-            seconds_since_heartbeat = int(delta.total_seconds())
-            is_stale = seconds_since_heartbeat > 90
-
-            # Update status if stale
-            if is_stale and doc.get("status") == MCPStatus.HEALTHY.value:
-                collection.update_one(
-                    {"name": name},
-                    {"$set": {"status": MCPStatus.UNHEALTHY.value}}
-                )
-
-        return {
-            "name": name,
-            "status": MCPStatus.UNHEALTHY.value if is_stale else doc.get("status", "unknown"),
-            "tools_count": doc.get("tools_count", 0),
-            "last_heartbeat": last_heartbeat.isoformat() if last_heartbeat else None,
-            "seconds_since_heartbeat": seconds_since_heartbeat,
-            "is_stale": is_stale
-        }
+        return health
 
     except HTTPException:
         raise
@@ -15,9 +15,10 @@ from fastapi import APIRouter, HTTPException, Header, Query
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
-from pymongo import MongoClient, ASCENDING
+from pymongo import ASCENDING
 import logging
-import os
+
+from src.infrastructure.async_mongo import async_mongo
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/navigation", tags=["Navigation"])
@@ -45,43 +46,46 @@ class LastScreenplayResponse(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-_mongo_client = None
-_screenplay_states = None  # user_id + screenplay_id → conversation_id
-_conversation_states = None  # user_id + screenplay_id + conversation_id → instance_id
+_indexes_ready = False
+
 
-def get_mongo_collections():
-    """Obtém as collections do MongoDB para navigation states."""
-    global _mongo_client, _screenplay_states, _conversation_states
+async def get_mongo_collections():
+    """
+    Obtém as collections (async) do MongoDB para navigation states.
+
+    screenplay_states: user_id + screenplay_id → conversation_id
+    conversation_states: user_id + screenplay_id + conversation_id → instance_id
+    """
+    global _indexes_ready
 
-    if _screenplay_states is not None:
-        return _screenplay_states, _conversation_states
+    db = async_mongo.database("conductor_state")
+    screenplay_states = db.screenplay_states
+    conversation_states = db.conversation_states
 
-    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/conductor_state?authSource=admin")
-    _mongo_client = MongoClient(mongo_uri)
-    db = _mongo_client.conductor_state
+    if _indexes_ready:
+        return screenplay_states, conversation_states
 
     # Collection para estado do roteiro (última conversa)
-    _screenplay_states = db.screenplay_states
-    _screenplay_states.create_index(
+    await screenplay_states.create_index(
         [("user_id", ASCENDING), ("screenplay_id", ASCENDING)],
         unique=True,
         name="user_screenplay_unique"
     )
-    _screenplay_states.create_index(
+    await screenplay_states.create_index(
         [("user_id", ASCENDING), ("updated_at", ASCENDING)],
         name="user_last_accessed"
     )
 
     # Collection para estado da conversa (último agente)
-    _conversation_states = db.conversation_states
-    _conversation_states.create_index(
+    await conversation_states.create_index(
         [("user_id", ASCENDING), ("screenplay_id", ASCENDING), ("conversation_id", ASCENDING)],
         unique=True,
         name="user_screenplay_conversation_unique"
     )
 
+    _indexes_ready = True
     logger.info("[NAVIGATION] MongoDB collections initialized with indexes")
-    return _screenplay_states, _conversation_states
+    return screenplay_states, conversation_states
 
 
 def get_user_id(x_user_id: Optional[str] = None, x_session_id: Optional[str] = None) -> str:
@@ -97,7 +101,7 @@ def get_user_id(x_user_id: Optional[str] = None, x_session_id: Optional[str] = N
 
 
 @router.get("", response_model=NavigationStateResponse, summary="Obter estado de navegação")
-def get_navigation_state(
+async def get_navigation_state(
     screenplay_id: Optional[str] = Query(None, description="ID do roteiro"),
     conversation_id: Optional[str] = Query(None, description="ID da conversa"),
     x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
@@ -113,11 +117,11 @@ def get_navigation_state(
     """
     try:
         user_id = get_user_id(x_user_id, x_session_id)
-        screenplay_states, conversation_states = get_mongo_collections()
+        screenplay_states, conversation_states = await get_mongo_collections()
 
         # Caso 1: Buscar instance_id de uma conversa específica
         if screenplay_id and conversation_id:
-            conv_state = conversation_states.find_one({
+            conv_state = await conversation_states.find_one({
                 "user_id": user_id,
                 "screenplay_id": screenplay_id,
                 "conversation_id": conversation_id
@@ -136,7 +140,7 @@ def get_navigation_state(
 
         # Caso 2: Buscar conversation_id de um roteiro específico
         if screenplay_id:
-            sp_state = screenplay_states.find_one({
+            sp_state = await screenplay_states.find_one({
                 "user_id": user_id,
                 "screenplay_id": screenplay_id
             })
@@ -150,7 +154,7 @@ def get_navigation_state(
 
             # Se tem conversation_id, buscar instance_id
             if conv_id:
-                conv_state = conversation_states.find_one({
+                conv_state = await conversation_states.find_one({
                     "user_id": user_id,
                     "screenplay_id": screenplay_id,
                     "conversation_id": conv_id
@@ -167,7 +171,7 @@ def get_navigation_state(
             )
 
         # Caso 3: Buscar último roteiro acessado
-        sp_state = screenplay_states.find_one(
+        sp_state = await screenplay_states.find_one(
             {"user_id": user_id},
             sort=[("updated_at", -1)]
         )
@@ -182,7 +186,7 @@ def get_navigation_state(
 
         # Se tem conversation_id, buscar instance_id
         if conv_id:
-            conv_state = conversation_states.find_one({
+            conv_state = await conversation_states.find_one({
                 "user_id": user_id,
                 "screenplay_id": sp_id,
                 "conversation_id": conv_id
@@ -204,7 +208,7 @@ def get_navigation_state(
 
 
 @router.get("/last", response_model=LastScreenplayResponse, summary="Obter último roteiro acessado")
-def get_last_screenplay(
+async def get_last_screenplay(
     x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
     x_session_id: Optional[str] = Header(None, alias="X-Session-Id")
 ):
@@ -213,9 +217,9 @@ def get_last_screenplay(
     """
     try:
         user_id = get_user_id(x_user_id, x_session_id)
-        screenplay_states, _ = get_mongo_collections()
+        screenplay_states, _ = await get_mongo_collections()
 
-        state = screenplay_states.find_one(
+        state = await screenplay_states.find_one(
             {"user_id": user_id},
             sort=[("updated_at", -1)]
         )
@@ -238,7 +242,7 @@ def get_last_screenplay(
 
 
 @router.put("", response_model=NavigationStateResponse, summary="Salvar estado de navegação")
-def save_navigation_state(
+async def save_navigation_state(
     state: NavigationState,
     x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
     x_session_id: Optional[str] = Header(None, alias="X-Session-Id")
@@ -254,12 +258,12 @@ def save_navigation_state(
             raise HTTPException(status_code=400, detail="screenplay_id é obrigatório")
 
         user_id = get_user_id(x_user_id, x_session_id)
-        screenplay_states, conversation_states = get_mongo_collections()
+        screenplay_states, conversation_states = await get_mongo_collections()
 
         now = datetime.utcnow()
 
         # 1. Salvar estado do roteiro (última conversa)
-        screenplay_states.update_one(
+        await screenplay_states.update_one(
             {
                 "user_id": user_id,
                 "screenplay_id": state.screenplay_id
@@ -278,7 +282,7 @@ def save_navigation_state(
 
         # 2. Se tem conversation_id, salvar estado da conversa (último agente)
         if state.conversation_id:
-            conversation_states.update_one(
+            await conversation_states.update_one(
                 {
                     "user_id": user_id,
                     "screenplay_id": state.screenplay_id,
@@ -313,7 +317,7 @@ def save_navigation_state(
 
 
 @router.delete("", summary="Limpar estado de navegação")
-def clear_navigation_state(
+async def clear_navigation_state(
     screenplay_id: Optional[str] = Query(None, description="ID do roteiro"),
     conversation_id: Optional[str] = Query(None, description="ID da conversa"),
     x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
@@ -328,13 +332,13 @@ def clear_navigation_state(
     """
     try:
         user_id = get_user_id(x_user_id, x_session_id)
-        screenplay_states, conversation_states = get_mongo_collections()
+        screenplay_states, conversation_states = await get_mongo_collections()
 
         deleted_count = 0
 
         if screenplay_id and conversation_id:
             # Limpar apenas estado da conversa
-            result = conversation_states.delete_one({
+            result = await conversation_states.delete_one({
                 "user_id": user_id,
                 "screenplay_id": screenplay_id,
                 "conversation_id": conversation_id
@@ -344,11 +348,11 @@ def clear_navigation_state(
 
         elif screenplay_id:
             # Limpar estado do roteiro e todas suas conversas
-            r1 = screenplay_states.delete_one({
+            r1 = await screenplay_states.delete_one({
                 "user_id": user_id,
                 "screenplay_id": screenplay_id
             })
-            r2 = conversation_states.delete_many({
+            r2 = await conversation_states.delete_many({
                 "user_id": user_id,
                 "screenplay_id": screenplay_id
             })
@@ -357,8 +361,8 @@ def clear_navigation_state(
 
         else:
             # Limpar todos os estados do usuário
-            r1 = screenplay_states.delete_many({"user_id": user_id})
-            r2 = conversation_states.delete_many({"user_id": user_id})
+            r1 = await screenplay_states.delete_many({"user_id": user_id})
+            r2 = await conversation_states.delete_many({"user_id": user_id})
             deleted_count = r1.deleted_count + r2.deleted_count
             logger.info(f"[NAVIGATION] Todos estados removidos: user={user_id}, deleted={deleted_count}")
 
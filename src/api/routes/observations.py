@@ -4,32 +4,30 @@ Task Observations Router - Endpoints para gerenciar observações de tasks por a
 Permite que agentes se inscrevam em tasks e recebam estado consolidado para injeção no prompt.
 """
 
+import asyncio
 import os
 import logging
 from datetime import datetime
 from typing import List, Optional
 
-import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from src.infrastructure.async_mongo import async_mongo
+from src.infrastructure.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/observations", tags=["observations"])
 
-# MongoDB connection
-from pymongo import MongoClient
-
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/conductor_state?authSource=admin")
 MONGO_DATABASE = os.getenv("MONGO_DATABASE", "conductor_state")
 CONSTRUCTION_API_URL = os.getenv("CONSTRUCTION_API_URL", "http://verticals-construction-api-projects:8001")
 OBSERVATION_TIMEOUT = float(os.getenv("OBSERVATION_TIMEOUT_SECONDS", "10"))
 
 
-def get_db():
-    """Get MongoDB database connection."""
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    return client[MONGO_DATABASE]
+def get_observations_collection():
+    """Async agent_task_observations collection (shared pool, see async_mongo)."""
+    return async_mongo.collection("agent_task_observations", MONGO_DATABASE)
 
 
 # ============================================================================
@@ -95,40 +93,40 @@ class AgentWorldStateResponse(BaseModel):
 async def fetch_task_state(project_id: int, task_id: int, include_subtasks: bool = False) -> dict:
     """Fetch task state from Construction API."""
     try:
-        async with httpx.AsyncClient(timeout=OBSERVATION_TIMEOUT) as client:
-            # Get task details
-            response = await client.get(f"{CONSTRUCTION_API_URL}/api/v1/tasks/{task_id}")
-            if response.status_code != 200:
-                logger.warning(f"Failed to fetch task {task_id}: {response.status_code}")
-                return None
-
-            task_data = response.json()
-
-            result = {
-                "id": task_data.get("id"),
-                "name": task_data.get("name", ""),
-                "progress": task_data.get("progress_percentage", task_data.get("progress", 0)),
-                "status": task_data.get("status", "unknown"),
-            }
+        client = http_clients.async_client("construction")
+        # Get task details
+        response = await client.get(f"{CONSTRUCTION_API_URL}/api/v1/tasks/{task_id}", timeout=OBSERVATION_TIMEOUT)
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch task {task_id}: {response.status_code}")
+            return None
+
+        task_data = response.json()
+
+        result = {
+            "id": task_data.get("id"),
+            "name": task_data.get("name", ""),
+            "progress": task_data.get("progress_percentage", task_data.get("progress", 0)),
+            "status": task_data.get("status", "unknown"),
+        }
 
-            # Get subtasks if requested
-            if include_subtasks:
-                subtasks_response = await client.get(f"{CONSTRUCTION_API_URL}/api/v1/tasks/{task_id}/subtasks")
-                if subtasks_response.status_code == 200:
-                    subtasks_data = subtasks_response.json()
-                    # Handle both list and object with "items" key
-                    subtasks_list = subtasks_data if isinstance(subtasks_data, list) else subtasks_data.get("items", [])
-                    result["subtasks"] = [
-                        {
-                            "id": st.get("id"),
-                            "name": st.get("name", ""),
-                            "progress": st.get("progress_percentage", st.get("progress", 0)),
-                            "status": st.get("status", "unknown"),
-                        }
-                        for st in subtasks_list
-                    ]
-
-            return result
+        # Get subtasks if requested
+        if include_subtasks:
+            subtasks_response = await client.get(f"{CONSTRUCTION_API_URL}/api/v1/tasks/{task_id}/subtasks", timeout=OBSERVATION_TIMEOUT)
+            if subtasks_response.status_code == 200:
+                subtasks_data = subtasks_response.json()
+                # Handle both list and object with "items" key
+                subtasks_list = subtasks_data if isinstance(subtasks_data, list) else subtasks_data.get("items", [])
+                result["subtasks"] = [
+                    {
+                        "id": st.get("id"),
+                        "name": st.get("name", ""),
+                        "progress": st.get("progress_percentage", st.get("progress", 0)),
+                        "status": st.get("status", "unknown"),
+                    }
+                    for st in subtasks_list
+                ]
+
+        return result
     except Exception as e:
         logger.error(f"Error fetching task {task_id}: {e}")
         return None
@@ -143,8 +141,7 @@ async def subscribe_to_task(agent_id: str, request: ObservationSubscribeRequest)
     """
     Inscreve um agente para observar uma task.
     """
-    db = get_db()
-    collection = db["agent_task_observations"]
+    collection = get_observations_collection()
 
     observation = {
         "capability": request.capability,
@@ -156,7 +153,7 @@ async def subscribe_to_task(agent_id: str, request: ObservationSubscribeRequest)
     }
 
     # Upsert: add observation to agent's list
-    result = collection.update_one(
+    result = await collection.update_one(
         {"agent_id": agent_id},
         {
             "$push": {"observations": observation},
@@ -180,10 +177,9 @@ async def unsubscribe_from_task(agent_id: str, task_id: int):
     """
     Remove inscrição de um agente em uma task.
     """
-    db = get_db()
-    collection = db["agent_task_observations"]
+    collection = get_observations_collection()
 
-    result = collection.update_one(
+    result = await collection.update_one(
         {"agent_id": agent_id},
         {
             "$pull": {"observations": {"task_id": task_id}},
@@ -208,10 +204,9 @@ async def list_observations(agent_id: str):
     """
     Lista todas as observações de um agente.
     """
-    db = get_db()
-    collection = db["agent_task_observations"]
+    collection = get_observations_collection()
 
-    doc = collection.find_one({"agent_id": agent_id})
+    doc = await collection.find_one({"agent_id": agent_id})
 
     if not doc:
         return {
@@ -235,10 +230,9 @@ async def get_agent_world_state(agent_id: str):
     Retorna o estado consolidado do mundo para um agente.
     Busca os dados atuais de cada task observada e retorna em formato pronto para injeção no prompt.
     """
-    db = get_db()
-    collection = db["agent_task_observations"]
+    collection = get_observations_collection()
 
-    doc = collection.find_one({"agent_id": agent_id})
+    doc = await collection.find_one({"agent_id": agent_id})
 
     if not doc:
         raise HTTPException(status_code=404, detail=f"No observations found for agent {agent_id}")
@@ -252,15 +246,14 @@ async def get_agent_world_state(agent_id: str):
             "timestamp": datetime.utcnow(),
         }
 
-    # Fetch current state for each observed task
-    capabilities = []
-    for obs in observations:
-        task_state = await fetch_task_state(
-            obs["project_id"],
-            obs["task_id"],
-            obs.get("include_subtasks", False),
-        )
+    # Fetch current state for each observed task (concurrently)
+    task_states = await asyncio.gather(*(
+        fetch_task_state(obs["project_id"], obs["task_id"], obs.get("include_subtasks", False))
+        for obs in observations
+    ))
 
+    capabilities = []
+    for obs, task_state in zip(observations, task_states):
         if task_state:
             # Build summary
             subtasks = task_state.get("subtasks", [])
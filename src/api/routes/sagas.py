@@ -7,7 +7,7 @@ The rollback endpoint doubles as an MCP tool definition for agents.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
@@ -28,6 +28,11 @@ class SagaStepRequest(BaseModel):
     service: str = Field(..., description="MCP sidecar service name")
     action: Dict[str, Any] = Field(..., description="Action: {tool, payload}")
     compensation: Dict[str, Any] = Field(..., description="Compensation: {tool, payload}")
+    depends_on: Optional[List[Union[int, str]]] = Field(
+        None,
+        description="Earlier steps (names or 0-based indices) that must complete first. "
+                    "[] = no dependencies; omitted = the previous step",
+    )
 
 
 class SagaCreateRequest(BaseModel):
@@ -35,6 +40,7 @@ class SagaCreateRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=200, description="Saga name")
     initiator: str = Field(..., description="Agent or user starting the saga")
     steps: List[SagaStepRequest] = Field(..., min_length=1, description="Ordered list of steps")
+    max_parallel: Optional[int] = Field(None, ge=1, le=32, description="Max steps running at once (default SAGA_MAX_PARALLEL)")
 
 
 class SagaStateResponse(BaseModel):
@@ -42,6 +48,7 @@ class SagaStateResponse(BaseModel):
     saga_id: str
     name: str
     initiator: str
+    max_parallel: Optional[int] = None
     status: str
     steps: List[Dict[str, Any]]
     created_at: str
@@ -101,8 +108,11 @@ def create_saga(request: SagaCreateRequest):
             name=request.name,
             initiator=request.initiator,
             steps=steps,
+            max_parallel=request.max_parallel,
         )
         return SagaStateResponse(**saga.to_dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Failed to create saga: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -125,7 +135,7 @@ def get_saga(saga_id: str):
 @router.post("/{saga_id}/execute", response_model=SagaStateResponse, summary="Execute saga")
 async def execute_saga(saga_id: str):
     """
-    Execute all steps of a saga sequentially.
+    Execute the steps of a saga, in parallel where their dependencies allow.
 
     If any step fails, automatically triggers rollback of completed steps.
     """
@@ -145,7 +155,7 @@ async def execute_saga_rollback(request: RollbackRequest):
     MCP tool: execute_saga_rollback
 
     Triggers compensating transactions for all completed steps in a saga,
-    executing them in reverse order. This is the primary tool for agents
+    executing them in reverse dependency order. This is the primary tool for agents
     to autonomously heal failed distributed transactions.
 
     The agent should:
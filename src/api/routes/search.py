@@ -0,0 +1,49 @@
+# src/api/routes/search.py
+"""
+Full-text search across conversations, conversation messages and agent
+history, backed by the incremental index of src/infrastructure/search_index.py.
+"""
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pymongo.errors import OperationFailure
+
+from src.core.services.search_index_service import search_index_service
+from src.infrastructure.search_index import KIND_CONVERSATION, KIND_HISTORY, KIND_MESSAGE
+from src.infrastructure.storage.history_archive import naive_utc
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/search", tags=["Search"])
+
+SEARCH_KINDS = (KIND_CONVERSATION, KIND_MESSAGE, KIND_HISTORY)
+
+
+@router.get("", summary="Full-text search over conversations, messages and history")
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description="Words, \"phrases\" and -excluded words"),
+    agent_id: Optional[str] = Query(None, description="Only hits of this agent"),
+    screenplay_id: Optional[str] = Query(None, description="Only hits of this screenplay"),
+    since: Optional[datetime] = Query(None, description="Only hits at or after this moment"),
+    kind: Optional[List[str]] = Query(None, description="conversation, message and/or history"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+):
+    """Hits ranked by relevance, each with a snippet and highlight offsets."""
+    if kind and not set(kind) <= set(SEARCH_KINDS):
+        raise HTTPException(status_code=422, detail=f"kind must be one of {', '.join(SEARCH_KINDS)}")
+    try:
+        return await search_index_service.search(
+            q,
+            agent_id=agent_id,
+            screenplay_id=screenplay_id,
+            since=naive_utc(since) if since else None,
+            kinds=kind,
+            limit=limit,
+            offset=offset,
+        )
+    except OperationFailure as e:
+        # e.g. text index not created yet (indexer never started)
+        logger.error(f"Search failed: {e}")
+        raise HTTPException(status_code=503, detail="Search index unavailable")
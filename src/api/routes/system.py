@@ -1,17 +1,56 @@
 # src/api/routes/system.py
 import re
-from fastapi import APIRouter, HTTPException
-from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 import yaml
 import os
 import logging
 
 from src.container import container
+from src.infrastructure.http_clients import http_clients
+from src.infrastructure.metrics import MetricsRegistry, metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/system", tags=["System"])
 
+# Watchers without a heartbeat for longer than this are left out of /metrics
+WATCHER_METRICS_MAX_AGE_SECONDS = int(os.getenv("WATCHER_METRICS_MAX_AGE_SECONDS", "60"))
+
+# Module-level MongoDB client (connection pool, lazy init)
+_mongo_client = None
+
+
+def _get_mongo_db():
+    """Get a shared MongoDB database handle (module-level singleton)."""
+    global _mongo_client
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        return None
+    if _mongo_client is None:
+        from pymongo import MongoClient
+        _mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
+    return _mongo_client[os.getenv("MONGO_DATABASE", "conductor_state")]
+
+
+def _watcher_telemetry() -> List[Dict[str, Any]]:
+    """Latest metrics snapshots published by live watchers (heartbeats)."""
+    try:
+        db = _get_mongo_db()
+        if db is None:
+            return []
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=WATCHER_METRICS_MAX_AGE_SECONDS)
+        cursor = db.watchers.find(
+            {"status": "running", "last_heartbeat": {"$gte": cutoff}},
+            {"telemetry": 1},
+        )
+        return [doc["telemetry"] for doc in cursor if doc.get("telemetry")]
+    except Exception as e:
+        logger.warning(f"Falha ao ler métricas dos watchers: {e}")
+        return []
+
 
 class SystemValidationResult(BaseModel):
     is_valid: bool
@@ -40,6 +79,16 @@ class MigrationRequest(BaseModel):
     to_type: str    # 'filesystem' or 'mongodb'
     path: str = None
     no_config_update: bool = False
+    dry_run: bool = False
+    verify: bool = False
+    chunk_size: int = 200
+    workers: int = 8
+    checkpoint: Optional[str] = None  # nome do checkpoint (arquivo em MIGRATION_CHECKPOINT_DIR)
+
+
+class HistoryRestoreRequest(BaseModel):
+    source: str = "history"  # 'history' (agent_id) ou 'agent_conversations' (instance_id)
+    segment_ids: Optional[List[str]] = None  # None = todos os segmentos
 
 
 @router.get("/validate", response_model=SystemValidationResult, summary="Validar sistema completo")
@@ -125,6 +174,59 @@ def _redact_secrets(obj: Any) -> Any:
     return obj
 
 
+@router.get("/metrics", summary="Métricas agregadas (Prometheus ou JSON)")
+def get_system_metrics(format: str = Query("prometheus", pattern="^(prometheus|json)$")):
+    """
+    Métricas do pipeline de tasks: contadores, gauges e histogramas de latência
+    (enqueue→consume, consume→insert, insert→pickup, pickup→first token, total),
+    por agente/provider.
+
+    Combina as métricas deste processo (API + consumer da fila) com os snapshots
+    publicados pelos watchers vivos nos heartbeats.
+    """
+    aggregated = MetricsRegistry.from_snapshots([metrics.snapshot(), *_watcher_telemetry()])
+    if format == "json":
+        return aggregated.to_json()
+    return PlainTextResponse(
+        aggregated.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/http-clients", summary="Pools HTTP de saída por upstream/host")
+def get_http_clients():
+    """
+    Estado dos clientes HTTP compartilhados deste processo: configuração de
+    cada upstream, conexões abertas no pool e, por host, requisições,
+    erros, em andamento e aguardando vaga (limite por host).
+
+    A latência por host está em /system/metrics (conductor_http_client_seconds).
+    """
+    return http_clients.stats()
+
+
+@router.get("/prompt-profiles", summary="Agentes, etapas e seções mais lentos na construção de prompts")
+def get_prompt_profiles(
+    since_hours: float = Query(24, gt=0, description="Janela em horas (pelo created_at da task)"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """
+    Agrega o `prompt_profile` gravado nas tasks: tempo médio/máximo de
+    construção do prompt por agente, por etapa (Mongo, observações, mesh,
+    histórico, ...) e bytes por seção do prompt, do mais lento ao mais rápido.
+    """
+    from src.core.prompt_profile import aggregate_profiles
+
+    db = _get_mongo_db()
+    if db is None:
+        raise HTTPException(status_code=503, detail="MONGO_URI não configurada")
+    try:
+        return aggregate_profiles(db.tasks, since_hours, limit)
+    except Exception as e:
+        logger.error(f"Erro ao agregar perfis de prompt: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/config", summary="Obter configuração do sistema")
 def get_system_config():
     """
@@ -212,10 +314,40 @@ def restore_agents(request: RestoreRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _migration_repository(backend: str, path: str = None):
+    """Repositório de origem/destino da migração (path só se aplica ao filesystem)."""
+    if backend == "mongodb":
+        if not container.settings.mongo_uri:
+            raise HTTPException(status_code=400, detail="MongoDB não configurado (MONGO_URI)")
+        return container.get_state_repository("mongo")
+    from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+    base_path = path or container.get_configuration_service().get_storage_config().path
+    return FileSystemStateRepository(base_path=base_path)
+
+
+# Checkpoints de migração pela API: só um nome, o arquivo fica sempre neste diretório
+MIGRATION_CHECKPOINT_DIR = os.path.join(".conductor_workspace", "migration_checkpoints")
+_CHECKPOINT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def _migration_checkpoint_path(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    if not _CHECKPOINT_NAME.match(name):
+        raise HTTPException(
+            status_code=400,
+            detail="checkpoint deve ser um nome (letras, dígitos, '_' ou '-', até 64), sem caminho",
+        )
+    os.makedirs(MIGRATION_CHECKPOINT_DIR, exist_ok=True)
+    return os.path.join(MIGRATION_CHECKPOINT_DIR, f"{name}.json")
+
+
 @router.post("/migrate", summary="Migrar storage entre filesystem e MongoDB")
 def migrate_storage(request: MigrationRequest):
     """
-    Migra dados entre filesystem e MongoDB.
+    Migra agentes e histórico entre filesystem e MongoDB em lote
+    (BulkMigrationEngine). `path` se aplica ao destino filesystem.
+    Suporta dry_run, verify e checkpoint para retomar migrações longas.
     """
     try:
         if request.from_type not in ["filesystem", "mongodb"]:
@@ -224,13 +356,42 @@ def migrate_storage(request: MigrationRequest):
         if request.to_type not in ["filesystem", "mongodb"]:
             raise HTTPException(status_code=400, detail="to_type deve ser 'filesystem' ou 'mongodb'")
 
-        # Para este MVP, simulamos a migração
+        if request.from_type == request.to_type:
+            # Só filesystem -> filesystem em outro diretório; MongoDB ignora path
+            # e copiaria o banco sobre ele mesmo
+            if request.to_type != "filesystem" or not request.path:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Origem e destino são iguais; só filesystem -> filesystem com path",
+                )
+
+        checkpoint_path = _migration_checkpoint_path(request.checkpoint)
+
+        from src.infrastructure.storage.bulk_migration import BulkMigrationEngine
+
+        source_repo = _migration_repository(request.from_type)
+        dest_repo = _migration_repository(
+            request.to_type, request.path if request.to_type == "filesystem" else None
+        )
+        if request.from_type == request.to_type and (
+            os.path.realpath(source_repo.base_path) == os.path.realpath(dest_repo.base_path)
+        ):
+            raise HTTPException(status_code=400, detail="path aponta para o próprio diretório de origem")
+        engine = BulkMigrationEngine(
+            source_repo, dest_repo,
+            chunk_size=request.chunk_size,
+            workers=request.workers,
+            checkpoint_path=checkpoint_path,
+        )
+        result = engine.run(dry_run=request.dry_run, verify=request.verify)
+
         return {
-            "status": "success",
+            "status": "success" if result["success"] else "mismatch",
             "from_type": request.from_type,
             "to_type": request.to_type,
             "path": request.path,
-            "migrated_items": 0,
+            "migrated_items": result["agents_migrated"],
+            **result,
             "message": f"Migração de {request.from_type} para {request.to_type} concluída"
         }
 
@@ -241,6 +402,86 @@ def migrate_storage(request: MigrationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Chave do arquivo de histórico: agent_id ou instance_id, nunca um caminho
+_HISTORY_KEY = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+def _history_key(key: str) -> str:
+    if not _HISTORY_KEY.match(key):
+        raise HTTPException(
+            status_code=400,
+            detail="key deve ser um agent_id ou instance_id (letras, dígitos, '_', '.' ou '-'), sem caminho",
+        )
+    return key
+
+
+def _history_source(source: str) -> str:
+    from src.infrastructure.storage.history_archive import SOURCE_HISTORY, SOURCE_LEGACY
+    if source not in (SOURCE_HISTORY, SOURCE_LEGACY):
+        raise HTTPException(status_code=400, detail=f"source deve ser '{SOURCE_HISTORY}' ou '{SOURCE_LEGACY}'")
+    return source
+
+
+@router.post("/history/compact", summary="Compactar histórico conforme a política de retenção")
+def compact_history(agent_id: Optional[str] = Query(None, description="Só este agente (padrão: todos)")):
+    """
+    Move para o arquivo frio as entradas de histórico fora da política de
+    retenção (HISTORY_RETENTION_* ou `history_retention` na definição).
+    """
+    from src.core.services.history_retention_service import history_retention_service
+    try:
+        return history_retention_service.compact([agent_id] if agent_id else None)
+    except Exception as e:
+        logger.error(f"Erro na compactação do histórico: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/history/archive/{key}", summary="Listar segmentos arquivados do histórico")
+def list_history_archive(key: str, source: str = Query("history")):
+    """Segmentos (metadados, sem payload) de um agente ou, para o legado, de uma instância."""
+    from src.core.services.history_retention_service import history_retention_service
+    segments = history_retention_service.archive.segments(_history_key(key), _history_source(source))
+    return {"key": key, "source": source, "count": len(segments), "segments": segments}
+
+
+@router.get("/history/archive/{key}/entries", summary="Ler entradas arquivadas do histórico")
+def read_history_archive(
+    key: str,
+    source: str = Query("history"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(500, ge=1, le=10000),
+):
+    """Entradas arquivadas (mais antiga primeiro), opcionalmente filtradas por intervalo."""
+    from src.core.services.history_retention_service import history_retention_service
+    from src.infrastructure.storage.history_archive import naive_utc
+    entries = history_retention_service.archive.read(
+        _history_key(key), _history_source(source),
+        since=naive_utc(since) if since else None,
+        until=naive_utc(until) if until else None,
+    )
+    return {"key": key, "source": source, "total": len(entries), "entries": entries[:limit]}
+
+
+@router.post("/history/archive/{key}/restore", summary="Restaurar histórico arquivado")
+def restore_history_archive(key: str, request: HistoryRestoreRequest):
+    """
+    Devolve segmentos ao histórico quente. Se a política continuar valendo,
+    a próxima compactação os arquiva de novo.
+    """
+    from src.core.services.history_retention_service import history_retention_service
+    try:
+        restored = history_retention_service.archive.restore(
+            _history_key(key), _history_source(request.source), segment_ids=request.segment_ids
+        )
+        return {"key": key, "source": request.source, "restored": restored}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao restaurar histórico arquivado: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/mcp/sidecars", summary="[DEPRECATED] Listar MCP sidecars descobertos")
 def list_mcp_sidecars():
     """
@@ -0,0 +1,181 @@
+# src/api/routes/traces.py
+"""
+Task trace endpoint: reconstructs the delegation chain of a task and the
+spans recorded along the way (api.enqueue -> queue -> watcher -> delegation).
+"""
+import os
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, HTTPException
+
+from src.infrastructure.tracing import SPANS_COLLECTION, parse_timestamp
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/tasks", tags=["Tracing"])
+
+# Guards against cycles / runaway chains when walking parent_task_id
+MAX_CHAIN_DEPTH = 50
+
+# Task fields returned in the trace (prompt/result can be large)
+TASK_TRACE_PROJECTION = {
+    "agent_id": 1, "provider": 1, "status": 1, "source": 1, "worker_id": 1,
+    "parent_task_id": 1, "trace": 1, "exit_code": 1, "duration": 1,
+    "enqueued_at": 1, "created_at": 1, "started_at": 1, "completed_at": 1,
+}
+
+# Module-level MongoDB client (connection pool, lazy init)
+_mongo_client = None
+
+
+def _get_mongo_db():
+    """Get a shared MongoDB database handle (module-level singleton)."""
+    global _mongo_client
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        return None
+    if _mongo_client is None:
+        from pymongo import MongoClient
+        _mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
+    return _mongo_client[os.getenv("MONGO_DATABASE", "conductor_state")]
+
+
+def _elapsed_ms(start: Any, end: Any) -> Optional[float]:
+    start_ts, end_ts = parse_timestamp(start), parse_timestamp(end)
+    if start_ts is None or end_ts is None:
+        return None
+    return round((end_ts - start_ts) * 1000, 3)
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _task_latencies(task: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Per-hop latencies (ms) derived from the task timestamps."""
+    origin = task.get("enqueued_at") or task.get("created_at")
+    return {
+        "enqueue_to_insert_ms": _elapsed_ms(task.get("enqueued_at"), task.get("created_at")),
+        "pickup_ms": _elapsed_ms(task.get("created_at"), task.get("started_at")),
+        "execution_ms": _elapsed_ms(task.get("started_at"), task.get("completed_at")),
+        "total_ms": _elapsed_ms(origin, task.get("completed_at")),
+    }
+
+
+def _serialize_span(span: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "span_id": span.get("span_id"),
+        "parent_span_id": span.get("parent_span_id"),
+        "name": span.get("name"),
+        "service": span.get("service"),
+        "start": _iso(span.get("start")),
+        "end": _iso(span.get("end")),
+        "duration_ms": span.get("duration_ms"),
+        "status": span.get("status"),
+        "attributes": span.get("attributes", {}),
+    }
+
+
+def _find_root(tasks, task: Dict[str, Any]) -> Dict[str, Any]:
+    """Follow parent_task_id up to the first task of the delegation chain."""
+    seen = {str(task["_id"])}
+    for _ in range(MAX_CHAIN_DEPTH):
+        parent_id = task.get("parent_task_id")
+        if not parent_id or parent_id in seen or not ObjectId.is_valid(parent_id):
+            break
+        parent = tasks.find_one({"_id": ObjectId(parent_id)}, TASK_TRACE_PROJECTION)
+        if not parent:
+            break
+        seen.add(parent_id)
+        task = parent
+    return task
+
+
+def _collect_chain(tasks, root: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Root plus all delegated descendants, one query per chain level."""
+    chain = [root]
+    seen = {str(root["_id"])}
+    frontier = [str(root["_id"])]
+    for _ in range(MAX_CHAIN_DEPTH):
+        if not frontier:
+            break
+        children = [
+            child for child in tasks.find({"parent_task_id": {"$in": frontier}}, TASK_TRACE_PROJECTION)
+            if str(child["_id"]) not in seen
+        ]
+        seen.update(str(child["_id"]) for child in children)
+        chain.extend(children)
+        frontier = [str(child["_id"]) for child in children]
+    return chain
+
+
+@router.get("/{task_id}/trace", summary="End-to-end trace of a task and its delegation chain")
+def get_task_trace(task_id: str) -> Dict[str, Any]:
+    """
+    Return the delegation tree containing the task, with per-hop latencies
+    and the spans recorded for each task (grouped by attributes.task_id).
+    """
+    try:
+        object_id = ObjectId(task_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid task_id: {task_id}")
+
+    db = _get_mongo_db()
+    if db is None:
+        raise HTTPException(status_code=503, detail="MongoDB not configured")
+
+    tasks = db.tasks
+    task = tasks.find_one({"_id": object_id}, TASK_TRACE_PROJECTION)
+    if not task:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+
+    chain = _collect_chain(tasks, _find_root(tasks, task))
+
+    trace_ids = sorted({t["trace"]["trace_id"] for t in chain if (t.get("trace") or {}).get("trace_id")})
+    spans_by_task: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    if trace_ids:
+        cursor = db[SPANS_COLLECTION].find({"trace_id": {"$in": trace_ids}}).sort("start", 1)
+        for span in cursor:
+            spans_by_task[str(span.get("attributes", {}).get("task_id", ""))].append(_serialize_span(span))
+
+    by_id = {str(t["_id"]): t for t in chain}
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for t in chain:
+        tid = str(t["_id"])
+        latencies = _task_latencies(t)
+        parent = by_id.get(t.get("parent_task_id") or "")
+        if parent is not None:
+            latencies["delegation_handoff_ms"] = _elapsed_ms(
+                parent.get("completed_at"), t.get("enqueued_at") or t.get("created_at")
+            )
+        nodes[tid] = {
+            "task_id": tid,
+            "agent_id": t.get("agent_id"),
+            "provider": t.get("provider"),
+            "status": t.get("status"),
+            "worker_id": t.get("worker_id"),
+            "parent_task_id": t.get("parent_task_id"),
+            "trace_id": (t.get("trace") or {}).get("trace_id"),
+            "enqueued_at": _iso(t.get("enqueued_at")),
+            "created_at": _iso(t.get("created_at")),
+            "started_at": _iso(t.get("started_at")),
+            "completed_at": _iso(t.get("completed_at")),
+            "latencies": latencies,
+            "spans": spans_by_task.get(tid, []),
+            "children": [],
+        }
+
+    root_id = str(chain[0]["_id"])
+    for t in chain[1:]:
+        nodes[t["parent_task_id"]]["children"].append(nodes[str(t["_id"])])
+
+    return {
+        "task_id": task_id,
+        "root_task_id": root_id,
+        "trace_ids": trace_ids,
+        "tasks_in_chain": len(chain),
+        "tree": nodes[root_id],
+    }
@@ -8,7 +8,7 @@ project_root = Path(__file__).parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from src.cli.shared import CLIArgumentParser, REPLManager
+from src.cli.shared import CLIArgumentParser
 from src.container import container
 from src.core.domain import TaskDTO
 from src.core.observability import configure_logging
@@ -814,6 +814,7 @@ def repl_command(args):
         return
     
     # Configure REPL based on mode
+    from src.cli.shared import REPLManager
     repl_manager = REPLManager(args.agent, cli)
     
     # Add mode-specific commands
@@ -1065,6 +1066,7 @@ def handle_agent_interaction(args):
             print("💡 Digite 'exit' para sair")
 
             # Use existing REPL manager
+            from src.cli.shared import REPLManager
             repl_manager = REPLManager(args.agent, cli)
 
             # Add debug commands based on context
@@ -3,9 +3,11 @@ Shared CLI Components
 
 This module provides reusable components for CLI interfaces,
 following DRY and SRP principles to eliminate code duplication.
+
+``REPLManager`` is resolved on first access: it pulls in prompt_toolkit,
+which one-shot commands never need.
 """
 
-from .repl_manager import REPLManager
 from .argument_parser import CLIArgumentParser
 from .state_manager import StateManager
 from .debug_utilities import DebugUtilities
@@ -18,3 +20,11 @@ __all__ = [
     "DebugUtilities",
     "ErrorHandling",
 ]
+
+
+def __getattr__(name):
+    if name == "REPLManager":
+        from .repl_manager import REPLManager
+
+        return REPLManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
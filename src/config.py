@@ -55,24 +55,12 @@ class Settings(BaseSettings):
             os.path.exists("/root/.config/gcloud")  # Docker-specific gcloud path
         )
         
-        # Skip credential validation for local development (Claude Code CLI available)
+        # Local development can rely on Claude Code CLI; whether it is actually
+        # installed is probed lazily (and cached) when an LLM client is created,
+        # see src.infrastructure.llm.cli_client.claude_cli_available.
         if not is_docker:
-            # Check if Claude Code CLI is available locally
-            try:
-                import subprocess
-                result = subprocess.run(["claude", "--version"], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=3)
-                if result.returncode == 0:
-                    # Claude Code CLI available - no API credentials needed
-                    return self
-            except:
-                pass
-            
-            # If no Claude Code CLI, still allow local development without strict validation
             return self
-            
+
         # For Docker containers, validate credentials
         gcp_creds = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
         gcloud_config_exists = os.path.exists("/root/.config/gcloud")
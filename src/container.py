@@ -1,27 +1,28 @@
-import os
-import yaml
-from pathlib import Path
-from typing import Dict, Any
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, Any
 
 from src.config import settings, ConfigManager
-from src.core.conductor_service import ConductorService
-from src.core.services.configuration_service import ConfigurationService
-from src.core.services.storage_service import StorageService
-from src.core.services.agent_storage_service import AgentStorageService
-from src.core.services.agent_storage_service import AgentStorageService
-from src.core.services.agent_discovery_service import AgentDiscoveryService
-from src.infrastructure.discovery_service import DiscoveryService
-from src.core.services.tool_management_service import ToolManagementService
-from src.core.services.task_execution_service import TaskExecutionService
-from src.core.services.session_management_service import SessionManagementService
-from src.core.exceptions import AgentNotFoundError
+from src.infrastructure.structured_logging import log_event
 from src.ports.state_repository import IStateRepository as StateRepository
 from src.ports.llm_client import LLMClient
-from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
-from src.infrastructure.storage.mongo_repository import MongoStateRepository
-from src.infrastructure.storage.mongo_observation_repository import MongoObservationRepository
-from src.infrastructure.llm.cli_client import create_llm_client
-from src.infrastructure.repository_factory import RepositoryFactory
+
+# Providers are imported inside their getters: a CLI invocation only pays
+# for the services (and drivers such as pymongo) that it actually resolves.
+if TYPE_CHECKING:
+    from src.core.conductor_service import ConductorService
+    from src.core.services.configuration_service import ConfigurationService
+    from src.core.services.storage_service import StorageService
+    from src.core.services.agent_storage_service import AgentStorageService
+    from src.core.services.agent_discovery_service import AgentDiscoveryService
+    from src.infrastructure.discovery_service import DiscoveryService
+    from src.core.services.tool_management_service import ToolManagementService
+    from src.core.services.task_execution_service import TaskExecutionService
+    from src.core.services.session_management_service import SessionManagementService
+    from src.infrastructure.storage.mongo_observation_repository import MongoObservationRepository
+
+logger = logging.getLogger(__name__)
 
 
 class DIContainer:
@@ -54,16 +55,22 @@ class DIContainer:
     def get_state_repository(self, provider: str = "file") -> StateRepository:
         """Get state repository instance based on provider."""
         if provider == "mongo":
+            from src.infrastructure.storage.mongo_repository import MongoStateRepository
+
             return MongoStateRepository(
                 connection_string=self.settings.mongo_uri,
                 db_name=self.settings.mongo_database,
             )
         else:
+            from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+
             return FileSystemStateRepository()
 
     def get_observation_repository(self) -> MongoObservationRepository:
         """Get singleton MongoObservationRepository instance."""
         if self._observation_repository is None:
+            from src.infrastructure.storage.mongo_observation_repository import MongoObservationRepository
+
             self._observation_repository = MongoObservationRepository(
                 connection_string=self.settings.mongo_uri,
                 db_name=self.settings.mongo_database,
@@ -91,6 +98,8 @@ class DIContainer:
         if timeout is None:
             timeout = self.settings.default_timeout
 
+        from src.infrastructure.llm.cli_client import create_llm_client
+
         return create_llm_client(
             ai_provider, working_directory, timeout, is_admin_agent, mcp_config
         )
@@ -99,12 +108,16 @@ class DIContainer:
     def get_configuration_service(self, config_path: str = "config.yaml") -> ConfigurationService:
         """Get singleton ConfigurationService instance."""
         if self._configuration_service is None:
+            from src.core.services.configuration_service import ConfigurationService
+
             self._configuration_service = ConfigurationService(config_path)
         return self._configuration_service
 
     def get_storage_service(self) -> StorageService:
         """Get singleton StorageService instance."""
         if self._storage_service is None:
+            from src.core.services.storage_service import StorageService
+
             config_service = self.get_configuration_service()
             self._storage_service = StorageService(config_service)
         return self._storage_service
@@ -112,6 +125,8 @@ class DIContainer:
     def get_agent_storage_service(self) -> AgentStorageService:
         """Get singleton AgentStorageService instance."""
         if self._agent_storage_service is None:
+            from src.core.services.agent_storage_service import AgentStorageService
+
             config_service = self.get_configuration_service()
             self._agent_storage_service = AgentStorageService(config_service)
         return self._agent_storage_service
@@ -119,6 +134,8 @@ class DIContainer:
     def get_agent_discovery_service(self) -> AgentDiscoveryService:
         """Get singleton AgentDiscoveryService instance."""
         if self._agent_discovery_service is None:
+            from src.core.services.agent_discovery_service import AgentDiscoveryService
+
             storage_service = self.get_storage_service()
             self._agent_discovery_service = AgentDiscoveryService(storage_service)
         return self._agent_discovery_service
@@ -126,12 +143,16 @@ class DIContainer:
     def get_discovery_service(self) -> DiscoveryService:
         """Get singleton DiscoveryService instance."""
         if self._discovery_service is None:
+            from src.infrastructure.discovery_service import DiscoveryService
+
             self._discovery_service = DiscoveryService()
         return self._discovery_service
 
     def get_tool_management_service(self) -> ToolManagementService:
         """Get singleton ToolManagementService instance."""
         if self._tool_management_service is None:
+            from src.core.services.tool_management_service import ToolManagementService
+
             config_service = self.get_configuration_service()
             discovery_service = self.get_discovery_service()
             self._tool_management_service = ToolManagementService(config_service, discovery_service)
@@ -140,6 +161,8 @@ class DIContainer:
     def get_task_execution_service(self) -> TaskExecutionService:
         """Get singleton TaskExecutionService instance."""
         if self._task_execution_service is None:
+            from src.core.services.task_execution_service import TaskExecutionService
+
             config_service = self.get_configuration_service()
             agent_storage_service = self.get_agent_storage_service()
             tool_service = self.get_tool_management_service()
@@ -152,6 +175,8 @@ class DIContainer:
     def get_session_management_service(self) -> SessionManagementService:
         """Get singleton SessionManagementService instance."""
         if self._session_management_service is None:
+            from src.core.services.session_management_service import SessionManagementService
+
             config_service = self.get_configuration_service()
             self._session_management_service = SessionManagementService(config_service)
         return self._session_management_service
@@ -164,6 +189,8 @@ class DIContainer:
             Singleton ConductorService instance
         """
         if self._conductor_service is None:
+            from src.core.conductor_service import ConductorService
+
             self._conductor_service = ConductorService()
         return self._conductor_service
 
@@ -200,48 +227,33 @@ class DIContainer:
         3. Config default (ai_providers.yaml)
         4. Fallback: 'claude'
         """
-        import traceback
-        from src.core.observability import configure_logging
-        logger = configure_logging(False, "container", "ai_provider")
-        
-        logger.info("🔍 [CONTAINER] get_ai_provider chamado com:")
-        logger.info(f"   - cli_provider: {cli_provider}")
-        logger.info(f"   - agent_definition: {agent_definition}")
-        if agent_definition:
-            logger.info(f"   - agent_ai_provider: {getattr(agent_definition, 'ai_provider', 'NOT_FOUND')}")
-        
-        # Capturar stack trace
-        stack = traceback.extract_stack()
-        caller = stack[-2] if len(stack) > 1 else None
-        if caller:
-            logger.info(f"   - Chamado por: {caller.filename}:{caller.lineno} em {caller.name}()")
-        
+        agent_id = getattr(agent_definition, "agent_id", None) or getattr(agent_definition, "name", None)
+
         # 1. CLI parameter tem prioridade máxima
         if cli_provider:
-            logger.info(f"✅ [CONTAINER] Usando CLI provider: {cli_provider}")
+            log_event(logger, "provider.resolved", agent_id=agent_id, provider=cli_provider, source="cli")
             return cli_provider
-        
+
         # 2. Agent definition
-        if agent_definition and hasattr(agent_definition, 'ai_provider') and agent_definition.ai_provider is not None:
+        if agent_definition and getattr(agent_definition, 'ai_provider', None) is not None:
             agent_provider = agent_definition.ai_provider
-            logger.info(f"✅ [CONTAINER] Usando agent provider: {agent_provider}")
+            log_event(logger, "provider.resolved", agent_id=agent_id, provider=agent_provider, source="agent")
             return agent_provider
-        
+
         # 3. Config default
         config = self.load_ai_providers_config()
         default_providers = config.get('default_providers', {})
-        logger.info(f"🔍 [CONTAINER] Config carregado: {config}")
-        
+
         # Para tarefas de geração, usar 'generation', senão 'chat'
         task_type = 'generation'  # Default para geração de código
         if default_providers.get(task_type):
             config_provider = default_providers[task_type]
-            logger.info(f"✅ [CONTAINER] Usando config provider ({task_type}): {config_provider}")
+            log_event(logger, "provider.resolved", agent_id=agent_id, provider=config_provider, source="config")
             return config_provider
-        
+
         # 4. Fallback
         fallback = config.get('fallback_provider', 'claude')
-        logger.info(f"✅ [CONTAINER] Usando fallback provider: {fallback}")
+        log_event(logger, "provider.resolved", agent_id=agent_id, provider=fallback, source="fallback")
         return fallback
 
 
@@ -37,6 +37,9 @@ class Defaults:
     TIMEOUT_SECONDS = 1800  # 30 minutes timeout for long-running operations
     MAX_SUGGESTIONS = 3
     SIMILARITY_THRESHOLD = 0.6
+    # Janela do histórico lida para prompts: o PromptEngine usa no máximo 100
+    # turnos; a folga cobre turnos soft-deleted/ocultos filtrados depois
+    HISTORY_TAIL_LIMIT = 200
 
 class Commands:
     """Comandos e subcomandos disponíveis."""
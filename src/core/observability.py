@@ -20,9 +20,11 @@ class SmartFormatter(logging.Formatter):
         super().__init__()
         self.json_formatter = JsonFormatter()
         self.plain_formatter = logging.Formatter("%(message)s")
+        # isatty() is a syscall; stdout does not change for the process lifetime
+        self.interactive = sys.stdout.isatty()
 
     def format(self, record: logging.LogRecord) -> str:
-        if sys.stdout.isatty():
+        if self.interactive:
             # REPL mode: clean output
             # Only show INFO messages and above in the clean format
             if record.levelno >= logging.INFO:
@@ -0,0 +1,156 @@
+# src/core/prompt_artifact.py
+"""
+Compiled agent prompt artifacts.
+
+The static part of an agent prompt (persona with placeholders resolved,
+instructions and formatted playbook, already CDATA-escaped inside
+``<system_context>``) only changes when the agent definition changes. It is
+compiled once per agent version and memoised, so every task for the same
+agent version starts with a byte-identical prefix (provider-side prompt
+caching) and skips the per-call formatting work.
+
+The version is a hash of the raw inputs (definition, persona, playbook).
+Artifacts live in an in-process LRU; with PROMPT_ARTIFACT_STORE=mongo they
+are also persisted to the ``prompt_artifacts`` collection and shared
+between processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_COLLECTION = "prompt_artifacts"
+MAX_CACHED_ARTIFACTS = int(os.getenv("PROMPT_ARTIFACT_CACHE_SIZE", "512"))
+
+
+def agent_version(agent_config: Dict[str, Any], persona: str, playbook: Dict[str, Any]) -> str:
+    """Content hash of the inputs that make up the static prompt prefix."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(agent_config or {}, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update((persona or "").encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(json.dumps(playbook or {}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class CompiledAgentPrompt:
+    """Static prompt material for one agent version."""
+
+    __slots__ = ("version", "persona_content", "instructions", "playbook_content", "static_prefix")
+
+    def __init__(self, version: str, persona_content: str, instructions: str,
+                 playbook_content: str, static_prefix: str):
+        self.version = version
+        self.persona_content = persona_content
+        self.instructions = instructions
+        self.playbook_content = playbook_content
+        self.static_prefix = static_prefix
+
+    def to_document(self, agent: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "_id": self.version,
+            "agent": agent,
+            "persona_content": self.persona_content,
+            "instructions": self.instructions,
+            "playbook_content": self.playbook_content,
+            "static_prefix": self.static_prefix,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any]) -> "CompiledAgentPrompt":
+        return cls(
+            doc["_id"], doc["persona_content"], doc["instructions"],
+            doc["playbook_content"], doc["static_prefix"],
+        )
+
+
+class PromptArtifactCache:
+    """LRU of compiled artifacts, optionally backed by MongoDB."""
+
+    def __init__(self, max_size: int = MAX_CACHED_ARTIFACTS, collection_factory=None):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, CompiledAgentPrompt]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection_factory = collection_factory
+        self._collection = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_collection(self):
+        if self._collection is None and self._collection_factory is not None:
+            try:
+                self._collection = self._collection_factory()
+            except Exception as e:
+                logger.warning(f"Prompt artifact store unavailable: {e}")
+                self._collection_factory = None
+        return self._collection
+
+    def get(self, version: str) -> Optional[CompiledAgentPrompt]:
+        with self._lock:
+            artifact = self._items.get(version)
+            if artifact is not None:
+                self._items.move_to_end(version)
+                self.hits += 1
+                return artifact
+
+        collection = self._get_collection()
+        if collection is not None:
+            try:
+                doc = collection.find_one({"_id": version})
+                if doc:
+                    artifact = CompiledAgentPrompt.from_document(doc)
+                    self._remember(artifact)
+                    with self._lock:
+                        self.hits += 1
+                    return artifact
+            except Exception as e:
+                logger.warning(f"Failed to read prompt artifact {version}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, artifact: CompiledAgentPrompt, agent: Optional[str] = None):
+        self._remember(artifact)
+        collection = self._get_collection()
+        if collection is not None:
+            try:
+                collection.replace_one({"_id": artifact.version}, artifact.to_document(agent), upsert=True)
+            except Exception as e:
+                logger.warning(f"Failed to persist prompt artifact {artifact.version}: {e}")
+
+    def _remember(self, artifact: CompiledAgentPrompt):
+        with self._lock:
+            self._items[artifact.version] = artifact
+            self._items.move_to_end(artifact.version)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+def _mongo_artifacts_collection():
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        return None
+    from pymongo import MongoClient
+    client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
+    return client[os.getenv("MONGO_DATABASE", "conductor_state")][ARTIFACTS_COLLECTION]
+
+
+artifact_cache = PromptArtifactCache(
+    collection_factory=_mongo_artifacts_collection
+    if os.getenv("PROMPT_ARTIFACT_STORE", "memory").lower() == "mongo" else None
+)
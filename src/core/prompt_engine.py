@@ -9,6 +9,9 @@ from datetime import datetime
 import xml.dom.minidom
 
 from src.core.exceptions import AgentNotFoundError, ConfigurationError
+from src.core.prompt_artifact import CompiledAgentPrompt, agent_version, artifact_cache
+from src.core.prompt_profile import PromptProfile
+from src.infrastructure.structured_logging import log_event
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +22,7 @@ class PromptEngine:
     Responsável por carregar, processar e construir prompts.
     """
 
-    def __init__(self, agent_home_path: str, prompt_format: str = "xml", instance_id: Optional[str] = None, screenplay_id: Optional[str] = None):
+    def __init__(self, agent_home_path: str, prompt_format: str = "xml", instance_id: Optional[str] = None, screenplay_id: Optional[str] = None, profile: Optional[PromptProfile] = None):
         """
         Inicializa o PromptEngine com o caminho para o diretório principal do agente.
 
@@ -28,6 +31,7 @@ class PromptEngine:
             prompt_format: Formato do prompt ("xml" ou "text")
             instance_id: ID da instância do agente (para contexto isolado)
             screenplay_id: ID do screenplay (opcional, se não fornecido busca pela instance)
+            profile: Perfil onde registrar tempos por etapa e tamanho por seção (opcional)
         """
         self.agent_home_path = Path(agent_home_path)
         self.agent_config: Dict[str, Any] = {}
@@ -42,6 +46,7 @@ class PromptEngine:
         self.conversation_context: str = ""
         self.conversation_delegation: Dict[str, Any] = {}  # auto_delegate settings + squad
         self.task_state_context: list = []  # World state from task observations
+        self.compiled_prompt: Optional[CompiledAgentPrompt] = None  # Prefixo estático compilado
 
         # Extract agent_id from MongoDB path
         if self.is_mongodb:
@@ -50,6 +55,7 @@ class PromptEngine:
         else:
             self.agent_id = None
         self.conversation_history_cache = []  # Cache do histórico de conversas
+        self.profile = profile or PromptProfile(self.agent_id or self.agent_home_path.name)
 
         logger.debug(f"PromptEngine inicializado para o caminho: {agent_home_path} (MongoDB: {self.is_mongodb}, Format: {self.prompt_format})")
 
@@ -61,15 +67,24 @@ class PromptEngine:
         Args:
             conversation_id: ID da conversa para carregar contexto específico e histórico de mensagens
         """
-        self._load_agent_config()
-        self._validate_agent_config()
-        self._load_agent_persona()
-        self._load_agent_playbook()
-        self._resolve_persona_placeholders()
-        self._load_screenplay_context()
-        self._load_conversation_context(conversation_id)
-        self._load_conversation_history(conversation_id)  # ← NOVO: Carregar histórico de mensagens
-        self._load_task_state_context()  # ← NOVO: Carregar estado de tasks observadas
+        stage = self.profile.stage
+        with stage("load_config"):
+            self._load_agent_config()
+            self._validate_agent_config()
+        with stage("load_persona"):
+            self._load_agent_persona()
+        with stage("load_playbook"):
+            self._load_agent_playbook()
+        with stage("compile_static"):
+            self._compile_static_context()  # Persona/instruções/playbook compilados por versão
+        with stage("load_screenplay"):
+            self._load_screenplay_context()
+        with stage("load_conversation_context"):
+            self._load_conversation_context(conversation_id)
+        with stage("load_history"):
+            self._load_conversation_history(conversation_id)  # ← NOVO: Carregar histórico de mensagens
+        with stage("load_world_state"):
+            self._load_task_state_context()  # ← NOVO: Carregar estado de tasks observadas
 
     def build_prompt(self, conversation_history: List[Dict], message: str, include_history: bool = True) -> str:
         """Constrói o prompt final usando o contexto já carregado."""
@@ -88,12 +103,7 @@ class PromptEngine:
         else:
             formatted_history = "Execução isolada - sem histórico de conversas anteriores."
         # Get instructions from definition with fallbacks
-        agent_instructions = (
-            self.agent_config.get("prompt", "") or
-            self.agent_config.get("instructions", "") or
-            self.agent_config.get("description", "") or
-            ""
-        )
+        agent_instructions = self._get_agent_instructions()
 
         # SAFETY: Truncate persona if too long to prevent system errors
         MAX_PERSONA_LENGTH = 20000  # Reasonable limit for persona content
@@ -165,7 +175,10 @@ class PromptEngine:
         if self.prompt_format == "xml":
             return self.build_xml_prompt(conversation_history, message, include_history)
         else:
-            return self.build_prompt(conversation_history, message, include_history)
+            with self.profile.stage("build_text"):
+                prompt = self.build_prompt(conversation_history, message, include_history)
+            self.profile.prompt_bytes = len(prompt.encode("utf-8"))
+            return prompt
 
     def get_available_tools(self) -> List[str]:
         """Get list of available tool names from agent config."""
@@ -260,7 +273,6 @@ class PromptEngine:
 
                 if playbook_data:
                     self.playbook = playbook_data
-                    self.playbook_content = self._format_playbook_for_prompt(self.playbook)
                     logger.debug(f"Playbook loaded successfully from MongoDB for agent: {self.agent_id}")
                 else:
                     logger.debug(f"Playbook not found for agent: {self.agent_id} (optional)")
@@ -283,8 +295,7 @@ class PromptEngine:
             try:
                 with open(playbook_path, "r", encoding="utf-8") as f:
                     playbook_raw_content = f.read()
-                    self.playbook = yaml.safe_load(playbook_raw_content)
-                    self.playbook_content = self._format_playbook_for_prompt(self.playbook)
+                    self.playbook = yaml.safe_load(playbook_raw_content) or {}
                     logger.debug(f"Playbook loaded successfully from: {playbook_path}")
 
             except yaml.YAMLError as e:
@@ -296,6 +307,76 @@ class PromptEngine:
                 self.playbook = {}
                 self.playbook_content = ""
 
+    def _get_agent_instructions(self) -> str:
+        """Instruções do agente (prompt > instructions > description)."""
+        return (
+            self.agent_config.get("prompt", "") or
+            self.agent_config.get("instructions", "") or
+            self.agent_config.get("description", "") or
+            ""
+        )
+
+    def _compile_static_context(self) -> None:
+        """
+        Compila o prefixo estático do agente (persona com placeholders resolvidos,
+        instruções e playbook formatado) uma vez por versão do agente.
+
+        A versão é o hash de definition + persona + playbook crus; enquanto o
+        agente não muda, o artefato é reutilizado do cache e o prefixo do prompt
+        é idêntico byte a byte entre tasks.
+        """
+        version = agent_version(self.agent_config, self.persona_content, self.playbook)
+        artifact = artifact_cache.get(version)
+        if artifact is None:
+            self.playbook_content = self._format_playbook_for_prompt(self.playbook)
+            self._resolve_persona_placeholders()
+            instructions = self._get_agent_instructions()
+            artifact = CompiledAgentPrompt(
+                version,
+                self.persona_content,
+                instructions,
+                self.playbook_content,
+                self._render_static_prefix(self.persona_content, instructions, self.playbook_content),
+            )
+            artifact_cache.put(artifact, agent=self.agent_id or self.agent_config.get("name"))
+            logger.debug(f"Prefixo estático compilado para versão {version}")
+
+        self.persona_content = artifact.persona_content
+        self.playbook_content = artifact.playbook_content
+        self.compiled_prompt = artifact
+
+    def _render_static_prefix(self, persona: str, instructions: str, playbook: str) -> str:
+        """Renderiza o bloco <system_context> (somente conteúdo estável do agente)."""
+        return f"""    <system_context>
+        <persona>
+            <![CDATA[{self._escape_xml_cdata(persona)}]]>
+        </persona>
+        <instructions>
+            <![CDATA[{self._escape_xml_cdata(instructions)}]]>
+        </instructions>
+        <playbook>
+            <![CDATA[{self._escape_xml_cdata(playbook)}]]>
+        </playbook>
+    </system_context>"""
+
+    def get_static_prefix(self) -> str:
+        """
+        Bloco <system_context> do prompt XML.
+
+        Usa o artefato compilado quando ele corresponde ao estado atual;
+        caso contrário (ex: atributos alterados manualmente) renderiza na hora.
+        """
+        instructions = self._get_agent_instructions()
+        artifact = self.compiled_prompt
+        if (
+            artifact is not None
+            and artifact.persona_content == self.persona_content
+            and artifact.instructions == instructions
+            and artifact.playbook_content == self.playbook_content
+        ):
+            return artifact.static_prefix
+        return self._render_static_prefix(self.persona_content, instructions, self.playbook_content)
+
     def _format_playbook_for_prompt(self, playbook_data: Dict[str, Any]) -> str:
         """Formata o playbook para inclusão no prompt."""
         if not playbook_data:
@@ -746,28 +827,29 @@ Rules:
         try:
             import os
             import httpx
+            from src.infrastructure.http_clients import http_clients
 
             # URL da API de observações (Conductor API)
             conductor_api_url = os.getenv("CONDUCTOR_API_URL", "http://conductor-api:8000")
             timeout = float(os.getenv("OBSERVATION_TIMEOUT_SECONDS", "10"))
 
             # Consultar estado consolidado via API síncrona
-            with httpx.Client(timeout=timeout) as client:
-                response = client.get(f"{conductor_api_url}/observations/{agent_id}/state")
+            client = http_clients.sync_client("conductor")
+            response = client.get(f"{conductor_api_url}/observations/{agent_id}/state", timeout=timeout)
 
-                if response.status_code == 200:
-                    state = response.json()
-                    self.task_state_context = state.get('capabilities', [])
+            if response.status_code == 200:
+                state = response.json()
+                self.task_state_context = state.get('capabilities', [])
 
-                    if self.task_state_context:
-                        logger.info(f"✅ Task state context carregado para '{agent_id}': {len(self.task_state_context)} capabilities")
-                    else:
-                        logger.debug(f"Nenhuma observação encontrada para agente '{agent_id}'")
-                elif response.status_code == 404:
-                    # Agente não tem observações - comportamento normal
-                    logger.debug(f"Agente '{agent_id}' não possui observações registradas")
+                if self.task_state_context:
+                    logger.info(f"✅ Task state context carregado para '{agent_id}': {len(self.task_state_context)} capabilities")
                 else:
-                    logger.warning(f"Falha ao carregar task state: HTTP {response.status_code}")
+                    logger.debug(f"Nenhuma observação encontrada para agente '{agent_id}'")
+            elif response.status_code == 404:
+                # Agente não tem observações - comportamento normal
+                logger.debug(f"Agente '{agent_id}' não possui observações registradas")
+            else:
+                logger.warning(f"Falha ao carregar task state: HTTP {response.status_code}")
 
         except httpx.TimeoutException:
             logger.warning(f"Timeout ao consultar observações para agente '{agent_id}'")
@@ -1180,87 +1262,73 @@ Rules:
         if not self.persona_content or not self.agent_config:
             raise ValueError("Contexto não foi carregado. Chame load_context() primeiro.")
 
-        # DEBUG: Log estado do histórico
-        logger.info(f"🔍 [BUILD_XML] conversation_history recebido: {len(conversation_history) if conversation_history else 0} mensagens")
-        logger.info(f"🔍 [BUILD_XML] conversation_history_cache: {len(self.conversation_history_cache) if self.conversation_history_cache else 0} mensagens")
-        logger.info(f"🔍 [BUILD_XML] include_history: {include_history}")
-
         # Se conversation_history estiver vazio mas temos cache, usar o cache
-        if not conversation_history and self.conversation_history_cache:
+        history_from_cache = not conversation_history and bool(self.conversation_history_cache)
+        if history_from_cache:
             conversation_history = self.conversation_history_cache
-            logger.info(f"✅ [BUILD_XML] Usando histórico do cache para XML: {len(conversation_history)} mensagens")
 
-        # Carrega e escapa os conteúdos
-        persona_cdata = self._escape_xml_cdata(self.persona_content)
+        profile = self.profile
+
+        # Prefixo estável (compilado por versão do agente)
+        with profile.stage("build_static"):
+            static_prefix = self.get_static_prefix()
+            message_cdata = self._escape_xml_cdata(message)
+        profile.section("persona", self.persona_content)
+        profile.section("instructions", self._get_agent_instructions())
+        profile.section("playbook", self.playbook_content)
+        profile.section("request", message_cdata)
 
-        # Get instructions with fallbacks
-        agent_instructions = (
-            self.agent_config.get("prompt", "") or
-            self.agent_config.get("instructions", "") or
-            self.agent_config.get("description", "") or
-            ""
-        )
-        instructions_cdata = self._escape_xml_cdata(agent_instructions)
-        playbook_cdata = self._escape_xml_cdata(self.playbook_content)
-        message_cdata = self._escape_xml_cdata(message)
-        
-        # Carrega e escapa o conteúdo do screenplay
-        screenplay_cdata = ""
-        if hasattr(self, 'screenplay_content') and self.screenplay_content:
-            screenplay_cdata = self._escape_xml_cdata(self.screenplay_content)
-        
         # Formata o histórico
-        history_xml = self._format_history_xml(conversation_history) if include_history else "<history/>"
-
-        # Monta a seção do screenplay se disponível
-        screenplay_section = ""
-        if screenplay_cdata:
-            screenplay_section = f"""        <screenplay>
-            <![CDATA[{screenplay_cdata}]]>
-        </screenplay>"""
-
-        # Monta a seção do contexto da conversa se disponível
-        conversation_context_section = ""
-        if hasattr(self, 'conversation_context') and self.conversation_context:
-            conversation_context_cdata = self._escape_xml_cdata(self.conversation_context)
-            conversation_context_section = f"""        <conversation_context>
-            <![CDATA[{conversation_context_cdata}]]>
-        </conversation_context>"""
-
-        # Monta a seção do world_state se disponível (estado de tasks observadas)
-        world_state_section = ""
-        if hasattr(self, 'task_state_context') and self.task_state_context:
-            world_state_section = "\n" + self._build_world_state_xml()
+        with profile.stage("build_history"):
+            history_xml = self._format_history_xml(conversation_history) if include_history else "<history/>"
+        profile.section("history", history_xml)
+
+        # Seções voláteis (por conversa/task) ficam depois do prefixo estável
+        session_sections = []
+
+        if self.screenplay_content:
+            session_sections.append(f"""<screenplay>
+            <![CDATA[{self._escape_xml_cdata(self.screenplay_content)}]]>
+        </screenplay>""")
+            profile.section("screenplay", session_sections[-1])
+
+        if self.conversation_context:
+            session_sections.append(f"""<conversation_context>
+            <![CDATA[{self._escape_xml_cdata(self.conversation_context)}]]>
+        </conversation_context>""")
+            profile.section("conversation_context", session_sections[-1])
 
         # Delegation section: when auto_delegate is enabled, inject squad awareness
-        delegation_section = ""
         if self.conversation_delegation.get("auto_delegate"):
-            delegation_section = self._build_delegation_xml()
+            with profile.stage("build_delegation"):
+                session_sections.append(self._build_delegation_xml())
+            profile.section("delegation", session_sections[-1])
+
+        # World state (estado de tasks observadas)
+        if self.task_state_context:
+            with profile.stage("build_world_state"):
+                session_sections.append(self._build_world_state_xml())
+            profile.section("world_state", session_sections[-1])
 
         # SAGA-016: Inject live MCP mesh topology for Council agents
-        mesh_section = ""
         try:
-            from src.core.services.mcp_mesh_service import mesh_service
-            mesh_data = mesh_service.get_mesh()
-            if mesh_data.get("summary", {}).get("total", 0) > 0:
-                mesh_context = mesh_service.get_mesh_context_for_prompt()
-                mesh_section = f"\n        {mesh_context}"
+            with profile.stage("build_mesh"):
+                from src.core.services.mcp_mesh_service import mesh_service
+                mesh_data = mesh_service.get_mesh()
+                if mesh_data.get("summary", {}).get("total", 0) > 0:
+                    session_sections.append(mesh_service.get_mesh_context_for_prompt())
+                    profile.section("mesh", session_sections[-1])
         except Exception:
             pass  # Mesh not available yet - graceful degradation
 
-        # Monta o prompt XML final
+        session_context = "".join(
+            f"\n        {section.strip()}" for section in session_sections if section and section.strip()
+        )
+        session_section = f"\n    <session_context>{session_context}\n    </session_context>" if session_context else ""
+
+        # Monta o prompt XML final: prefixo estático primeiro, conteúdo volátil depois
         final_prompt = f"""<prompt>
-    <system_context>
-        <persona>
-            <![CDATA[{persona_cdata}]]>
-        </persona>
-        <instructions>
-            <![CDATA[{instructions_cdata}]]>
-        </instructions>
-        <playbook>
-            <![CDATA[{playbook_cdata}]]>
-        </playbook>{screenplay_section}{conversation_context_section}{delegation_section}{world_state_section}{mesh_section}
-    </system_context>
+{static_prefix}{session_section}
     <conversation_history>
 {history_xml}
     </conversation_history>
@@ -1269,10 +1337,17 @@ Rules:
     </user_request>
 </prompt>"""
         
-        logger.info(f"Prompt XML final construído com sucesso ({len(final_prompt)} chars).")
+        profile.prompt_bytes = len(final_prompt.encode("utf-8"))
+        log_event(
+            logger, "prompt.built", agent_id=profile.agent_id,
+            history_messages=len(conversation_history) if conversation_history else 0,
+            history_from_cache=history_from_cache, include_history=include_history,
+            prompt_chars=len(final_prompt),
+        )
 
         # Save prompt to disk for debugging/analysis
-        self._save_prompt_to_disk(final_prompt, "xml", format_xml=True)
+        with profile.stage("save_prompt"):
+            self._save_prompt_to_disk(final_prompt, "xml", format_xml=True)
 
         return final_prompt
 
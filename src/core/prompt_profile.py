@@ -0,0 +1,125 @@
+# src/core/prompt_profile.py
+"""
+Per-request prompt build profile.
+
+``PromptEngine.load_context`` and ``build_xml_prompt`` record how long each
+stage took (Mongo reads, the observations call, history rendering, ...) and
+how many bytes each prompt section contributed. The compact form is stored
+on the task document (``prompt_profile``), so slow prompts can be traced
+back to a stage after the fact and aggregated per agent and section.
+
+Stage and section names never contain dots: they are used as MongoDB keys.
+"""
+
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+TASK_FIELD = "prompt_profile"
+
+# Sections in prompt order
+SECTIONS = (
+    "persona", "instructions", "playbook", "screenplay", "conversation_context",
+    "delegation", "world_state", "mesh", "history", "request",
+)
+
+
+class PromptProfile:
+    """Stage timings (ms) and section sizes (bytes) of one prompt build."""
+
+    __slots__ = ("agent_id", "stages", "sections", "prompt_bytes")
+
+    def __init__(self, agent_id: Optional[str] = None):
+        self.agent_id = agent_id
+        self.stages: Dict[str, float] = {}
+        self.sections: Dict[str, int] = {}
+        self.prompt_bytes = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Rebuilding with the same engine replaces the previous timing
+            self.stages[name] = (time.perf_counter() - started) * 1000
+
+    def section(self, name: str, content: Optional[str]) -> None:
+        self.sections[name] = len(content.encode("utf-8")) if content else 0
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.stages.values())
+
+    def compact(self) -> Dict[str, Any]:
+        """Task-document form: timings rounded to 0.01 ms, empty sections left out."""
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "stages": {name: round(ms, 2) for name, ms in self.stages.items()},
+            "bytes": {name: size for name, size in self.sections.items() if size},
+            "prompt_bytes": self.prompt_bytes,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API form: every stage and section, slowest stage first."""
+        stages = sorted(self.stages.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "agent_id": self.agent_id,
+            "total_ms": round(self.total_ms, 3),
+            "prompt_bytes": self.prompt_bytes,
+            "stages": [{"stage": name, "ms": round(ms, 3)} for name, ms in stages],
+            "sections": [
+                {"section": name, "bytes": self.sections[name]}
+                for name in SECTIONS if name in self.sections
+            ],
+        }
+
+
+def _ranked(pipeline_result: List[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            key: row["_id"],
+            "count": row["count"],
+            "avg": round(row["avg"] or 0, 2),
+            "max": round(row["max"] or 0, 2),
+        }
+        for row in pipeline_result
+    ]
+
+
+def aggregate_profiles(collection, since_hours: float = 24, limit: int = 10) -> Dict[str, Any]:
+    """Slowest agents, stages and largest sections over the tasks created in
+    the last ``since_hours`` that carry a prompt profile."""
+    match = {
+        "$match": {
+            TASK_FIELD: {"$exists": True},
+            "created_at": {"$gte": datetime.now(timezone.utc) - timedelta(hours=since_hours)},
+        }
+    }
+
+    def by_entry(field: str) -> List[Dict[str, Any]]:
+        return list(collection.aggregate([
+            match,
+            {"$project": {"entry": {"$objectToArray": f"${TASK_FIELD}.{field}"}}},
+            {"$unwind": "$entry"},
+            {"$group": {"_id": "$entry.k", "count": {"$sum": 1},
+                        "avg": {"$avg": "$entry.v"}, "max": {"$max": "$entry.v"}}},
+            {"$sort": {"avg": -1}},
+            {"$limit": limit},
+        ]))
+
+    agents = list(collection.aggregate([
+        match,
+        {"$group": {"_id": "$agent_id", "count": {"$sum": 1},
+                    "avg": {"$avg": f"${TASK_FIELD}.total_ms"}, "max": {"$max": f"${TASK_FIELD}.total_ms"}}},
+        {"$sort": {"avg": -1}},
+        {"$limit": limit},
+    ]))
+    return {
+        "since_hours": since_hours,
+        "tasks": collection.count_documents(match["$match"]),
+        "agents_ms": _ranked(agents, "agent_id"),
+        "stages_ms": _ranked(by_entry("stages"), "stage"),
+        "sections_bytes": _ranked(by_entry("bytes"), "section"),
+    }
@@ -2,7 +2,9 @@
 import time
 from typing import List, Optional
 from src.core.services.storage_service import StorageService
+from src.core.services.agent_name_index import AgentNameIndex
 from src.core.domain import AgentDefinition
+from src.core.prompt_profile import PromptProfile
 
 
 class AgentDiscoveryService:
@@ -14,6 +16,9 @@ class AgentDiscoveryService:
         # Reduzido de 5 minutos para melhorar UX ao criar novos agentes
         self._cache = {}
         self._cache_timeout = 30  # 30 segundos
+        # Índice de nomes (existência/sugestões), mesma validade do cache
+        self._name_index: Optional[AgentNameIndex] = None
+        self._name_index_built_at = 0.0
 
     def discover_agents(self) -> List[AgentDefinition]:
         """Descobre e retorna todas as definições de agentes disponíveis."""
@@ -43,8 +48,18 @@ class AgentDiscoveryService:
         return definitions
 
     def clear_cache(self):
-        """Limpa o cache de descoberta de agentes."""
+        """Limpa o cache de descoberta de agentes (e o índice de nomes)."""
         self._cache.clear()
+        self._name_index = None
+
+    def get_name_index(self) -> AgentNameIndex:
+        """Índice de nomes, construído da projeção agent_id -> name do repositório."""
+        current_time = time.time()
+        if (self._name_index is None or
+                current_time - self._name_index_built_at >= self._cache_timeout):
+            self._name_index = AgentNameIndex(self._storage.list_agent_names())
+            self._name_index_built_at = current_time
+        return self._name_index
 
     def get_agent_definition(self, agent_id: str) -> Optional[AgentDefinition]:
         """Carrega a definição de um agente específico."""
@@ -88,8 +103,13 @@ class AgentDiscoveryService:
         
         return agent_definition
 
-    def get_conversation_history(self, agent_id: str) -> List[dict]:
-        """Carrega o histórico de conversas de um agente."""
+    def get_conversation_history(self, agent_id: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Carrega o histórico de conversas de um agente.
+        Com ``limit``, lê só as últimas entradas (custo proporcional à janela).
+        """
+        if limit is not None:
+            return self._storage.load_history_tail(agent_id, limit)
         return self._storage.load_history(agent_id)
 
     def get_conversation_history_by_conversation_id(self, conversation_id: str) -> List[dict]:
@@ -149,48 +169,16 @@ class AgentDiscoveryService:
             return False
 
     def agent_exists(self, agent_id: str) -> bool:
-        """Verifica se um agente existe no sistema."""
+        """Verifica se um agente existe no sistema (O(1), sem carregar definições)."""
         try:
-            agents = self.discover_agents()
-            return any(agent.agent_id == agent_id for agent in agents)
+            return agent_id in self.get_name_index()
         except Exception:
             return False
 
     def get_similar_agent_names(self, agent_id: str, max_suggestions: int = 3) -> List[str]:
         """Retorna sugestões de agentes similares baseado no nome fornecido."""
         try:
-            agents = self.discover_agents()
-            agent_names = [agent.agent_id for agent in agents]
-            
-            # Simple similarity based on common substrings and case-insensitive matching
-            suggestions = []
-            agent_id_lower = agent_id.lower()
-            
-            # First, look for exact case-insensitive matches
-            for name in agent_names:
-                if name.lower() == agent_id_lower:
-                    suggestions.append(name)
-            
-            # Then, look for partial matches
-            if len(suggestions) < max_suggestions:
-                for name in agent_names:
-                    if (agent_id_lower in name.lower() or name.lower() in agent_id_lower) and name not in suggestions:
-                        suggestions.append(name)
-                        if len(suggestions) >= max_suggestions:
-                            break
-            
-            # Finally, look for similar patterns (same length, similar characters)
-            if len(suggestions) < max_suggestions:
-                for name in agent_names:
-                    if name not in suggestions and len(name) == len(agent_id):
-                        # Count matching characters in same positions
-                        matches = sum(1 for a, b in zip(agent_id_lower, name.lower()) if a == b)
-                        if matches >= len(agent_id) * 0.6:  # 60% similarity
-                            suggestions.append(name)
-                            if len(suggestions) >= max_suggestions:
-                                break
-            
-            return suggestions[:max_suggestions]
+            return self.get_name_index().suggest(agent_id, max_suggestions)
         except Exception:
             return []
 
@@ -319,7 +307,7 @@ class AgentDiscoveryService:
         """Lista todas as definições de agente (compatibilidade com AgentService legado)."""
         return self.discover_agents()
 
-    def get_full_prompt(self, agent_id: str, sample_message: str = "Mensagem de exemplo", meta: bool = False, new_agent_id: str = None, current_message: str = None, include_history: bool = True, save_to_file: bool = False, conversation_id: str = None, screenplay_id: str = None, instance_id: str = None) -> str:
+    def get_full_prompt(self, agent_id: str, sample_message: str = "Mensagem de exemplo", meta: bool = False, new_agent_id: str = None, current_message: str = None, include_history: bool = True, save_to_file: bool = False, conversation_id: str = None, screenplay_id: str = None, instance_id: str = None, profile: Optional[PromptProfile] = None) -> str:
         """
         Gera o prompt completo que será usado pelo LLM, combinando:
         - Persona do agente
@@ -337,6 +325,7 @@ class AgentDiscoveryService:
             current_message: Mensagem atual do REPL (sobrescreve sample_message se fornecida)
             save_to_file: Se True, salva o prompt em arquivo .md
             conversation_id: ID da conversa (se fornecido, busca histórico da conversa ao invés do agente)
+            profile: PromptProfile onde registrar tempos por etapa e tamanhos por seção (opcional)
 
         Returns:
             String com o prompt completo
@@ -371,7 +360,8 @@ class AgentDiscoveryService:
                 agent_home_path,
                 prompt_format,
                 instance_id=instance_id,
-                screenplay_id=screenplay_id
+                screenplay_id=screenplay_id,
+                profile=profile
             )
             prompt_engine.load_context(conversation_id=conversation_id)  # ← Pass conversation_id to load conversation context and history
 
@@ -382,7 +372,10 @@ class AgentDiscoveryService:
                 conversation_history = []  # Deixar vazio, PromptEngine usa cache interno
             elif include_history and not conversation_id:
                 # Fallback: buscar histórico legado se não tem conversation_id
-                conversation_history = self.get_conversation_history(agent_id)
+                from src.core.constants import Defaults
+                conversation_history = self.get_conversation_history(
+                    agent_id, limit=Defaults.HISTORY_TAIL_LIMIT
+                )
             else:
                 conversation_history = []
 
@@ -0,0 +1,111 @@
+# src/core/services/agent_name_index.py
+"""
+Índice de nomes de agentes.
+
+Construído a partir da projeção leve ``agent_id -> name`` do repositório
+(``IStateRepository.list_agent_names``), responde em O(1) se um agente existe
+e sugere agentes parecidos sem carregar nenhuma definição:
+
+- ``ids``: conjunto de agent_ids;
+- ``_by_key``: nome normalizado (id ou ``name``) -> agent_ids;
+- ``_postings``: trigrama -> agent_ids, usado para gerar candidatos que são
+  então ranqueados por substring, similaridade de trigramas e distância de
+  edição.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Candidatos abaixo destes limites não são sugeridos
+MIN_SIMILARITY = 0.3
+MAX_EDIT_RATIO = 1 / 3
+
+
+def normalize(name: str) -> str:
+    """Minúsculas, só alfanuméricos: 'Code-Generator' == 'code_generator'."""
+    return _NON_ALNUM.sub("", (name or "").lower())
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Distância de Levenshtein (duas linhas)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class AgentNameIndex:
+    """Índice imutável de agent_ids e nomes; reconstrua-o para invalidar."""
+
+    def __init__(self, names: Dict[str, str]):
+        self.ids: Set[str] = set(names)
+        self._by_key: Dict[str, Set[str]] = defaultdict(set)
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._keys: Dict[str, Set[str]] = {}
+
+        for agent_id, name in names.items():
+            keys = {key for key in (normalize(agent_id), normalize(name)) if key}
+            self._keys[agent_id] = keys
+            for key in keys:
+                self._by_key[key].add(agent_id)
+                for gram in trigrams(key):
+                    self._postings[gram].add(agent_id)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def suggest(self, query: str, limit: int = 3) -> List[str]:
+        """agent_ids mais parecidos com ``query``, do melhor para o pior."""
+        key = normalize(query)
+        if not key or limit <= 0:
+            return []
+
+        query_grams = trigrams(key)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for agent_id in self._postings.get(gram, ()):
+                shared[agent_id] += 1
+
+        exact = self._by_key.get(key, set())
+        ranked = []
+        for agent_id in shared:
+            best = None
+            for candidate in self._keys[agent_id]:
+                score = self._score(key, query_grams, candidate, agent_id in exact)
+                if score is not None and (best is None or score < best):
+                    best = score
+            if best is not None:
+                ranked.append((best, agent_id))
+
+        ranked.sort()
+        return [agent_id for _, agent_id in ranked[:limit]]
+
+    @staticmethod
+    def _score(key: str, query_grams: Set[str], candidate: str, is_exact: bool):
+        """Tupla ordenável (menor = melhor) ou None se não for parecido."""
+        if is_exact or candidate == key:
+            return (0, 0.0, 0)
+        candidate_grams = trigrams(candidate)
+        common = len(query_grams & candidate_grams)
+        similarity = common / len(query_grams | candidate_grams)
+        distance = edit_distance(key, candidate)
+        if key in candidate or candidate in key:
+            return (1, -similarity, distance)
+        if similarity >= MIN_SIMILARITY or distance <= max(1, int(len(key) * MAX_EDIT_RATIO)):
+            return (2, -similarity, distance)
+        return None
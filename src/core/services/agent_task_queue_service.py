@@ -22,6 +22,20 @@ from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
 
+from src.core.prompt_profile import PromptProfile
+
+from src.infrastructure.metrics import (
+    PROMPT_BYTES,
+    TASK_STAGE_SECONDS,
+    TASKS_TOTAL,
+)
+from src.infrastructure.tracing import (
+    TRACEPARENT_HEADER,
+    SpanContext,
+    parse_timestamp,
+    tracer,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,10 +50,12 @@ class AgentTaskMessage:
         "screenplay_id",
         "input",
         "priority",
+        "deadline",
         "source",
         "parent_task_id",
         "idempotency_key",
         "enqueued_at",
+        "traceparent",
     )
 
     def __init__(
@@ -51,10 +67,12 @@ class AgentTaskMessage:
         conversation_id: Optional[str] = None,
         screenplay_id: Optional[str] = None,
         priority: int = 5,
+        deadline: Optional[str] = None,
         source: str = "dispatch_api",
         parent_task_id: Optional[str] = None,
         idempotency_key: Optional[str] = None,
         enqueued_at: Optional[str] = None,
+        traceparent: Optional[str] = None,
     ):
         self.task_id = task_id or str(ObjectId())
         self.agent_id = agent_id
@@ -63,10 +81,12 @@ class AgentTaskMessage:
         self.screenplay_id = screenplay_id
         self.input = input
         self.priority = max(0, min(9, priority))
+        self.deadline = deadline  # ISO 8601; carried into the task document
         self.source = source
         self.parent_task_id = parent_task_id
         self.idempotency_key = idempotency_key or str(uuid.uuid4())
         self.enqueued_at = enqueued_at or datetime.now(timezone.utc).isoformat()
+        self.traceparent = traceparent
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -77,10 +97,12 @@ class AgentTaskMessage:
             "screenplay_id": self.screenplay_id,
             "input": self.input,
             "priority": self.priority,
+            "deadline": self.deadline,
             "source": self.source,
             "parent_task_id": self.parent_task_id,
             "idempotency_key": self.idempotency_key,
             "enqueued_at": self.enqueued_at,
+            "traceparent": self.traceparent,
         }
 
     @classmethod
@@ -93,10 +115,12 @@ class AgentTaskMessage:
             screenplay_id=data.get("screenplay_id"),
             input=data["input"],
             priority=data.get("priority", 5),
+            deadline=data.get("deadline"),
             source=data.get("source", "dispatch_api"),
             parent_task_id=data.get("parent_task_id"),
             idempotency_key=data.get("idempotency_key"),
             enqueued_at=data.get("enqueued_at"),
+            traceparent=data.get("traceparent"),
         )
 
 
@@ -206,11 +230,15 @@ class AgentTaskQueueService:
                     priority=msg.priority,
                     message_id=msg.idempotency_key,
                     timestamp=datetime.now(timezone.utc),
+                    headers=(
+                        {TRACEPARENT_HEADER: msg.traceparent} if msg.traceparent else None
+                    ),
                 ),
                 routing_key=self.ROUTING_KEY,
             )
 
             self._stats["published"] += 1
+            TASKS_TOTAL.inc(component="queue", outcome="published", agent_id=msg.agent_id)
             logger.info(
                 "Published task %s for agent %s (priority=%d, key=%s)",
                 msg.task_id,
@@ -280,6 +308,10 @@ class AgentTaskQueueService:
             body = message.body.decode("utf-8")
             data = json.loads(body)
             msg = AgentTaskMessage.from_dict(data)
+            headers = getattr(message, "headers", None) or {}
+            if headers.get(TRACEPARENT_HEADER):
+                msg.traceparent = str(headers[TRACEPARENT_HEADER])
+            self._observe_queue_wait(msg)
 
             logger.info(
                 "Consuming task %s for agent %s (key=%s)",
@@ -293,12 +325,15 @@ class AgentTaskQueueService:
 
             if result == "duplicate":
                 self._stats["deduplicated"] += 1
+                TASKS_TOTAL.inc(component="queue", outcome="deduplicated", agent_id=msg.agent_id)
                 await message.ack()
             elif result == "failed":
                 self._stats["failed"] += 1
+                TASKS_TOTAL.inc(component="queue", outcome="failed", agent_id=msg.agent_id)
                 await message.nack(requeue=False)
             elif result == "ok":
                 self._stats["consumed"] += 1
+                TASKS_TOTAL.inc(component="queue", outcome="consumed", agent_id=msg.agent_id)
                 await message.ack()
                 logger.info(
                     "Task %s submitted to MongoDB for agent %s",
@@ -312,6 +347,7 @@ class AgentTaskQueueService:
         except Exception as e:
             logger.error("Error processing task message: %s", e, exc_info=True)
             self._stats["failed"] += 1
+            TASKS_TOTAL.inc(component="queue", outcome="failed", agent_id="")
             try:
                 await message.nack(requeue=False)
             except Exception:
@@ -322,6 +358,28 @@ class AgentTaskQueueService:
 
         Returns: "ok", "duplicate", or "failed".
         """
+        parent = SpanContext.from_traceparent(msg.traceparent)
+        enqueued = parse_timestamp(msg.enqueued_at)
+        if parent and enqueued:
+            tracer.record_span(
+                "queue.wait", parent, enqueued, time.time(),
+                {"task_id": msg.task_id, "agent_id": msg.agent_id},
+            )
+
+        with tracer.span(
+            "queue.consume", parent,
+            {"task_id": msg.task_id, "agent_id": msg.agent_id, "source": msg.source},
+        ) as span:
+            result = self._consume(msg, span.context)
+            span.set_attribute("result", result)
+            if result == "failed":
+                span.status = "error"
+            return result
+
+    def _consume(self, msg: "AgentTaskMessage", trace_context: SpanContext) -> str:
+        """Dedup, build the prompt and submit the task to MongoDB."""
+        consume_started = time.monotonic()
+
         # Layer 1: Dedup check via MongoDB
         if self._is_duplicate(msg.idempotency_key):
             logger.info("Duplicate task skipped (key=%s)", msg.idempotency_key)
@@ -352,17 +410,22 @@ class AgentTaskQueueService:
         input_with_context = msg.input + delegation_footer
 
         # Build prompt fresh (with up-to-date history)
-        xml_prompt = self._build_prompt(
-            agent_id=msg.agent_id,
-            input_text=input_with_context,
-            conversation_id=msg.conversation_id,
-            screenplay_id=screenplay_id,
-        )
+        profile = PromptProfile(msg.agent_id)
+        with tracer.span("prompt.build", trace_context, {"task_id": msg.task_id}):
+            xml_prompt = self._build_prompt(
+                agent_id=msg.agent_id,
+                input_text=input_with_context,
+                conversation_id=msg.conversation_id,
+                screenplay_id=screenplay_id,
+                profile=profile,
+            )
 
         if not xml_prompt:
             logger.error("Failed to build prompt for agent %s", msg.agent_id)
             return "failed"
 
+        PROMPT_BYTES.observe(len(xml_prompt.encode("utf-8")), agent_id=msg.agent_id)
+
         # Determine provider
         provider = self._get_provider(agent_def)
 
@@ -378,21 +441,34 @@ class AgentTaskQueueService:
         task_client = MongoTaskClient()
         cwd = os.getenv("CONDUCTOR_HOST_CWD", os.path.expanduser("~"))
 
-        task_client.submit_task(
-            task_id=msg.task_id,
+        with tracer.span("mongo.insert", trace_context, {"task_id": msg.task_id}):
+            task_client.submit_task(
+                task_id=msg.task_id,
+                agent_id=msg.agent_id,
+                cwd=cwd,
+                timeout=getattr(agent_def, "timeout", 300) or 300,
+                provider=provider,
+                prompt=xml_prompt,
+                instance_id=instance_id,
+                conversation_id=msg.conversation_id,
+                screenplay_id=screenplay_id,
+                is_councilor_execution=False,
+                idempotency_key=msg.idempotency_key,
+                source=msg.source,
+                enqueued_at=msg.enqueued_at,
+                parent_task_id=msg.parent_task_id,
+                trace=trace_context.to_dict(),
+                prompt_profile=profile.compact(),
+                priority=msg.priority,
+                deadline=msg.deadline,
+            )
+
+        TASK_STAGE_SECONDS.observe(
+            time.monotonic() - consume_started,
+            stage="consume_to_insert",
             agent_id=msg.agent_id,
-            cwd=cwd,
-            timeout=getattr(agent_def, "timeout", 300) or 300,
             provider=provider,
-            prompt=xml_prompt,
-            instance_id=instance_id,
-            conversation_id=msg.conversation_id,
-            screenplay_id=screenplay_id,
-            is_councilor_execution=False,
-            idempotency_key=msg.idempotency_key,
-            source=msg.source,
         )
-
         return "ok"
 
 
@@ -575,6 +651,7 @@ class AgentTaskQueueService:
         input_text: str,
         conversation_id: str,
         screenplay_id: str,
+        profile: Optional[PromptProfile] = None,
     ) -> Optional[str]:
         """Build the full XML prompt for an agent using the discovery service."""
         try:
@@ -590,6 +667,7 @@ class AgentTaskQueueService:
                 save_to_file=False,
                 conversation_id=conversation_id,
                 screenplay_id=screenplay_id,
+                profile=profile,
             )
             return xml_prompt
         except Exception as e:
@@ -609,6 +687,19 @@ class AgentTaskQueueService:
     # Stats
     # ------------------------------------------------------------------
 
+    def _observe_queue_wait(self, msg: AgentTaskMessage):
+        """Record enqueue -> consume latency from the message timestamp."""
+        try:
+            enqueued = datetime.fromisoformat(msg.enqueued_at)
+        except (TypeError, ValueError):
+            return
+        if enqueued.tzinfo is None:
+            enqueued = enqueued.replace(tzinfo=timezone.utc)
+        wait = (datetime.now(timezone.utc) - enqueued).total_seconds()
+        TASK_STAGE_SECONDS.observe(
+            wait, stage="enqueue_to_consume", agent_id=msg.agent_id, provider=""
+        )
+
     def get_stats(self) -> Dict[str, Any]:
         """Return queue statistics."""
         return {
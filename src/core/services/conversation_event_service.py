@@ -0,0 +1,326 @@
+# src/core/services/conversation_event_service.py
+"""
+Conversation Event Hub - live updates for GET /conversations/{id}/events
+
+A single MongoDB change stream over the ``conversations`` and ``tasks``
+collections is shared by every connected client. Each change is turned
+into zero or more conversation events and fanned out to the subscribers
+of that conversation:
+
+- message_appended     a message was pushed to ``messages``
+- placeholder_updated  a bot placeholder got its content/status
+- active_agent_changed ``active_agent`` was set
+- task_status          a task linked to the conversation changed status
+
+Event ids are derived from change stream resume tokens, so a client
+reconnecting with ``Last-Event-ID`` gets the events it missed from a
+bounded replay buffer (or a ``resync`` event when they are no longer
+buffered).
+
+Change streams need a replica set. On a standalone server the hub falls
+back to events published in-process by ConversationService, which covers
+writes made through this API but not the watcher's (task_status and
+delegation messages are then only visible by re-fetching).
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_APPENDED = "message_appended"
+PLACEHOLDER_UPDATED = "placeholder_updated"
+ACTIVE_AGENT_CHANGED = "active_agent_changed"
+TASK_STATUS = "task_status"
+RESYNC = "resync"
+
+WATCHED_COLLECTIONS = ("conversations", "tasks")
+
+# Only the fields needed to route task events survive the updateLookup
+CHANGE_STREAM_PIPELINE = [
+    {"$match": {
+        "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+        "operationType": {"$in": ["insert", "update"]},
+    }},
+    {"$project": {
+        "operationType": 1,
+        "ns": 1,
+        "documentKey": 1,
+        "updateDescription": 1,
+        "fullDocument.conversation_id": 1,
+        "fullDocument.status": 1,
+        "fullDocument.agent_id": 1,
+        "fullDocument.instance_id": 1,
+    }},
+]
+
+_MESSAGE_KEY = re.compile(r"^messages\.(\d+)$")
+_MESSAGE_FIELD_KEY = re.compile(r"^messages\.(\d+)\.(\w+)$")
+
+
+def events_from_change(change: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Translate a change stream document into ``(event_type, data)`` pairs.
+
+    Every ``data`` carries the ``conversation_id`` it belongs to; changes
+    that can't be tied to a conversation produce no events.
+    """
+    collection = (change.get("ns") or {}).get("coll")
+    full_document = change.get("fullDocument") or {}
+    conversation_id = full_document.get("conversation_id")
+    if not conversation_id:
+        return []
+
+    updated = (change.get("updateDescription") or {}).get("updatedFields") or {}
+
+    if collection == "tasks":
+        if change.get("operationType") == "insert" or "status" in updated:
+            return [(TASK_STATUS, {
+                "conversation_id": conversation_id,
+                "task_id": str((change.get("documentKey") or {}).get("_id", "")),
+                "status": updated.get("status", full_document.get("status")),
+                "agent_id": full_document.get("agent_id"),
+                "instance_id": full_document.get("instance_id"),
+            })]
+        return []
+
+    if collection != "conversations" or change.get("operationType") != "update":
+        return []
+
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    appended: List[Tuple[int, Dict[str, Any]]] = []
+    placeholders: Dict[int, Dict[str, Any]] = {}
+
+    for key, value in updated.items():
+        if key == "messages" and isinstance(value, list):
+            # Whole array rewritten (first append to an empty conversation)
+            appended.extend(enumerate(value))
+            continue
+        match = _MESSAGE_KEY.match(key)
+        if match:
+            appended.append((int(match.group(1)), value))
+            continue
+        match = _MESSAGE_FIELD_KEY.match(key)
+        if match:
+            placeholders.setdefault(int(match.group(1)), {})[match.group(2)] = value
+
+    for index, message in sorted(appended, key=lambda item: item[0]):
+        events.append((MESSAGE_APPENDED, {
+            "conversation_id": conversation_id,
+            "sequence": index + 1,
+            "message": message,
+        }))
+    for index, fields in sorted(placeholders.items()):
+        events.append((PLACEHOLDER_UPDATED, {
+            "conversation_id": conversation_id,
+            "sequence": index + 1,
+            "fields": fields,
+        }))
+    if "active_agent" in updated:
+        events.append((ACTIVE_AGENT_CHANGED, {
+            "conversation_id": conversation_id,
+            "active_agent": updated["active_agent"],
+        }))
+    return events
+
+
+class Subscription:
+    """A client's bounded event queue for one conversation."""
+
+    MAX_QUEUE_SIZE = 256
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        # Set when events were dropped; the stream tells the client to resync
+        self.overflowed = False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ConversationEventHub:
+    """
+    Shared change-stream consumer and per-conversation pub/sub.
+
+    The change stream is consumed on a daemon thread (pymongo is blocking)
+    and events are dispatched on the API event loop.
+    """
+
+    REPLAY_BUFFER_SIZE = 1000
+    RETRY_INTERVAL = 5  # seconds
+
+    def __init__(self):
+        self._running = False
+        self._streaming = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self._resume_token: Optional[Dict[str, Any]] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=self.REPLAY_BUFFER_SIZE)
+        self._local_ids = itertools.count(1)
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+
+    @property
+    def streaming(self) -> bool:
+        """True while the change stream is the event source."""
+        return self._streaming
+
+    async def start(self):
+        """Start consuming the change stream."""
+        if self._running:
+            return
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(
+            target=self._change_stream_loop, name="conversation-events", daemon=True
+        )
+        self._thread.start()
+        logger.info("Conversation Event Hub started")
+
+    async def stop(self):
+        """Stop consuming the change stream."""
+        self._running = False
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        self._streaming = False
+        logger.info("Conversation Event Hub stopped")
+
+    def subscribe(self, conversation_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber, pre-loaded with the events after ``last_event_id``.
+
+        Must be called on the event loop. When ``last_event_id`` is no longer
+        buffered the first event is a ``resync``.
+        """
+        subscription = Subscription(conversation_id)
+        if last_event_id:
+            missed = self._events_after(last_event_id)
+            if missed is None:
+                subscription.offer(self._event(RESYNC, {"conversation_id": conversation_id}, None))
+            else:
+                for event in missed:
+                    if event["data"]["conversation_id"] == conversation_id:
+                        subscription.offer(event)
+        self._subscribers.setdefault(conversation_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.conversation_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.conversation_id]
+
+    def publish_local(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Publish an event for a write made in this process.
+
+        Thread-safe (sync routes run in the threadpool). Ignored while the
+        change stream is active, since it will report the same write.
+        """
+        if self._streaming or self._loop is None:
+            return
+        event = self._event(event_type, data, f"local-{next(self._local_ids)}")
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _event(event_type: str, data: Dict[str, Any], event_id: Optional[str]) -> Dict[str, Any]:
+        return {"id": event_id, "type": event_type, "data": data}
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        """Buffer an event and hand it to its conversation's subscribers."""
+        self._buffer.append(event)
+        for subscription in list(self._subscribers.get(event["data"]["conversation_id"], ())):
+            subscription.offer(event)
+
+    def _events_after(self, event_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Buffered events after ``event_id``, or None if it's not buffered."""
+        events = list(self._buffer)
+        for position, event in enumerate(events):
+            if event["id"] == event_id:
+                return events[position + 1:]
+        return None
+
+    # ------------------------------------------------------------------
+    # Change stream
+    # ------------------------------------------------------------------
+
+    def _get_database(self):
+        from pymongo import MongoClient
+        mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+        db_name = os.getenv("MONGO_DATABASE", "conductor_state")
+        return MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)[db_name]
+
+    def _change_stream_loop(self):
+        """Consume the change stream, resuming after errors."""
+        from pymongo.errors import OperationFailure, PyMongoError
+
+        db = None
+        while self._running:
+            try:
+                if db is None:
+                    db = self._get_database()
+                with db.watch(
+                    CHANGE_STREAM_PIPELINE,
+                    full_document="updateLookup",
+                    resume_after=self._resume_token,
+                ) as stream:
+                    self._stream = stream
+                    self._streaming = True
+                    logger.info("Conversation change stream opened")
+                    for change in stream:
+                        self._resume_token = change["_id"]
+                        token = change["_id"].get("_data")
+                        for position, (event_type, data) in enumerate(events_from_change(change)):
+                            self._loop.call_soon_threadsafe(
+                                self._dispatch, self._event(event_type, data, f"{token}.{position}")
+                            )
+                        if not self._running:
+                            break
+            except OperationFailure as e:
+                # Standalone server (no change streams) or resume token too old
+                if self._resume_token is not None:
+                    logger.warning(f"Conversation change stream could not resume, restarting: {e}")
+                    self._resume_token = None
+                else:
+                    logger.warning(f"Change streams unavailable, using in-process events: {e}")
+                    return
+            except (PyMongoError, RuntimeError) as e:
+                if self._running:
+                    logger.warning(f"Conversation change stream interrupted: {e}")
+            finally:
+                self._stream = None
+                self._streaming = False
+            if self._running:
+                threading.Event().wait(self.RETRY_INTERVAL)
+
+
+# Singleton instance
+conversation_events = ConversationEventHub()
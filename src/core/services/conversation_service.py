@@ -10,20 +10,233 @@ Este serviço implementa o novo modelo de conversações onde:
 Ref: PLANO_REFATORACAO_CONVERSATION_ID.md
 Data: 2025-11-01
 """
+import base64
+import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import DuplicateKeyError
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import ConnectionFailure, DuplicateKeyError
 import os
+import threading
 import uuid
 from dotenv import load_dotenv
 
+from src.core.services.conversation_event_service import (
+    ACTIVE_AGENT_CHANGED,
+    MESSAGE_APPENDED,
+    conversation_events,
+)
+from src.infrastructure.conversation_writes import (
+    append_messages_async,
+    message_preview,
+)
+
 logger = logging.getLogger(__name__)
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
+# Campos devolvidos na listagem (nunca os arrays messages/participants)
+SUMMARY_PROJECTION = {
+    "_id": 0,
+    "conversation_id": 1,
+    "title": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "message_count": 1,
+    "participant_count": 1,
+    "last_message_preview": 1,
+    "screenplay_id": 1,
+    "display_order": 1,
+}
+
+# Ordem estável da listagem: (updated_at, conversation_id) desc
+LIST_SORT = [("updated_at", -1), ("conversation_id", -1)]
+
+
+def encode_cursor(conversation: Dict[str, Any]) -> str:
+    """Cursor opaco apontando para depois da conversa informada."""
+    raw = json.dumps([conversation.get("updated_at"), conversation.get("conversation_id")])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverso de encode_cursor; ValueError se o cursor for inválido."""
+    try:
+        updated_at, conversation_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Cursor de paginação inválido")
+    if not isinstance(updated_at, str) or not isinstance(conversation_id, str):
+        raise ValueError("Cursor de paginação inválido")
+    return updated_at, conversation_id
+
+
+def list_filter(screenplay_id: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Filtro da listagem (roteiro + keyset); ValueError se o cursor for inválido."""
+    query_filter: Dict[str, Any] = {}
+    if screenplay_id:
+        query_filter["screenplay_id"] = screenplay_id
+    if cursor:
+        updated_at, conversation_id = decode_cursor(cursor)
+        query_filter["$or"] = [
+            {"updated_at": {"$lt": updated_at}},
+            {"updated_at": updated_at, "conversation_id": {"$lt": conversation_id}},
+        ]
+    return query_filter
+
+
+def summary_counters_pipeline(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Contadores/preview calculados no servidor ($size), sem trafegar os arrays."""
+    return [
+        {"$match": match},
+        {"$project": {
+            "_id": 0,
+            "conversation_id": 1,
+            "message_count": {"$size": {"$ifNull": ["$messages", []]}},
+            "participant_count": {"$size": {"$ifNull": ["$participants", []]}},
+            "last_message": {"$arrayElemAt": [{"$ifNull": ["$messages", []]}, -1]},
+        }},
+    ]
+
+
+def _summary_counter(doc: Dict[str, Any]) -> Dict[str, Any]:
+    last_message = doc.pop("last_message", None)
+    doc["last_message_preview"] = message_preview(last_message) if last_message else None
+    return doc
+
+
+def _counter_backfill(doc: Dict[str, Any]) -> tuple:
+    """(filtro, update) que grava os contadores só se ainda não existirem."""
+    return (
+        {"conversation_id": doc["conversation_id"], "message_count": {"$exists": False}},
+        {"$set": {
+            "message_count": doc["message_count"],
+            "participant_count": doc["participant_count"],
+            "last_message_preview": doc["last_message_preview"],
+        }},
+    )
+
+
+def _merge_counters(conversations: List[Dict[str, Any]], counters: List[Dict[str, Any]]):
+    by_id = {doc["conversation_id"]: doc for doc in counters}
+    for conversation in conversations:
+        conversation.update(by_id.get(conversation["conversation_id"], {}))
+
+
+def conversation_title(title: Optional[str]) -> str:
+    """Título informado ou padrão; ValueError fora de 3-100 caracteres."""
+    # Gerar título padrão se não fornecido
+    if not title:
+        title = f"Conversa {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}"
+
+    # Validar título (3-100 caracteres)
+    if len(title) < 3 or len(title) > 100:
+        raise ValueError("O título deve ter entre 3 e 100 caracteres")
+    return title
+
+
+def new_conversation_document(
+    title: str,
+    active_agent: Optional[Dict[str, Any]],
+    screenplay_id: Optional[str],
+    context: Optional[str],
+    allowed_agents: Optional[List[str]],
+    max_chain_depth: Optional[int],
+    auto_delegate: bool,
+    display_order: int,
+) -> Dict[str, Any]:
+    """Documento de uma nova conversa (título já validado por conversation_title)."""
+    timestamp = datetime.utcnow().isoformat()
+    return {
+        "conversation_id": str(uuid.uuid4()),
+        "title": title,
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "active_agent": active_agent,
+        "participants": [active_agent] if active_agent else [],
+        "messages": [],
+        "message_count": 0,
+        "participant_count": 1 if active_agent else 0,
+        "last_message_preview": None,
+        "screenplay_id": screenplay_id,
+        "context": context,  # Campo de contexto em markdown (pode ser null)
+        "allowed_agents": allowed_agents,  # Squad da conversa (None = sem restricao)
+        "display_order": display_order,  # Ordem de exibicao inicial
+        "max_chain_depth": max_chain_depth,  # Per-conversation chain limit (None = use global)
+        "auto_delegate": auto_delegate,  # Allow agents to auto-chain without human interaction
+    }
+
+
+def _next_display_order(max_order_conversation: Optional[Dict[str, Any]]) -> int:
+    """Próximo display_order a partir da conversa com o maior valor (ou 0)."""
+    if max_order_conversation and "display_order" in max_order_conversation:
+        return max_order_conversation["display_order"] + 1
+    return 0
+
+
+def build_messages(
+    user_input: Optional[str],
+    agent_response: Optional[str],
+    agent_info: Optional[Dict[str, Any]],
+    timestamp: str,
+) -> tuple:
+    """(mensagens, participante) de um add_message; participante só com resposta de agente."""
+    messages = []
+
+    # Adicionar mensagem do usuário
+    if user_input:
+        messages.append({
+            "id": str(uuid.uuid4()),
+            "type": "user",
+            "content": user_input,
+            "timestamp": timestamp
+        })
+
+    # Adicionar resposta do agente
+    participant = None
+    if agent_response and agent_info:
+        messages.append({
+            "id": str(uuid.uuid4()),
+            "type": "bot",
+            "content": agent_response,
+            "timestamp": timestamp,
+            "agent": {
+                "agent_id": agent_info.get("agent_id"),
+                "instance_id": agent_info.get("instance_id"),
+                "name": agent_info.get("name"),
+                "emoji": agent_info.get("emoji")
+            }
+        })
+        # Agente entra nos participantes (se ainda não estiver) no mesmo update
+        participant = agent_info
+
+    return messages, participant
+
+
+def _publish_appended(conversation_id: str, sequence: int, messages: List[Dict[str, Any]]):
+    first_sequence = sequence - len(messages) + 1
+    for offset, message in enumerate(messages):
+        conversation_events.publish_local(MESSAGE_APPENDED, {
+            "conversation_id": conversation_id,
+            "sequence": first_sequence + offset,
+            "message": message,
+        })
+
+
+def settings_update(max_chain_depth: Optional[int], auto_delegate: Optional[bool]) -> Dict[str, Any]:
+    """$set de update_conversation_settings (só updated_at = nada a mudar)."""
+    updates: Dict[str, Any] = {"updated_at": datetime.utcnow().isoformat()}
+
+    if max_chain_depth is not None:
+        # 0 means "reset to global default" → store as None
+        updates["max_chain_depth"] = max_chain_depth if max_chain_depth > 0 else None
+
+    if auto_delegate is not None:
+        updates["auto_delegate"] = auto_delegate
+
+    return updates
+
 
 class ConversationService:
     """
@@ -31,8 +244,16 @@ class ConversationService:
 
     Uma conversa pode ter múltiplos agentes participantes e mantém
     um histórico unificado de todas as interações.
+
+    Versão síncrona: índices, backfill de contadores, leitura de mensagens
+    (agent discovery) e o modelo legado do CLI. As rotas usam
+    AsyncConversationService.
     """
 
+    # Bancos já preparados neste processo (índices + backfill de contadores)
+    _prepared_databases = set()
+    _prepare_lock = threading.Lock()
+
     def __init__(self):
         """Inicializa conexão com MongoDB."""
         mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017')
@@ -48,23 +269,66 @@ class ConversationService:
         self.legacy_conversations = self.db['agent_conversations']
 
         logger.info(f"ConversationService initialized with db: {db_name}")
-        self._ensure_indexes()
+        self._ensure_indexes_once((mongo_uri, db_name))
 
-    def _ensure_indexes(self):
-        """Cria índices para otimização de queries."""
+    def _ensure_indexes_once(self, database_key: tuple):
+        """
+        Prepara o banco uma vez por processo.
+
+        O CLI instancia o serviço a cada requisição; sem isso cada instância
+        repetiria os create_index e a varredura do backfill de contadores.
+        """
+        with self._prepare_lock:
+            if database_key in self._prepared_databases:
+                return
+            if self._ensure_indexes():
+                self._prepared_databases.add(database_key)
+
+    def _ensure_indexes(self) -> bool:
+        """Cria índices para otimização de queries. Retorna False se o MongoDB estiver indisponível."""
         indexes = [
             ("conversation_id", {"unique": True}),
             ("participants.agent_id", {}),
             ("updated_at", {}),
             ("screenplay_id", {}),
+            # Keyset pagination da listagem (global e por roteiro)
+            (LIST_SORT, {"name": "updated_at_conversation_id"}),
+            ([("screenplay_id", 1)] + LIST_SORT, {"name": "screenplay_updated_at_conversation_id"}),
         ]
-        for key, kwargs in indexes:
-            self._safe_create_index(self.conversations, key, **kwargs)
+        try:
+            for key, kwargs in indexes:
+                self._safe_create_index(self.conversations, key, **kwargs)
+        except ConnectionFailure as e:
+            # Sem servidor não adianta tentar os demais índices (cada um esperaria o timeout)
+            logger.warning(f"⚠️ MongoDB indisponível, índices de conversas não criados: {e}")
+            return False
+        self._backfill_summary_counters()
+        return True
+
+    def _summary_counters(self, match: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Calcula contadores/preview no servidor ($size), sem trafegar os arrays."""
+        return [_summary_counter(doc) for doc in self.conversations.aggregate(summary_counters_pipeline(match))]
+
+    def _persist_summary_counters(self, counters: List[Dict[str, Any]]):
+        for doc in counters:
+            self.conversations.update_one(*_counter_backfill(doc))
+
+    def _backfill_summary_counters(self):
+        """Preenche contadores em conversas criadas antes de existirem (uma vez)."""
+        try:
+            counters = self._summary_counters({"message_count": {"$exists": False}})
+            if counters:
+                self._persist_summary_counters(counters)
+                logger.info(f"🔢 Contadores preenchidos em {len(counters)} conversas legadas")
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao preencher contadores de conversas: {e}")
 
     def _safe_create_index(self, collection, key, **kwargs):
         """Create index silently, ignoring if it already exists."""
         try:
             collection.create_index(key, **kwargs)
+        except ConnectionFailure:
+            raise
         except Exception as e:
             # Ignore IndexKeySpecsConflict (code 86) - index already exists
             if hasattr(e, 'code') and e.code == 86:
@@ -76,87 +340,6 @@ class ConversationService:
     # NOVO MODELO: Conversas Globais
     # ==========================================
 
-    def create_conversation(
-        self,
-        title: Optional[str] = None,
-        active_agent: Optional[Dict[str, Any]] = None,
-        screenplay_id: Optional[str] = None,
-        context: Optional[str] = None,
-        allowed_agents: Optional[List[str]] = None,
-        max_chain_depth: Optional[int] = 10,
-        auto_delegate: bool = True,
-    ) -> str:
-        """
-        Cria uma nova conversa.
-
-        Args:
-            title: Titulo da conversa (opcional, sera gerado se nao fornecido)
-            active_agent: Metadados do agente inicial {agent_id, instance_id, name, emoji}
-            screenplay_id: ID do roteiro ao qual esta conversa pertence (opcional)
-            context: Contexto da conversa em markdown (bug, feature, etc.) (opcional)
-            allowed_agents: Lista de agent_ids permitidos (squad da conversa). None = sem restricao.
-
-        Returns:
-            str: conversation_id (UUID)
-        """
-        conversation_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat()
-
-        # Gerar título padrão se não fornecido
-        if not title:
-            title = f"Conversa {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}"
-
-        # Validar título (3-100 caracteres)
-        if len(title) < 3 or len(title) > 100:
-            raise ValueError("O título deve ter entre 3 e 100 caracteres")
-
-        # 🔥 NOVO: Calcular display_order automaticamente
-        # Buscar o maior display_order das conversas existentes para o mesmo screenplay_id
-        query_filter = {}
-        if screenplay_id:
-            query_filter["screenplay_id"] = screenplay_id
-
-        # Buscar conversa com maior display_order
-        max_order_conversation = self.conversations.find_one(
-            query_filter,
-            {"display_order": 1},
-            sort=[("display_order", -1)]
-        )
-
-        # Se existe conversa com display_order, incrementa; senão, inicia em 0
-        display_order = 0
-        if max_order_conversation and "display_order" in max_order_conversation:
-            display_order = max_order_conversation["display_order"] + 1
-
-        logger.info(f"🔢 [CREATE] Calculando display_order para nova conversa: {display_order}")
-
-        conversation_doc = {
-            "conversation_id": conversation_id,
-            "title": title,
-            "created_at": timestamp,
-            "updated_at": timestamp,
-            "active_agent": active_agent,
-            "participants": [active_agent] if active_agent else [],
-            "messages": [],
-            "screenplay_id": screenplay_id,
-            "context": context,  # Campo de contexto em markdown (pode ser null)
-            "allowed_agents": allowed_agents,  # Squad da conversa (None = sem restricao)
-            "display_order": display_order,  # Ordem de exibicao inicial
-            "max_chain_depth": max_chain_depth,  # Per-conversation chain limit (None = use global)
-            "auto_delegate": auto_delegate,  # Allow agents to auto-chain without human interaction
-        }
-
-        try:
-            self.conversations.insert_one(conversation_doc)
-            logger.info(f"✅ Conversa criada: {conversation_id} - '{title}'")
-            return conversation_id
-        except DuplicateKeyError:
-            logger.error(f"❌ Conversation ID já existe: {conversation_id}")
-            raise
-        except Exception as e:
-            logger.error(f"❌ Erro ao criar conversa: {e}", exc_info=True)
-            raise
-
     def get_conversation_by_id(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """
         Obtém uma conversa pelo ID.
@@ -183,151 +366,6 @@ class ConversationService:
             logger.error(f"❌ Erro ao buscar conversa: {e}", exc_info=True)
             return None
 
-    def add_message(
-        self,
-        conversation_id: str,
-        user_input: Optional[str] = None,
-        agent_response: Optional[str] = None,
-        agent_info: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """
-        Adiciona uma ou mais mensagens à conversa.
-
-        Args:
-            conversation_id: ID da conversa
-            user_input: Mensagem do usuário (opcional)
-            agent_response: Resposta do agente (opcional)
-            agent_info: Metadados do agente {agent_id, instance_id, name, emoji}
-
-        Returns:
-            bool: True se adicionado com sucesso
-        """
-        try:
-            timestamp = datetime.utcnow().isoformat()
-            new_messages = []
-
-            # Adicionar mensagem do usuário
-            if user_input:
-                new_messages.append({
-                    "id": str(uuid.uuid4()),
-                    "type": "user",
-                    "content": user_input,
-                    "timestamp": timestamp
-                })
-
-            # Adicionar resposta do agente
-            if agent_response and agent_info:
-                new_messages.append({
-                    "id": str(uuid.uuid4()),
-                    "type": "bot",
-                    "content": agent_response,
-                    "timestamp": timestamp,
-                    "agent": {
-                        "agent_id": agent_info.get("agent_id"),
-                        "instance_id": agent_info.get("instance_id"),
-                        "name": agent_info.get("name"),
-                        "emoji": agent_info.get("emoji")
-                    }
-                })
-
-                # Adicionar agente aos participantes se ainda não estiver
-                self._add_participant(conversation_id, agent_info)
-
-            if not new_messages:
-                logger.warning(f"⚠️ Nenhuma mensagem para adicionar")
-                return False
-
-            # Atualizar conversa
-            result = self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$push": {"messages": {"$each": new_messages}},
-                    "$set": {"updated_at": timestamp}
-                }
-            )
-
-            if result.matched_count == 0:
-                logger.error(f"❌ Conversa não encontrada: {conversation_id}")
-                return False
-
-            logger.info(f"✅ Adicionadas {len(new_messages)} mensagens à conversa {conversation_id}")
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao adicionar mensagem: {e}", exc_info=True)
-            return False
-
-    def set_active_agent(
-        self,
-        conversation_id: str,
-        agent_info: Dict[str, Any]
-    ) -> bool:
-        """
-        Define o agente ativo para a próxima resposta.
-
-        Args:
-            conversation_id: ID da conversa
-            agent_info: Metadados do agente {agent_id, instance_id, name, emoji}
-
-        Returns:
-            bool: True se atualizado com sucesso
-        """
-        try:
-            timestamp = datetime.utcnow().isoformat()
-
-            result = self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$set": {
-                        "active_agent": agent_info,
-                        "updated_at": timestamp
-                    }
-                }
-            )
-
-            if result.matched_count == 0:
-                logger.error(f"❌ Conversa não encontrada: {conversation_id}")
-                return False
-
-            logger.info(f"✅ Agente ativo atualizado: {agent_info.get('name')} ({agent_info.get('agent_id')})")
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao atualizar agente ativo: {e}", exc_info=True)
-            return False
-
-    def _add_participant(self, conversation_id: str, agent_info: Dict[str, Any]):
-        """
-        Adiciona um agente à lista de participantes se ainda não estiver presente.
-
-        Args:
-            conversation_id: ID da conversa
-            agent_info: Metadados do agente
-        """
-        try:
-            # Verificar se agente já está nos participantes
-            conversation = self.conversations.find_one(
-                {
-                    "conversation_id": conversation_id,
-                    "participants.agent_id": agent_info.get("agent_id")
-                }
-            )
-
-            if conversation:
-                # Agente já é participante
-                return
-
-            # Adicionar agente aos participantes
-            self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {"$push": {"participants": agent_info}}
-            )
-
-            logger.info(f"✅ Participante adicionado: {agent_info.get('name')}")
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao adicionar participante: {e}", exc_info=True)
-
     def get_conversation_messages(
         self,
         conversation_id: str,
@@ -360,234 +398,6 @@ class ConversationService:
             logger.error(f"❌ Erro ao obter mensagens: {e}", exc_info=True)
             return []
 
-    def list_conversations(
-        self,
-        limit: int = 20,
-        skip: int = 0,
-        screenplay_id: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Lista conversas recentes.
-
-        Args:
-            limit: Número máximo de conversas a retornar
-            skip: Número de conversas a pular (paginação)
-            screenplay_id: Filtrar conversas por roteiro (opcional)
-
-        Returns:
-            Lista de conversas
-        """
-        try:
-            # Construir filtro
-            query_filter = {}
-            if screenplay_id:
-                query_filter["screenplay_id"] = screenplay_id
-
-            conversations = list(
-                self.conversations
-                .find(query_filter, {"_id": 0})
-                .sort("updated_at", -1)
-                .skip(skip)
-                .limit(limit)
-            )
-
-            logger.info(f"📋 Listadas {len(conversations)} conversas" + (f" para screenplay {screenplay_id}" if screenplay_id else ""))
-            return conversations
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao listar conversas: {e}", exc_info=True)
-            return []
-
-    def delete_conversation(self, conversation_id: str) -> bool:
-        """
-        Deleta uma conversa.
-
-        Args:
-            conversation_id: ID da conversa
-
-        Returns:
-            bool: True se deletada com sucesso
-        """
-        try:
-            result = self.conversations.delete_one({"conversation_id": conversation_id})
-
-            if result.deleted_count > 0:
-                logger.info(f"🗑️ Conversa deletada: {conversation_id}")
-                return True
-            else:
-                logger.warning(f"⚠️ Conversa não encontrada para deletar: {conversation_id}")
-                return False
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao deletar conversa: {e}", exc_info=True)
-            return False
-
-    def update_conversation_title(self, conversation_id: str, new_title: str) -> bool:
-        """
-        Atualiza o título de uma conversa.
-
-        Args:
-            conversation_id: ID da conversa
-            new_title: Novo título (deve ter entre 3 e 100 caracteres)
-
-        Returns:
-            bool: True se atualizado com sucesso
-        """
-        try:
-            # Validar título
-            if len(new_title) < 3 or len(new_title) > 100:
-                raise ValueError("O título deve ter entre 3 e 100 caracteres")
-
-            timestamp = datetime.utcnow().isoformat()
-
-            result = self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$set": {
-                        "title": new_title,
-                        "updated_at": timestamp
-                    }
-                }
-            )
-
-            if result.matched_count == 0:
-                logger.error(f"❌ Conversa não encontrada: {conversation_id}")
-                return False
-
-            logger.info(f"✅ Título atualizado para conversa {conversation_id}: '{new_title}'")
-            return True
-
-        except ValueError as e:
-            logger.error(f"❌ Erro de validação: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"❌ Erro ao atualizar título: {e}", exc_info=True)
-            return False
-
-    def update_conversation_context(self, conversation_id: str, context: Optional[str]) -> bool:
-        """
-        Atualiza o contexto de uma conversa.
-
-        Args:
-            conversation_id: ID da conversa
-            context: Novo contexto em markdown (pode ser None para limpar)
-
-        Returns:
-            bool: True se atualizado com sucesso
-        """
-        try:
-            timestamp = datetime.utcnow().isoformat()
-
-            result = self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$set": {
-                        "context": context,
-                        "updated_at": timestamp
-                    }
-                }
-            )
-
-            if result.matched_count == 0:
-                logger.error(f"❌ Conversa não encontrada: {conversation_id}")
-                return False
-
-            logger.info(f"✅ Contexto atualizado para conversa {conversation_id}")
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao atualizar contexto: {e}", exc_info=True)
-            return False
-
-    def update_conversation_settings(
-        self,
-        conversation_id: str,
-        max_chain_depth: Optional[int] = None,
-        auto_delegate: Optional[bool] = None,
-    ) -> bool:
-        """
-        Update conversation chain settings (max_chain_depth, auto_delegate).
-
-        Args:
-            conversation_id: ID da conversa
-            max_chain_depth: Per-conversation chain limit (None = unchanged, 0 = reset to global)
-            auto_delegate: Allow agents to auto-chain (None = unchanged)
-
-        Returns:
-            bool: True if updated successfully
-        """
-        try:
-            timestamp = datetime.utcnow().isoformat()
-            updates: Dict[str, Any] = {"updated_at": timestamp}
-
-            if max_chain_depth is not None:
-                # 0 means "reset to global default" → store as None
-                updates["max_chain_depth"] = max_chain_depth if max_chain_depth > 0 else None
-
-            if auto_delegate is not None:
-                updates["auto_delegate"] = auto_delegate
-
-            if len(updates) == 1:
-                # Only updated_at, nothing to change
-                return True
-
-            result = self.conversations.update_one(
-                {"conversation_id": conversation_id},
-                {"$set": updates}
-            )
-
-            if result.matched_count == 0:
-                logger.error(f"Conversa nao encontrada: {conversation_id}")
-                return False
-
-            logger.info(f"Settings updated for conversation {conversation_id}: {updates}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Erro ao atualizar settings: {e}", exc_info=True)
-            return False
-
-    def update_conversation_order(self, order_updates: List[Dict[str, Any]]) -> int:
-        """
-        🔥 NOVO: Atualiza a ordem de exibição das conversas.
-
-        Args:
-            order_updates: Lista de dicionários com {conversation_id: str, display_order: int}
-
-        Returns:
-            int: Número de conversas atualizadas
-        """
-        try:
-            updated_count = 0
-
-            for update in order_updates:
-                conversation_id = update.get("conversation_id")
-                display_order = update.get("display_order")
-
-                if not conversation_id or display_order is None:
-                    logger.warning(f"⚠️ Update inválido ignorado: {update}")
-                    continue
-
-                result = self.conversations.update_one(
-                    {"conversation_id": conversation_id},
-                    {
-                        "$set": {
-                            "display_order": display_order,
-                            "updated_at": datetime.utcnow().isoformat()
-                        }
-                    }
-                )
-
-                if result.matched_count > 0:
-                    updated_count += 1
-
-            logger.info(f"✅ Ordem atualizada para {updated_count}/{len(order_updates)} conversas")
-            return updated_count
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao atualizar ordem das conversas: {e}", exc_info=True)
-            raise
-
     # ==========================================
     # LEGACY: Compatibilidade com modelo antigo
     # ==========================================
@@ -715,3 +525,240 @@ class ConversationService:
         except Exception as e:
             logger.error(f"Error appending to legacy conversation: {e}")
             return False
+
+
+class AsyncConversationService:
+    """
+    Versão assíncrona das operações de conversa usadas pelas rotas.
+
+    Usa a API async do PyMongo (src.infrastructure.async_mongo), então as
+    rotas aguardam o MongoDB sem ocupar uma thread do threadpool. Índices,
+    backfill de contadores e os métodos legados continuam no
+    ConversationService síncrono.
+    """
+
+    def __init__(self, database=None):
+        # database: AsyncDatabase fixo (testes); por padrão, o do event loop corrente
+        self._database = database
+
+    @property
+    def conversations(self):
+        if self._database is not None:
+            return self._database["conversations"]
+        from src.infrastructure.async_mongo import async_mongo
+        return async_mongo.collection("conversations")
+
+    async def create_conversation(
+        self,
+        title: Optional[str] = None,
+        active_agent: Optional[Dict[str, Any]] = None,
+        screenplay_id: Optional[str] = None,
+        context: Optional[str] = None,
+        allowed_agents: Optional[List[str]] = None,
+        max_chain_depth: Optional[int] = 10,
+        auto_delegate: bool = True,
+    ) -> Dict[str, Any]:
+        """Cria uma conversa e devolve o documento criado (sem _id)."""
+        title = conversation_title(title)
+
+        max_order_conversation = await self.conversations.find_one(
+            {"screenplay_id": screenplay_id} if screenplay_id else {},
+            {"display_order": 1},
+            sort=[("display_order", -1)]
+        )
+        conversation_doc = new_conversation_document(
+            title, active_agent, screenplay_id, context, allowed_agents,
+            max_chain_depth, auto_delegate, _next_display_order(max_order_conversation),
+        )
+        await self.conversations.insert_one(conversation_doc)
+        conversation_doc.pop("_id", None)
+        logger.info(f"✅ Conversa criada: {conversation_doc['conversation_id']} - '{title}'")
+        return conversation_doc
+
+    async def get_conversation_by_id(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Obtém uma conversa pelo ID (None se não encontrada)."""
+        return await self.conversations.find_one({"conversation_id": conversation_id}, {"_id": 0})
+
+    async def conversation_exists(self, conversation_id: str) -> bool:
+        """Verifica se a conversa existe sem carregar o documento."""
+        return await self.conversations.find_one({"conversation_id": conversation_id}, {"_id": 1}) is not None
+
+    async def add_message(
+        self,
+        conversation_id: str,
+        user_input: Optional[str] = None,
+        agent_response: Optional[str] = None,
+        agent_info: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """
+        Adiciona uma ou mais mensagens à conversa.
+
+        Mensagens, participante e contadores são gravados em um único update
+        (ver src.infrastructure.conversation_writes).
+
+        Returns:
+            Número de sequência da última mensagem adicionada (message_count),
+            ou None se nada foi adicionado
+        """
+        timestamp = datetime.utcnow().isoformat()
+        messages, participant = build_messages(user_input, agent_response, agent_info, timestamp)
+        if not messages:
+            logger.warning(f"⚠️ Nenhuma mensagem para adicionar")
+            return None
+
+        sequence = await append_messages_async(
+            self.conversations, conversation_id, messages, timestamp, participant
+        )
+        if sequence is None:
+            logger.error(f"❌ Conversa não encontrada: {conversation_id}")
+            return None
+
+        logger.info(f"✅ Adicionadas {len(messages)} mensagens à conversa {conversation_id} (seq={sequence})")
+        _publish_appended(conversation_id, sequence, messages)
+        return sequence
+
+    async def set_active_agent(self, conversation_id: str, agent_info: Dict[str, Any]) -> bool:
+        """Define o agente ativo; False se a conversa não existe."""
+        result = await self.conversations.update_one(
+            {"conversation_id": conversation_id},
+            {"$set": {"active_agent": agent_info, "updated_at": datetime.utcnow().isoformat()}}
+        )
+        if result.matched_count == 0:
+            logger.error(f"❌ Conversa não encontrada: {conversation_id}")
+            return False
+
+        logger.info(f"✅ Agente ativo atualizado: {agent_info.get('name')} ({agent_info.get('agent_id')})")
+        conversation_events.publish_local(ACTIVE_AGENT_CHANGED, {
+            "conversation_id": conversation_id,
+            "active_agent": agent_info,
+        })
+        return True
+
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Mensagens da conversa; com limit, só as mais recentes saem do banco ($slice)."""
+        projection: Dict[str, Any] = {"_id": 0, "messages": 1}
+        if limit and limit > 0:
+            projection["messages"] = {"$slice": -limit}
+        conversation = await self.conversations.find_one({"conversation_id": conversation_id}, projection)
+        return conversation.get("messages", []) if conversation else []
+
+    async def list_conversations(
+        self,
+        limit: int = 20,
+        skip: int = 0,
+        screenplay_id: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista sumários das conversas mais recentes.
+
+        Apenas os campos de SUMMARY_PROJECTION são lidos. A ordem é
+        (updated_at, conversation_id) decrescente, e `cursor` (ver
+        encode_cursor) continua a partir da última conversa da página
+        anterior sem custo de skip; `skip` é a paginação por offset legada.
+
+        Raises:
+            ValueError: Se o cursor for inválido
+        """
+        query = self.conversations.find(list_filter(screenplay_id, cursor), SUMMARY_PROJECTION).sort(LIST_SORT)
+        if skip and not cursor:
+            query = query.skip(skip)
+        conversations = await query.limit(limit).to_list(length=None)
+
+        # Conversas sem contadores (escritas por fora do serviço): calcula no servidor
+        legacy_ids = [c["conversation_id"] for c in conversations if "message_count" not in c]
+        if legacy_ids:
+            counters_cursor = await self.conversations.aggregate(
+                summary_counters_pipeline({"conversation_id": {"$in": legacy_ids}})
+            )
+            counters = [_summary_counter(doc) for doc in await counters_cursor.to_list(length=None)]
+            _merge_counters(conversations, counters)
+            for doc in counters:
+                await self.conversations.update_one(*_counter_backfill(doc))
+
+        logger.info(f"📋 Listadas {len(conversations)} conversas" + (f" para screenplay {screenplay_id}" if screenplay_id else ""))
+        return conversations
+
+    async def delete_conversation(self, conversation_id: str) -> bool:
+        """Deleta uma conversa; False se não encontrada."""
+        result = await self.conversations.delete_one({"conversation_id": conversation_id})
+        if result.deleted_count > 0:
+            logger.info(f"🗑️ Conversa deletada: {conversation_id}")
+            return True
+        logger.warning(f"⚠️ Conversa não encontrada para deletar: {conversation_id}")
+        return False
+
+    async def _update(self, conversation_id: str, fields: Dict[str, Any]) -> bool:
+        result = await self.conversations.update_one({"conversation_id": conversation_id}, {"$set": fields})
+        if result.matched_count == 0:
+            logger.error(f"❌ Conversa não encontrada: {conversation_id}")
+            return False
+        return True
+
+    async def update_conversation_title(self, conversation_id: str, new_title: str) -> bool:
+        """Atualiza o título (ValueError fora de 3-100 caracteres)."""
+        if len(new_title) < 3 or len(new_title) > 100:
+            raise ValueError("O título deve ter entre 3 e 100 caracteres")
+        updated = await self._update(
+            conversation_id, {"title": new_title, "updated_at": datetime.utcnow().isoformat()}
+        )
+        if updated:
+            logger.info(f"✅ Título atualizado para conversa {conversation_id}: '{new_title}'")
+        return updated
+
+    async def update_conversation_context(self, conversation_id: str, context: Optional[str]) -> bool:
+        """Atualiza o contexto (None limpa)."""
+        updated = await self._update(
+            conversation_id, {"context": context, "updated_at": datetime.utcnow().isoformat()}
+        )
+        if updated:
+            logger.info(f"✅ Contexto atualizado para conversa {conversation_id}")
+        return updated
+
+    async def update_conversation_settings(
+        self,
+        conversation_id: str,
+        max_chain_depth: Optional[int] = None,
+        auto_delegate: Optional[bool] = None,
+    ) -> bool:
+        """
+        Update conversation chain settings.
+
+        max_chain_depth: per-conversation chain limit (None = unchanged, 0 = reset to global)
+        auto_delegate: allow agents to auto-chain (None = unchanged)
+        """
+        updates = settings_update(max_chain_depth, auto_delegate)
+        if len(updates) == 1:
+            # Only updated_at, nothing to change
+            return True
+        updated = await self._update(conversation_id, updates)
+        if updated:
+            logger.info(f"Settings updated for conversation {conversation_id}: {updates}")
+        return updated
+
+    async def update_conversation_order(self, order_updates: List[Dict[str, Any]]) -> int:
+        """Atualiza display_order de várias conversas em um único bulk_write."""
+        timestamp = datetime.utcnow().isoformat()
+        operations = []
+        for update in order_updates:
+            conversation_id = update.get("conversation_id")
+            display_order = update.get("display_order")
+            if not conversation_id or display_order is None:
+                logger.warning(f"⚠️ Update inválido ignorado: {update}")
+                continue
+            operations.append(UpdateOne(
+                {"conversation_id": conversation_id},
+                {"$set": {"display_order": display_order, "updated_at": timestamp}},
+            ))
+
+        updated_count = 0
+        if operations:
+            result = await self.conversations.bulk_write(operations, ordered=False)
+            updated_count = result.matched_count
+
+        logger.info(f"✅ Ordem atualizada para {updated_count}/{len(order_updates)} conversas")
+        return updated_count
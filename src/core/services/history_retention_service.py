@@ -0,0 +1,97 @@
+# src/core/services/history_retention_service.py
+"""
+History Retention Service - periodic history compaction
+
+Runs ``HistoryCompactor`` (src/infrastructure/storage/history_archive.py)
+against the configured storage backend every
+``HISTORY_COMPACTION_INTERVAL_SECONDS`` (default 3600), in a worker thread
+so the event loop is never blocked by MongoDB or file I/O.
+
+Nothing is archived unless a retention policy is configured: globally via
+``HISTORY_RETENTION_MAX_AGE_DAYS`` / ``HISTORY_RETENTION_MAX_ENTRIES`` or
+per agent via ``history_retention`` in its definition.
+
+Used by:
+- API startup/shutdown (background loop)
+- POST /system/history/compact, GET/POST /system/history/archive/... routes
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.infrastructure.storage.history_archive import HistoryCompactor, RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryRetentionService:
+    """Background compactor plus archive lookup/restore for the API."""
+
+    INTERVAL = int(os.getenv("HISTORY_COMPACTION_INTERVAL_SECONDS", "3600"))
+
+    def __init__(self, repository=None, policy: Optional[RetentionPolicy] = None):
+        self._repository = repository
+        self._policy = policy
+        self._compactor: Optional[HistoryCompactor] = None
+        self._lock = threading.Lock()  # one compaction at a time
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.last_result: Optional[Dict] = None
+
+    @property
+    def compactor(self) -> HistoryCompactor:
+        if self._compactor is None:
+            repository = self._repository
+            if repository is None:
+                from src.container import container
+                repository = container.get_storage_service().get_repository()
+            self._compactor = HistoryCompactor(repository, self._policy)
+        return self._compactor
+
+    @property
+    def archive(self):
+        return self.compactor.archive
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info("History Retention Service started (every %ds)", self.INTERVAL)
+
+    async def stop(self):
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("History Retention Service stopped")
+
+    def compact(self, agent_ids: Optional[List[str]] = None) -> Dict:
+        """Run one compaction pass (all agents by default)."""
+        with self._lock:
+            result = self.compactor.run(agent_ids)
+        if result["history_archived"] or result["legacy_archived"] or result["errors"]:
+            logger.info(f"History compaction: {result}")
+        if agent_ids is None:
+            self.last_result = result
+        return result
+
+    async def _loop(self):
+        while self._running:
+            await asyncio.sleep(self.INTERVAL)
+            try:
+                await asyncio.to_thread(self.compact)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"History compaction failed: {e}")
+
+
+# Singleton
+history_retention_service = HistoryRetentionService()
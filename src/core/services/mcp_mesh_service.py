@@ -3,21 +3,33 @@
 MCP Mesh Service - Dynamic MCP Discovery Node (SAGA-016 Phase 1)
 
 Background service that maintains a live view of all MCP sidecars
-in the Primoia ecosystem. Pings /health on all registered 13xxx
-MCP sidecars every 30 seconds and caches results in memory.
+in the Primoia ecosystem and caches their /health results in memory.
+
+The sweep is adaptive:
+- healthy sidecars are pinged every ~30s (jittered, so they spread out)
+- unhealthy/unknown ones are retried on a fast exponential backoff
+- at most MAX_CONCURRENT_PINGS pings are in flight
+- the registry is re-read incrementally (``updated_at`` watermark plus a
+  name-only scan for additions/removals) instead of reloaded in full
+
+Health transitions are pushed to subscribers (``subscribe``), which is
+how the Pulse service learns about sidecars going down or recovering.
 
 Used by:
 - GET /api/system/mcp/mesh endpoint
 - Council agent prompt injection (live mesh context)
+- Pulse mesh health alerts
 """
 
 import asyncio
 import logging
+import os
+import random
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-import httpx
+from src.infrastructure.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -69,22 +81,40 @@ class MCPNode:
         }
 
 
+# Called as listener(name, prev_status, new_status, node); new_status is None
+# when the sidecar left the registry, prev_status is None when it joined.
+TransitionListener = Callable[[str, Optional[str], Optional[str], Optional[Dict[str, Any]]], Awaitable[None]]
+
+
 class MCPMeshService:
     """
     Maintains an in-memory mesh topology of all MCP sidecars.
 
     Runs a background loop that pings each registered sidecar's /health
-    endpoint every ``ping_interval`` seconds.
+    endpoint when it is due (see module docstring for the schedule).
     """
 
     PING_INTERVAL_SECONDS = 30
+    PING_JITTER = 0.2  # +/- fraction of PING_INTERVAL_SECONDS
+    RETRY_MIN_SECONDS = 2  # first retry of a failing sidecar, doubled per failure
     PING_TIMEOUT_SECONDS = 5
+    MAX_CONCURRENT_PINGS = int(os.getenv("MCP_MESH_MAX_CONCURRENT_PINGS", "16"))
+    REGISTRY_REFRESH_SECONDS = 15
 
     def __init__(self):
         self._nodes: Dict[str, MCPNode] = {}
         self._running = False
         self._task: Optional[asyncio.Task] = None
         self._last_sweep: Optional[str] = None
+        self._mongo_client = None
+        # Registry mirror and per-sidecar schedule
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._next_ping: Dict[str, float] = {}  # name -> monotonic due time
+        self._failures: Dict[str, int] = {}  # name -> consecutive failed pings
+        self._registry_watermark: Optional[datetime] = None
+        self._next_registry_refresh = 0.0
+        self._listeners: List[TransitionListener] = []
+        self._ping_slots: Optional[asyncio.Semaphore] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -138,6 +168,15 @@ class MCPMeshService:
         lines.append("</mcp_mesh_topology>")
         return "\n".join(lines)
 
+    def subscribe(self, listener: TransitionListener):
+        """Register an async callback for health transitions."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: TransitionListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
     # ------------------------------------------------------------------
     # Background sweep
     # ------------------------------------------------------------------
@@ -162,13 +201,13 @@ class MCPMeshService:
         logger.info("MCP Mesh Service stopped")
 
     async def _sweep_loop(self):
-        """Periodically sweep all registered sidecars."""
+        """Ping sidecars as they become due and refresh the registry."""
         # Initial sweep immediately
         await self._sweep_once()
 
         while self._running:
             try:
-                await asyncio.sleep(self.PING_INTERVAL_SECONDS)
+                await asyncio.sleep(self._seconds_until_due())
                 if self._running:
                     await self._sweep_once()
             except asyncio.CancelledError:
@@ -177,43 +216,143 @@ class MCPMeshService:
                 logger.error("Mesh sweep error: %s", e, exc_info=True)
                 await asyncio.sleep(5)
 
+    def _seconds_until_due(self) -> float:
+        """Time until the next ping or registry refresh (at least 0.5s)."""
+        now = time.monotonic()
+        due = min([self._next_registry_refresh, *self._next_ping.values()])
+        return min(max(due - now, 0.5), self.REGISTRY_REFRESH_SECONDS)
+
     async def _sweep_once(self):
-        """Run one full sweep: load registry, ping all sidecars."""
-        try:
-            registry_entries = self._load_registry()
-        except Exception as e:
-            logger.error("Failed to load MCP registry: %s", e)
-            return
+        """Refresh the registry if due, then ping every sidecar that is due."""
+        now = time.monotonic()
+        if now >= self._next_registry_refresh:
+            try:
+                await self._refresh_registry()
+            except Exception as e:
+                logger.error("Failed to load MCP registry: %s", e)
+            self._next_registry_refresh = now + self.REGISTRY_REFRESH_SECONDS
 
-        tasks = []
-        for entry in registry_entries:
-            tasks.append(self._ping_sidecar(entry))
+        due = [
+            entry for name, entry in self._entries.items()
+            if self._next_ping.get(name, 0.0) <= now
+        ]
+        if not due:
+            return
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._ping_slots is None:
+            self._ping_slots = asyncio.Semaphore(self.MAX_CONCURRENT_PINGS)
+        await asyncio.gather(*(self._scheduled_ping(entry) for entry in due), return_exceptions=True)
 
         self._last_sweep = datetime.now(timezone.utc).isoformat()
         healthy = sum(1 for n in self._nodes.values() if n.status == "healthy")
         logger.info(
-            "Mesh sweep complete: %d nodes (%d healthy)",
-            len(self._nodes), healthy,
+            "Mesh sweep: pinged %d of %d nodes (%d healthy)",
+            len(due), len(self._nodes), healthy,
         )
 
-    def _load_registry(self) -> List[Dict[str, Any]]:
-        """Load MCP entries from MongoDB registry (synchronous)."""
-        import os
-        from pymongo import MongoClient
+    async def _scheduled_ping(self, entry: Dict[str, Any]):
+        """Ping one sidecar (bounded), reschedule it and publish transitions."""
+        name = entry.get("name", "unknown")
+        previous = self._nodes.get(name)
+        prev_status = previous.status if previous else None
+
+        async with self._ping_slots:
+            await self._ping_sidecar(entry)
+
+        node = self._nodes.get(name)
+        status = node.status if node else None
+        self._schedule_next(name, status == "healthy")
+        if status != prev_status:
+            await self._publish(name, prev_status, status, node.to_dict() if node else None)
+
+    def _schedule_next(self, name: str, healthy: bool):
+        """Jittered long interval when healthy, exponential backoff otherwise."""
+        if healthy:
+            self._failures.pop(name, None)
+            jitter = 1 + random.uniform(-self.PING_JITTER, self.PING_JITTER)
+            delay = self.PING_INTERVAL_SECONDS * jitter
+        else:
+            failures = self._failures.get(name, 0)
+            self._failures[name] = failures + 1
+            delay = min(self.RETRY_MIN_SECONDS * (2 ** failures), self.PING_INTERVAL_SECONDS)
+        self._next_ping[name] = time.monotonic() + delay
+
+    async def _publish(self, name: str, prev_status: Optional[str], new_status: Optional[str],
+                       node: Optional[Dict[str, Any]]):
+        for listener in list(self._listeners):
+            try:
+                await listener(name, prev_status, new_status, node)
+            except Exception as e:
+                logger.error("Mesh transition listener failed for %s: %s", name, e)
+
+    # ------------------------------------------------------------------
+    # Registry mirror
+    # ------------------------------------------------------------------
+
+    def _get_registry_collection(self):
+        """mcp_registry collection on a shared client (connection pool, lazy init)."""
+        if self._mongo_client is None:
+            from pymongo import MongoClient
 
-        mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+            mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+            self._mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
         db_name = os.getenv("MONGO_DATABASE", "conductor_state")
+        return self._mongo_client[db_name]["mcp_registry"]
+
+    async def _refresh_registry(self):
+        """
+        Bring the registry mirror up to date.
+
+        The first call loads everything; later calls fetch entries whose
+        ``updated_at`` passed the watermark plus any name that appeared,
+        and drop names that disappeared.
+        """
+        if self._registry_watermark is None and not self._entries:
+            changed = await asyncio.to_thread(self._load_registry)
+            removed: List[str] = []
+        else:
+            changed, removed = await asyncio.to_thread(self._load_registry_changes)
+
+        for entry in changed:
+            name = entry.get("name")
+            if not name:
+                continue
+            previous = self._entries.get(name)
+            self._entries[name] = entry
+            if previous is not None and (
+                previous.get("url") != entry.get("url") or previous.get("host_url") != entry.get("host_url")
+            ):
+                # Moved: check it right away
+                self._next_ping[name] = 0.0
+            updated_at = entry.get("updated_at")
+            if isinstance(updated_at, datetime) and (
+                self._registry_watermark is None or updated_at > self._registry_watermark
+            ):
+                self._registry_watermark = updated_at
+
+        for name in removed:
+            self._entries.pop(name, None)
+            self._next_ping.pop(name, None)
+            self._failures.pop(name, None)
+            node = self._nodes.pop(name, None)
+            if node is not None:
+                await self._publish(name, node.status, None, node.to_dict())
+
+    def _load_registry(self) -> List[Dict[str, Any]]:
+        """Load all MCP entries from MongoDB registry (synchronous)."""
+        return list(self._get_registry_collection().find({}))
 
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
-        db = client[db_name]
-        collection = db["mcp_registry"]
+    def _load_registry_changes(self):
+        """Entries changed since the watermark, plus additions and removals by name."""
+        collection = self._get_registry_collection()
+        names = set(collection.distinct("name"))
+        known = set(self._entries)
 
-        docs = list(collection.find({}))
-        client.close()
-        return docs
+        query: Dict[str, Any] = {"name": {"$in": list(names - known)}}
+        if self._registry_watermark is not None:
+            query = {"$or": [query, {"updated_at": {"$gt": self._registry_watermark}}]}
+        changed = list(collection.find(query))
+        return changed, list(known - names)
 
     async def _ping_sidecar(self, entry: Dict[str, Any]):
         """Ping a single sidecar's /health endpoint."""
@@ -235,8 +374,8 @@ class MCPMeshService:
 
         try:
             start = time.monotonic()
-            async with httpx.AsyncClient(timeout=self.PING_TIMEOUT_SECONDS) as client:
-                resp = await client.get(health_url)
+            client = http_clients.async_client("mcp")
+            resp = await client.get(health_url, timeout=self.PING_TIMEOUT_SECONDS)
             elapsed_ms = (time.monotonic() - start) * 1000
 
             if resp.status_code == 200:
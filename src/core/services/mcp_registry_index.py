@@ -0,0 +1,378 @@
+# src/core/services/mcp_registry_index.py
+"""
+MCP Registry Index - in-memory view of the ``mcp_registry`` collection
+
+Sidecars heartbeat every few seconds and agents resolve their MCP lists on
+every task, so the registry routes used to hit MongoDB once per heartbeat,
+once per resolved name and once (plus a possible write) per health check.
+This index serves those routes from memory instead:
+
+- the collection is loaded once and then kept in sync by a change stream
+  (or, on a standalone server, by a periodic reload)
+- ``resolve`` answers k names with k dict lookups
+- heartbeats update the entry in memory and are coalesced per name into
+  one ``bulk_write`` every FLUSH_INTERVAL seconds
+- a single background sweeper flips entries whose heartbeat is older than
+  STALE_SECONDS to ``unhealthy`` (one ``update_many`` per sweep)
+
+Writes made by the CRUD routes are applied to the index right away with
+``put``/``discard``/``reload``, so the API reads its own writes without waiting
+for the change stream.
+
+Until ``start`` is called (tests, scripts) heartbeats are written through
+immediately and nothing is swept.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+
+
+def resolve_url(entry: Dict[str, Any]) -> str:
+    """SSE URL an agent should use: host_url when set, with the auth token appended."""
+    url = entry.get("host_url") or entry["url"]
+    auth = entry.get("auth")
+    if auth:
+        separator = "&" if "?" in url else "?"
+        url = f"{url}{separator}auth={auth}"
+    return url
+
+
+class MCPRegistryIndex:
+    """
+    In-memory ``name -> registry document`` index with write-behind heartbeats.
+
+    Route handlers run in the threadpool, so every access to the index goes
+    through a lock; MongoDB I/O happens outside it.
+    """
+
+    STALE_SECONDS = 90
+    FLUSH_INTERVAL = 5  # seconds between heartbeat flushes and stale sweeps
+    RELOAD_INTERVAL = 30  # full reload period when change streams are unavailable
+    RETRY_INTERVAL = 5  # seconds before reopening a failed change stream
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._names_by_id: Dict[Any, str] = {}
+        self._loaded = False
+        # name -> fields of the latest heartbeat not yet written
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._collection = None
+        self._running = False
+        self._streaming = False
+        self._stream = None
+        self._resume_token: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Load the registry and start the change stream and sweeper."""
+        if self._running:
+            return
+        self._running = True
+        try:
+            await asyncio.to_thread(self.reload)
+        except Exception as e:
+            # Retried lazily on first use and by the sweeper
+            logger.warning(f"Failed to load MCP registry index: {e}")
+        self._thread = threading.Thread(
+            target=self._change_stream_loop, name="mcp-registry-index", daemon=True
+        )
+        self._thread.start()
+        self._task = asyncio.create_task(self._sweeper_loop())
+        logger.info("MCP Registry Index started (%d entries)", len(self._entries))
+
+    async def stop(self):
+        """Stop background work and write out pending heartbeats."""
+        self._running = False
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await asyncio.to_thread(self.flush)
+        except Exception as e:
+            logger.warning(f"Failed to flush MCP heartbeats on shutdown: {e}")
+        logger.info("MCP Registry Index stopped")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Copy of the registry entry of ``name`` (None if unknown)."""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                return dict(entry)
+        if self._check_missing(name):
+            return self.get(name)
+        return None
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Map names to SSE URLs, skipping unknown and unhealthy entries."""
+        self._ensure_loaded()
+        resolved: Dict[str, str] = {}
+        not_found: List[str] = []
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is not None and entry.get("status") != UNHEALTHY:
+                    resolved[name] = resolve_url(entry)
+                else:
+                    not_found.append(name)
+        return {"resolved": resolved, "not_found": not_found}
+
+    def health(self, name: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Heartbeat-derived health of ``name`` (None if unknown)."""
+        entry = self.get(name)
+        if entry is None:
+            return None
+        now = now or datetime.utcnow()
+        last_heartbeat = entry.get("last_heartbeat")
+        seconds_since_heartbeat = None
+        is_stale = False
+        if last_heartbeat:
+            seconds_since_heartbeat = int((now - last_heartbeat).total_seconds())
+            is_stale = seconds_since_heartbeat > self.STALE_SECONDS
+        return {
+            "name": name,
+            "status": UNHEALTHY if is_stale else entry.get("status", "unknown"),
+            "tools_count": entry.get("tools_count", 0),
+            "last_heartbeat": last_heartbeat.isoformat() if last_heartbeat else None,
+            "seconds_since_heartbeat": seconds_since_heartbeat,
+            "is_stale": is_stale,
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_heartbeat(self, name: str, tools_count: Optional[int] = None) -> bool:
+        """
+        Mark ``name`` alive. Returns False if it isn't registered.
+
+        The write is queued for the next flush while the index is running.
+        """
+        update: Dict[str, Any] = {"last_heartbeat": datetime.utcnow(), "status": HEALTHY}
+        if tools_count is not None:
+            update["tools_count"] = tools_count
+        if self.get(name) is None:
+            return False
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return False
+            entry.update(update)
+            self._pending.setdefault(name, {}).update(update)
+        if not self._running:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write queued heartbeats in one unordered bulk_write; returns the count."""
+        from pymongo import UpdateOne
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        operations = [UpdateOne({"name": name}, {"$set": fields}) for name, fields in pending.items()]
+        try:
+            self._get_collection().bulk_write(operations, ordered=False)
+        except Exception:
+            # Put them back unless a newer heartbeat arrived meanwhile
+            with self._lock:
+                for name, fields in pending.items():
+                    self._pending[name] = {**fields, **self._pending.get(name, {})}
+            raise
+        return len(operations)
+
+    def mark_stale(self, now: Optional[datetime] = None) -> List[str]:
+        """Flip healthy entries with a heartbeat older than STALE_SECONDS to unhealthy."""
+        threshold = (now or datetime.utcnow()) - timedelta(seconds=self.STALE_SECONDS)
+        with self._lock:
+            stale = [
+                name for name, entry in self._entries.items()
+                if entry.get("status") == HEALTHY
+                and entry.get("last_heartbeat") is not None
+                and entry["last_heartbeat"] < threshold
+            ]
+            for name in stale:
+                self._entries[name]["status"] = UNHEALTHY
+        if stale:
+            # The heartbeat condition keeps a sidecar that just came back healthy
+            self._get_collection().update_many(
+                {"name": {"$in": stale}, "status": HEALTHY, "last_heartbeat": {"$lt": threshold}},
+                {"$set": {"status": UNHEALTHY}},
+            )
+            logger.info(f"MCPs marked unhealthy (stale heartbeat): {', '.join(sorted(stale))}")
+        return stale
+
+    def put(self, doc: Dict[str, Any]):
+        """Apply a registry document this process just wrote or read."""
+        with self._lock:
+            self._put_locked(doc)
+
+    def discard(self, name: str):
+        """Drop ``name`` (deleted by this process)."""
+        with self._lock:
+            self._remove_locked(name)
+
+    def refresh(self, name: str):
+        """Re-read one entry from MongoDB (after a write made by this process)."""
+        doc = self._get_collection().find_one({"name": name})
+        with self._lock:
+            if doc is None:
+                self._remove_locked(name)
+            else:
+                self._put_locked(doc)
+
+    def reload(self):
+        """Replace the index with the current contents of the collection."""
+        docs = list(self._get_collection().find({}))
+        with self._lock:
+            self._entries = {}
+            self._names_by_id = {}
+            for doc in docs:
+                self._put_locked(doc)
+            self._loaded = True
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.reload()
+
+    def _check_missing(self, name: str) -> bool:
+        """
+        Look up a name the index doesn't know; True if MongoDB has it.
+
+        Only needed without a change stream, where entries registered by
+        another process show up at the next reload.
+        """
+        if self._streaming:
+            return False
+        self.refresh(name)
+        with self._lock:
+            return name in self._entries
+
+    def _put_locked(self, doc: Dict[str, Any]):
+        name = doc.get("name")
+        if not name:
+            return
+        entry = dict(doc)
+        # A heartbeat not yet flushed is newer than what MongoDB holds
+        entry.update(self._pending.get(name, {}))
+        self._entries[name] = entry
+        if "_id" in doc:
+            self._names_by_id[doc["_id"]] = name
+
+    def _remove_locked(self, name: str):
+        entry = self._entries.pop(name, None)
+        self._pending.pop(name, None)
+        if entry is not None:
+            self._names_by_id.pop(entry.get("_id"), None)
+
+    def _get_collection(self):
+        """mcp_registry collection on a shared client (connection pool, lazy init)."""
+        if self._collection is None:
+            from pymongo import MongoClient
+
+            mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+            db_name = os.getenv("MONGO_DATABASE", "conductor_state")
+            self._collection = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)[db_name]["mcp_registry"]
+        return self._collection
+
+    def _apply_change(self, change: Dict[str, Any]):
+        """Apply a change stream event to the index."""
+        operation = change.get("operationType")
+        document_id = (change.get("documentKey") or {}).get("_id")
+        with self._lock:
+            if operation == "delete":
+                name = self._names_by_id.get(document_id)
+                if name is not None:
+                    self._remove_locked(name)
+            elif change.get("fullDocument") is not None:
+                self._put_locked(change["fullDocument"])
+
+    async def _sweeper_loop(self):
+        """Flush heartbeats and flip stale entries; reload when not streaming."""
+        loop = asyncio.get_running_loop()
+        last_reload = loop.time()
+        while self._running:
+            try:
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                await asyncio.to_thread(self.flush)
+                await asyncio.to_thread(self.mark_stale)
+                if not self._streaming and loop.time() - last_reload >= self.RELOAD_INTERVAL:
+                    await asyncio.to_thread(self.reload)
+                    last_reload = loop.time()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"MCP registry sweep error: {e}", exc_info=True)
+
+    def _change_stream_loop(self):
+        """Consume the registry change stream, resuming after errors."""
+        from pymongo.errors import OperationFailure, PyMongoError
+
+        while self._running:
+            try:
+                with self._get_collection().watch(
+                    full_document="updateLookup", resume_after=self._resume_token
+                ) as stream:
+                    self._stream = stream
+                    if self._resume_token is None:
+                        # Catch up on changes made before the stream opened
+                        self.reload()
+                    self._streaming = True
+                    for change in stream:
+                        self._resume_token = change["_id"]
+                        self._apply_change(change)
+                        if not self._running:
+                            break
+            except OperationFailure as e:
+                # Standalone server (no change streams) or resume token too old
+                if self._resume_token is not None:
+                    logger.warning(f"MCP registry change stream could not resume, restarting: {e}")
+                    self._resume_token = None
+                else:
+                    logger.warning(f"Change streams unavailable, reloading MCP registry periodically: {e}")
+                    return
+            except (PyMongoError, RuntimeError) as e:
+                if self._running:
+                    logger.warning(f"MCP registry change stream interrupted: {e}")
+            finally:
+                self._stream = None
+                self._streaming = False
+            if self._running:
+                threading.Event().wait(self.RETRY_INTERVAL)
+
+
+# Singleton instance
+mcp_registry_index = MCPRegistryIndex()
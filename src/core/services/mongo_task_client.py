@@ -1,5 +1,6 @@
 # projects/conductor/src/core/services/mongo_task_client.py
 import os
+import sys
 import time
 import logging
 from datetime import datetime, timezone
@@ -7,8 +8,22 @@ from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 from bson import ObjectId
 
+from src.infrastructure.prompt_segments import PromptSegmentStore, segments_enabled
+from src.infrastructure.structured_logging import detail_sampled, log_event
+from src.infrastructure.task_ordering import (
+    DEFAULT_PRIORITY,
+    ensure_ordering_indexes,
+    ordering_fields,
+    parse_deadline,
+)
+
 logger = logging.getLogger(__name__)
 
+
+def _describe_caller(frame) -> str:
+    return f"{frame.f_code.co_filename}:{frame.f_lineno} em {frame.f_code.co_name}()"
+
+
 class MongoTaskClient:
     def __init__(self):
         mongo_uri = os.getenv("MONGO_URI")
@@ -21,12 +36,13 @@ class MongoTaskClient:
             self.client.admin.command('ping')
             self.db = self.client.conductor_state  # Database correto (SAGA-004)
             self.collection = self.db.tasks  # Coleção de tasks
+            self.segment_store = PromptSegmentStore(self.db)  # Prompts deduplicados por hash
             logger.info("✅ Conexão com MongoDB estabelecida com sucesso.")
         except ConnectionFailure as e:
             logger.critical(f"❌ Falha ao conectar com MongoDB: {e}")
             raise
 
-    def submit_task(self, task_id: str, agent_id: str, cwd: str, timeout: int = 1800, provider: str = "claude", prompt: str = None, instance_id: str = None, is_councilor_execution: bool = False, councilor_config: dict = None, conversation_id: str = None, screenplay_id: str = None, idempotency_key: str = None, source: str = "dispatch_api") -> str:
+    def submit_task(self, task_id: str, agent_id: str, cwd: str, timeout: int = 1800, provider: str = "claude", prompt: str = None, instance_id: str = None, is_councilor_execution: bool = False, councilor_config: dict = None, conversation_id: str = None, screenplay_id: str = None, idempotency_key: str = None, source: str = "dispatch_api", enqueued_at: str = None, parent_task_id: str = None, trace: dict = None, prompt_profile: dict = None, priority: int = DEFAULT_PRIORITY, deadline=None) -> str:
         """
         Insere uma nova tarefa na coleção e retorna seu ID.
 
@@ -42,27 +58,23 @@ class MongoTaskClient:
             conversation_id: ID da conversa para contexto (REQUIRED)
             screenplay_id: ID do screenplay para contexto do projeto (REQUIRED)
             idempotency_key: UUID for dedup (optional, used by task queue)
+            enqueued_at: ISO timestamp of the original enqueue (optional, for end-to-end latency)
+            parent_task_id: ID da task que delegou esta (optional, agent_chain)
+            trace: Contexto de trace {trace_id, span_id} propagado ao watcher (optional)
+            prompt_profile: Perfil compacto da construção do prompt (PromptProfile.compact(), optional)
+            priority: Prioridade 0-9 (9 = mais alta); o watcher reclama por prioridade, deadline e created_at
+            deadline: Prazo (datetime ou ISO 8601, optional); antes das tasks sem prazo da mesma prioridade
 
         Returns:
             str: ID da task inserida
         """
-        # 🔍 LOG DETALHADO PARA RASTREAR PROVIDER
-        import traceback
-        logger.info("🔍 [MONGO_TASK_CLIENT] submit_task chamado com:")
-        logger.info(f"   - agent_id: {agent_id}")
-        logger.info(f"   - provider: {provider}")
-        logger.info(f"   - instance_id: {instance_id}")
-        logger.info(f"   - conversation_id: {conversation_id}")
-        logger.info(f"   - screenplay_id: {screenplay_id}")
-        logger.info(f"   - idempotency_key: {idempotency_key}")
-        logger.info(f"   - cwd: {cwd}")
-        logger.info(f"   - timeout: {timeout}")
-        
-        # Capturar stack trace para ver quem chamou
-        stack = traceback.extract_stack()
-        caller = stack[-2] if len(stack) > 1 else None
-        if caller:
-            logger.info(f"   - Chamado por: {caller.filename}:{caller.lineno} em {caller.name}()")
+        # Quem chamou: só o frame (barato); formatado apenas se for logado
+        caller = sys._getframe(1)
+        if detail_sampled(task_id):
+            log_event(
+                logger, "task.submit_detail", task_id=task_id, caller=_describe_caller(caller),
+                cwd=cwd, timeout=timeout, idempotency_key=idempotency_key, parent_task_id=parent_task_id,
+            )
 
         # 🔥 VALIDAÇÕES OBRIGATÓRIAS - NÃO PERMITIR INSERIR SEM ESSES CAMPOS
         # Exceção: Conselheiros (councilor_execution) podem executar sem conversation_id/screenplay_id
@@ -87,13 +99,20 @@ class MongoTaskClient:
                 "🚨 ERRO: Tentativa de inserir task na coleção MongoDB com campos obrigatórios faltando:",
                 *validation_errors,
                 "\n📍 Stack trace:",
-                f"   Chamado por: {caller.filename}:{caller.lineno} em {caller.name}()" if caller else "   Desconhecido",
+                f"   Chamado por: {_describe_caller(caller)}",
                 f"\n💡 Dica: Para chat/execuções normais, esses campos são OBRIGATÓRIOS.",
                 f"   Apenas conselheiros (is_councilor_execution=True) podem executar sem conversation_id/screenplay_id."
             ])
             logger.error(error_message)
             raise ValueError(error_message)
 
+        try:
+            deadline = parse_deadline(deadline)
+        except ValueError:
+            logger.warning(f"⚠️ deadline inválido ignorado: {deadline}")
+            deadline = None
+
+        now = datetime.now(timezone.utc)
         task_document = {
             "_id": ObjectId(task_id),  # 🔥 Use task_id from gateway
             "agent_id": agent_id,
@@ -106,8 +125,8 @@ class MongoTaskClient:
             "conversation_id": conversation_id,  # 🔥 REQUIRED: ID da conversa para contexto
             "screenplay_id": screenplay_id,  # 🔥 REQUIRED: ID do screenplay para contexto do projeto
             "context": {},  # SAGA-004: Context object for additional metadata
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
+            "created_at": now,
+            "updated_at": now,
             "result": "",
             "exit_code": None,
             "duration": None,
@@ -116,6 +135,8 @@ class MongoTaskClient:
             "councilor_config": councilor_config if is_councilor_execution else None,
             "severity": None,  # Será definido após análise do resultado
             "source": source,  # dispatch_api | agent_chain | pulse
+            # Ordem de claim: priority (com aging), due_at, created_at
+            **ordering_fields(priority, deadline, now),
         }
 
         # Only include idempotency_key when set (sparse unique index
@@ -123,8 +144,37 @@ class MongoTaskClient:
         if idempotency_key is not None:
             task_document["idempotency_key"] = idempotency_key
 
-        result = self.collection.insert_one(task_document)
-        logger.info(f"📤 Tarefa submetida ao MongoDB com ID: {task_id}")
+        if parent_task_id:
+            task_document["parent_task_id"] = parent_task_id
+
+        if trace:
+            task_document["trace"] = trace
+
+        if prompt_profile:
+            task_document["prompt_profile"] = prompt_profile
+
+        if enqueued_at:
+            try:
+                task_document["enqueued_at"] = datetime.fromisoformat(enqueued_at)
+            except ValueError:
+                logger.warning(f"⚠️ enqueued_at inválido ignorado: {enqueued_at}")
+
+        # Opt-in (TASK_PROMPT_STORAGE=segments): persona/playbook/screenplay/histórico ficam
+        # uma vez só em prompt_segments; a task guarda hashes + cauda dinâmica e NÃO tem
+        # "prompt" (leitores usam PromptSegmentStore.assemble)
+        if prompt and segments_enabled():
+            try:
+                task_document.update(self.segment_store.store(prompt))
+                task_document.pop("prompt")
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao segmentar prompt, gravando inline: {e}")
+
+        self.collection.insert_one(task_document)
+        log_event(
+            logger, "task.submitted", task_id=task_id, agent_id=agent_id, provider=provider,
+            source=source, instance_id=instance_id, conversation_id=conversation_id,
+            screenplay_id=screenplay_id, prompt_segmented="prompt" not in task_document,
+        )
         return task_id
 
     def get_task_result(self, task_id: str, poll_interval: float = 2.0, timeout: int = 1800) -> dict:
@@ -224,10 +274,14 @@ class MongoTaskClient:
             list: Lista de documentos de execução
         """
         try:
-            cursor = self.collection.find({
-                "agent_id": agent_id,
-                "is_councilor_execution": True
-            }).sort("created_at", -1).limit(limit)
+            cursor = self.collection.find(
+                {
+                    "agent_id": agent_id,
+                    "is_councilor_execution": True
+                },
+                # Prompt não é usado na listagem
+                {"prompt": 0, "prompt_segments": 0, "prompt_tail": 0},
+            ).sort("created_at", -1).limit(limit)
 
             executions = []
             for doc in cursor:
@@ -332,7 +386,7 @@ class MongoTaskClient:
             logger.warning(f"⚠️ Falha ao criar índices de conselheiros: {e}")
 
     def ensure_task_queue_indexes(self):
-        """Create indexes for task queue dedup."""
+        """Create indexes for task queue dedup, claim order and delegation chains."""
         try:
             self.collection.create_index(
                 "idempotency_key",
@@ -343,3 +397,17 @@ class MongoTaskClient:
             logger.info("Task queue idempotency_key index created.")
         except Exception as e:
             logger.warning(f"Failed to create idempotency_key index: {e}")
+        try:
+            # GET /tasks/{id}/trace busca os filhos de cada nível por parent_task_id
+            self.collection.create_index(
+                "parent_task_id",
+                sparse=True,
+                name="idx_parent_task_id",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create parent_task_id index: {e}")
+        try:
+            ensure_ordering_indexes(self.collection)
+        except Exception as e:
+            logger.warning(f"Failed to create claim order indexes: {e}")
+        self.segment_store.ensure_indexes()
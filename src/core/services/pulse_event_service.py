@@ -4,7 +4,8 @@ Pulse Event Service - Proactive Event Triggers (SAGA-016 Phase 2)
 
 Dual event source:
 1. RabbitMQ Dead Letter Queue listener - captures failed messages from DLX
-2. MCP Mesh health change detector - detects sidecars going down/up
+2. MCP Mesh health transitions - pushed by the mesh sweep when sidecars
+   go down/up or join/leave the registry
 
 When critical events are detected, they are formatted as system events
 and injected into Support Councilor agent sessions via the Conductor API.
@@ -71,21 +72,18 @@ class PulseEventService:
     """
     Proactive event detection and alert injection.
 
-    Runs two background loops:
-    - RabbitMQ DLQ consumer (if RabbitMQ is reachable)
-    - MCP Mesh health watcher (compares snapshots to detect changes)
+    Runs a RabbitMQ DLQ consumer (if RabbitMQ is reachable) and
+    subscribes to MCP Mesh health transitions.
     """
 
     DLQ_EXCHANGE = "primoia.dlx"
     DLQ_QUEUE = "primoia.dead-letters"
-    HEALTH_CHECK_INTERVAL = 30  # seconds
 
     def __init__(self):
         self._running = False
         self._tasks: List[asyncio.Task] = []
         self._event_log: List[Dict[str, Any]] = []
         self._max_log_size = 200
-        self._previous_mesh_snapshot: Dict[str, str] = {}  # name -> status
         self._rabbitmq_available = False
 
     # ------------------------------------------------------------------
@@ -104,14 +102,17 @@ class PulseEventService:
 
         # Start RabbitMQ DLQ listener
         self._tasks.append(asyncio.create_task(self._dlq_listener_loop()))
-        # Start mesh health watcher
-        self._tasks.append(asyncio.create_task(self._mesh_health_watcher_loop()))
+        # Mesh health transitions
+        from src.core.services.mcp_mesh_service import mesh_service
+        mesh_service.subscribe(self._on_mesh_transition)
 
         logger.info("Pulse Event Service started")
 
     async def stop(self):
         """Stop all event listeners."""
         self._running = False
+        from src.core.services.mcp_mesh_service import mesh_service
+        mesh_service.unsubscribe(self._on_mesh_transition)
         for task in self._tasks:
             if not task.done():
                 task.cancel()
@@ -218,87 +219,64 @@ class PulseEventService:
             return None
 
     # ------------------------------------------------------------------
-    # MCP Mesh health watcher
+    # MCP Mesh health transitions
     # ------------------------------------------------------------------
 
-    async def _mesh_health_watcher_loop(self):
-        """Detect MCP sidecar health changes by comparing mesh snapshots."""
-        while self._running:
-            try:
-                await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
-                if not self._running:
-                    break
-                await self._check_mesh_health_changes()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error("Mesh health watcher error: %s", e)
-                await asyncio.sleep(10)
-
-    async def _check_mesh_health_changes(self):
-        """Compare current mesh to previous snapshot and emit events."""
-        try:
-            from src.core.services.mcp_mesh_service import mesh_service
-        except ImportError:
-            return
+    async def _on_mesh_transition(
+        self,
+        name: str,
+        prev_status: Optional[str],
+        status: Optional[str],
+        node: Optional[Dict[str, Any]],
+    ):
+        """Turn a mesh health transition into a Pulse event (and alert on DOWN)."""
+        node = node or {}
 
-        mesh = mesh_service.get_mesh()
-        current_snapshot: Dict[str, str] = {}
-
-        for node in mesh.get("nodes", []):
-            name = node["name"]
-            status = node["status"]
-            current_snapshot[name] = status
-
-            prev_status = self._previous_mesh_snapshot.get(name)
-
-            if prev_status is None:
-                # New node discovered
-                if status == "healthy":
-                    event = PulseEvent(
-                        source="mesh_watcher",
-                        severity=PulseEvent.SEVERITY_INFO,
-                        title=f"MCP sidecar discovered: {name}",
-                        detail=f"{name} is now online (port {node.get('port', '?')}, {node.get('tools_count', 0)} tools)",
-                        metadata={"node": name, "status": status, "port": node.get("port")},
-                    )
-                    self._record_event(event)
-
-            elif prev_status == "healthy" and status != "healthy":
-                # Service went down
-                event = PulseEvent(
-                    source="mesh_watcher",
-                    severity=PulseEvent.SEVERITY_CRITICAL,
-                    title=f"MCP sidecar DOWN: {name}",
-                    detail=f"{name} changed from healthy to {status}. Error: {node.get('error', 'N/A')}",
-                    metadata={"node": name, "prev_status": prev_status, "new_status": status},
-                )
-                self._record_event(event)
-                await self._inject_alert(event)
+        if status is None:
+            # Left the registry
+            event = PulseEvent(
+                source="mesh_watcher",
+                severity=PulseEvent.SEVERITY_WARNING,
+                title=f"MCP sidecar REMOVED: {name}",
+                detail=f"{name} is no longer in the registry",
+                metadata={"node": name},
+            )
+            self._record_event(event)
 
-            elif prev_status != "healthy" and status == "healthy":
-                # Service recovered
+        elif prev_status is None:
+            # New node discovered
+            if status == "healthy":
                 event = PulseEvent(
                     source="mesh_watcher",
                     severity=PulseEvent.SEVERITY_INFO,
-                    title=f"MCP sidecar RECOVERED: {name}",
-                    detail=f"{name} is healthy again (was {prev_status})",
-                    metadata={"node": name, "prev_status": prev_status, "new_status": status},
+                    title=f"MCP sidecar discovered: {name}",
+                    detail=f"{name} is now online (port {node.get('port', '?')}, {node.get('tools_count', 0)} tools)",
+                    metadata={"node": name, "status": status, "port": node.get("port")},
                 )
                 self._record_event(event)
 
-        # Detect removed nodes
-        for name in set(self._previous_mesh_snapshot) - set(current_snapshot):
+        elif prev_status == "healthy" and status != "healthy":
+            # Service went down
             event = PulseEvent(
                 source="mesh_watcher",
-                severity=PulseEvent.SEVERITY_WARNING,
-                title=f"MCP sidecar REMOVED: {name}",
-                detail=f"{name} is no longer in the registry",
-                metadata={"node": name},
+                severity=PulseEvent.SEVERITY_CRITICAL,
+                title=f"MCP sidecar DOWN: {name}",
+                detail=f"{name} changed from healthy to {status}. Error: {node.get('error', 'N/A')}",
+                metadata={"node": name, "prev_status": prev_status, "new_status": status},
             )
             self._record_event(event)
+            await self._inject_alert(event)
 
-        self._previous_mesh_snapshot = current_snapshot
+        elif prev_status != "healthy" and status == "healthy":
+            # Service recovered
+            event = PulseEvent(
+                source="mesh_watcher",
+                severity=PulseEvent.SEVERITY_INFO,
+                title=f"MCP sidecar RECOVERED: {name}",
+                detail=f"{name} is healthy again (was {prev_status})",
+                metadata={"node": name, "prev_status": prev_status, "new_status": status},
+            )
+            self._record_event(event)
 
     # ------------------------------------------------------------------
     # Alert injection via dispatch
@@ -372,31 +350,32 @@ class PulseEventService:
             "CONDUCTOR_API_URL", "http://primoia-conductor-api:8000"
         )
 
-        import httpx
+        from src.infrastructure.http_clients import http_clients
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(
-                f"{conductor_api_url}/agents/dispatch",
-                json={
-                    "target_agent_id": support_agent_id,
-                    "input": prompt,
-                },
+        client = http_clients.async_client("conductor")
+        resp = await client.post(
+            f"{conductor_api_url}/agents/dispatch",
+            json={
+                "target_agent_id": support_agent_id,
+                "input": prompt,
+                "priority": 8,
+            },
+        )
+        if resp.status_code < 300:
+            data = resp.json()
+            logger.info(
+                "Dispatched %s to %s via HTTP fallback (task=%s, conversation=%s)",
+                event.title,
+                support_agent_id,
+                data.get("task_id"),
+                data.get("conversation_id"),
+            )
+        else:
+            logger.warning(
+                "Failed to dispatch alert (HTTP %d): %s",
+                resp.status_code,
+                resp.text[:200],
             )
-            if resp.status_code < 300:
-                data = resp.json()
-                logger.info(
-                    "Dispatched %s to %s via HTTP fallback (task=%s, conversation=%s)",
-                    event.title,
-                    support_agent_id,
-                    data.get("task_id"),
-                    data.get("conversation_id"),
-                )
-            else:
-                logger.warning(
-                    "Failed to dispatch alert (HTTP %d): %s",
-                    resp.status_code,
-                    resp.text[:200],
-                )
 
     # ------------------------------------------------------------------
     # Internal
@@ -7,22 +7,35 @@ MCP services. Each saga tracks a sequence of steps with their
 compensating actions, enabling automatic rollback on failure.
 
 Flow:
-1. Agent starts a saga via API (defines steps + compensating payloads)
-2. SagaManager executes steps sequentially via MCP tool calls
-3. On failure, SagaManager triggers compensating transactions
-   for all completed steps in reverse order
+1. Agent starts a saga via API (defines steps + compensating payloads
+   and, optionally, the earlier steps each one depends on)
+2. SagaManager executes steps as a DAG via MCP tool calls, running
+   independent steps in parallel (bounded by ``max_parallel``)
+3. On failure, SagaManager triggers compensating transactions for all
+   completed steps in reverse-topological order (a step is compensated
+   only after every completed step depending on it)
 4. State is persisted to MongoDB for auditability
+
+A step without ``depends_on`` depends on the previous step, so sagas
+defined before dependencies existed still run strictly in order.
 """
 
+import asyncio
 import logging
 import os
+import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
+from src.infrastructure.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_PARALLEL = int(os.getenv("SAGA_MAX_PARALLEL", "4"))
+SERVICE_URL_TTL = 30  # seconds a registry lookup is reused
+
 
 class SagaStatus(str, Enum):
     """Lifecycle status of a saga."""
@@ -53,18 +66,30 @@ class SagaStep:
         service: str,
         action: Dict[str, Any],
         compensation: Dict[str, Any],
+        depends_on: Optional[List[str]] = None,
     ):
         self.step_id = step_id
         self.name = name
         self.service = service  # MCP sidecar name
         self.action = action  # {"tool": "tool_name", "payload": {...}}
         self.compensation = compensation  # {"tool": "tool_name", "payload": {...}}
+        self.depends_on: List[str] = depends_on or []  # step_ids of earlier steps
         self.status = StepStatus.PENDING
         self.result: Optional[Dict[str, Any]] = None
         self.error: Optional[str] = None
         self.executed_at: Optional[str] = None
         self.compensated_at: Optional[str] = None
 
+    def state_fields(self) -> Dict[str, Any]:
+        """Fields that change while the saga runs."""
+        return {
+            "status": self.status.value,
+            "result": self.result,
+            "error": self.error,
+            "executed_at": self.executed_at,
+            "compensated_at": self.compensated_at,
+        }
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "step_id": self.step_id,
@@ -72,6 +97,7 @@ class SagaStep:
             "service": self.service,
             "action": self.action,
             "compensation": self.compensation,
+            "depends_on": self.depends_on,
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
@@ -87,6 +113,7 @@ class SagaStep:
             service=data["service"],
             action=data["action"],
             compensation=data["compensation"],
+            depends_on=data.get("depends_on"),
         )
         step.status = StepStatus(data.get("status", "pending"))
         step.result = data.get("result")
@@ -99,10 +126,11 @@ class SagaStep:
 class SagaState:
     """Full state of a saga instance."""
 
-    def __init__(self, saga_id: str, name: str, initiator: str):
+    def __init__(self, saga_id: str, name: str, initiator: str, max_parallel: int = DEFAULT_MAX_PARALLEL):
         self.saga_id = saga_id
         self.name = name
         self.initiator = initiator  # agent or user that started the saga
+        self.max_parallel = max_parallel  # steps (or compensations) in flight at once
         self.status = SagaStatus.PENDING
         self.steps: List[SagaStep] = []
         self.created_at = datetime.now(timezone.utc).isoformat()
@@ -115,6 +143,7 @@ class SagaState:
             "saga_id": self.saga_id,
             "name": self.name,
             "initiator": self.initiator,
+            "max_parallel": self.max_parallel,
             "status": self.status.value,
             "steps": [s.to_dict() for s in self.steps],
             "created_at": self.created_at,
@@ -129,6 +158,7 @@ class SagaState:
             saga_id=data["saga_id"],
             name=data["name"],
             initiator=data["initiator"],
+            max_parallel=data.get("max_parallel", DEFAULT_MAX_PARALLEL),
         )
         saga.status = SagaStatus(data.get("status", "pending"))
         saga.steps = [SagaStep.from_dict(s) for s in data.get("steps", [])]
@@ -138,6 +168,22 @@ class SagaState:
         saga.error = data.get("error")
         return saga
 
+    def status_fields(self) -> Dict[str, Any]:
+        """Saga-level fields that change while the saga runs."""
+        return {
+            "status": self.status.value,
+            "completed_at": self.completed_at,
+            "error": self.error,
+        }
+
+    def dependents(self) -> Dict[str, List[SagaStep]]:
+        """Map step_id -> steps that depend on it."""
+        dependents: Dict[str, List[SagaStep]] = {s.step_id: [] for s in self.steps}
+        for step in self.steps:
+            for dep in step.depends_on:
+                dependents[dep].append(step)
+        return dependents
+
 
 class SagaManager:
     """
@@ -148,27 +194,48 @@ class SagaManager:
 
     def __init__(self):
         self._sagas: Dict[str, SagaState] = {}
+        self._mongo_client = None
+        self._service_urls: Dict[str, Tuple[Optional[str], float]] = {}  # service -> (url, expires_at)
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
-    def _get_collection(self):
-        from pymongo import MongoClient
+    def _get_db(self):
+        """Database handle on a shared client (connection pool, lazy init)."""
+        if self._mongo_client is None:
+            from pymongo import MongoClient
 
-        mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+            mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+            self._mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
         db_name = os.getenv("MONGO_DATABASE", "conductor_state")
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
-        return client[db_name]["sagas"]
+        return self._mongo_client[db_name]
+
+    def _get_collection(self):
+        return self._get_db()["sagas"]
+
+    def _persist(self, saga: SagaState, step: Optional[SagaStep] = None):
+        """
+        Save saga state to MongoDB.
 
-    def _persist(self, saga: SagaState):
-        """Save saga state to MongoDB."""
+        ``create_saga`` writes the whole document; afterwards only the
+        saga status fields and, when given, the fields of ``step`` are
+        ``$set`` (by array position), so parallel steps don't rewrite
+        each other's state.
+        """
         saga.updated_at = datetime.now(timezone.utc).isoformat()
+        if saga.status == SagaStatus.PENDING and step is None:
+            update = saga.to_dict()
+        else:
+            update = {**saga.status_fields(), "updated_at": saga.updated_at}
+            if step is not None:
+                index = saga.steps.index(step)
+                update.update({f"steps.{index}.{k}": v for k, v in step.state_fields().items()})
         try:
             collection = self._get_collection()
             collection.update_one(
                 {"saga_id": saga.saga_id},
-                {"$set": saga.to_dict()},
+                {"$set": update},
                 upsert=True,
             )
         except Exception as e:
@@ -194,6 +261,7 @@ class SagaManager:
         name: str,
         initiator: str,
         steps: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None,
     ) -> SagaState:
         """
         Create a new saga with the given steps.
@@ -203,9 +271,21 @@ class SagaManager:
         - service: MCP sidecar name to call
         - action: {"tool": "...", "payload": {...}}
         - compensation: {"tool": "...", "payload": {...}}
+
+        and may contain:
+        - depends_on: earlier steps (names or 0-based indices) that must
+          complete first; ``[]`` for none. Omitted = the previous step.
+
+        Raises:
+            ValueError: if a dependency is unknown or not an earlier step
         """
         saga_id = f"saga_{uuid4().hex[:12]}"
-        saga = SagaState(saga_id=saga_id, name=name, initiator=initiator)
+        saga = SagaState(
+            saga_id=saga_id,
+            name=name,
+            initiator=initiator,
+            max_parallel=max(1, max_parallel or DEFAULT_MAX_PARALLEL),
+        )
 
         for i, step_data in enumerate(steps):
             step = SagaStep(
@@ -214,6 +294,7 @@ class SagaManager:
                 service=step_data["service"],
                 action=step_data["action"],
                 compensation=step_data["compensation"],
+                depends_on=self._resolve_dependencies(saga.steps, step_data.get("depends_on")),
             )
             saga.steps.append(step)
 
@@ -222,6 +303,35 @@ class SagaManager:
         logger.info("Saga created: %s (%s) with %d steps", saga_id, name, len(steps))
         return saga
 
+    @staticmethod
+    def _resolve_dependencies(
+        earlier: List[SagaStep],
+        depends_on: Optional[List[Union[int, str]]],
+    ) -> List[str]:
+        """
+        Map declared dependencies to step_ids.
+
+        Only earlier steps can be referenced, so the step list is always a
+        valid topological order and cycles are impossible.
+        """
+        if depends_on is None:
+            return [earlier[-1].step_id] if earlier else []
+
+        by_name = {s.name: s for s in earlier}
+        step_ids: List[str] = []
+        for ref in depends_on:
+            if isinstance(ref, int) and not isinstance(ref, bool):
+                if not 0 <= ref < len(earlier):
+                    raise ValueError(f"Step {len(earlier)} depends on step {ref}, which is not an earlier step")
+                step_id = earlier[ref].step_id
+            elif ref in by_name:
+                step_id = by_name[ref].step_id
+            else:
+                raise ValueError(f"Step {len(earlier)} depends on unknown earlier step '{ref}'")
+            if step_id not in step_ids:
+                step_ids.append(step_id)
+        return step_ids
+
     def get_saga(self, saga_id: str) -> Optional[SagaState]:
         """Get saga state from cache or MongoDB."""
         if saga_id in self._sagas:
@@ -254,10 +364,12 @@ class SagaManager:
 
     async def execute_saga(self, saga_id: str) -> SagaState:
         """
-        Execute all steps in a saga sequentially.
+        Execute the saga's steps as a DAG.
 
-        On any step failure, automatically triggers rollback of
-        all previously completed steps.
+        A step starts once all its dependencies completed, with at most
+        ``max_parallel`` steps in flight. On the first failure no new step
+        is started; in-flight steps finish, then all completed steps are
+        rolled back.
         """
         saga = self.get_saga(saga_id)
         if not saga:
@@ -269,26 +381,42 @@ class SagaManager:
         saga.status = SagaStatus.RUNNING
         self._persist(saga)
 
-        for step in saga.steps:
-            try:
-                result = await self._execute_step(step)
-                step.status = StepStatus.COMPLETED
-                step.result = result
-                step.executed_at = datetime.now(timezone.utc).isoformat()
-                self._persist(saga)
-
-            except Exception as e:
-                step.status = StepStatus.FAILED
-                step.error = str(e)[:500]
-                saga.error = f"Step '{step.name}' failed: {str(e)[:200]}"
-                self._persist(saga)
-
-                logger.error(
-                    "Saga %s step '%s' failed: %s. Triggering rollback.",
-                    saga_id, step.name, e,
-                )
-                await self.rollback_saga(saga_id)
-                return self.get_saga(saga_id)
+        by_id = {s.step_id: s for s in saga.steps}
+        waiting = [s for s in saga.steps if s.status == StepStatus.PENDING]
+        running: Dict[asyncio.Task, SagaStep] = {}
+        failed = False
+
+        while waiting or running:
+            if not failed:
+                for step in list(waiting):
+                    if len(running) >= saga.max_parallel:
+                        break
+                    if all(by_id[dep].status == StepStatus.COMPLETED for dep in step.depends_on):
+                        waiting.remove(step)
+                        running[asyncio.ensure_future(self._execute_step(step))] = step
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step = running.pop(task)
+                try:
+                    step.result = task.result()
+                    step.status = StepStatus.COMPLETED
+                    step.executed_at = datetime.now(timezone.utc).isoformat()
+                except Exception as e:
+                    step.status = StepStatus.FAILED
+                    step.error = str(e)[:500]
+                    if not failed:
+                        saga.error = f"Step '{step.name}' failed: {str(e)[:200]}"
+                    failed = True
+                    logger.error("Saga %s step '%s' failed: %s", saga_id, step.name, e)
+                self._persist(saga, step)
+
+        if failed:
+            logger.error("Saga %s failed. Triggering rollback.", saga_id)
+            await self.rollback_saga(saga_id)
+            return self.get_saga(saga_id)
 
         saga.status = SagaStatus.COMPLETED
         saga.completed_at = datetime.now(timezone.utc).isoformat()
@@ -298,8 +426,12 @@ class SagaManager:
 
     async def rollback_saga(self, saga_id: str) -> SagaState:
         """
-        Rollback a saga by executing compensating transactions
-        for all completed steps in reverse order.
+        Rollback a saga by executing compensating transactions for all
+        completed steps in reverse-topological order.
+
+        A step is compensated once every completed step depending on it
+        has been compensated (or failed to), so independent compensations
+        run in parallel, bounded by ``max_parallel``.
         """
         saga = self.get_saga(saga_id)
         if not saga:
@@ -308,29 +440,41 @@ class SagaManager:
         saga.status = SagaStatus.COMPENSATING
         self._persist(saga)
 
-        # Get completed steps in reverse order
-        completed_steps = [
-            s for s in reversed(saga.steps)
-            if s.status == StepStatus.COMPLETED
-        ]
-
-        for step in completed_steps:
-            try:
-                await self._execute_compensation(step)
-                step.status = StepStatus.COMPENSATED
-                step.compensated_at = datetime.now(timezone.utc).isoformat()
-                self._persist(saga)
-                logger.info(
-                    "Saga %s: compensated step '%s'", saga_id, step.name,
-                )
-            except Exception as e:
-                step.status = StepStatus.COMPENSATION_FAILED
-                step.error = f"Compensation failed: {str(e)[:300]}"
-                self._persist(saga)
-                logger.error(
-                    "Saga %s: compensation failed for step '%s': %s",
-                    saga_id, step.name, e,
-                )
+        dependents = saga.dependents()
+        # Reversed so that, among ready steps, later ones are started first
+        waiting = [s for s in reversed(saga.steps) if s.status == StepStatus.COMPLETED]
+        pending_ids = {s.step_id for s in waiting}
+        running: Dict[asyncio.Task, SagaStep] = {}
+
+        while waiting or running:
+            for step in list(waiting):
+                if len(running) >= saga.max_parallel:
+                    break
+                if not any(d.step_id in pending_ids for d in dependents[step.step_id]):
+                    waiting.remove(step)
+                    running[asyncio.ensure_future(self._execute_compensation(step))] = step
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step = running.pop(task)
+                pending_ids.discard(step.step_id)
+                try:
+                    task.result()
+                    step.status = StepStatus.COMPENSATED
+                    step.compensated_at = datetime.now(timezone.utc).isoformat()
+                    logger.info(
+                        "Saga %s: compensated step '%s'", saga_id, step.name,
+                    )
+                except Exception as e:
+                    step.status = StepStatus.COMPENSATION_FAILED
+                    step.error = f"Compensation failed: {str(e)[:300]}"
+                    logger.error(
+                        "Saga %s: compensation failed for step '%s': %s",
+                        saga_id, step.name, e,
+                    )
+                self._persist(saga, step)
 
         saga.status = SagaStatus.ROLLED_BACK
         saga.completed_at = datetime.now(timezone.utc).isoformat()
@@ -370,8 +514,6 @@ class SagaManager:
         Resolves the service name to a URL from the MCP registry,
         then POSTs to /tools/{tool_name}.
         """
-        import httpx
-
         url = await self._resolve_service_url(service)
         if not url:
             raise ConnectionError(f"Service '{service}' not found in MCP registry")
@@ -379,33 +521,34 @@ class SagaManager:
         # MCP sidecar tool call: POST /tools/{tool_name}
         tool_url = f"{url.rstrip('/')}/tools/{tool}"
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(tool_url, json=payload)
-            if resp.status_code >= 400:
-                raise RuntimeError(
-                    f"MCP tool call failed: {tool} on {service} "
-                    f"(HTTP {resp.status_code}): {resp.text[:200]}"
-                )
-            return resp.json()
+        resp = await http_clients.async_client("mcp").post(tool_url, json=payload)
+        if resp.status_code >= 400:
+            raise RuntimeError(
+                f"MCP tool call failed: {tool} on {service} "
+                f"(HTTP {resp.status_code}): {resp.text[:200]}"
+            )
+        return resp.json()
 
     async def _resolve_service_url(self, service: str) -> Optional[str]:
-        """Resolve MCP service name to its sidecar URL."""
+        """Resolve MCP service name to its sidecar URL (cached for SERVICE_URL_TTL)."""
+        cached = self._service_urls.get(service)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
         try:
-            from pymongo import MongoClient
-
-            mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-            db_name = os.getenv("MONGO_DATABASE", "conductor_state")
-            client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
-            collection = client[db_name]["mcp_registry"]
-            doc = collection.find_one({"name": service})
-            client.close()
-
-            if doc:
-                # Prefer host_url for external access
-                return doc.get("host_url") or doc.get("url", "")
+            doc = await asyncio.to_thread(
+                self._get_db()["mcp_registry"].find_one,
+                {"name": service},
+                {"_id": 0, "host_url": 1, "url": 1},
+            )
         except Exception as e:
             logger.error("Failed to resolve service URL for %s: %s", service, e)
-        return None
+            return None
+
+        # Prefer host_url for external access
+        url = (doc.get("host_url") or doc.get("url", "")) if doc else None
+        if url:
+            self._service_urls[service] = (url, time.monotonic() + SERVICE_URL_TTL)
+        return url
 
 
 # Singleton
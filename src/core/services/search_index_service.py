@@ -0,0 +1,111 @@
+# src/core/services/search_index_service.py
+"""
+Search Index Service - keeps the full-text search index current
+
+Runs ``SearchIndex.update`` (src/infrastructure/search_index.py) every
+``SEARCH_INDEX_INTERVAL_SECONDS`` (default 10). Each pass only reads what
+changed since the persisted watermarks, so new messages become searchable
+within one interval without full rebuilds.
+
+The loop starts even when MongoDB is down: index creation is retried with
+exponential backoff (RETRY_MIN_SECONDS doubled per failure, at most
+RETRY_MAX_SECONDS) before the first pass.
+
+Used by:
+- API startup/shutdown (background loop)
+- GET /search
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+from src.infrastructure.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexService:
+    """Background incremental indexer plus search entry point for the API."""
+
+    INTERVAL = float(os.getenv("SEARCH_INDEX_INTERVAL_SECONDS", "10"))
+    RETRY_MIN_SECONDS = 2  # first retry of index creation, doubled per failure
+    RETRY_MAX_SECONDS = 300
+
+    def __init__(self, database=None):
+        # database: fixed AsyncDatabase (tests); by default the current event loop's
+        self._database = database
+        self._lock = asyncio.Lock()  # one pass at a time
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.indexes_ready = False
+        self.last_result: Optional[Dict] = None
+
+    @property
+    def index(self) -> SearchIndex:
+        database = self._database
+        if database is None:
+            from src.infrastructure.async_mongo import async_mongo
+            database = async_mongo.database()
+        return SearchIndex(database)
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Search Index Service started (every %ss)", self.INTERVAL)
+
+    async def stop(self):
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Search Index Service stopped")
+
+    async def update(self) -> Dict:
+        """Run one incremental indexing pass."""
+        async with self._lock:
+            result = await self.index.update()
+        if any(result.values()):
+            logger.info(f"Search index updated: {result}")
+        self.last_result = result
+        return result
+
+    async def search(self, query: str, **filters) -> Dict:
+        return await self.index.search(query, **filters)
+
+    async def _ensure_indexes(self):
+        """Create the indexes, retrying with backoff until MongoDB answers."""
+        failures = 0
+        while self._running:
+            try:
+                await self.index.ensure_indexes()
+                self.indexes_ready = True
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = min(self.RETRY_MIN_SECONDS * (2 ** failures), self.RETRY_MAX_SECONDS)
+                failures += 1
+                logger.warning("Search index creation failed (retry in %ss): %s", delay, e)
+                await asyncio.sleep(delay)
+
+    async def _loop(self):
+        await self._ensure_indexes()
+        while self._running:
+            try:
+                await self.update()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Search index update failed: {e}")
+            await asyncio.sleep(self.INTERVAL)
+
+
+# Singleton
+search_index_service = SearchIndexService()
@@ -0,0 +1,80 @@
+# src/infrastructure/async_mongo.py
+"""
+Shared async MongoDB access for FastAPI routes.
+
+Routes that call sync ``pymongo`` either occupy a Starlette threadpool
+worker for every request (sync ``def``) or block the event loop outright
+(``async def``). This module hands out PyMongo's native async API
+(``AsyncMongoClient``, pymongo >= 4.13) so routes can ``await`` their
+queries and concurrency is bounded by the connection pool, not the
+threadpool.
+
+One client (and pool) is kept per event loop: an ``AsyncMongoClient`` is
+bound to the loop it first runs on, and tests or scripts may drive the
+API from loops of their own.
+
+Settings: ``MONGO_URI``, ``MONGO_DATABASE`` and ``MONGO_ASYNC_MAX_POOL_SIZE``
+(default 100).
+
+Usage:
+    collection = async_mongo.collection("conversations")
+    doc = await collection.find_one({"conversation_id": conversation_id})
+
+The API closes every client on shutdown (``await async_mongo.aclose()``).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongo:
+    """Per-event-loop ``AsyncMongoClient`` registry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[int, Any] = {}
+
+    def client(self):
+        """Pooled ``AsyncMongoClient`` of the running event loop."""
+        from pymongo import AsyncMongoClient
+
+        key = id(asyncio.get_running_loop())
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = AsyncMongoClient(
+                        os.getenv("MONGO_URI", "mongodb://localhost:27017"),
+                        serverSelectionTimeoutMS=5000,
+                        maxPoolSize=int(os.getenv("MONGO_ASYNC_MAX_POOL_SIZE", "100")),
+                    )
+        return client
+
+    def database(self, name: Optional[str] = None):
+        """``AsyncDatabase`` (``MONGO_DATABASE`` unless ``name`` is given)."""
+        return self.client()[name or os.getenv("MONGO_DATABASE", "conductor_state")]
+
+    def collection(self, name: str, database: Optional[str] = None):
+        """``AsyncCollection`` ``name`` of ``database``."""
+        return self.database(database)[name]
+
+    async def aclose(self):
+        """Close every client (FastAPI shutdown)."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                # Client bound to another (closed) loop
+                logger.debug("Failed to close async MongoDB client: %s", e)
+
+
+# Singleton
+async_mongo = AsyncMongo()
@@ -0,0 +1,166 @@
+# src/infrastructure/conversation_writes.py
+"""
+Single-round-trip writes to the ``conversations`` collection.
+
+Appending messages used to take three round trips (membership ``find_one``,
+participant ``$push``, message ``$push``), and two concurrent replies from
+the same agent could both pass the membership check and push the
+participant twice. ``append_pipeline`` does everything in one update
+pipeline evaluated by the server:
+
+    participants      += [participant]  unless participant.agent_id is present
+    messages          += new messages
+    message_count      = $size(messages)
+    participant_count  = $size(participants)
+    last_message_preview, updated_at
+
+``append_messages`` runs it with ``find_one_and_update`` and returns the new
+message count, i.e. the sequence number of the last appended message.
+The ``*_operation(s)`` builders return pymongo write models so the watcher
+can send several conversation writes in one ``bulk_write``.
+
+Like metrics/tracing, this module only needs pymongo, so the host watcher
+can import it.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+CONVERSATIONS_COLLECTION = "conversations"
+
+# Maximum content length kept in last_message_preview
+PREVIEW_LENGTH = 200
+
+
+def message_preview(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary of a message stored as the conversation's last_message_preview."""
+    preview = {
+        "type": message.get("type"),
+        "content": (message.get("content") or "")[:PREVIEW_LENGTH],
+        "timestamp": message.get("timestamp"),
+    }
+    agent = message.get("agent") or {}
+    if agent.get("name"):
+        preview["agent_name"] = agent["name"]
+    if message.get("task_id"):
+        preview["task_id"] = message["task_id"]
+    return preview
+
+
+def append_pipeline(
+    messages: List[Dict[str, Any]],
+    updated_at: str,
+    participant: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Update pipeline appending ``messages`` (and ``participant`` if new).
+
+    Client values are wrapped in ``$literal`` so message content starting
+    with ``$`` is never read as a field path.
+    """
+    stage: Dict[str, Any] = {
+        "messages": {"$concatArrays": [{"$ifNull": ["$messages", []]}, {"$literal": messages}]},
+        "updated_at": {"$literal": updated_at},
+    }
+    if messages:
+        stage["last_message_preview"] = {"$literal": message_preview(messages[-1])}
+    if participant:
+        current = {"$ifNull": ["$participants", []]}
+        stage["participants"] = {
+            "$cond": [
+                {"$in": [{"$literal": participant.get("agent_id")}, {"$ifNull": ["$participants.agent_id", []]}]},
+                current,
+                {"$concatArrays": [current, {"$literal": [participant]}]},
+            ]
+        }
+    return [
+        {"$set": stage},
+        {"$set": {
+            "message_count": {"$size": "$messages"},
+            "participant_count": {"$size": {"$ifNull": ["$participants", []]}},
+        }},
+    ]
+
+
+def append_messages(
+    collection,
+    conversation_id: str,
+    messages: List[Dict[str, Any]],
+    updated_at: str,
+    participant: Optional[Dict[str, Any]] = None,
+) -> Optional[int]:
+    """Append in one update; returns the new message_count or None if the conversation is missing."""
+    doc = collection.find_one_and_update(
+        {"conversation_id": conversation_id},
+        append_pipeline(messages, updated_at, participant),
+        projection={"_id": 0, "message_count": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["message_count"] if doc else None
+
+
+async def append_messages_async(
+    collection,
+    conversation_id: str,
+    messages: List[Dict[str, Any]],
+    updated_at: str,
+    participant: Optional[Dict[str, Any]] = None,
+) -> Optional[int]:
+    """``append_messages`` for an async (PyMongo ``AsyncCollection``) collection."""
+    doc = await collection.find_one_and_update(
+        {"conversation_id": conversation_id},
+        append_pipeline(messages, updated_at, participant),
+        projection={"_id": 0, "message_count": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["message_count"] if doc else None
+
+
+def append_operation(
+    conversation_id: str,
+    messages: List[Dict[str, Any]],
+    updated_at: str,
+    participant: Optional[Dict[str, Any]] = None,
+) -> UpdateOne:
+    """Bulk-write form of :func:`append_messages`."""
+    return UpdateOne({"conversation_id": conversation_id}, append_pipeline(messages, updated_at, participant))
+
+
+def placeholder_operations(
+    conversation_id: str,
+    task_id: str,
+    content: str,
+    status: str,
+    completed_at: str,
+) -> List[UpdateOne]:
+    """
+    Fill a delegated bot placeholder with its task result.
+
+    The second operation keeps last_message_preview in sync when the
+    placeholder is still the last message of the conversation.
+    """
+    return [
+        UpdateOne(
+            {"conversation_id": conversation_id, "messages.task_id": task_id, "messages.delegated": True},
+            {"$set": {
+                "messages.$.content": content,
+                "messages.$.status": status,
+                "messages.$.completed_at": completed_at,
+            }},
+        ),
+        UpdateOne(
+            {"conversation_id": conversation_id, "last_message_preview.task_id": task_id},
+            {"$set": {"last_message_preview.content": (content or "")[:PREVIEW_LENGTH]}},
+        ),
+    ]
+
+
+def apply_operations(collection, operations: List[UpdateOne]):
+    """Send conversation writes in one ordered round trip (no-op when empty)."""
+    if not operations:
+        return None
+    return collection.bulk_write(operations, ordered=True)
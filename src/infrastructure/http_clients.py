@@ -0,0 +1,339 @@
+# src/infrastructure/http_clients.py
+"""
+Managed outbound HTTP clients.
+
+Creating an ``httpx.AsyncClient`` per call throws away the connection
+(and TLS session) every time: mesh pings, saga tool calls, observation
+fetches and Pulse dispatches all used to do that. This registry keeps one
+long-lived client per upstream, with:
+
+- a keep-alive pool sized per upstream (HTTP/2 when ``h2`` is installed)
+- a per-host concurrency limit (requests beyond it wait for a slot)
+- default timeouts per upstream, overridable per request
+- per-host latency/error metrics in the shared registry, plus a
+  connection/in-flight view at GET /system/http-clients
+
+Upstream settings come from ``UPSTREAMS`` and can be overridden with
+``HTTP_<UPSTREAM>_TIMEOUT``, ``HTTP_<UPSTREAM>_MAX_CONNECTIONS`` and
+``HTTP_<UPSTREAM>_MAX_PER_HOST`` environment variables.
+
+Usage:
+    client = http_clients.async_client("mcp")
+    resp = await client.get(url, timeout=5)
+
+The API closes every client on shutdown (``await http_clients.aclose()``).
+The host watcher, which only has ``requests``, uses ``pooled_session``.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.infrastructure.metrics import HTTP_CLIENT_ERRORS, HTTP_CLIENT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Pool and timeout settings of one upstream."""
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_connections: int = 50
+    max_keepalive: int = 20
+    keepalive_expiry: float = 30.0
+    max_per_host: int = 10
+
+
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    # MCP sidecars: health pings and saga tool calls, many hosts
+    "mcp": UpstreamConfig(timeout=30.0, max_connections=100, max_per_host=8),
+    # Construction API (task observations)
+    "construction": UpstreamConfig(
+        timeout=float(os.getenv("OBSERVATION_TIMEOUT_SECONDS", "10")), max_per_host=20
+    ),
+    # Conductor API itself (dispatch fallback, observation state, delegation)
+    "conductor": UpstreamConfig(timeout=15.0, max_per_host=20),
+    # Conductor gateway (watcher task events, statistics, MCP config)
+    "gateway": UpstreamConfig(timeout=10.0, max_per_host=20),
+    "default": UpstreamConfig(),
+}
+
+
+def upstream_config(name: str) -> UpstreamConfig:
+    """Settings of ``name`` with environment overrides applied."""
+    config = UPSTREAMS.get(name, UPSTREAMS["default"])
+    prefix = f"HTTP_{name.upper()}_"
+    overrides: Dict[str, Any] = {}
+    for env, field, cast in (
+        ("TIMEOUT", "timeout", float),
+        ("MAX_CONNECTIONS", "max_connections", int),
+        ("MAX_PER_HOST", "max_per_host", int),
+    ):
+        value = os.getenv(prefix + env)
+        if value:
+            overrides[field] = cast(value)
+    return replace(config, **overrides) if overrides else config
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HostStats:
+    """Live counters of one upstream host (metrics hold the latency histogram)."""
+
+    __slots__ = ("requests", "errors", "in_flight", "waiting")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.waiting = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+def _host_key(request) -> str:
+    url = request.url
+    return f"{url.host}:{url.port}" if url.port else url.host
+
+
+class _InstrumentedTransport:
+    """Shared bookkeeping of the async/sync transport wrappers."""
+
+    def __init__(self, upstream: str, config: UpstreamConfig, inner):
+        self.upstream = upstream
+        self.config = config
+        self.inner = inner
+        self.hosts: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, host: str) -> HostStats:
+        stats = self.hosts.get(host)
+        if stats is None:
+            with self._lock:
+                stats = self.hosts.setdefault(host, HostStats())
+        return stats
+
+    def _record(self, host: str, stats: HostStats, started: float, failed: bool):
+        stats.in_flight -= 1
+        stats.requests += 1
+        if failed:
+            stats.errors += 1
+            HTTP_CLIENT_ERRORS.inc(upstream=self.upstream, host=host)
+        else:
+            HTTP_CLIENT_SECONDS.observe(time.monotonic() - started, upstream=self.upstream, host=host)
+
+    def open_connections(self) -> Optional[int]:
+        """Connections held by the pool (None if the transport doesn't say)."""
+        pool = getattr(self.inner, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        return len(connections) if connections is not None else None
+
+
+def _build_transports():
+    """Define the httpx transport wrappers (httpx is imported lazily)."""
+    import httpx
+
+    class AsyncInstrumentedTransport(_InstrumentedTransport, httpx.AsyncBaseTransport):
+        def __init__(self, upstream: str, config: UpstreamConfig, inner):
+            super().__init__(upstream, config, inner)
+            self._slots: Dict[str, asyncio.Semaphore] = {}
+
+        async def handle_async_request(self, request):
+            host = _host_key(request)
+            stats = self._stats(host)
+            slot = self._slots.setdefault(host, asyncio.Semaphore(self.config.max_per_host))
+            stats.waiting += 1
+            async with slot:
+                stats.waiting -= 1
+                stats.in_flight += 1
+                started = time.monotonic()
+                try:
+                    response = await self.inner.handle_async_request(request)
+                except Exception:
+                    self._record(host, stats, started, failed=True)
+                    raise
+                self._record(host, stats, started, failed=False)
+                return response
+
+        async def aclose(self):
+            await self.inner.aclose()
+
+    class SyncInstrumentedTransport(_InstrumentedTransport, httpx.BaseTransport):
+        def __init__(self, upstream: str, config: UpstreamConfig, inner):
+            super().__init__(upstream, config, inner)
+            self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+        def handle_request(self, request):
+            host = _host_key(request)
+            stats = self._stats(host)
+            with self._lock:
+                slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.config.max_per_host))
+            stats.waiting += 1
+            with slot:
+                stats.waiting -= 1
+                stats.in_flight += 1
+                started = time.monotonic()
+                try:
+                    response = self.inner.handle_request(request)
+                except Exception:
+                    self._record(host, stats, started, failed=True)
+                    raise
+                self._record(host, stats, started, failed=False)
+                return response
+
+        def close(self):
+            self.inner.close()
+
+    return AsyncInstrumentedTransport, SyncInstrumentedTransport
+
+
+class HttpClientRegistry:
+    """
+    One long-lived httpx client per upstream (async and sync flavours).
+
+    Async clients are bound to the event loop that created them; a caller
+    on another loop (e.g. a test's ``asyncio.run``) gets its own client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._async: Dict[Tuple[str, int], Tuple[Any, _InstrumentedTransport]] = {}
+        self._sync: Dict[str, Tuple[Any, _InstrumentedTransport]] = {}
+        self._transport_classes = None
+
+    def _client_kwargs(self, config: UpstreamConfig) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            "timeout": httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        }
+
+    def _transports(self):
+        if self._transport_classes is None:
+            self._transport_classes = _build_transports()
+        return self._transport_classes
+
+    def async_client(self, upstream: str = "default"):
+        """Pooled ``httpx.AsyncClient`` for ``upstream`` (call from a running loop)."""
+        import httpx
+
+        key = (upstream, id(asyncio.get_running_loop()))
+        entry = self._async.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._async.get(key)
+                if entry is None:
+                    config = upstream_config(upstream)
+                    kwargs = self._client_kwargs(config)
+                    http2 = _http2_available()
+                    inner = httpx.AsyncHTTPTransport(limits=kwargs["limits"], http2=http2)
+                    transport = self._transports()[0](upstream, config, inner)
+                    client = httpx.AsyncClient(transport=transport, timeout=kwargs["timeout"], http2=http2)
+                    entry = self._async[key] = (client, transport)
+        return entry[0]
+
+    def sync_client(self, upstream: str = "default"):
+        """Pooled ``httpx.Client`` for ``upstream`` (thread-safe)."""
+        import httpx
+
+        entry = self._sync.get(upstream)
+        if entry is None:
+            with self._lock:
+                entry = self._sync.get(upstream)
+                if entry is None:
+                    config = upstream_config(upstream)
+                    kwargs = self._client_kwargs(config)
+                    http2 = _http2_available()
+                    inner = httpx.HTTPTransport(limits=kwargs["limits"], http2=http2)
+                    transport = self._transports()[1](upstream, config, inner)
+                    client = httpx.Client(transport=transport, timeout=kwargs["timeout"], http2=http2)
+                    entry = self._sync[upstream] = (client, transport)
+        return entry[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-upstream, per-host counters and pool sizes."""
+        result: Dict[str, Any] = {}
+        entries = [(f"{name}:async", t) for (name, _), (_, t) in list(self._async.items())]
+        entries += [(f"{name}:sync", t) for name, (_, t) in list(self._sync.items())]
+        for key, transport in entries:
+            upstream, flavour = key.rsplit(":", 1)
+            view = result.setdefault(upstream, {"config": vars(transport.config).copy(), "clients": []})
+            view["clients"].append({
+                "type": flavour,
+                "open_connections": transport.open_connections(),
+                "hosts": {host: s.to_dict() for host, s in transport.hosts.items()},
+            })
+        return result
+
+    async def aclose(self):
+        """Close every client (FastAPI shutdown)."""
+        with self._lock:
+            async_entries, self._async = list(self._async.values()), {}
+            sync_entries, self._sync = list(self._sync.values()), {}
+        for client, _ in async_entries:
+            try:
+                await client.aclose()
+            except Exception as e:
+                # Client bound to another (closed) loop
+                logger.debug("Failed to close async HTTP client: %s", e)
+        for client, _ in sync_entries:
+            client.close()
+
+
+def pooled_session(upstream: str = "default"):
+    """
+    Keep-alive ``requests.Session`` for ``upstream`` with latency metrics.
+
+    The pool holds ``max_per_host`` connections per host and blocks when
+    they are all busy. Timeouts are still passed per request, as usual
+    with requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    config = upstream_config(upstream)
+
+    class _Session(requests.Session):
+        def send(self, request, **kwargs):
+            host = urlparse(request.url).netloc
+            started = time.monotonic()
+            try:
+                response = super().send(request, **kwargs)
+            except Exception:
+                HTTP_CLIENT_ERRORS.inc(upstream=upstream, host=host)
+                raise
+            HTTP_CLIENT_SECONDS.observe(time.monotonic() - started, upstream=upstream, host=host)
+            return response
+
+    session = _Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.max_per_host, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Singleton
+http_clients = HttpClientRegistry()
@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+import shutil
 import subprocess
 import time
 from typing import Optional, List
@@ -233,6 +234,50 @@ class GeminiCLIClient(BaseCLIClient):
         return unique_tools
 
 
+# `claude --version` boots a Node runtime (hundreds of ms), so its outcome is
+# cached on disk, keyed by the resolved binary path and its mtime: upgrading
+# or removing the CLI invalidates the entry.
+CLI_PROBE_CACHE = Path(
+    os.getenv("CONDUCTOR_CACHE_DIR", Path.home() / ".cache" / "conductor")
+) / "cli_probe.json"
+_cli_probe_memo = {}
+
+
+def claude_cli_available() -> bool:
+    """Whether a working Claude Code CLI is on PATH (probed once per binary)."""
+    binary = shutil.which("claude")
+    if binary is None:
+        return False
+    try:
+        key = f"{os.path.realpath(binary)}:{os.stat(binary).st_mtime_ns}"
+    except OSError:
+        return False
+    if key in _cli_probe_memo:
+        return _cli_probe_memo[key]
+
+    try:
+        cached = json.loads(CLI_PROBE_CACHE.read_text())
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get("key") == key:
+        available = bool(cached.get("available"))
+    else:
+        try:
+            result = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5)
+            available = result.returncode == 0
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug(f"Claude Code CLI not available: {e}")
+            available = False
+        try:
+            CLI_PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            CLI_PROBE_CACHE.write_text(json.dumps({"key": key, "available": available}))
+        except OSError as e:
+            logger.debug(f"Could not cache Claude Code CLI probe: {e}")
+
+    _cli_probe_memo[key] = available
+    return available
+
+
 def create_llm_client(
     ai_provider: str,
     working_directory: str = None,
@@ -264,18 +309,11 @@ def create_llm_client(
     # If running locally, prefer Claude Code CLI (if available)
     if not is_docker:
         # Check if Claude Code is available
-        try:
-            result = subprocess.run(["claude", "--version"],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=5)
-            if result.returncode == 0:
-                logger.info(
-                    f"🏠 Local environment detected - Using Claude Code CLI (timeout: {timeout}s, admin: {is_admin_agent}, mcp: {mcp_config is not None}, mcp_configs: {mcp_configs})"
-                )
-                return ClaudeCLIClient(working_directory, timeout, is_admin_agent, mcp_config, mcp_configs)
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
-            logger.debug(f"Claude Code CLI not available: {e}")
+        if claude_cli_available():
+            logger.info(
+                f"🏠 Local environment detected - Using Claude Code CLI (timeout: {timeout}s, admin: {is_admin_agent}, mcp: {mcp_config is not None}, mcp_configs: {mcp_configs})"
+            )
+            return ClaudeCLIClient(working_directory, timeout, is_admin_agent, mcp_config, mcp_configs)
 
     # Fallback to provider-specific clients (for Docker or when Claude Code is not available)
     if ai_provider == "claude":
@@ -0,0 +1,426 @@
+# src/infrastructure/metrics.py
+"""
+Lightweight metrics: counters, gauges and HDR-style latency histograms.
+
+Shared by the API, the agent task queue consumer and the task watcher
+(which runs on the host, so this module only depends on the stdlib).
+
+Histograms use log-linear buckets (16 sub-buckets per power of two, ~6%
+relative error) stored sparsely, so recording is O(1) and snapshots from
+different processes can be merged bucket by bucket. The watcher publishes
+its snapshot with each heartbeat and the API merges them at
+GET /system/metrics.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Scale factors: histograms store integers in these units
+SECONDS = 1_000_000  # microsecond resolution
+BYTES = 1
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _bucket_index(value: int) -> int:
+    """Map a non-negative integer to its log-linear bucket index."""
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (value >> shift)
+
+
+def _bucket_midpoint(index: int) -> float:
+    """Representative value of a bucket (midpoint of its range)."""
+    if index < 2 * SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index - shift * SUB_BUCKETS
+    low = mantissa << shift
+    high = ((mantissa + 1) << shift) - 1
+    return (low + high) / 2
+
+
+class _Child:
+    """A single labelled series."""
+
+    __slots__ = ("_lock",)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+
+class CounterChild(_Child):
+    __slots__ = ("value",)
+
+    def __init__(self):
+        super().__init__()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+    def merge(self, data: Dict[str, Any]):
+        self.inc(data.get("value", 0))
+
+
+class GaugeChild(_Child):
+    __slots__ = ("value",)
+
+    def __init__(self):
+        super().__init__()
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+    def merge(self, data: Dict[str, Any]):
+        # Gauges from several processes add up (e.g. active tasks per watcher)
+        self.inc(data.get("value", 0))
+
+
+class HistogramChild(_Child):
+    __slots__ = ("scale", "buckets", "count", "sum", "min", "max")
+
+    def __init__(self, scale: int):
+        super().__init__()
+        self.scale = scale
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def observe(self, value: float):
+        raw = int(value * self.scale) if value > 0 else 0
+        index = _bucket_index(raw)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.sum += raw
+            if self.min is None or raw < self.min:
+                self.min = raw
+            if self.max is None or raw > self.max:
+                self.max = raw
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0..1) in base units."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(q * self.count + 0.5))
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    value = min(max(_bucket_midpoint(index), self.min), self.max)
+                    return value / self.scale
+            return self.max / self.scale
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "min": self.min,
+                "max": self.max,
+                "buckets": {str(k): v for k, v in self.buckets.items()},
+            }
+
+    def merge(self, data: Dict[str, Any]):
+        if not data.get("count"):
+            return
+        with self._lock:
+            for key, count in data.get("buckets", {}).items():
+                index = int(key)
+                self.buckets[index] = self.buckets.get(index, 0) + count
+            self.count += data["count"]
+            self.sum += data.get("sum", 0)
+            if data.get("min") is not None:
+                self.min = data["min"] if self.min is None else min(self.min, data["min"])
+            if data.get("max") is not None:
+                self.max = data["max"] if self.max is None else max(self.max, data["max"])
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Human-readable summary in base units."""
+        count = self.count
+        return {
+            "count": count,
+            "sum": self.sum / self.scale,
+            "mean": (self.sum / count / self.scale) if count else 0.0,
+            "min": (self.min or 0) / self.scale,
+            "max": (self.max or 0) / self.scale,
+            **{f"p{int(q * 100)}": self.quantile(q) for q in quantiles},
+        }
+
+
+class MetricFamily:
+    """A named metric with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], _Child] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> _Child:
+        raise NotImplementedError
+
+    def labels(self, **labels) -> Any:
+        """Get (or create) the series for these label values."""
+        key = tuple(str(labels.get(name) or "") for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def series(self) -> List[Tuple[Dict[str, str], _Child]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in items]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "series": [
+                {"labels": labels, **child.snapshot()} for labels, child in self.series()
+            ],
+        }
+
+
+class Counter(MetricFamily):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0, **labels):
+        self.labels(**labels).inc(amount)
+
+
+class Gauge(MetricFamily):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float, **labels):
+        self.labels(**labels).set(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        self.labels(**labels).inc(amount)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.labels(**labels).dec(amount)
+
+
+class Histogram(MetricFamily):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), scale: int = SECONDS):
+        super().__init__(name, help, labelnames)
+        self.scale = scale
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.scale)
+
+    def observe(self, value: float, **labels):
+        self.labels(**labels).observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data["scale"] = self.scale
+        return data
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them as Prometheus text or JSON."""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames, **kwargs) -> Any:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.get(name)
+                if family is None:
+                    family = cls(name, help, tuple(labelnames), **kwargs)
+                    self._families[name] = family
+        return family
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  scale: int = SECONDS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, scale=scale)
+
+    def families(self) -> List[MetricFamily]:
+        with self._lock:
+            return list(self._families.values())
+
+    # ------------------------------------------------------------------
+    # Snapshots (cross-process aggregation)
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable snapshot (JSON/BSON safe) of every family."""
+        return {family.name: family.snapshot() for family in self.families()}
+
+    def merge_snapshot(self, snapshot: Dict[str, Any]):
+        """Add a snapshot (e.g. from a watcher heartbeat) into this registry."""
+        factories = {"counter": self.counter, "gauge": self.gauge}
+        for name, data in (snapshot or {}).items():
+            kind = data.get("type")
+            labelnames = data.get("labelnames", [])
+            if kind == "histogram":
+                family = self.histogram(name, data.get("help", ""), labelnames,
+                                        scale=data.get("scale", SECONDS))
+            elif kind in factories:
+                family = factories[kind](name, data.get("help", ""), labelnames)
+            else:
+                continue
+            for series in data.get("series", []):
+                family.labels(**series.get("labels", {})).merge(series)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Dict[str, Any]]) -> "MetricsRegistry":
+        merged = cls()
+        for snapshot in snapshots:
+            merged.merge_snapshot(snapshot)
+        return merged
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def to_json(self) -> Dict[str, Any]:
+        """Readable view: plain values for counters/gauges, percentiles for histograms."""
+        result = {}
+        for family in self.families():
+            series = []
+            for labels, child in family.series():
+                if isinstance(child, HistogramChild):
+                    series.append({"labels": labels, **child.summary()})
+                else:
+                    series.append({"labels": labels, "value": child.value})
+            result[family.name] = {"type": family.kind, "help": family.help, "series": series}
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (histograms as summaries)."""
+        lines = []
+        for family in sorted(self.families(), key=lambda f: f.name):
+            prom_type = "summary" if family.kind == "histogram" else family.kind
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {prom_type}")
+            for labels, child in family.series():
+                if isinstance(child, HistogramChild):
+                    for q in DEFAULT_QUANTILES:
+                        quantile_labels = _format_labels({**labels, "quantile": str(q)})
+                        lines.append(f"{family.name}{quantile_labels} {child.quantile(q):.6g}")
+                    label_str = _format_labels(labels)
+                    lines.append(f"{family.name}_sum{label_str} {child.sum / child.scale:.6g}")
+                    lines.append(f"{family.name}_count{label_str} {child.count}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {child.value:.6g}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(value)}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# ============================================================================
+# Shared registry and task pipeline metrics
+# ============================================================================
+
+metrics = MetricsRegistry()
+
+# Stages: enqueue_to_consume, consume_to_insert, insert_to_pickup,
+# pickup_to_first_token, total
+TASK_STAGE_SECONDS = metrics.histogram(
+    "conductor_task_stage_seconds",
+    "Latency of each task pipeline stage",
+    ("stage", "agent_id", "provider"),
+)
+TASK_EXECUTION_SECONDS = metrics.histogram(
+    "conductor_task_execution_seconds",
+    "LLM subprocess execution time",
+    ("agent_id", "provider"),
+)
+PROMPT_BYTES = metrics.histogram(
+    "conductor_prompt_bytes",
+    "Size of the prompt submitted with each task",
+    ("agent_id",),
+    scale=BYTES,
+)
+TASKS_TOTAL = metrics.counter(
+    "conductor_tasks_total",
+    "Tasks handled per component and outcome",
+    ("component", "outcome", "agent_id"),
+)
+# Insert -> claim by the class of the submitted priority (task_ordering.priority_class)
+TASK_QUEUE_WAIT_SECONDS = metrics.histogram(
+    "conductor_task_queue_wait_seconds",
+    "Time a task waited in the MongoDB queue before a watcher claimed it",
+    ("priority_class",),
+)
+TASK_DEADLINE_MISSED = metrics.counter(
+    "conductor_task_deadline_missed_total",
+    "Tasks claimed after their deadline",
+    ("priority_class",),
+)
+ACTIVE_TASKS = metrics.gauge(
+    "conductor_active_tasks",
+    "Tasks currently being processed",
+    ("component",),
+)
+# Outbound HTTP (pooled clients in the API, requests.Session in the watcher)
+HTTP_CLIENT_SECONDS = metrics.histogram(
+    "conductor_http_client_seconds",
+    "Outbound HTTP request latency (until response headers)",
+    ("upstream", "host"),
+)
+HTTP_CLIENT_ERRORS = metrics.counter(
+    "conductor_http_client_errors_total",
+    "Outbound HTTP requests that failed before a response",
+    ("upstream", "host"),
+)
@@ -0,0 +1,178 @@
+# src/infrastructure/prompt_segments.py
+"""
+Content-addressed prompt storage.
+
+Task prompts repeat the same persona/playbook (<system_context>), screenplay,
+conversation context and history turns across thousands of tasks. Instead of
+storing the full XML in every ``tasks`` document, the prompt is split at
+section boundaries and every section except the last (the ``<user_request>``
+tail) is stored once in ``prompt_segments`` keyed by its SHA-256:
+
+    tasks:           {prompt_segments: [hash, ...], prompt_tail: "...", prompt_size: n}
+    prompt_segments: {_id: hash, content, size, created_at, last_used_at}
+
+``assemble()`` rebuilds the exact original prompt (and still accepts legacy
+documents with an inline ``prompt``).
+
+Opt-in: segmenting is off unless ``TASK_PROMPT_STORAGE=segments``. When it is
+on, task documents have NO ``prompt`` field — anything reading
+``tasks.prompt`` directly (queries, dashboards, scripts) must rebuild it with
+``assemble()`` instead. Only enable it once every watcher in the deployment
+runs a version that assembles segmented prompts.
+
+Tasks are never deleted one by one: the watcher's TTL index drops them
+TASK_TTL_SECONDS after ``created_at``. Every ``store()`` refreshes
+``last_used_at`` of the segments it references, so a segment is only read by
+tasks created before it was last used, and a TTL index on ``last_used_at``
+(SEGMENT_TTL_SECONDS, longer than the task TTL) removes it once the last of
+those tasks is gone.
+
+Like metrics/tracing, this module only needs pymongo, so the host watcher
+can import it.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_COLLECTION = "prompt_segments"
+
+# Tasks expire this long after created_at (TTL index created by the watcher)
+TASK_TTL_SECONDS = 24 * 3600
+
+# Segments unused for this long are dropped by TTL; must outlive the task TTL
+SEGMENT_TTL_SECONDS = TASK_TTL_SECONDS + int(os.getenv("PROMPT_SEGMENT_GRACE_SECONDS", str(24 * 3600)))
+
+# Segment contents are immutable (addressed by hash), so they cache forever
+MAX_CACHED_SEGMENTS = int(os.getenv("PROMPT_SEGMENT_CACHE_SIZE", "4096"))
+
+# A new segment starts at each line opening one of these sections (or closing
+# a container, so the last history turn hashes the same as the others)
+_BOUNDARY = re.compile(
+    r"^[ \t]*<(?:system_context|session_context|screenplay|conversation_context|delegation"
+    r"|world_state|mcp_mesh_topology|conversation_history|turn|user_request"
+    r"|/session_context|/conversation_history)\b",
+    re.MULTILINE,
+)
+
+
+class PromptSegmentMissing(Exception):
+    """A task references a segment that is no longer in the store."""
+
+
+def segment_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def split_prompt(prompt: str) -> List[str]:
+    """Split a prompt at section boundaries; "".join(result) == prompt."""
+    starts = [m.start() for m in _BOUNDARY.finditer(prompt) if m.start() > 0]
+    bounds = [0] + starts + [len(prompt)]
+    return [prompt[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+class PromptSegmentStore:
+    """Stores prompts as deduplicated segments plus a per-task tail."""
+
+    def __init__(self, db, cache_size: int = MAX_CACHED_SEGMENTS):
+        self.collection = db[SEGMENTS_COLLECTION]
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self):
+        try:
+            self.collection.create_index("last_used_at", expireAfterSeconds=SEGMENT_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to create prompt_segments indexes: {e}")
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def store(self, prompt: str) -> Dict[str, Any]:
+        """
+        Persist the prompt segments and return the task fields that reference them.
+
+        Returns:
+            {"prompt_segments": [hash, ...], "prompt_tail": str, "prompt_size": int}
+        """
+        pieces = split_prompt(prompt or "")
+        tail = pieces.pop() if pieces else ""
+        hashes = [segment_hash(piece) for piece in pieces]
+
+        if hashes:
+            now = datetime.now(timezone.utc)
+            contents = dict(zip(hashes, pieces))
+            operations = [
+                UpdateOne(
+                    {"_id": digest},
+                    {
+                        "$setOnInsert": {"content": contents[digest], "size": len(contents[digest]), "created_at": now},
+                        "$set": {"last_used_at": now},
+                    },
+                    upsert=True,
+                )
+                for digest in contents
+            ]
+            self.collection.bulk_write(operations, ordered=False)
+            for digest, content in contents.items():
+                self._remember(digest, content)
+
+        return {"prompt_segments": hashes, "prompt_tail": tail, "prompt_size": len(prompt or "")}
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def assemble(self, task: Dict[str, Any]) -> str:
+        """Rebuild the full prompt of a task (inline ``prompt`` is returned as is)."""
+        if task.get("prompt"):
+            return task["prompt"]
+        hashes = task.get("prompt_segments") or []
+        if not hashes:
+            return task.get("prompt_tail") or ""
+
+        contents: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for digest in set(hashes):
+                content = self._cache.get(digest)
+                if content is None:
+                    missing.append(digest)
+                else:
+                    self._cache.move_to_end(digest)
+                    contents[digest] = content
+
+        if missing:
+            for doc in self.collection.find({"_id": {"$in": missing}}, {"content": 1}):
+                contents[doc["_id"]] = doc["content"]
+                self._remember(doc["_id"], doc["content"])
+
+        absent = [digest for digest in set(hashes) if digest not in contents]
+        if absent:
+            raise PromptSegmentMissing(f"Missing prompt segments: {', '.join(sorted(absent))}")
+
+        return "".join(contents[digest] for digest in hashes) + (task.get("prompt_tail") or "")
+
+    def _remember(self, digest: str, content: str):
+        with self._lock:
+            self._cache[digest] = content
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+def segments_enabled() -> bool:
+    """TASK_PROMPT_STORAGE=inline (default) | segments."""
+    return os.getenv("TASK_PROMPT_STORAGE", "inline").lower() == "segments"
+
@@ -0,0 +1,392 @@
+# src/infrastructure/search_index.py
+"""
+Full-text search over conversations, their messages and agent history.
+
+Conversation messages live in arrays inside ``conversations`` documents and
+history entries in ``history``; neither can carry a useful text index. This
+module keeps a flattened copy in ``search_messages``, one document per
+searchable unit, under a MongoDB text index:
+
+    kind="conversation"  title + context of a conversation  (_id "conversation:<id>")
+    kind="message"       one conversation message           (_id "message:<id>:<seq>")
+    kind="history"       one history entry (input + reply)  (_id "history:<_id>")
+
+``SearchIndex.update`` is incremental. Conversations are picked up through
+a keyset watermark on ``(updated_at, conversation_id)`` and only messages
+past the count already indexed are read (``$slice``); history through a
+watermark on ``(createdAt, _id)``. Delegation placeholders are filled in
+place without touching ``updated_at``, so messages indexed while still
+pending are re-read on every pass until they settle. Watermarks persist in
+``search_index_state``; nothing is ever rebuilt from scratch.
+
+Hits of conversations deleted since they were indexed are dropped (and
+purged from the index) when a search finds them.
+
+Settings: ``SEARCH_TEXT_LANGUAGE`` (text index default_language, default
+``none``: no stemming or stop words, content mixes Portuguese and English)
+and ``SEARCH_INDEX_BATCH`` (documents read per batch, default 200).
+
+Written against PyMongo's async API (src.infrastructure.async_mongo).
+"""
+
+import logging
+import os
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateMany, UpdateOne
+
+from src.infrastructure.storage.history_archive import entry_time
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLLECTION = "search_messages"
+STATE_COLLECTION = "search_index_state"
+CONVERSATIONS_COLLECTION = "conversations"
+HISTORY_COLLECTION = "history"
+
+KIND_CONVERSATION = "conversation"
+KIND_MESSAGE = "message"
+KIND_HISTORY = "history"
+
+# Placeholder statuses that will still be overwritten in place
+PENDING_STATUSES = ("pending", "running", "processing")
+
+# Upper bound of messages read from one conversation per pass ($slice needs a limit)
+MAX_MESSAGES_PER_READ = 100000
+
+SNIPPET_WIDTH = 200
+
+_STATE_ID = "watermarks"
+_WORD = re.compile(r"\w+", re.UNICODE)
+_PHRASE = re.compile(r'"([^"]+)"')
+
+CONVERSATION_PROJECTION = {
+    "_id": 0,
+    "conversation_id": 1,
+    "title": 1,
+    "context": 1,
+    "screenplay_id": 1,
+    "updated_at": 1,
+}
+
+
+def _batch_size() -> int:
+    return int(os.getenv("SEARCH_INDEX_BATCH", "200"))
+
+
+def conversation_document(conversation: Dict[str, Any], indexed: int) -> Dict[str, Any]:
+    """Index entry of the conversation itself (title + context)."""
+    return {
+        "kind": KIND_CONVERSATION,
+        "conversation_id": conversation["conversation_id"],
+        "screenplay_id": conversation.get("screenplay_id"),
+        "title": conversation.get("title") or "",
+        "content": conversation.get("context") or "",
+        "timestamp": entry_time({"timestamp": conversation.get("updated_at")}),
+        "indexed": indexed,
+    }
+
+
+def message_document(conversation: Dict[str, Any], seq: int, message: Dict[str, Any]) -> Dict[str, Any]:
+    """Index entry of the ``seq``-th (1-based) message of a conversation."""
+    agent = message.get("agent") or {}
+    return {
+        "kind": KIND_MESSAGE,
+        "conversation_id": conversation["conversation_id"],
+        "screenplay_id": conversation.get("screenplay_id"),
+        "seq": seq,
+        "message_id": message.get("id"),
+        "type": message.get("type"),
+        "agent_id": agent.get("agent_id") or message.get("source_agent_id"),
+        "agent_name": agent.get("name"),
+        "instance_id": agent.get("instance_id"),
+        "content": message.get("content") or "",
+        "timestamp": entry_time(message),
+        "pending": message.get("status") in PENDING_STATUSES,
+    }
+
+
+def history_document(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Index entry of a history document (question and answer in one text)."""
+    content = "\n\n".join(part for part in (entry.get("user_input"), entry.get("ai_response")) if part)
+    return {
+        "kind": KIND_HISTORY,
+        "agent_id": entry.get("agent_id"),
+        "instance_id": entry.get("instance_id"),
+        "screenplay_id": entry.get("screenplay_id"),
+        "content": content,
+        "timestamp": entry_time(entry),
+    }
+
+
+def _upsert(doc_id: str, document: Dict[str, Any]) -> UpdateOne:
+    return UpdateOne({"_id": doc_id}, {"$set": document}, upsert=True)
+
+
+def search_filter(
+    query: str,
+    agent_id: Optional[str] = None,
+    screenplay_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    kinds: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """MongoDB filter of a search (``$text`` plus the optional equality/range filters)."""
+    query_filter: Dict[str, Any] = {"$text": {"$search": query}}
+    if agent_id:
+        query_filter["agent_id"] = agent_id
+    if screenplay_id:
+        query_filter["screenplay_id"] = screenplay_id
+    if since:
+        query_filter["timestamp"] = {"$gte": since}
+    if kinds:
+        query_filter["kind"] = {"$in": list(kinds)}
+    return query_filter
+
+
+def search_terms(query: str) -> List[str]:
+    """Terms worth highlighting: quoted phrases and words, minus negated words."""
+    phrases = [phrase.strip() for phrase in _PHRASE.findall(query) if phrase.strip()]
+    rest = _PHRASE.sub(" ", query)
+    words = [token for token in rest.split() if not token.startswith("-")]
+    terms = phrases + [word for token in words for word in _WORD.findall(token)]
+    return [_fold(term) for term in dict.fromkeys(terms)]
+
+
+def _fold(text: str) -> str:
+    """
+    Lower-case, accent-free copy of ``text`` with the same length, so
+    offsets found in it are valid in the original (like the text index,
+    "acao" matches "Ação").
+    """
+    folded = []
+    for char in text:
+        base = unicodedata.normalize("NFKD", char)[:1] or char
+        folded.append((base.lower() or base)[:1])
+    return "".join(folded)
+
+
+def _matches(content: str, terms: List[str]) -> List[Tuple[int, int]]:
+    if not terms:
+        return []
+    folded = _fold(content)
+    pattern = re.compile(r"(?<!\w)(?:" + "|".join(re.escape(term) for term in terms) + r")(?!\w)")
+    return [match.span() for match in pattern.finditer(folded)]
+
+
+def make_snippet(content: str, terms: List[str], width: int = SNIPPET_WIDTH) -> Dict[str, Any]:
+    """
+    Window of ``content`` around the densest cluster of ``terms``.
+
+    Returns ``{"snippet": str, "highlights": [[start, end], ...]}`` with
+    offsets relative to the snippet; "…" marks cut ends.
+    """
+    spans = _matches(content, terms)
+    if len(content) <= width:
+        start, end = 0, len(content)
+    else:
+        start = 0
+        if spans:
+            best = max(spans, key=lambda span: sum(1 for other in spans if span[0] <= other[0] < span[0] + width))
+            start = max(0, min(best[0] - width // 4, len(content) - width))
+            if start:
+                space = content.find(" ", start, best[0])
+                start = space + 1 if space != -1 else start
+        end = min(len(content), start + width)
+        if end < len(content):
+            space = content.rfind(" ", start, end)
+            end = space if space > start else end
+
+    prefix = "…" if start > 0 else ""
+    snippet = prefix + content[start:end] + ("…" if end < len(content) else "")
+    highlights = [
+        [s - start + len(prefix), e - start + len(prefix)]
+        for s, e in spans if s >= start and e <= end
+    ]
+    return {"snippet": snippet, "highlights": highlights}
+
+
+def search_result(document: Dict[str, Any], terms: List[str]) -> Dict[str, Any]:
+    """API shape of an index hit."""
+    result = {key: value for key, value in document.items() if key not in ("_id", "content", "pending", "indexed")}
+    if isinstance(result.get("timestamp"), datetime):
+        result["timestamp"] = result["timestamp"].isoformat()
+    # a conversation without context can only have matched on its title
+    text = document.get("content") or (document.get("title") if document["kind"] == KIND_CONVERSATION else "")
+    result.update(make_snippet(text or "", terms))
+    return result
+
+
+class SearchIndex:
+    """Incremental maintenance and ranked lookup of ``search_messages``."""
+
+    def __init__(self, database, batch_size: Optional[int] = None):
+        self.db = database
+        self.entries = database[SEARCH_COLLECTION]
+        self.state = database[STATE_COLLECTION]
+        self.conversations = database[CONVERSATIONS_COLLECTION]
+        self.history = database[HISTORY_COLLECTION]
+        self.batch_size = batch_size or _batch_size()
+
+    async def ensure_indexes(self):
+        await self.entries.create_index(
+            [("content", "text"), ("title", "text")],
+            name="search_text",
+            weights={"content": 10, "title": 3},
+            default_language=os.getenv("SEARCH_TEXT_LANGUAGE", "none"),
+            # messages may carry a "language" field of their own
+            language_override="search_language",
+        )
+        await self.entries.create_index([("conversation_id", 1), ("seq", 1)])
+        await self.entries.create_index([("pending", 1)], partialFilterExpression={"pending": True})
+
+    # ------------------------------------------------------------------
+    # Incremental indexing
+    # ------------------------------------------------------------------
+
+    async def update(self) -> Dict[str, int]:
+        """One indexing pass: new/changed conversations, pending placeholders, new history."""
+        stats = {"conversations": 0, "messages": 0, "history": 0}
+        watermarks = await self.state.find_one({"_id": _STATE_ID}) or {}
+        await self._update_conversations(watermarks.get("conversations"), stats)
+        await self._refresh_pending(stats)
+        await self._update_history(watermarks.get("history"), stats)
+        return stats
+
+    async def index_conversation(self, conversation_id: str, start: Optional[int] = None) -> int:
+        """
+        Index the messages of a conversation from position ``start`` (0-based;
+        default: past the ones already indexed). Returns how many were written.
+        """
+        previous = await self.entries.find_one({"_id": f"conversation:{conversation_id}"}) or {}
+        if start is None:
+            start = previous.get("indexed", 0)
+        projection = dict(CONVERSATION_PROJECTION, messages={"$slice": [start, MAX_MESSAGES_PER_READ]})
+        conversation = await self.conversations.find_one({"conversation_id": conversation_id}, projection)
+        if conversation is None:
+            await self.entries.delete_many({"conversation_id": conversation_id})
+            return 0
+
+        messages = conversation.pop("messages", None) or []
+        indexed = max(previous.get("indexed", 0), start + len(messages))
+        operations = [
+            _upsert(f"message:{conversation_id}:{seq}", message_document(conversation, seq, message))
+            for seq, message in enumerate(messages, start=start + 1)
+        ]
+        operations.append(_upsert(f"conversation:{conversation_id}", conversation_document(conversation, indexed)))
+        if previous and previous.get("screenplay_id") != conversation.get("screenplay_id"):
+            # moved to another screenplay: older entries follow
+            operations.append(UpdateMany(
+                {"conversation_id": conversation_id, "kind": KIND_MESSAGE},
+                {"$set": {"screenplay_id": conversation.get("screenplay_id")}},
+            ))
+        await self.entries.bulk_write(operations, ordered=False)
+        return len(messages)
+
+    async def _update_conversations(self, watermark: Optional[List], stats: Dict[str, int]):
+        while True:
+            query: Dict[str, Any] = {"updated_at": {"$exists": True}}
+            if watermark:
+                updated_at, conversation_id = watermark
+                query = {"$or": [
+                    {"updated_at": {"$gt": updated_at}},
+                    {"updated_at": updated_at, "conversation_id": {"$gt": conversation_id}},
+                ]}
+            batch = await self.conversations.find(
+                query, {"_id": 0, "conversation_id": 1, "updated_at": 1}
+            ).sort([("updated_at", 1), ("conversation_id", 1)]).limit(self.batch_size).to_list()
+            for conversation in batch:
+                stats["messages"] += await self.index_conversation(conversation["conversation_id"])
+            stats["conversations"] += len(batch)
+            if batch:
+                watermark = [batch[-1]["updated_at"], batch[-1]["conversation_id"]]
+                await self._save_watermark("conversations", watermark)
+            if len(batch) < self.batch_size:
+                return
+
+    async def _refresh_pending(self, stats: Dict[str, int]):
+        """Re-read conversations from their first message indexed while pending."""
+        first_pending: Dict[str, int] = {}
+        async for entry in self.entries.find({"pending": True}, {"conversation_id": 1, "seq": 1}):
+            conversation_id = entry["conversation_id"]
+            first_pending[conversation_id] = min(entry["seq"], first_pending.get(conversation_id, entry["seq"]))
+        for conversation_id, seq in first_pending.items():
+            stats["messages"] += await self.index_conversation(conversation_id, start=seq - 1)
+
+    async def _update_history(self, watermark: Optional[List], stats: Dict[str, int]):
+        while True:
+            query: Dict[str, Any] = {"createdAt": {"$exists": True}}
+            if watermark:
+                created_at, entry_id = watermark
+                query = {"$or": [
+                    {"createdAt": {"$gt": created_at}},
+                    {"createdAt": created_at, "_id": {"$gt": entry_id}},
+                ]}
+            batch = await self.history.find(query).sort(
+                [("createdAt", 1), ("_id", 1)]
+            ).limit(self.batch_size).to_list()
+            if batch:
+                await self.entries.bulk_write(
+                    [_upsert(f"history:{entry['_id']}", history_document(entry)) for entry in batch],
+                    ordered=False,
+                )
+                watermark = [batch[-1]["createdAt"], batch[-1]["_id"]]
+                await self._save_watermark("history", watermark)
+            stats["history"] += len(batch)
+            if len(batch) < self.batch_size:
+                return
+
+    async def _save_watermark(self, name: str, watermark: List):
+        await self.state.update_one({"_id": _STATE_ID}, {"$set": {name: watermark}}, upsert=True)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def search(
+        self,
+        query: str,
+        agent_id: Optional[str] = None,
+        screenplay_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        kinds: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Hits ranked by text score (newest first on ties), with snippets."""
+        query_filter = search_filter(query, agent_id, screenplay_id, since, kinds)
+        score = {"$meta": "textScore"}
+        documents = await self.entries.find(query_filter, {"score": score}).sort(
+            [("score", score), ("timestamp", -1)]
+        ).skip(offset).limit(limit + 1).to_list()
+        has_more = len(documents) > limit
+        documents = await self._drop_deleted(documents[:limit])
+
+        terms = search_terms(query)
+        return {
+            "query": query,
+            "offset": offset,
+            "limit": limit,
+            "has_more": has_more,
+            "next_offset": offset + limit if has_more else None,
+            "results": [search_result(document, terms) for document in documents],
+        }
+
+    async def _drop_deleted(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        conversation_ids = {doc["conversation_id"] for doc in documents if doc.get("conversation_id")}
+        if not conversation_ids:
+            return documents
+        existing = {
+            doc["conversation_id"]
+            async for doc in self.conversations.find(
+                {"conversation_id": {"$in": list(conversation_ids)}}, {"_id": 0, "conversation_id": 1}
+            )
+        }
+        deleted = conversation_ids - existing
+        if not deleted:
+            return documents
+        await self.entries.delete_many({"conversation_id": {"$in": list(deleted)}})
+        logger.info(f"Search index: purged entries of {len(deleted)} deleted conversation(s)")
+        return [doc for doc in documents if doc.get("conversation_id") not in deleted]
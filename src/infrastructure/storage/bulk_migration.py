@@ -0,0 +1,429 @@
+# src/infrastructure/storage/bulk_migration.py
+"""
+Motor de migração em lote entre backends de storage (filesystem <-> MongoDB).
+
+Os agentes são processados em chunks:
+- MongoDB: uma consulta `$in` por chunk para leitura e `bulk_write` /
+  `insert_many` (ordered=False) para escrita
+- Filesystem: leitura e escrita paralelas com ThreadPoolExecutor
+- Histórico: copiado com cursor em lotes (`batch_size`), sem carregar tudo;
+  entradas do filesystem ganham `createdAt` a partir do próprio timestamp,
+  na ordem do arquivo (ver history_created_at)
+
+A migração é retomável: após cada chunk os agent_ids concluídos são gravados
+em um arquivo de checkpoint. Re-executar um chunk é idempotente (upserts no
+MongoDB com _id determinístico no histórico; arquivos reescritos no filesystem).
+"""
+
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.infrastructure.storage.history_archive import entry_time
+from src.infrastructure.storage.mongo_repository import MongoStateRepository
+from src.ports.state_repository import IStateRepository
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_HISTORY_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 8
+
+# Campos do agente copiados (além de session e history)
+AGENT_FIELDS = ("definition", "persona", "knowledge", "playbook")
+
+# Namespace para _id determinístico de entradas vindas do filesystem
+_HISTORY_ID_NAMESPACE = uuid.UUID("5b0c6f1e-8d3a-4f0a-9d2e-3c6a1f7e2b40")
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Resolução de datas do MongoDB: createdAt sobe ao menos isso entre entradas
+_CREATED_AT_STEP = timedelta(milliseconds=1)
+
+
+def history_created_at(entries: List[Dict], fallback: datetime) -> List[datetime]:
+    """
+    ``createdAt`` de cada entrada de um history.log, na ordem do arquivo.
+
+    Usa o ``timestamp`` da própria entrada (ver entry_time), truncado ao
+    milissegundo como o MongoDB guarda, mas sempre estritamente crescente:
+    entradas sem data, com a mesma data ou fora de ordem ficam 1 ms depois
+    da anterior. Entradas sem data antes da primeira datada ficam logo
+    antes dela; um arquivo sem nenhuma data termina em ``fallback``.
+    """
+    times = [entry_time(entry) for entry in entries]
+    known = [i for i, moment in enumerate(times) if moment is not None]
+    if known:
+        anchor, anchor_index = times[known[0]], known[0]
+    else:
+        anchor, anchor_index = fallback, len(times) - 1
+    anchor = anchor.replace(microsecond=anchor.microsecond // 1000 * 1000)
+    previous = anchor - _CREATED_AT_STEP * (anchor_index + 1)
+
+    result = []
+    for moment in times:
+        candidate = previous + _CREATED_AT_STEP
+        if moment is not None:
+            moment = moment.replace(microsecond=moment.microsecond // 1000 * 1000)
+            candidate = max(moment, candidate)
+        result.append(candidate)
+        previous = candidate
+    return result
+
+
+def _size_of(value) -> int:
+    if not value:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+class MigrationCheckpoint:
+    """Arquivo JSON com os agentes já migrados (permite retomar a migração)."""
+
+    def __init__(self, path: Optional[str], source: str, destination: str):
+        self.path = path
+        self.key = f"{source}->{destination}"
+        self.completed: set = set()
+        self.history_entries = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("key") == self.key:
+                    self.completed = set(data.get("completed", []))
+                    self.history_entries = data.get("history_entries", 0)
+            except (OSError, ValueError):
+                pass
+
+    def mark(self, agent_ids: List[str], history_entries: int):
+        self.completed.update(agent_ids)
+        self.history_entries += history_entries
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "key": self.key,
+                "completed": sorted(self.completed),
+                "history_entries": self.history_entries,
+                "updated_at": datetime.utcnow().isoformat(),
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BulkMigrationEngine:
+    """Copia agentes (definition, persona, session, knowledge, playbook) e history em lote."""
+
+    def __init__(self, source_repo: IStateRepository, dest_repo: IStateRepository,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 history_batch_size: int = DEFAULT_HISTORY_BATCH_SIZE,
+                 workers: int = DEFAULT_WORKERS,
+                 checkpoint_path: Optional[str] = None,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        self.source = source_repo
+        self.dest = dest_repo
+        self.chunk_size = max(1, chunk_size)
+        self.history_batch_size = max(1, history_batch_size)
+        self.workers = max(1, workers)
+        self.checkpoint_path = checkpoint_path
+        self.progress = progress
+
+    @staticmethod
+    def _backend(repo: IStateRepository) -> str:
+        return "mongodb" if isinstance(repo, MongoStateRepository) else "filesystem"
+
+    def _map(self, fn, items):
+        if self.workers == 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _read_agents(self, agent_ids: List[str]) -> List[Dict]:
+        """Carrega os dados de um chunk de agentes da origem."""
+        if isinstance(self.source, MongoStateRepository):
+            by_id = {agent_id: {"agent_id": agent_id} for agent_id in agent_ids}
+            projection = {"agent_id": 1, **{field: 1 for field in AGENT_FIELDS}}
+            for doc in self.source.agents_collection.find({"agent_id": {"$in": agent_ids}}, projection):
+                payload = by_id[doc["agent_id"]]
+                payload["definition"] = doc.get("definition") or {}
+                payload["persona"] = (doc.get("persona") or {}).get("content", "")
+                payload["knowledge"] = doc.get("knowledge") or {}
+                payload["playbook"] = doc.get("playbook") or {}
+            for doc in self.source.sessions_collection.find({"agent_id": {"$in": agent_ids}}):
+                by_id[doc["agent_id"]]["session"] = {
+                    "current_task_id": doc.get("current_task_id"),
+                    "state": doc.get("state", {}),
+                }
+            return [by_id[agent_id] for agent_id in agent_ids]
+
+        def load(agent_id: str) -> Dict:
+            return {
+                "agent_id": agent_id,
+                "definition": self.source.load_definition(agent_id),
+                "persona": self.source.load_persona(agent_id),
+                "session": self.source.load_session(agent_id),
+                "knowledge": self.source.load_knowledge(agent_id),
+                "playbook": self.source.load_playbook(agent_id),
+            }
+
+        return self._map(load, agent_ids)
+
+    def _iter_history(self, agent_ids: List[str]) -> Iterator[List[Dict]]:
+        """Entradas de histórico do chunk em lotes de history_batch_size (com agent_id e _id)."""
+        if isinstance(self.source, MongoStateRepository):
+            cursor = self.source.history_collection.find(
+                {"agent_id": {"$in": agent_ids}}
+            ).sort([("agent_id", 1), ("createdAt", 1), ("_id", 1)]).batch_size(self.history_batch_size)
+            batch = []
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= self.history_batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        batch = []
+        now = datetime.utcnow()
+        for agent_id in agent_ids:
+            entries = self.source.load_history(agent_id)
+            created_at = history_created_at(entries, now)
+            for index, entry in enumerate(entries):
+                doc = dict(entry)
+                doc["agent_id"] = agent_id
+                doc.setdefault("_id", str(uuid.uuid5(_HISTORY_ID_NAMESPACE, f"{agent_id}:{index}")))
+                doc.setdefault("createdAt", created_at[index])
+                batch.append(doc)
+                if len(batch) >= self.history_batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def _write_agents(self, payloads: List[Dict]):
+        if isinstance(self.dest, MongoStateRepository):
+            now = datetime.utcnow()
+            agent_ops, session_ops = [], []
+            for payload in payloads:
+                fields = {}
+                for field in AGENT_FIELDS:
+                    value = payload.get(field)
+                    if value:
+                        fields[field] = {"content": value} if field == "persona" else value
+                if fields:
+                    agent_ops.append(UpdateOne(
+                        {"agent_id": payload["agent_id"]},
+                        {"$set": fields, "$setOnInsert": {"created_at": now}},
+                        upsert=True,
+                    ))
+                session = payload.get("session")
+                if session:
+                    session_ops.append(ReplaceOne(
+                        {"agent_id": payload["agent_id"]},
+                        {
+                            "agent_id": payload["agent_id"],
+                            "current_task_id": session.get("current_task_id"),
+                            "state": session.get("state", {}),
+                            "createdAt": now,
+                        },
+                        upsert=True,
+                    ))
+            if agent_ops:
+                self.dest.agents_collection.bulk_write(agent_ops, ordered=False)
+            if session_ops:
+                self.dest.sessions_collection.bulk_write(session_ops, ordered=False)
+            return
+
+        def save(payload: Dict):
+            agent_id = payload["agent_id"]
+            if payload.get("definition"):
+                self.dest.save_definition(agent_id, payload["definition"])
+            if payload.get("persona"):
+                self.dest.save_persona(agent_id, payload["persona"])
+            if payload.get("session"):
+                self.dest.save_session(agent_id, payload["session"])
+            if payload.get("knowledge"):
+                self.dest.save_knowledge(agent_id, payload["knowledge"])
+            if payload.get("playbook"):
+                self.dest.save_playbook(agent_id, payload["playbook"])
+
+        self._map(save, payloads)
+
+    def _write_history(self, batch: List[Dict], truncated: set):
+        """Grava um lote de histórico; `truncated` evita duplicar ao reprocessar um chunk."""
+        if isinstance(self.dest, MongoStateRepository):
+            try:
+                # createdAt vem da origem (ver _iter_history)
+                self.dest.history_collection.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Entradas já copiadas (retomada) têm o mesmo _id
+                errors = e.details.get("writeErrors", [])
+                if any(err.get("code") != DUPLICATE_KEY_ERROR for err in errors):
+                    raise
+            return
+
+        by_agent: Dict[str, List[Dict]] = {}
+        for doc in batch:
+            entry = {k: v for k, v in doc.items() if k not in ("_id", "agent_id", "createdAt")}
+            by_agent.setdefault(doc["agent_id"], []).append(entry)
+
+        def append(item):
+            agent_id, entries = item
+            history_file = os.path.join(self.dest._get_agent_dir(agent_id), "history.log")
+            mode = "a" if agent_id in truncated else "w"
+            with open(history_file, mode, encoding="utf-8") as f:
+                f.writelines(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in entries)
+
+        self._map(append, list(by_agent.items()))
+        truncated.update(by_agent)
+
+    # ------------------------------------------------------------------
+    # Verificação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _history_counts(repo: IStateRepository, agent_ids: List[str]) -> Dict[str, int]:
+        if isinstance(repo, MongoStateRepository):
+            counts = {agent_id: 0 for agent_id in agent_ids}
+            for row in repo.history_collection.aggregate([
+                {"$match": {"agent_id": {"$in": agent_ids}}},
+                {"$group": {"_id": "$agent_id", "count": {"$sum": 1}}},
+            ]):
+                counts[row["_id"]] = row["count"]
+            return counts
+        return {agent_id: len(repo.load_history(agent_id)) for agent_id in agent_ids}
+
+    def _verify_chunk(self, agent_ids: List[str]) -> List[Dict]:
+        """Compara origem e destino (campos do agente e contagem de histórico)."""
+        mismatches = []
+        source_payloads = {p["agent_id"]: p for p in self._read_agents(agent_ids)}
+        dest_engine = BulkMigrationEngine(self.dest, self.source, workers=self.workers)
+        dest_payloads = {p["agent_id"]: p for p in dest_engine._read_agents(agent_ids)}
+        source_counts = self._history_counts(self.source, agent_ids)
+        dest_counts = self._history_counts(self.dest, agent_ids)
+
+        for agent_id in agent_ids:
+            src, dst = source_payloads[agent_id], dest_payloads[agent_id]
+            fields = [f for f in AGENT_FIELDS if src.get(f) and src.get(f) != dst.get(f)]
+            if source_counts[agent_id] != dest_counts[agent_id]:
+                fields.append("history")
+            if fields:
+                mismatches.append({
+                    "agent_id": agent_id,
+                    "fields": fields,
+                    "history_source": source_counts[agent_id],
+                    "history_destination": dest_counts[agent_id],
+                })
+        return mismatches
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def run(self, dry_run: bool = False, verify: bool = False, resume: bool = True) -> Dict:
+        """
+        Executar a migração.
+
+        Args:
+            dry_run: Apenas lê a origem e conta agentes, histórico e bytes
+            verify: Compara origem e destino após copiar (ou só compara, com dry_run)
+            resume: Pula agentes registrados no checkpoint
+
+        Returns:
+            Resumo com contagens, throughput e divergências (se verify)
+        """
+        started = time.time()
+        checkpoint = MigrationCheckpoint(
+            self.checkpoint_path if not dry_run else None,
+            self._backend(self.source), self._backend(self.dest),
+        )
+        if not resume:
+            checkpoint.clear()
+            checkpoint.completed = set()
+            checkpoint.history_entries = 0
+
+        agent_ids = self.source.list_agents()
+        pending = [agent_id for agent_id in agent_ids if agent_id not in checkpoint.completed]
+
+        agents_done = history_done = bytes_done = 0
+        mismatches: List[Dict] = []
+
+        for offset in range(0, len(pending), self.chunk_size):
+            chunk = pending[offset:offset + self.chunk_size]
+
+            payloads = self._read_agents(chunk)
+            bytes_done += sum(_size_of(p.get(f)) for p in payloads for f in AGENT_FIELDS + ("session",))
+            if not dry_run:
+                self._write_agents(payloads)
+
+            chunk_history = 0
+            truncated: set = set()
+            for batch in self._iter_history(chunk):
+                chunk_history += len(batch)
+                bytes_done += sum(_size_of(doc) for doc in batch)
+                if not dry_run:
+                    self._write_history(batch, truncated)
+
+            if verify and not dry_run:
+                mismatches.extend(self._verify_chunk(chunk))
+
+            agents_done += len(chunk)
+            history_done += chunk_history
+            if not dry_run:
+                checkpoint.mark(chunk, chunk_history)
+
+            if self.progress:
+                elapsed = max(time.time() - started, 1e-9)
+                self.progress({
+                    "agents": agents_done,
+                    "total_agents": len(pending),
+                    "history_entries": history_done,
+                    "agents_per_second": agents_done / elapsed,
+                })
+
+        if verify and dry_run:
+            for offset in range(0, len(agent_ids), self.chunk_size):
+                mismatches.extend(self._verify_chunk(agent_ids[offset:offset + self.chunk_size]))
+
+        duration = time.time() - started
+        rate = 1 / duration if duration > 0 else 0.0
+        result = {
+            "success": not mismatches,
+            "dry_run": dry_run,
+            "agents_total": len(agent_ids),
+            "agents_skipped": len(agent_ids) - len(pending),
+            "agents_migrated": agents_done if not dry_run else 0,
+            "agents_scanned": agents_done,
+            "history_entries": history_done,
+            "bytes": bytes_done,
+            "duration": duration,
+            "throughput": {
+                "agents_per_second": round(agents_done * rate, 2),
+                "history_entries_per_second": round(history_done * rate, 2),
+                "bytes_per_second": round(bytes_done * rate, 2),
+            },
+        }
+        if verify:
+            result["verified"] = not mismatches
+            result["mismatches"] = mismatches
+        return result
@@ -2,10 +2,58 @@
 import os
 import json
 import yaml
+from contextlib import contextmanager
 from datetime import datetime
 from src.ports.state_repository import IStateRepository
 from typing import Dict, Any, List
 
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, appends e compactação não são serializados
+    fcntl = None
+
+HISTORY_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+@contextmanager
+def history_lock(history_file: str):
+    """
+    Lock exclusivo (flock) que serializa quem escreve no history.log.
+
+    O lock fica em ``history.log.lock``, não no próprio arquivo: a
+    compactação substitui o history.log com os.replace, e um lock no inode
+    antigo não protegeria o novo.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{history_file}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _iter_lines_reversed(path: str, block_size: int = None):
+    """Linhas (bytes) do arquivo, da última para a primeira, lendo blocos a partir do fim."""
+    block_size = block_size or HISTORY_TAIL_BLOCK_SIZE
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size) + remainder
+            lines = chunk.split(b"\n")
+            # A primeira linha pode estar incompleta: segue para o próximo bloco
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        yield remainder
+
+
 class FileSystemStateRepository(IStateRepository):
     """Implementação de repositório de estado baseada em sistema de arquivos."""
     
@@ -149,7 +197,7 @@ class FileSystemStateRepository(IStateRepository):
         try:
             agent_dir = self._get_agent_dir(agent_id)
             history_file = os.path.join(agent_dir, "history.log")
-            with open(history_file, 'a', encoding='utf-8') as f:
+            with history_lock(history_file), open(history_file, 'a', encoding='utf-8') as f:
                 json.dump(history_entry, f, ensure_ascii=False)
                 f.write('\n')
             return True
@@ -176,13 +224,40 @@ class FileSystemStateRepository(IStateRepository):
         except Exception:
             return []
 
+    def load_history_tail(self, agent_id: str, limit: int, instance_id: str = None) -> List[Dict]:
+        """Carrega as últimas ``limit`` entradas do history.log, lendo o arquivo do fim para o início."""
+        if limit <= 0:
+            return []
+        try:
+            history_file = os.path.join(self._get_agent_dir(agent_id), "history.log")
+            if not os.path.exists(history_file):
+                return []
+            tail = []
+            for line in _iter_lines_reversed(history_file):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if instance_id is not None and entry.get("instance_id") != instance_id:
+                    continue
+                tail.append(entry)
+                if len(tail) >= limit:
+                    break
+            tail.reverse()
+            return tail
+        except Exception:
+            return []
+
     def clear_history(self, agent_id: str) -> bool:
         """Limpa o histórico completo de um agente."""
         try:
             agent_dir = self._get_agent_dir(agent_id)
             history_file = os.path.join(agent_dir, "history.log")
             # Trunca o arquivo escrevendo conteúdo vazio
-            with open(history_file, 'w', encoding='utf-8') as f:
+            with history_lock(history_file), open(history_file, 'w', encoding='utf-8') as f:
                 pass  # Apenas abre e fecha para truncar
             return True
         except Exception:
@@ -212,6 +287,24 @@ class FileSystemStateRepository(IStateRepository):
         except Exception:
             return []
 
+    def list_agent_names(self) -> Dict[str, str]:
+        """
+        Projeção agent_id -> name dos agentes com definition.yaml.
+        Não usa _get_agent_dir, que criaria diretórios como efeito colateral.
+        """
+        names = {}
+        agents_dir = os.path.join(self.base_path, "agents")
+        for agent_id in self.list_agents():
+            definition_file = os.path.join(agents_dir, agent_id, "definition.yaml")
+            try:
+                with open(definition_file, 'r', encoding='utf-8') as f:
+                    definition = yaml.safe_load(f) or {}
+            except Exception:
+                continue
+            if isinstance(definition, dict) and definition:
+                names[agent_id] = definition.get("name") or agent_id
+        return names
+
     def get_agent_created_at(self, agent_id: str) -> datetime:
         """Retorna a data de criação do agente (baseado no timestamp do arquivo definition.yaml)."""
         try:
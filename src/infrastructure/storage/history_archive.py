@@ -0,0 +1,537 @@
+# src/infrastructure/storage/history_archive.py
+"""
+Retenção, compactação e arquivo frio do histórico dos agentes.
+
+O histórico quente (coleção ``history``, ``history.log`` por agente e os
+arrays legados de ``agent_conversations``) só cresce. Uma política de
+retenção (idade máxima e/ou número máximo de entradas) define o que fica
+quente; o resto é movido, em ordem cronológica, para segmentos comprimidos
+(JSONL + gzip) com índice por agente e intervalo de tempo:
+
+- MongoDB: coleção ``history_archive`` (um documento por segmento, com o
+  payload comprimido em ``data``), indexada por (source, key, first_at)
+- Filesystem: ``agents/<id>/archive/*.jsonl.gz`` + ``segments.json``;
+  compactação e restauração seguram o lock dos appends (``history_lock``)
+  enquanto reescrevem o ``history.log``
+
+O segmento é gravado antes de as entradas saírem do histórico quente, e
+``restore`` devolve entradas com o mesmo ``_id`` (upsert), então repetir uma
+compactação ou restauração interrompida não duplica nada.
+
+Política: global via ``HISTORY_RETENTION_MAX_AGE_DAYS`` /
+``HISTORY_RETENTION_MAX_ENTRIES``; por agente via o campo
+``history_retention: {max_age_days, max_entries}`` da definição, que
+sobrescreve a global campo a campo. Entradas sem data (legado) só são
+afetadas por ``max_entries`` no filesystem.
+"""
+
+import gzip
+import json
+import os
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.infrastructure.storage.filesystem_repository import history_lock
+
+DEFAULT_SEGMENT_SIZE = 1000
+
+SOURCE_HISTORY = "history"
+SOURCE_LEGACY = "agent_conversations"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Quanto histórico fica quente. ``None`` = sem limite naquele eixo."""
+
+    max_age_days: Optional[float] = None
+    max_entries: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self.max_age_days is not None or self.max_entries is not None
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        return cls.from_dict({
+            "max_age_days": os.getenv("HISTORY_RETENTION_MAX_AGE_DAYS"),
+            "max_entries": os.getenv("HISTORY_RETENTION_MAX_ENTRIES"),
+        })
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "RetentionPolicy":
+        """Política a partir de um dict (valores vazios ou inválidos são ignorados)."""
+        data = data or {}
+        values = {}
+        for field, cast in (("max_age_days", float), ("max_entries", int)):
+            try:
+                value = cast(data[field]) if data.get(field) not in (None, "") else None
+            except (TypeError, ValueError):
+                value = None
+            values[field] = value if value is None or value >= 0 else None
+        return cls(**values)
+
+    def override(self, data: Optional[Dict]) -> "RetentionPolicy":
+        """Esta política com os campos definidos em ``data`` sobrescritos."""
+        other = RetentionPolicy.from_dict(data)
+        changes = {k: v for k, v in vars(other).items() if v is not None}
+        return replace(self, **changes)
+
+    def age_cutoff(self, now: datetime) -> Optional[datetime]:
+        if self.max_age_days is None:
+            return None
+        return now - timedelta(days=self.max_age_days)
+
+
+# ----------------------------------------------------------------------
+# Segmentos (JSONL + gzip, datetimes preservados)
+# ----------------------------------------------------------------------
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return str(value)
+
+
+def _decode_object(obj):
+    if len(obj) == 1 and "$date" in obj:
+        try:
+            return datetime.fromisoformat(obj["$date"])
+        except (TypeError, ValueError):
+            return obj
+    return obj
+
+
+def encode_segment(entries: List[Dict]) -> bytes:
+    lines = (json.dumps(entry, default=_encode_value, ensure_ascii=False) for entry in entries)
+    return gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def decode_segment(data: bytes) -> List[Dict]:
+    text = gzip.decompress(bytes(data)).decode("utf-8")
+    return [json.loads(line, object_hook=_decode_object) for line in text.splitlines() if line]
+
+
+def naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def entry_time(entry: Dict) -> Optional[datetime]:
+    """Momento (UTC, naive) de uma entrada: ``createdAt`` ou ``timestamp`` (epoch ou ISO)."""
+    value = entry.get("createdAt") or entry.get("timestamp")
+    if isinstance(value, datetime):
+        return naive_utc(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return datetime.utcfromtimestamp(value)
+        except (OverflowError, OSError, ValueError):
+            return None
+    if isinstance(value, str):
+        try:
+            return naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _in_range(meta: Dict, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    if since is not None and meta.get("last_at") is not None and meta["last_at"] < since:
+        return False
+    if until is not None and meta.get("first_at") is not None and meta["first_at"] > until:
+        return False
+    return True
+
+
+def _filter_entries(entries: List[Dict], since: Optional[datetime], until: Optional[datetime]) -> List[Dict]:
+    if since is None and until is None:
+        return entries
+    kept = []
+    for entry in entries:
+        moment = entry_time(entry)
+        if moment is None:
+            continue
+        if (since is None or moment >= since) and (until is None or moment <= until):
+            kept.append(entry)
+    return kept
+
+
+# ----------------------------------------------------------------------
+# MongoDB
+# ----------------------------------------------------------------------
+
+class MongoHistoryArchive:
+    """Arquivo frio do histórico em MongoDB (coleção ``history_archive``)."""
+
+    def __init__(self, repository, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.repository = repository
+        self.segment_size = max(1, segment_size)
+        self.history = repository.history_collection
+        self.legacy = repository.db[SOURCE_LEGACY]
+        self.archive = repository.db["history_archive"]
+        repository._safe_create_index(self.archive, [("source", 1), ("key", 1), ("first_at", 1)])
+
+    # -- compactação ---------------------------------------------------
+
+    def compact(self, agent_id: str, policy: RetentionPolicy, now: datetime) -> int:
+        """Move para o arquivo as entradas de ``agent_id`` fora da política."""
+        conditions = []
+        cutoff = policy.age_cutoff(now)
+        if cutoff is not None:
+            conditions.append({"createdAt": {"$lt": cutoff}})
+        if policy.max_entries is not None:
+            boundary = list(
+                self.history.find({"agent_id": agent_id, "createdAt": {"$ne": None}}, {"createdAt": 1})
+                .sort("createdAt", -1).skip(policy.max_entries).limit(1)
+            )
+            if boundary:
+                conditions.append({"createdAt": {"$lte": boundary[0]["createdAt"]}})
+        if not conditions:
+            return 0
+
+        archived = 0
+        query = {"agent_id": agent_id, "$or": conditions}
+        while True:
+            batch = list(self.history.find(query).sort("createdAt", 1).limit(self.segment_size))
+            if not batch:
+                return archived
+            self._write_segment(SOURCE_HISTORY, agent_id, batch)
+            self.history.delete_many({"_id": {"$in": [entry["_id"] for entry in batch]}})
+            archived += len(batch)
+
+    def compact_legacy(self, policy_for, now: datetime) -> int:
+        """
+        Apara os arrays ``conversation_history`` de ``agent_conversations``.
+        ``policy_for(agent_name)`` devolve a política de cada documento.
+        A atualização é condicionada a ``metadata.total_messages`` (otimista):
+        um documento que recebeu mensagens no meio fica para a próxima rodada.
+        """
+        archived = 0
+        for doc in self.legacy.find({}, {"instance_id": 1, "agent_name": 1, "metadata.total_messages": 1}):
+            policy = policy_for(doc.get("agent_name"))
+            if not policy.active:
+                continue
+            full = self.legacy.find_one({"_id": doc["_id"]})
+            messages = (full or {}).get("conversation_history") or []
+            drop = 0
+            if policy.max_entries is not None:
+                drop = max(drop, len(messages) - policy.max_entries)
+            cutoff = policy.age_cutoff(now)
+            if cutoff is not None:
+                leading = 0
+                for message in messages:
+                    moment = entry_time(message)
+                    if moment is None or moment >= cutoff:
+                        break
+                    leading += 1
+                drop = max(drop, leading)
+            if drop <= 0:
+                continue
+
+            segment_id = self._write_segment(SOURCE_LEGACY, full.get("instance_id"), messages[:drop])
+            total = (full.get("metadata") or {}).get("total_messages")
+            result = self.legacy.update_one(
+                {"_id": full["_id"], "metadata.total_messages": total},
+                {"$set": {"conversation_history": messages[drop:]}},
+            )
+            if result.matched_count:
+                archived += drop
+            else:
+                self.archive.delete_one({"_id": segment_id})
+        return archived
+
+    def _write_segment(self, source: str, key: str, entries: List[Dict]) -> str:
+        times = [moment for moment in map(entry_time, entries) if moment is not None]
+        segment_id = str(uuid.uuid4())
+        self.archive.insert_one({
+            "_id": segment_id,
+            "source": source,
+            "key": key,
+            "first_at": min(times) if times else None,
+            "last_at": max(times) if times else None,
+            "count": len(entries),
+            "archived_at": datetime.utcnow(),
+            "data": encode_segment(entries),
+        })
+        return segment_id
+
+    # -- consulta e restauração ---------------------------------------
+
+    def segments(self, key: str, source: str = SOURCE_HISTORY) -> List[Dict]:
+        """Metadados dos segmentos de ``key`` (sem payload), do mais antigo ao mais novo."""
+        cursor = self.archive.find({"source": source, "key": key}, {"data": 0}).sort("first_at", 1)
+        segments = []
+        for doc in cursor:
+            doc["segment_id"] = doc.pop("_id")
+            segments.append(doc)
+        return segments
+
+    def read(self, key: str, source: str = SOURCE_HISTORY, since: Optional[datetime] = None,
+             until: Optional[datetime] = None, segment_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Entradas arquivadas de ``key`` (opcionalmente por intervalo ou segmentos)."""
+        entries = []
+        for _, segment_entries in self._load(key, source, since, until, segment_ids):
+            entries.extend(segment_entries)
+        return _filter_entries(entries, since, until)
+
+    def restore(self, key: str, source: str = SOURCE_HISTORY,
+                segment_ids: Optional[List[str]] = None) -> int:
+        """Devolve segmentos ao histórico quente e os remove do arquivo."""
+        restored = 0
+        for segment_id, entries in self._load(key, source, None, None, segment_ids):
+            if source == SOURCE_HISTORY:
+                from pymongo import ReplaceOne
+
+                self.history.bulk_write(
+                    [ReplaceOne({"_id": entry["_id"]}, entry, upsert=True) for entry in entries],
+                    ordered=False,
+                )
+            else:
+                self.legacy.update_one(
+                    {"instance_id": key},
+                    {"$push": {"conversation_history": {"$each": entries, "$position": 0}}},
+                )
+            self.archive.delete_one({"_id": segment_id})
+            restored += len(entries)
+        return restored
+
+    def _load(self, key, source, since, until, segment_ids) -> Iterator[Tuple[str, List[Dict]]]:
+        query = {"source": source, "key": key}
+        if segment_ids is not None:
+            query["_id"] = {"$in": list(segment_ids)}
+        for doc in self.archive.find(query).sort("first_at", 1):
+            if _in_range(doc, since, until):
+                yield doc["_id"], decode_segment(doc["data"])
+
+
+# ----------------------------------------------------------------------
+# Filesystem
+# ----------------------------------------------------------------------
+
+class FileSystemHistoryArchive:
+    """Arquivo frio do ``history.log``: ``archive/*.jsonl.gz`` + ``segments.json``."""
+
+    INDEX_FILE = "segments.json"
+
+    def __init__(self, repository, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.repository = repository
+        self.segment_size = max(1, segment_size)
+
+    def _agent_dir(self, agent_id: str) -> str:
+        # agent_id vira componente de caminho: nada de "..", "/" ou absolutos
+        if agent_id in ("", ".", "..") or os.path.basename(agent_id) != agent_id or "\\" in agent_id:
+            raise ValueError(f"agent_id inválido para o arquivo de histórico: {agent_id!r}")
+        return os.path.join(self.repository.base_path, "agents", agent_id)
+
+    def _archive_dir(self, agent_id: str) -> str:
+        return os.path.join(self._agent_dir(agent_id), "archive")
+
+    def _load_index(self, agent_id: str) -> List[Dict]:
+        path = os.path.join(self._archive_dir(agent_id), self.INDEX_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                segments = json.load(f, object_hook=_decode_object)
+            return segments if isinstance(segments, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def _save_index(self, agent_id: str, segments: List[Dict]):
+        path = os.path.join(self._archive_dir(agent_id), self.INDEX_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(segments, f, default=_encode_value)
+        os.replace(f"{path}.tmp", path)
+
+    # -- compactação ---------------------------------------------------
+
+    def compact(self, agent_id: str, policy: RetentionPolicy, now: datetime) -> int:
+        history_file = os.path.join(self._agent_dir(agent_id), "history.log")
+        if not policy.active or not os.path.exists(history_file):
+            return 0
+        # Do read ao os.replace sob o lock dos appends: nada anexado se perde
+        with history_lock(history_file):
+            return self._compact_locked(agent_id, history_file, policy, now)
+
+    def _compact_locked(self, agent_id: str, history_file: str, policy: RetentionPolicy, now: datetime) -> int:
+        with open(history_file, "rb") as f:
+            raw_lines = f.read().splitlines(keepends=True)
+        entries = []
+        for raw in raw_lines:
+            try:
+                entries.append((raw, json.loads(raw)) if raw.strip() else (raw, None))
+            except ValueError:
+                entries.append((raw, None))
+        valid = [i for i, (_, entry) in enumerate(entries) if entry is not None]
+
+        drop = 0
+        if policy.max_entries is not None:
+            drop = max(drop, len(valid) - policy.max_entries)
+        cutoff = policy.age_cutoff(now)
+        if cutoff is not None:
+            leading = 0
+            for i in valid:
+                moment = entry_time(entries[i][1])
+                if moment is None or moment >= cutoff:
+                    break
+                leading += 1
+            drop = max(drop, leading)
+        if drop <= 0:
+            return 0
+
+        split = valid[drop - 1] + 1
+        archived = [entry for _, entry in entries[:split] if entry is not None]
+        os.makedirs(self._archive_dir(agent_id), exist_ok=True)
+        segments = self._load_index(agent_id)
+        for chunk in _chunks(archived, self.segment_size):
+            segments.append(self._write_segment(agent_id, chunk))
+        self._save_index(agent_id, segments)
+
+        # Reescreve o history.log com o que ficou
+        tmp_path = f"{history_file}.compact"
+        with open(tmp_path, "wb") as out:
+            out.writelines(raw for raw, _ in entries[split:])
+        os.replace(tmp_path, history_file)
+        return len(archived)
+
+    def _write_segment(self, agent_id: str, entries: List[Dict]) -> Dict:
+        times = [moment for moment in map(entry_time, entries) if moment is not None]
+        segment_id = str(uuid.uuid4())
+        file_name = f"history-{segment_id}.jsonl.gz"
+        with open(os.path.join(self._archive_dir(agent_id), file_name), "wb") as f:
+            f.write(encode_segment(entries))
+        return {
+            "segment_id": segment_id,
+            "source": SOURCE_HISTORY,
+            "key": agent_id,
+            "file": file_name,
+            "first_at": min(times) if times else None,
+            "last_at": max(times) if times else None,
+            "count": len(entries),
+            "archived_at": datetime.utcnow(),
+        }
+
+    # -- consulta e restauração ---------------------------------------
+
+    def segments(self, key: str, source: str = SOURCE_HISTORY) -> List[Dict]:
+        if source != SOURCE_HISTORY:
+            return []
+        return self._load_index(key)
+
+    def read(self, key: str, source: str = SOURCE_HISTORY, since: Optional[datetime] = None,
+             until: Optional[datetime] = None, segment_ids: Optional[List[str]] = None) -> List[Dict]:
+        entries = []
+        for _, segment_entries in self._load(key, source, since, until, segment_ids):
+            entries.extend(segment_entries)
+        return _filter_entries(entries, since, until)
+
+    def restore(self, key: str, source: str = SOURCE_HISTORY,
+                segment_ids: Optional[List[str]] = None) -> int:
+        """Devolve segmentos ao início do ``history.log`` e os remove do arquivo."""
+        loaded = list(self._load(key, source, None, None, segment_ids))
+        if not loaded:
+            return 0
+        restored = [entry for _, entries in loaded for entry in entries]
+
+        history_file = os.path.join(self._agent_dir(key), "history.log")
+        tmp_path = f"{history_file}.restore"
+        with history_lock(history_file):
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                for entry in restored:
+                    json.dump(entry, out, ensure_ascii=False, default=_encode_value)
+                    out.write("\n")
+                if os.path.exists(history_file):
+                    with open(history_file, "r", encoding="utf-8") as f:
+                        out.write(f.read())
+            os.replace(tmp_path, history_file)
+
+        done = {segment_id for segment_id, _ in loaded}
+        remaining = []
+        for segment in self._load_index(key):
+            if segment["segment_id"] in done:
+                try:
+                    os.remove(os.path.join(self._archive_dir(key), segment["file"]))
+                except OSError:
+                    pass
+            else:
+                remaining.append(segment)
+        self._save_index(key, remaining)
+        return len(restored)
+
+    def _load(self, key, source, since, until, segment_ids) -> Iterator[Tuple[str, List[Dict]]]:
+        wanted = set(segment_ids) if segment_ids is not None else None
+        for segment in self.segments(key, source):
+            if wanted is not None and segment["segment_id"] not in wanted:
+                continue
+            if not _in_range(segment, since, until):
+                continue
+            with open(os.path.join(self._archive_dir(key), segment["file"]), "rb") as f:
+                yield segment["segment_id"], decode_segment(f.read())
+
+
+# ----------------------------------------------------------------------
+# Compactador
+# ----------------------------------------------------------------------
+
+def archive_for(repository, segment_size: int = DEFAULT_SEGMENT_SIZE):
+    """Arquivo adequado ao backend do repositório."""
+    from src.infrastructure.storage.mongo_repository import MongoStateRepository
+
+    if isinstance(repository, MongoStateRepository):
+        return MongoHistoryArchive(repository, segment_size)
+    return FileSystemHistoryArchive(repository, segment_size)
+
+
+class HistoryCompactor:
+    """Aplica a política de retenção (global + por agente) a todos os agentes."""
+
+    def __init__(self, repository, policy: Optional[RetentionPolicy] = None,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.repository = repository
+        self.policy = policy if policy is not None else RetentionPolicy.from_env()
+        self.archive = archive_for(repository, segment_size)
+
+    def policy_for(self, agent_id: Optional[str]) -> RetentionPolicy:
+        if not agent_id:
+            return self.policy
+        try:
+            definition = self.repository.load_definition(agent_id) or {}
+        except Exception:
+            definition = {}
+        return self.policy.override(definition.get("history_retention"))
+
+    def run(self, agent_ids: Optional[List[str]] = None, now: Optional[datetime] = None) -> Dict:
+        """Compacta ``agent_ids`` (todos por padrão). Retorna contadores por fonte."""
+        now = now or datetime.utcnow()
+        result = {"agents": 0, "history_archived": 0, "legacy_archived": 0, "errors": {}}
+        for agent_id in agent_ids if agent_ids is not None else self.repository.list_agents():
+            policy = self.policy_for(agent_id)
+            if not policy.active:
+                continue
+            try:
+                archived = self.archive.compact(agent_id, policy, now)
+            except Exception as e:
+                result["errors"][agent_id] = str(e)
+                continue
+            if archived:
+                result["agents"] += 1
+                result["history_archived"] += archived
+
+        if agent_ids is None and isinstance(self.archive, MongoHistoryArchive):
+            policies: Dict[Optional[str], RetentionPolicy] = {}
+
+            def cached_policy(agent_name):
+                if agent_name not in policies:
+                    policies[agent_name] = self.policy_for(agent_name)
+                return policies[agent_name]
+
+            try:
+                result["legacy_archived"] = self.archive.compact_legacy(cached_policy, now)
+            except Exception as e:
+                result["errors"][SOURCE_LEGACY] = str(e)
+        return result
@@ -3,10 +3,16 @@
 
 import os
 from typing import Dict, Any, List
-from pymongo import MongoClient
 from datetime import datetime
 
 
+def MongoClient(*args, **kwargs):
+    """``pymongo.MongoClient``, imported on first use (pymongo is slow to import)."""
+    from pymongo import MongoClient
+
+    return MongoClient(*args, **kwargs)
+
+
 class MongoObservationRepository:
     """Repository for storing and retrieving task observations from MongoDB."""
 
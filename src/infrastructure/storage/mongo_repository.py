@@ -1,11 +1,21 @@
 # src/infrastructure/storage/mongo_repository.py
 import json
+import logging
 import uuid
 from typing import Dict, Any, List
-from pymongo import MongoClient
 from datetime import datetime
 
 from src.ports.state_repository import IStateRepository
+from src.infrastructure.structured_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+
+def MongoClient(*args, **kwargs):
+    """``pymongo.MongoClient``, imported on first use (pymongo is slow to import)."""
+    from pymongo import MongoClient
+
+    return MongoClient(*args, **kwargs)
 
 
 class MongoStateRepository(IStateRepository):
@@ -36,6 +46,11 @@ class MongoStateRepository(IStateRepository):
         self._safe_create_index(self.sessions_collection, "createdAt", expireAfterSeconds=86400)
         self._safe_create_index(self.agents_collection, "agent_id")
         self._safe_create_index(self.history_collection, "agent_id")
+        # Leituras de cauda (load_history_tail): sort reverso + limit pelo índice
+        self._safe_create_index(self.history_collection, [("agent_id", 1), ("createdAt", -1)])
+        self._safe_create_index(
+            self.history_collection, [("agent_id", 1), ("instance_id", 1), ("createdAt", -1)]
+        )
         self._safe_create_index(self.sessions_collection, "agent_id")
 
     def _safe_create_index(self, collection, key, **kwargs):
@@ -225,9 +240,6 @@ class MongoStateRepository(IStateRepository):
             instance_id: ID da instância (para isolamento de contextos por sessão/UI)
         """
         try:
-            import logging
-            logger = logging.getLogger(__name__)
-            
             doc = dict(history_entry)  # Copia o dict
             doc["agent_id"] = agent_id
             doc["createdAt"] = datetime.utcnow()
@@ -235,9 +247,8 @@ class MongoStateRepository(IStateRepository):
             # SAGA-004: Adicionar instance_id para separação de contextos
             if instance_id:
                 doc["instance_id"] = instance_id
-                logger.info(f"✅ [MONGO_REPOSITORY] instance_id adicionado ao documento: {instance_id}")
             else:
-                logger.warning(f"⚠️ [MONGO_REPOSITORY] instance_id não fornecido para agent_id: {agent_id}")
+                logger.warning("[MONGO_REPOSITORY] instance_id não fornecido para agent_id: %s", agent_id)
 
             # Sempre força um _id único para evitar conflitos
             # Remove qualquer _id existente (vazio ou não) e gera um novo
@@ -247,24 +258,15 @@ class MongoStateRepository(IStateRepository):
             # Gera um _id único usando UUID
             doc["_id"] = str(uuid.uuid4())
 
-            logger.info("=" * 80)
-            logger.info(f"💾 [MONGO_REPOSITORY] Inserindo documento no MongoDB:")
-            logger.info(f"   - Collection: history")
-            logger.info(f"   - agent_id: {agent_id}")
-            logger.info(f"   - instance_id: {doc.get('instance_id', 'None')}")
-            logger.info(f"   - _id: {doc['_id']}")
-            logger.info(f"   - user_input: {doc.get('user_input', '')[:100]}...")
-            logger.info(f"   - ai_response: {doc.get('ai_response', '')[:100]}...")
-            logger.info("=" * 80)
-
             self.history_collection.insert_one(doc)
-            
-            logger.info(f"✅ [MONGO_REPOSITORY] Documento inserido com sucesso na collection 'history'!")
+
+            log_event(
+                logger, "history.appended", agent_id=agent_id, instance_id=instance_id,
+                history_id=doc["_id"], user_input_chars=len(doc.get("user_input") or ""),
+                ai_response_chars=len(doc.get("ai_response") or ""),
+            )
             return True
         except Exception as e:
-            import json
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"MongoDB insert failed for agent {agent_id}: {e}")
             logger.error(f"Document data: {json.dumps(doc, indent=2, default=str)}")
             return False
@@ -272,7 +274,8 @@ class MongoStateRepository(IStateRepository):
     def load_history(self, agent_id: str) -> List[Dict]:
         """Carrega o histórico completo como lista de dicionários."""
         try:
-            cursor = self.history_collection.find({"agent_id": agent_id}).sort("_id", 1)
+            # createdAt: entradas migradas do filesystem têm _id uuid5, sem ordem
+            cursor = self.history_collection.find({"agent_id": agent_id}).sort([("createdAt", 1), ("_id", 1)])
             history_entries = []
 
             for doc in cursor:
@@ -285,6 +288,25 @@ class MongoStateRepository(IStateRepository):
         except Exception:
             return []
 
+    def load_history_tail(self, agent_id: str, limit: int, instance_id: str = None) -> List[Dict]:
+        """Carrega as últimas ``limit`` entradas (mais antiga primeiro) via índice."""
+        if limit <= 0:
+            return []
+        try:
+            query = {"agent_id": agent_id}
+            if instance_id is not None:
+                query["instance_id"] = instance_id
+            cursor = (
+                self.history_collection.find(query, {"_id": 0, "createdAt": 0})
+                .sort("createdAt", -1)
+                .limit(limit)
+            )
+            history_entries = list(cursor)
+            history_entries.reverse()
+            return history_entries
+        except Exception:
+            return []
+
     def clear_history(self, agent_id: str) -> bool:
         """Limpa o histórico completo de um agente."""
         try:
@@ -313,6 +335,21 @@ class MongoStateRepository(IStateRepository):
         except Exception:
             return []
 
+    def list_agent_names(self) -> Dict[str, str]:
+        """Projeção agent_id -> definition.name (sem carregar as definições)."""
+        try:
+            names = {}
+            cursor = self.agents_collection.find(
+                {"definition": {"$exists": True, "$ne": {}}},
+                {"_id": 0, "agent_id": 1, "definition.name": 1},
+            )
+            for doc in cursor:
+                if doc.get("agent_id"):
+                    names[doc["agent_id"]] = (doc.get("definition") or {}).get("name") or doc["agent_id"]
+            return names
+        except Exception:
+            return {}
+
     def get_agent_home_path(self, agent_id: str) -> str:
         """Retorna um caminho conceitual para o agente no MongoDB."""
         return f"mongodb://agents/{agent_id}"
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Structured, low-overhead logging for the task hot paths.
+
+Hot paths log through ``log_event(logger, "<event>", **fields)``. Each
+event has a fixed field schema (``EVENTS``), so the message is a lazy
+%-style template compiled once per event: nothing is formatted unless
+the level is enabled, and a handler on another thread does the
+formatting.
+
+Per-task debug detail (field dumps, callers) is sampled per task and
+only computed for the sampled ones:
+
+    if detail_sampled(task_id):
+        log_event(logger, "task.submit_detail", task_id=task_id, caller=...)
+
+``detail_sampled`` hashes the key, so the API and the watcher keep or
+drop the same tasks.
+
+Modes (``CONDUCTOR_LOG_MODE``):
+    default     handlers untouched; every task's detail is logged
+    production  root handlers are fed by a queue: records are formatted
+                as one JSON object per line and written by a listener
+                thread; detail is kept for CONDUCTOR_LOG_DETAIL_SAMPLE
+                of the tasks (default 0.01)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+LOG_MODE_ENV = "CONDUCTOR_LOG_MODE"
+DETAIL_SAMPLE_ENV = "CONDUCTOR_LOG_DETAIL_SAMPLE"
+
+MODE_DEFAULT = "default"
+MODE_PRODUCTION = "production"
+
+# event -> fields, in message order
+EVENTS: Dict[str, Tuple[str, ...]] = {
+    "task.submitted": (
+        "task_id", "agent_id", "provider", "source", "instance_id",
+        "conversation_id", "screenplay_id", "prompt_segmented",
+    ),
+    "task.submit_detail": ("task_id", "caller", "cwd", "timeout", "idempotency_key", "parent_task_id"),
+    "history.appended": ("agent_id", "instance_id", "history_id", "user_input_chars", "ai_response_chars"),
+    "prompt.built": ("agent_id", "history_messages", "history_from_cache", "include_history", "prompt_chars"),
+    "provider.resolved": ("agent_id", "provider", "source"),
+    "watcher.task_fields": ("task_id", "thread", "instance_id", "keys"),
+    "watcher.task_started": (
+        "task_id", "thread", "agent_id", "instance_id", "provider", "cwd",
+        "timeout", "mcp_configs", "prompt_chars",
+    ),
+    "watcher.llm_detail": ("task_id", "command", "cursor_agent", "process_cwd", "path", "prompt_head"),
+    "watcher.llm_finished": ("task_id", "provider", "exit_code", "duration_s", "output_chars", "stream"),
+    "watcher.llm_output": ("task_id", "stream_stats", "output_head"),
+    "watcher.task_completed": (
+        "task_id", "thread", "agent_id", "instance_id", "exit_code", "duration_s", "result_chars",
+    ),
+    "watcher.statistics_updated": (
+        "instance_id", "duration_ms", "exit_code", "task_count", "average_ms", "success_rate",
+    ),
+}
+
+_TEMPLATES = {
+    name: " ".join(["%s"] + [f"{field}=%r" for field in fields]) for name, fields in EVENTS.items()
+}
+_FIELD_SETS = {name: frozenset(fields) for name, fields in EVENTS.items()}
+
+_state = {"mode": MODE_DEFAULT, "detail_rate": 1.0, "listener": None, "formatters": []}
+_lock = threading.Lock()
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Log ``event`` with its schema fields (missing ones are None).
+
+    Field values must be scalars (str, numbers, bool, None): event records
+    reach the production listener thread unformatted.
+    Raises KeyError for unknown events or fields.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    schema = EVENTS[event]
+    if not fields.keys() <= _FIELD_SETS[event]:
+        raise KeyError(f"fields {sorted(set(fields) - _FIELD_SETS[event])} not in the schema of {event}")
+    values = tuple(fields.get(name) for name in schema)
+    logger.log(level, _TEMPLATES[event], event, *values, extra={"event": event, "fields": schema})
+
+
+def detail_sampled(key: Any) -> bool:
+    """Whether the per-task detail of ``key`` (usually the task id) is logged."""
+    rate = _state["detail_rate"]
+    if rate >= 1:
+        return True
+    if rate <= 0 or key is None:
+        return False
+    return zlib.crc32(str(key).encode("utf-8")) % 10_000 < rate * 10_000
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record; events carry their fields as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            payload["event"] = event
+            # args = (event, *values), in schema order
+            payload.update(zip(record.fields, record.args[1:]))
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves the formatting of events to the listener thread.
+
+    The stock ``prepare`` renders the message on the logging thread so
+    that arbitrary args need not cross threads. Event fields are scalars,
+    so event records are queued as is; any other record gets the stock
+    treatment.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if getattr(record, "event", None) is not None:
+            return record
+        return super().prepare(record)
+
+
+def log_mode() -> str:
+    return _state["mode"]
+
+
+def configure_log_mode(mode: Optional[str] = None, detail_rate: Optional[float] = None) -> str:
+    """Apply ``CONDUCTOR_LOG_MODE`` (or ``mode``) to the root logger.
+
+    Call after the process set up its handlers (basicConfig). Production
+    mode moves the current root handlers behind a queue, once; later calls
+    only update the mode and the detail sample rate.
+    """
+    mode = (mode or os.getenv(LOG_MODE_ENV, MODE_DEFAULT)).strip().lower()
+    if mode not in (MODE_DEFAULT, MODE_PRODUCTION):
+        logging.getLogger(__name__).warning("Unknown %s=%r, using default", LOG_MODE_ENV, mode)
+        mode = MODE_DEFAULT
+    if detail_rate is None:
+        default_rate = "0.01" if mode == MODE_PRODUCTION else "1"
+        try:
+            detail_rate = float(os.getenv(DETAIL_SAMPLE_ENV, default_rate))
+        except ValueError:
+            detail_rate = float(default_rate)
+
+    with _lock:
+        _state["detail_rate"] = detail_rate
+        if mode == MODE_PRODUCTION and _state["listener"] is None:
+            root = logging.getLogger()
+            handlers = list(root.handlers) or [logging.StreamHandler()]
+            _state["formatters"] = [(handler, handler.formatter) for handler in handlers]
+            for handler in handlers:
+                handler.setFormatter(StructuredFormatter())
+            records = queue.SimpleQueue()
+            listener = QueueListener(records, *handlers, respect_handler_level=True)
+            root.handlers = [DeferredQueueHandler(records)]
+            listener.start()
+            atexit.register(shutdown_log_mode)
+            _state["listener"] = listener
+        _state["mode"] = mode
+    return mode
+
+
+def shutdown_log_mode() -> None:
+    """Flush and stop the production listener, restoring its handlers on the root logger."""
+    with _lock:
+        listener = _state["listener"]
+        if listener is None:
+            return
+        listener.stop()
+        for handler, formatter in _state["formatters"]:
+            handler.setFormatter(formatter)
+        logging.getLogger().handlers = list(listener.handlers)
+        _state["listener"] = None
+        _state["formatters"] = []
+        _state["mode"] = MODE_DEFAULT
+        _state["detail_rate"] = 1.0
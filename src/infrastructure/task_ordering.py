@@ -0,0 +1,144 @@
+# src/infrastructure/task_ordering.py
+"""
+Claim order of the MongoDB task queue: priority, deadline and aging.
+
+RabbitMQ orders ``AgentTaskMessage`` by priority until the consumer
+inserts the task; from then on the watcher claims pending tasks by
+
+    priority desc, due_at asc, created_at asc
+
+``priority`` starts at the submitted priority (kept in ``base_priority``)
+and ages: a task still pending ``aging_seconds`` after its last bump
+gains one level, at most AGING_MAX_LEVELS above its base and never into
+the high class unless it started there (``aging_ceiling``). A backlog of
+low-priority work catches up with the normal tasks submitted after it
+instead of starving, but aged work never overtakes a fresh escalation.
+``due_at`` is the deadline, or NO_DEADLINE when there is none, so tasks
+without a deadline come after every deadline of the same priority.
+
+Tasks inserted without these fields (older documents, other writers) are
+given the defaults by ``backfill_ordering_fields``.
+
+Shared by the API (task insert) and the watcher (claim, aging); stdlib only.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+MIN_PRIORITY = 0
+MAX_PRIORITY = 9
+DEFAULT_PRIORITY = 5
+
+AGING_ENV = "TASK_PRIORITY_AGING_SECONDS"
+DEFAULT_AGING_SECONDS = float(os.environ.get(AGING_ENV, "60"))
+
+# Sorts after any real deadline (BSON dates reach year 9999)
+NO_DEADLINE = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+CLAIM_SORT = [("priority", -1), ("due_at", 1), ("created_at", 1)]
+CLAIM_INDEX = [("status", 1), ("priority", -1), ("due_at", 1), ("created_at", 1)]
+AGING_INDEX = [("status", 1), ("aged_at", 1)]
+
+# priority class -> lowest priority in it
+HIGH_PRIORITY = 7
+PRIORITY_CLASSES = (("high", HIGH_PRIORITY), ("normal", 4), ("low", MIN_PRIORITY))
+
+AGING_MAX_LEVELS = 2
+
+
+def clamp_priority(priority: Optional[int]) -> int:
+    if priority is None:
+        return DEFAULT_PRIORITY
+    return max(MIN_PRIORITY, min(MAX_PRIORITY, int(priority)))
+
+
+def parse_deadline(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Deadline as an aware UTC datetime (naive values are UTC).
+
+    Raises ValueError for strings that are not ISO 8601.
+    """
+    if value is None or value == "":
+        return None
+    deadline = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if deadline.tzinfo is None:
+        return deadline.replace(tzinfo=timezone.utc)
+    return deadline.astimezone(timezone.utc)
+
+
+def ordering_fields(priority: Optional[int], deadline: Optional[datetime], now: datetime) -> Dict[str, Any]:
+    """Ordering fields of a new task document."""
+    priority = clamp_priority(priority)
+    fields = {
+        "priority": priority,
+        "base_priority": priority,
+        "aged_at": now,
+        "due_at": deadline or NO_DEADLINE,
+    }
+    if deadline:
+        fields["deadline"] = deadline
+    return fields
+
+
+def priority_class(priority: Optional[int]) -> str:
+    priority = clamp_priority(priority)
+    for name, lowest in PRIORITY_CLASSES:
+        if priority >= lowest:
+            return name
+    return PRIORITY_CLASSES[-1][0]
+
+
+def aging_ceiling(base_priority: int) -> int:
+    """Highest priority aging can give a task submitted at ``base_priority``."""
+    limit = MAX_PRIORITY if base_priority >= HIGH_PRIORITY else HIGH_PRIORITY - 1
+    return max(base_priority, min(base_priority + AGING_MAX_LEVELS, limit))
+
+
+def age_pending(collection, aging_seconds: float = DEFAULT_AGING_SECONDS, now: Optional[datetime] = None) -> int:
+    """Raise by one level every pending task not bumped for ``aging_seconds``.
+
+    Safe to run from every watcher: a task bumped by one no longer matches
+    the filter for the others.
+    """
+    if aging_seconds <= 0:
+        return 0
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=aging_seconds)
+    aged = 0
+    # One update per base priority: the ceiling depends on it
+    for base in range(MIN_PRIORITY, MAX_PRIORITY + 1):
+        ceiling = aging_ceiling(base)
+        if ceiling <= base:
+            continue
+        result = collection.update_many(
+            {
+                "status": "pending",
+                "base_priority": base,
+                "priority": {"$lt": ceiling},
+                "aged_at": {"$lte": cutoff},
+            },
+            {"$inc": {"priority": 1}, "$set": {"aged_at": now}},
+        )
+        aged += result.modified_count
+    return aged
+
+
+def backfill_ordering_fields(collection, now: Optional[datetime] = None) -> int:
+    """Give pending tasks without ordering fields the defaults (priority 5, no deadline).
+
+    Without them a task sorts after every other under ``priority desc`` and
+    never ages.
+    """
+    now = now or datetime.now(timezone.utc)
+    fields = ordering_fields(DEFAULT_PRIORITY, None, now)
+    result = collection.update_many(
+        {"status": "pending", "priority": {"$exists": False}},
+        {"$set": fields},
+    )
+    return result.modified_count
+
+
+def ensure_ordering_indexes(collection) -> None:
+    collection.create_index(CLAIM_INDEX, name="idx_claim_order")
+    collection.create_index(AGING_INDEX, name="idx_priority_aging")
+    backfill_ordering_fields(collection)
@@ -0,0 +1,343 @@
+# src/infrastructure/tracing.py
+"""
+Lightweight task tracing across enqueue, queue consumer, watcher and delegation.
+
+Trace context follows the W3C ``traceparent`` format so it can travel in
+HTTP headers, RabbitMQ message headers and the task document. Spans are
+buffered and flushed in batches to an exporter:
+
+- ``mongo`` (default): the ``spans`` collection, used by GET /tasks/{id}/trace
+- ``file``: OTLP/JSON lines (one ExportTraceServiceRequest per batch)
+- ``none``: tracing disabled
+
+Selected with CONDUCTOR_TRACE_EXPORTER / CONDUCTOR_TRACE_FILE. Like
+metrics.py, this module only depends on the stdlib (plus pymongo when the
+Mongo exporter is used) so the host watcher can import it.
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+SPANS_COLLECTION = "spans"
+SPAN_TTL_SECONDS = int(os.getenv("CONDUCTOR_TRACE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_BUFFERED_SPANS = 256
+
+
+class SpanContext:
+    """Identifies a span within a trace (W3C trace-context)."""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    @classmethod
+    def new_root(cls) -> "SpanContext":
+        return cls(secrets.token_hex(16), secrets.token_hex(8))
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """Parse a traceparent header; returns None when missing or malformed."""
+        if not value:
+            return None
+        parts = value.strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            int(parts[1], 16)
+            int(parts[2], 16)
+        except ValueError:
+            return None
+        return cls(parts[1], parts[2])
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["SpanContext"]:
+        if not data or not data.get("trace_id") or not data.get("span_id"):
+            return None
+        return cls(data["trace_id"], data["span_id"])
+
+
+class Span:
+    """A timed operation. End it with end() or use Tracer.span()."""
+
+    __slots__ = (
+        "name", "context", "parent_span_id", "service",
+        "start_time", "end_time", "attributes", "status", "_tracer",
+    )
+
+    def __init__(self, name: str, context: SpanContext, parent_span_id: Optional[str],
+                 service: str, start_time: float, attributes: Dict[str, Any], tracer: "Tracer"):
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.service = service
+        self.start_time = start_time
+        self.end_time: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self._tracer = tracer
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, end_time: Optional[float] = None, status: Optional[str] = None):
+        if self.end_time is not None:
+            return
+        self.end_time = end_time if end_time is not None else time.time()
+        if status:
+            self.status = status
+        self._tracer._on_end(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return round((self.end_time - self.start_time) * 1000, 3)
+
+    def to_document(self) -> Dict[str, Any]:
+        """Representation stored in the ``spans`` collection."""
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "service": self.service,
+            "start": datetime.fromtimestamp(self.start_time, timezone.utc),
+            "end": datetime.fromtimestamp(self.end_time or self.start_time, timezone.utc),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": dict(self.attributes),
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON span (trace and span ids as hex, times in unix nanos)."""
+        otlp = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(self.start_time * 1e9)),
+            "endTimeUnixNano": str(int((self.end_time or self.start_time) * 1e9)),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2 if self.status == "error" else 1},
+        }
+        if self.parent_span_id:
+            otlp["parentSpanId"] = self.parent_span_id
+        return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# ============================================================================
+# Exporters
+# ============================================================================
+
+class MongoSpanExporter:
+    """Writes spans to the ``spans`` collection (local span store)."""
+
+    def __init__(self, collection_factory: Callable[[], Any]):
+        self._collection_factory = collection_factory
+        self._collection = None
+
+    def _get_collection(self):
+        if self._collection is None:
+            collection = self._collection_factory()
+            if collection is None:
+                return None
+            try:
+                collection.create_index([("trace_id", 1), ("start", 1)])
+                collection.create_index("attributes.task_id")
+                collection.create_index("start", expireAfterSeconds=SPAN_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Failed to create span indexes: %s", e)
+            self._collection = collection
+        return self._collection
+
+    def export(self, spans: List[Span]):
+        collection = self._get_collection()
+        if collection is None or not spans:
+            return
+        collection.insert_many([span.to_document() for span in spans], ordered=False)
+
+
+class OTLPFileExporter:
+    """Appends OTLP/JSON ExportTraceServiceRequest lines to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        if not spans:
+            return
+        by_service: Dict[str, List[Span]] = {}
+        for span in spans:
+            by_service.setdefault(span.service, []).append(span)
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", service)]},
+                    "scopeSpans": [{
+                        "scope": {"name": "conductor"},
+                        "spans": [span.to_otlp() for span in service_spans],
+                    }],
+                }
+                for service, service_spans in by_service.items()
+            ]
+        }
+        line = json.dumps(payload, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _default_mongo_collection():
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        return None
+    from pymongo import MongoClient
+    client = MongoClient(mongo_uri, serverSelectionTimeoutMS=3000)
+    return client[os.getenv("MONGO_DATABASE", "conductor_state")][SPANS_COLLECTION]
+
+
+def exporter_from_env(collection_factory: Optional[Callable[[], Any]] = None):
+    """Build the exporter selected by CONDUCTOR_TRACE_EXPORTER (mongo | file | none)."""
+    kind = os.getenv("CONDUCTOR_TRACE_EXPORTER", "mongo").lower()
+    if kind == "none":
+        return None
+    if kind == "file":
+        return OTLPFileExporter(os.getenv("CONDUCTOR_TRACE_FILE", "/tmp/conductor-traces.jsonl"))
+    return MongoSpanExporter(collection_factory or _default_mongo_collection)
+
+
+# ============================================================================
+# Tracer
+# ============================================================================
+
+class Tracer:
+    """Creates spans and flushes finished ones to the exporter in batches."""
+
+    def __init__(self, service: str = "conductor-api", exporter=None):
+        self.service = service
+        self.exporter = exporter
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def configure(self, service: Optional[str] = None, exporter=None):
+        """Set service name and exporter (None disables export)."""
+        if service:
+            self.service = service
+        self.exporter = exporter
+
+    def start_span(self, name: str, parent: Optional[SpanContext] = None,
+                   attributes: Optional[Dict[str, Any]] = None,
+                   start_time: Optional[float] = None) -> Span:
+        """Start a span; child of ``parent`` or the root of a new trace."""
+        if parent is not None:
+            context = SpanContext(parent.trace_id, secrets.token_hex(8))
+            parent_span_id = parent.span_id
+        else:
+            context = SpanContext.new_root()
+            parent_span_id = None
+        return Span(
+            name, context, parent_span_id, self.service,
+            start_time if start_time is not None else time.time(),
+            dict(attributes or {}), self,
+        )
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[SpanContext] = None,
+             attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        """Context manager that ends the span (status=error on exception)."""
+        span = self.start_span(name, parent, attributes)
+        try:
+            yield span
+        except BaseException:
+            span.end(status="error")
+            raise
+        else:
+            span.end()
+
+    def record_span(self, name: str, parent: Optional[SpanContext], start_time: float,
+                    end_time: float, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Record an already-elapsed interval (e.g. time spent waiting in a queue)."""
+        span = self.start_span(name, parent, attributes, start_time=start_time)
+        span.end(end_time=end_time)
+        return span
+
+    def _on_end(self, span: Span):
+        if self.exporter is None:
+            return
+        with self._lock:
+            self._buffer.append(span)
+            full = len(self._buffer) >= MAX_BUFFERED_SPANS
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, name="SpanFlusher", daemon=True
+                )
+                self._flush_thread.start()
+        if full:
+            self._wakeup.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wakeup.wait(FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Export buffered spans now."""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans or self.exporter is None:
+            return
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning("Failed to export %d spans: %s", len(spans), e)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from a datetime (naive = UTC) or ISO string."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# Process-wide tracer (API + queue consumer). The watcher reconfigures it.
+tracer = Tracer(exporter=exporter_from_env())
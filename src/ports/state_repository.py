@@ -104,6 +104,18 @@ class IStateRepository(ABC):
         """
         raise NotImplementedError
 
+    def load_history_tail(self, agent_id: str, limit: int, instance_id: str = None) -> List[Dict]:
+        """
+        Carrega as últimas ``limit`` entradas do histórico (mais antiga primeiro),
+        opcionalmente só as de ``instance_id``.
+        Backends devem sobrescrever com uma leitura proporcional à janela;
+        esta versão genérica é o fallback.
+        """
+        history = self.load_history(agent_id)
+        if instance_id is not None:
+            history = [entry for entry in history if entry.get("instance_id") == instance_id]
+        return history[-limit:] if limit > 0 else []
+
     @abstractmethod
     def clear_history(self, agent_id: str) -> bool:
         """
@@ -119,6 +131,19 @@ class IStateRepository(ABC):
         """
         raise NotImplementedError
 
+    def list_agent_names(self) -> Dict[str, str]:
+        """
+        Projeção leve agent_id -> name dos agentes que possuem definição.
+        Backends devem sobrescrever com uma consulta que não carregue as
+        definições completas; esta versão genérica é o fallback.
+        """
+        names = {}
+        for agent_id in self.list_agents():
+            definition = self.load_definition(agent_id)
+            if definition:
+                names[agent_id] = definition.get("name") or agent_id
+        return names
+
     @abstractmethod
     def get_agent_home_path(self, agent_id: str) -> str:
         """
@@ -13,6 +13,7 @@ if str(project_root) not in sys.path:
 
 # Importa o container de injeção de dependência que já existe
 from src.container import container
+from src.infrastructure.structured_logging import configure_log_mode
 
 # Import do MongoDB client com tratamento de erro
 try:
@@ -35,9 +36,12 @@ from src.api.routes.pulse import router as pulse_router  # SAGA-016: Pulse event
 from src.api.routes.sagas import router as sagas_router  # SAGA-016: Saga healing & rollback
 from src.api.routes.dispatch import router as dispatch_router  # Agent-to-agent dispatch
 from src.api.routes.enqueue import router as enqueue_router  # Async agent task queue
+from src.api.routes.traces import router as traces_router  # End-to-end task traces
+from src.api.routes.search import router as search_router  # Full-text search
 
 # Configura o logging e a aplicação FastAPI
 logging.basicConfig(level=logging.INFO)
+configure_log_mode()  # CONDUCTOR_LOG_MODE=production: JSON por linha via thread de log
 logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Conductor API",
@@ -66,6 +70,8 @@ app.include_router(pulse_router)  # SAGA-016: Pulse event triggers & screenplay
 app.include_router(sagas_router)  # SAGA-016: Saga healing & rollback
 app.include_router(dispatch_router)  # Agent-to-agent dispatch
 app.include_router(enqueue_router)  # Async agent task queue via RabbitMQ
+app.include_router(traces_router)  # GET /tasks/{task_id}/trace
+app.include_router(search_router)  # GET /search
 
 @app.on_event("startup")
 async def startup_event():
@@ -101,6 +107,38 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"⚠️ Agent Task Queue Service failed to start: {e}")
 
+    # Start conversation event hub (SSE /conversations/{id}/events)
+    try:
+        from src.core.services.conversation_event_service import conversation_events
+        await conversation_events.start()
+        logger.info("✅ Conversation Event Hub started.")
+    except Exception as e:
+        logger.warning(f"⚠️ Conversation Event Hub failed to start: {e}")
+
+    # Start MCP registry index (heartbeats, resolve, health)
+    try:
+        from src.core.services.mcp_registry_index import mcp_registry_index
+        await mcp_registry_index.start()
+        logger.info("✅ MCP Registry Index started.")
+    except Exception as e:
+        logger.warning(f"⚠️ MCP Registry Index failed to start: {e}")
+
+    # Start history retention (periodic compaction into the cold archive)
+    try:
+        from src.core.services.history_retention_service import history_retention_service
+        await history_retention_service.start()
+        logger.info("✅ History Retention Service started.")
+    except Exception as e:
+        logger.warning(f"⚠️ History Retention Service failed to start: {e}")
+
+    # Start search indexer (incremental full-text index of messages/history)
+    try:
+        from src.core.services.search_index_service import search_index_service
+        await search_index_service.start()
+        logger.info("✅ Search Index Service started.")
+    except Exception as e:
+        logger.warning(f"⚠️ Search Index Service failed to start: {e}")
+
     # Ensure task queue indexes
     try:
         task_client = MongoTaskClient()
@@ -116,6 +154,11 @@ async def shutdown_event():
         await agent_task_queue_service.stop()
     except Exception:
         pass
+    try:
+        from src.core.services.conversation_event_service import conversation_events
+        await conversation_events.stop()
+    except Exception:
+        pass
     try:
         from src.core.services.pulse_event_service import pulse_service
         await pulse_service.stop()
@@ -126,6 +169,36 @@ async def shutdown_event():
         await mesh_service.stop()
     except Exception:
         pass
+    try:
+        from src.core.services.mcp_registry_index import mcp_registry_index
+        await mcp_registry_index.stop()
+    except Exception:
+        pass
+    try:
+        from src.core.services.history_retention_service import history_retention_service
+        await history_retention_service.stop()
+    except Exception:
+        pass
+    try:
+        from src.core.services.search_index_service import search_index_service
+        await search_index_service.stop()
+    except Exception:
+        pass
+    try:
+        from src.infrastructure.async_mongo import async_mongo
+        await async_mongo.aclose()
+    except Exception:
+        pass
+    try:
+        from src.infrastructure.http_clients import http_clients
+        await http_clients.aclose()
+    except Exception:
+        pass
+    try:
+        from src.infrastructure.tracing import tracer
+        tracer.flush()
+    except Exception:
+        pass
 
 # As rotas de agentes foram movidas para src/api/routes/agents.py
 
@@ -3,6 +3,7 @@
 Tests for SAGA-016 Phase 1: MCP Mesh Service and API routes.
 """
 import asyncio
+import time
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime, timezone
@@ -132,6 +133,108 @@ class TestMCPMeshService:
         assert svc._last_sweep is not None
 
 
+class TestAdaptiveSweep:
+    """Scheduling, bounded concurrency, incremental registry and transitions."""
+
+    def _fake_ping(self, svc, healthy_names, in_flight=None):
+        async def ping(entry):
+            if in_flight is not None:
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                await asyncio.sleep(0.01)
+                in_flight["now"] -= 1
+            status = "healthy" if entry["name"] in healthy_names else "unhealthy"
+            svc._nodes[entry["name"]] = MCPNode(name=entry["name"], url=entry["url"], status=status)
+        return ping
+
+    def test_healthy_nodes_wait_long_unhealthy_retry_fast(self):
+        svc = MCPMeshService()
+        svc._load_registry = MagicMock(return_value=[
+            {"name": "up", "url": "http://up:1"},
+            {"name": "down", "url": "http://down:2"},
+        ])
+        svc._ping_sidecar = self._fake_ping(svc, {"up"})
+
+        asyncio.get_event_loop().run_until_complete(svc._sweep_once())
+
+        now = time.monotonic()
+        assert svc._next_ping["up"] - now > svc.PING_INTERVAL_SECONDS * (1 - svc.PING_JITTER) - 1
+        assert svc._next_ping["down"] - now <= svc.RETRY_MIN_SECONDS
+
+        # Consecutive failures back off exponentially, capped at the healthy interval
+        for expected in (2, 3, 4):
+            svc._schedule_next("down", healthy=False)
+            assert svc._failures["down"] == expected
+        svc._failures["down"] = 50
+        svc._schedule_next("down", healthy=False)
+        assert svc._next_ping["down"] - time.monotonic() <= svc.PING_INTERVAL_SECONDS
+
+    def test_ping_concurrency_is_bounded(self):
+        svc = MCPMeshService()
+        svc.MAX_CONCURRENT_PINGS = 3
+        svc._load_registry = MagicMock(return_value=[
+            {"name": f"svc-{i}", "url": f"http://svc-{i}:1"} for i in range(10)
+        ])
+        in_flight = {"now": 0, "peak": 0}
+        svc._ping_sidecar = self._fake_ping(svc, set(), in_flight)
+
+        asyncio.get_event_loop().run_until_complete(svc._sweep_once())
+
+        assert in_flight["peak"] == 3
+        assert len(svc._nodes) == 10
+
+    def test_transitions_are_published(self):
+        svc = MCPMeshService()
+        svc._load_registry = MagicMock(return_value=[{"name": "a", "url": "http://a:1"}])
+        healthy = {"a"}
+        svc._ping_sidecar = self._fake_ping(svc, healthy)
+        seen = []
+
+        async def listener(name, prev_status, new_status, node):
+            seen.append((name, prev_status, new_status))
+
+        svc.subscribe(listener)
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(svc._sweep_once())
+        healthy.clear()
+        svc._next_ping["a"] = 0.0
+        loop.run_until_complete(svc._sweep_once())
+        svc._next_ping["a"] = 0.0
+        loop.run_until_complete(svc._sweep_once())
+
+        assert seen == [("a", None, "healthy"), ("a", "healthy", "unhealthy")]
+
+    def test_registry_refresh_is_incremental(self):
+        svc = MCPMeshService()
+        stamp = datetime(2026, 1, 1)
+        svc._load_registry = MagicMock(return_value=[
+            {"name": "a", "url": "http://a:1", "updated_at": stamp},
+            {"name": "b", "url": "http://b:1", "updated_at": stamp},
+        ])
+        collection = MagicMock()
+        collection.distinct.return_value = ["a", "c"]
+        collection.find.return_value = [{"name": "c", "url": "http://c:1"}]
+        svc._get_registry_collection = MagicMock(return_value=collection)
+        svc._nodes["b"] = MCPNode(name="b", url="http://b:1", status="healthy")
+        removed = []
+
+        async def listener(name, prev_status, new_status, node):
+            removed.append((name, new_status))
+
+        svc.subscribe(listener)
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(svc._refresh_registry())
+        loop.run_until_complete(svc._refresh_registry())
+
+        svc._load_registry.assert_called_once()
+        query = collection.find.call_args[0][0]
+        assert query["$or"][0] == {"name": {"$in": ["c"]}}
+        assert query["$or"][1] == {"updated_at": {"$gt": stamp}}
+        assert set(svc._entries) == {"a", "c"}
+        assert removed == [("b", None)]
+        assert "b" not in svc._nodes
+
+
 class TestMeshAPIRoute:
     """Tests for the /system/mcp/mesh endpoint."""
 
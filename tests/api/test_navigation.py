@@ -0,0 +1,45 @@
+# tests/api/test_navigation.py
+"""
+Tests for the navigation state routes (async MongoDB access path).
+"""
+import pytest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import navigation
+from tests.mongomock_compat import AsyncDatabase
+
+
+@pytest.fixture
+def client():
+    mongomock = pytest.importorskip("mongomock")
+    database = AsyncDatabase(mongomock.MongoClient().conductor_state)
+    app = FastAPI()
+    app.include_router(navigation.router)
+    with patch.object(navigation.async_mongo, "database", return_value=database):
+        yield TestClient(app)
+
+
+HEADERS = {"X-User-Id": "u1"}
+
+
+class TestNavigationRoutes:
+    def test_save_and_restore_state(self, client):
+        client.put("/navigation", json={"screenplay_id": "s1", "conversation_id": "c1", "instance_id": "i1"}, headers=HEADERS)
+        client.put("/navigation", json={"screenplay_id": "s2", "conversation_id": "c2"}, headers=HEADERS)
+
+        by_screenplay = client.get("/navigation", params={"screenplay_id": "s1"}, headers=HEADERS).json()
+        last = client.get("/navigation/last", headers=HEADERS).json()
+
+        assert (by_screenplay["conversation_id"], by_screenplay["instance_id"]) == ("c1", "i1")
+        assert last["screenplay_id"] == "s2"
+
+    def test_clear_screenplay_state(self, client):
+        client.put("/navigation", json={"screenplay_id": "s1", "conversation_id": "c1", "instance_id": "i1"}, headers=HEADERS)
+
+        response = client.delete("/navigation", params={"screenplay_id": "s1"}, headers=HEADERS)
+
+        assert response.json()["deleted_count"] == 2
+        assert client.get("/navigation", headers=HEADERS).json()["screenplay_id"] is None
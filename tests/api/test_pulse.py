@@ -90,43 +90,33 @@ class TestPulseEventService:
             svc._record_event(ev)
         assert len(svc._event_log) <= 10
 
-    def test_mesh_health_change_detection(self):
-        """Test that health changes are detected between snapshots."""
+    def test_mesh_health_transitions(self):
+        """Test that health transitions pushed by the mesh become events."""
         svc = PulseEventService()
+        svc._inject_alert = AsyncMock()
 
-        # Set up initial snapshot
-        svc._previous_mesh_snapshot = {
-            "svc-a": "healthy",
-            "svc-b": "healthy",
-            "svc-c": "unhealthy",
-        }
-
-        # Create new mesh data with changes
-        from src.core.services.mcp_mesh_service import MCPMeshService, MCPNode
-
-        mesh_svc = MCPMeshService()
-        mesh_svc._nodes = {
-            "svc-a": MCPNode(name="svc-a", url="http://a", status="unhealthy", error="timeout"),
-            "svc-b": MCPNode(name="svc-b", url="http://b", status="healthy"),
-            "svc-c": MCPNode(name="svc-c", url="http://c", status="healthy"),
-            # svc-d is new
-            "svc-d": MCPNode(name="svc-d", url="http://d", status="healthy"),
-        }
-
-        with patch("src.core.services.mcp_mesh_service.mesh_service", mesh_svc):
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(svc._check_mesh_health_changes())
+        async def push_transitions():
+            await svc._on_mesh_transition("svc-a", "healthy", "unhealthy", {"error": "timeout"})
+            await svc._on_mesh_transition("svc-c", "unhealthy", "healthy", {})
+            await svc._on_mesh_transition("svc-d", None, "healthy", {"port": 13004})
+            await svc._on_mesh_transition("svc-e", "healthy", None, None)
+
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(push_transitions())
 
-        # Should have detected:
-        # - svc-a went from healthy to unhealthy (CRITICAL)
+        # Should have recorded:
+        # - svc-a went from healthy to unhealthy (CRITICAL, alert injected)
         # - svc-c recovered (INFO)
         # - svc-d discovered (INFO)
+        # - svc-e removed (WARNING)
         events = svc.get_events()
         titles = [e["title"] for e in events]
 
         assert any("DOWN" in t and "svc-a" in t for t in titles)
         assert any("RECOVERED" in t and "svc-c" in t for t in titles)
         assert any("discovered" in t and "svc-d" in t for t in titles)
+        assert any("REMOVED" in t and "svc-e" in t for t in titles)
+        svc._inject_alert.assert_awaited_once()
 
 
 class TestPulseAPIRoute:
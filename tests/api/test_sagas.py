@@ -360,3 +360,136 @@ class TestSagaAPIRoutes:
                 data = resp.json()
                 assert data["status"] == "rolled_back"
                 assert data["compensated_steps"] == 1
+
+
+class TestSagaDAG:
+    """Tests for dependency-aware parallel execution and rollback."""
+
+    def _make_manager(self):
+        mgr = SagaManager()
+        mgr._persist = MagicMock()
+        mgr._load = MagicMock(return_value=None)
+        return mgr
+
+    def _step(self, name, depends_on=None):
+        step = {
+            "name": name,
+            "service": f"{name}-sidecar",
+            "action": {"tool": f"do_{name}", "payload": {}},
+            "compensation": {"tool": f"undo_{name}", "payload": {}},
+        }
+        if depends_on is not None:
+            step["depends_on"] = depends_on
+        return step
+
+    def test_default_dependency_is_previous_step(self):
+        mgr = self._make_manager()
+        saga = mgr.create_saga(name="Seq", initiator="t", steps=[self._step("a"), self._step("b")])
+
+        assert saga.steps[0].depends_on == []
+        assert saga.steps[1].depends_on == [saga.steps[0].step_id]
+
+    def test_forward_or_unknown_dependency_rejected(self):
+        mgr = self._make_manager()
+        with pytest.raises(ValueError):
+            mgr.create_saga(name="Bad", initiator="t", steps=[self._step("a", depends_on=[1]), self._step("b")])
+        with pytest.raises(ValueError):
+            mgr.create_saga(name="Bad", initiator="t", steps=[self._step("a"), self._step("b", depends_on=["zzz"])])
+
+    def test_independent_steps_run_concurrently(self):
+        mgr = self._make_manager()
+        saga = mgr.create_saga(
+            name="Restart sidecars",
+            initiator="t",
+            steps=[self._step(n, depends_on=[]) for n in ("x", "y", "z")] + [self._step("verify", depends_on=["x", "y", "z"])],
+            max_parallel=3,
+        )
+        in_flight, peak, order = 0, 0, []
+
+        async def execute(step):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            order.append(step.name)
+            return {"status": "ok"}
+
+        mgr._execute_step = execute
+        result = asyncio.get_event_loop().run_until_complete(mgr.execute_saga(saga.saga_id))
+
+        assert result.status == SagaStatus.COMPLETED
+        assert peak == 3
+        assert order[-1] == "verify"
+
+    def test_max_parallel_bounds_in_flight_steps(self):
+        mgr = self._make_manager()
+        saga = mgr.create_saga(
+            name="Bounded", initiator="t",
+            steps=[self._step(str(i), depends_on=[]) for i in range(5)],
+            max_parallel=2,
+        )
+        in_flight, peak = 0, 0
+
+        async def execute(step):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        mgr._execute_step = execute
+        asyncio.get_event_loop().run_until_complete(mgr.execute_saga(saga.saga_id))
+
+        assert peak == 2
+
+    def test_rollback_compensates_dependents_first(self):
+        """
+        a -> b, a -> c, (b, c) -> d; d fails.
+        b and c are compensated (in parallel) before a.
+        """
+        mgr = self._make_manager()
+        saga = mgr.create_saga(
+            name="Diamond", initiator="t",
+            steps=[
+                self._step("a"),
+                self._step("b", depends_on=["a"]),
+                self._step("c", depends_on=["a"]),
+                self._step("d", depends_on=["b", "c"]),
+            ],
+        )
+        compensated = []
+
+        async def execute(step):
+            if step.name == "d":
+                raise RuntimeError("boom")
+            return {}
+
+        async def compensate(step):
+            await asyncio.sleep(0.01)
+            compensated.append(step.name)
+            return {}
+
+        mgr._execute_step = execute
+        mgr._execute_compensation = compensate
+        result = asyncio.get_event_loop().run_until_complete(mgr.execute_saga(saga.saga_id))
+
+        assert result.status == SagaStatus.ROLLED_BACK
+        assert sorted(compensated[:2]) == ["b", "c"]
+        assert compensated[2] == "a"
+        assert result.steps[3].status == StepStatus.FAILED
+
+    def test_step_updates_are_targeted(self):
+        mgr = SagaManager()
+        collection = MagicMock()
+        mgr._get_collection = MagicMock(return_value=collection)
+        saga = mgr.create_saga(name="Targeted", initiator="t", steps=[self._step("a"), self._step("b")])
+        saga.status = SagaStatus.RUNNING
+        saga.steps[1].status = StepStatus.COMPLETED
+
+        mgr._persist(saga, saga.steps[1])
+
+        update = collection.update_one.call_args[0][1]["$set"]
+        assert update["steps.1.status"] == "completed"
+        assert "steps" not in update and "steps.0.status" not in update
@@ -0,0 +1,103 @@
+# tests/api/test_system_migrate.py
+"""
+Tests for POST /system/migrate checkpoint handling and history archive key validation.
+"""
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import system
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(system.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("name", ["../config", "/etc/passwd", "a/b", "..", ".hidden", "x" * 65])
+def test_checkpoint_must_be_a_plain_name(name):
+    with patch("src.api.routes.system._migration_repository") as repository:
+        response = _client().post("/system/migrate", json={
+            "from_type": "filesystem", "to_type": "mongodb", "checkpoint": name,
+        })
+
+    assert response.status_code == 400
+    repository.assert_not_called()
+
+
+def test_checkpoint_name_maps_into_the_checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(system, "MIGRATION_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    engine = MagicMock()
+    engine.return_value.run.return_value = {"success": True, "agents_migrated": 0}
+
+    with patch("src.api.routes.system._migration_repository"), \
+            patch("src.infrastructure.storage.bulk_migration.BulkMigrationEngine", engine):
+        response = _client().post("/system/migrate", json={
+            "from_type": "filesystem", "to_type": "mongodb", "checkpoint": "fs-to-mongo_1",
+        })
+
+    assert response.status_code == 200
+    assert engine.call_args.kwargs["checkpoint_path"] == os.path.join(
+        str(tmp_path / "checkpoints"), "fs-to-mongo_1.json"
+    )
+
+
+@pytest.mark.parametrize("body", [
+    {"from_type": "mongodb", "to_type": "mongodb"},
+    {"from_type": "mongodb", "to_type": "mongodb", "path": "/tmp/elsewhere"},
+    {"from_type": "filesystem", "to_type": "filesystem"},
+])
+def test_same_backend_is_rejected_unless_filesystem_with_path(body):
+    with patch("src.api.routes.system._migration_repository") as repository:
+        response = _client().post("/system/migrate", json=body)
+
+    assert response.status_code == 400
+    repository.assert_not_called()
+
+
+def test_filesystem_copy_onto_its_own_directory_is_rejected(tmp_path):
+    with patch("src.api.routes.system._migration_repository",
+               return_value=MagicMock(base_path=str(tmp_path))), \
+            patch("src.infrastructure.storage.bulk_migration.BulkMigrationEngine") as engine:
+        response = _client().post("/system/migrate", json={
+            "from_type": "filesystem", "to_type": "filesystem", "path": str(tmp_path),
+        })
+
+    assert response.status_code == 400
+    engine.assert_not_called()
+
+
+@pytest.mark.parametrize("path", [
+    "/system/history/archive/..",
+    "/system/history/archive/..%2F..%2Fconfig/entries",
+    "/system/history/archive/.hidden",
+    "/system/history/archive/a%5Cb",
+])
+def test_history_archive_key_must_be_an_id(path):
+    with patch("src.core.services.history_retention_service.history_retention_service") as service:
+        response = _client().get(path)
+
+    assert response.status_code in (400, 404)
+    service.archive.segments.assert_not_called()
+    service.archive.read.assert_not_called()
+
+
+def test_history_archive_restore_rejects_path_keys():
+    with patch("src.core.services.history_retention_service.history_retention_service") as service:
+        response = _client().post("/system/history/archive/..%2Fother/restore", json={})
+
+    assert response.status_code in (400, 404)
+    service.archive.restore.assert_not_called()
+
+
+def test_history_archive_accepts_agent_and_instance_ids():
+    with patch("src.core.services.history_retention_service.history_retention_service") as service:
+        service.archive.segments.return_value = []
+        response = _client().get("/system/history/archive/dispatch-1700000000-abcdef")
+
+    assert response.status_code == 200
+    service.archive.segments.assert_called_once_with("dispatch-1700000000-abcdef", "history")
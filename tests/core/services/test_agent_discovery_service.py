@@ -219,6 +219,20 @@ class TestAgentDiscoveryService:
         mock_repository.load_history.assert_called_once_with("test_agent")
         assert result == mock_history
 
+    def test_get_conversation_history_with_limit_reads_tail(self):
+        """Com limit, só a cauda do histórico é lida."""
+        mock_repository = Mock()
+        mock_repository.load_history_tail.return_value = [{"prompt": "q", "response": "a"}]
+        mock_storage_service = Mock()
+        mock_storage_service.get_repository.return_value = mock_repository
+
+        service = AgentDiscoveryService(mock_storage_service)
+        result = service.get_conversation_history("test_agent", limit=200)
+
+        mock_repository.load_history_tail.assert_called_once_with("test_agent", 200)
+        mock_repository.load_history.assert_not_called()
+        assert result == [{"prompt": "q", "response": "a"}]
+
     def test_clear_conversation_history_success(self):
         """Test successful clearing of conversation history."""
         # Setup mock repository
@@ -267,11 +281,7 @@ class TestAgentDiscoveryService:
         mock_repository = Mock()
         mock_storage_service.get_repository.return_value = mock_repository
         
-        mock_repository.list_agents.return_value = ["agent1", "agent2"]
-        mock_repository.load_definition.side_effect = [
-            {"name": "Agent 1", "version": "1.0", "schema_version": "1.0", "description": "Test", "author": "Test"},
-            {"name": "Agent 2", "version": "1.0", "schema_version": "1.0", "description": "Test", "author": "Test"}
-        ]
+        mock_repository.list_agent_names.return_value = {"agent1": "Agent 1", "agent2": "Agent 2"}
         
         service = AgentDiscoveryService(mock_storage_service)
         
@@ -280,6 +290,7 @@ class TestAgentDiscoveryService:
         
         # Verify
         assert result is True
+        mock_repository.load_definition.assert_not_called()
 
     def test_agent_exists_returns_false_when_agent_not_found(self):
         """Test that agent_exists returns False when agent is not found."""
@@ -288,11 +299,7 @@ class TestAgentDiscoveryService:
         mock_repository = Mock()
         mock_storage_service.get_repository.return_value = mock_repository
         
-        mock_repository.list_agents.return_value = ["agent1", "agent2"]
-        mock_repository.load_definition.side_effect = [
-            {"name": "Agent 1", "version": "1.0", "schema_version": "1.0", "description": "Test", "author": "Test"},
-            {"name": "Agent 2", "version": "1.0", "schema_version": "1.0", "description": "Test", "author": "Test"}
-        ]
+        mock_repository.list_agent_names.return_value = {"agent1": "Agent 1", "agent2": "Agent 2"}
         
         service = AgentDiscoveryService(mock_storage_service)
         
@@ -301,6 +308,42 @@ class TestAgentDiscoveryService:
         
         # Verify
         assert result is False
+        mock_repository.load_definition.assert_not_called()
+
+    def test_name_index_is_built_once_and_rebuilt_after_clear_cache(self):
+        """O índice de nomes é reutilizado até clear_cache (criação/remoção de agentes)."""
+        mock_storage_service = Mock()
+        mock_repository = Mock()
+        mock_storage_service.get_repository.return_value = mock_repository
+        mock_repository.list_agent_names.return_value = {"agent1": "Agent 1"}
+
+        service = AgentDiscoveryService(mock_storage_service)
+        assert service.agent_exists("agent1")
+        assert not service.agent_exists("agent2")
+
+        mock_repository.list_agent_names.return_value = {"agent1": "Agent 1", "agent2": "Agent 2"}
+        assert not service.agent_exists("agent2")
+        service.clear_cache()
+        assert service.agent_exists("agent2")
+        assert mock_repository.list_agent_names.call_count == 2
+
+    def test_get_similar_agent_names_uses_name_index(self):
+        """Sugestões vêm do índice: nome normalizado, substring e erros de digitação."""
+        mock_storage_service = Mock()
+        mock_repository = Mock()
+        mock_storage_service.get_repository.return_value = mock_repository
+        mock_repository.list_agent_names.return_value = {
+            "CodeGenerator_Agent": "Code Generator",
+            "RequirementsAnalyst_Agent": "Requirements Analyst",
+            "Unrelated": "Something Else",
+        }
+
+        service = AgentDiscoveryService(mock_storage_service)
+
+        assert service.get_similar_agent_names("code-generator") == ["CodeGenerator_Agent"]
+        assert service.get_similar_agent_names("RequirmentsAnalyst_Agent") == ["RequirementsAnalyst_Agent"]
+        assert service.get_similar_agent_names("zzz") == []
+        mock_repository.load_definition.assert_not_called()
 
     def test_build_meta_agent_context_with_meta_and_new_agent_id(self):
         """Test building meta agent context with all parameters."""
@@ -0,0 +1,122 @@
+# tests/core/services/test_conversation_event_service.py
+"""
+Tests for the conversation event hub behind GET /conversations/{id}/events.
+"""
+import asyncio
+
+from src.core.services.conversation_event_service import (
+    ACTIVE_AGENT_CHANGED,
+    MESSAGE_APPENDED,
+    PLACEHOLDER_UPDATED,
+    RESYNC,
+    TASK_STATUS,
+    ConversationEventHub,
+    events_from_change,
+)
+
+
+def _conversation_update(updated_fields, conversation_id="c1"):
+    return {
+        "operationType": "update",
+        "ns": {"coll": "conversations"},
+        "fullDocument": {"conversation_id": conversation_id},
+        "updateDescription": {"updatedFields": updated_fields},
+    }
+
+
+class TestEventsFromChange:
+    def test_appended_messages_carry_sequence(self):
+        events = events_from_change(_conversation_update({
+            "messages.4": {"id": "m5"},
+            "messages.3": {"id": "m4"},
+            "message_count": 5,
+        }))
+
+        assert [(t, d["sequence"], d["message"]["id"]) for t, d in events] == [
+            (MESSAGE_APPENDED, 4, "m4"),
+            (MESSAGE_APPENDED, 5, "m5"),
+        ]
+
+    def test_placeholder_fields_are_grouped(self):
+        events = events_from_change(_conversation_update({
+            "messages.2.content": "done",
+            "messages.2.status": "completed",
+        }))
+
+        assert events == [(PLACEHOLDER_UPDATED, {
+            "conversation_id": "c1",
+            "sequence": 3,
+            "fields": {"content": "done", "status": "completed"},
+        })]
+
+    def test_active_agent_change(self):
+        [(event_type, data)] = events_from_change(_conversation_update({"active_agent": {"agent_id": "a1"}}))
+
+        assert event_type == ACTIVE_AGENT_CHANGED
+        assert data["active_agent"] == {"agent_id": "a1"}
+
+    def test_task_status_needs_conversation(self):
+        change = {
+            "operationType": "update",
+            "ns": {"coll": "tasks"},
+            "documentKey": {"_id": "t1"},
+            "fullDocument": {"conversation_id": "c1", "agent_id": "a1"},
+            "updateDescription": {"updatedFields": {"status": "completed"}},
+        }
+
+        assert events_from_change(change)[0] == (TASK_STATUS, {
+            "conversation_id": "c1",
+            "task_id": "t1",
+            "status": "completed",
+            "agent_id": "a1",
+            "instance_id": None,
+        })
+        change["fullDocument"] = {"agent_id": "a1"}
+        assert events_from_change(change) == []
+
+
+class TestConversationEventHub:
+    def _event(self, event_id, conversation_id="c1"):
+        return {"id": event_id, "type": MESSAGE_APPENDED, "data": {"conversation_id": conversation_id}}
+
+    def test_dispatch_reaches_only_that_conversation(self):
+        async def scenario():
+            hub = ConversationEventHub()
+            mine, other = hub.subscribe("c1"), hub.subscribe("c2")
+            hub._dispatch(self._event("e1"))
+            return mine.queue.qsize(), other.queue.qsize()
+
+        assert asyncio.get_event_loop().run_until_complete(scenario()) == (1, 0)
+
+    def test_reconnect_replays_missed_events(self):
+        async def scenario():
+            hub = ConversationEventHub()
+            for event_id in ("e1", "e2", "e3"):
+                hub._dispatch(self._event(event_id))
+            hub._dispatch(self._event("x1", conversation_id="c2"))
+            subscription = hub.subscribe("c1", last_event_id="e1")
+            return [subscription.queue.get_nowait()["id"] for _ in range(subscription.queue.qsize())]
+
+        assert asyncio.get_event_loop().run_until_complete(scenario()) == ["e2", "e3"]
+
+    def test_unknown_last_event_id_asks_for_resync(self):
+        async def scenario():
+            hub = ConversationEventHub()
+            subscription = hub.subscribe("c1", last_event_id="gone")
+            return subscription.queue.get_nowait()["type"]
+
+        assert asyncio.get_event_loop().run_until_complete(scenario()) == RESYNC
+
+    def test_publish_local_is_ignored_while_streaming(self):
+        async def scenario():
+            hub = ConversationEventHub()
+            hub._loop = asyncio.get_running_loop()
+            subscription = hub.subscribe("c1")
+            hub._streaming = True
+            hub.publish_local(MESSAGE_APPENDED, {"conversation_id": "c1"})
+            hub._streaming = False
+            hub.publish_local(MESSAGE_APPENDED, {"conversation_id": "c1"})
+            await asyncio.sleep(0)
+            return subscription.queue.qsize()
+
+        assert asyncio.get_event_loop().run_until_complete(scenario()) == 1
@@ -0,0 +1,223 @@
+# tests/core/services/test_conversation_service.py
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from src.core.services.conversation_service import (
+    AsyncConversationService,
+    ConversationService,
+    encode_cursor,
+)
+from tests.mongomock_compat import AsyncDatabase
+
+
+@pytest.fixture
+def service(monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(ConversationService, "_prepared_databases", set())
+    with patch("src.core.services.conversation_service.MongoClient", return_value=client):
+        yield ConversationService()
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture
+def async_service():
+    mongomock = pytest.importorskip("mongomock")
+    return AsyncConversationService(AsyncDatabase(mongomock.MongoClient().db))
+
+
+AGENT = {"agent_id": "a1", "instance_id": "i1", "name": "Agent One", "emoji": "🤖"}
+
+
+class TestConversationCounters:
+    """Contadores denormalizados mantidos na escrita."""
+
+    def test_add_message_maintains_counters_and_preview(self, async_service):
+        conversation_id = run(async_service.create_conversation(title="Counters"))["conversation_id"]
+
+        run(async_service.add_message(conversation_id, user_input="hello", agent_response="x" * 500, agent_info=AGENT))
+        run(async_service.add_message(conversation_id, user_input="again", agent_response="ok", agent_info=AGENT))
+
+        doc = async_service.conversations.sync.find_one({"conversation_id": conversation_id})
+        assert doc["message_count"] == 4
+        assert doc["participant_count"] == 1
+        assert doc["last_message_preview"]["content"] == "ok"
+        assert doc["last_message_preview"]["agent_name"] == "Agent One"
+
+    def test_preview_is_truncated(self, async_service):
+        conversation_id = run(async_service.create_conversation(title="Preview"))["conversation_id"]
+        run(async_service.add_message(conversation_id, user_input="y" * 1000))
+
+        doc = async_service.conversations.sync.find_one({"conversation_id": conversation_id})
+        assert len(doc["last_message_preview"]["content"]) == 200
+
+    def test_legacy_documents_get_counters_on_listing(self, async_service):
+        async_service.conversations.sync.insert_one({
+            "conversation_id": "legacy",
+            "title": "Legacy",
+            "created_at": "2025-01-01T00:00:00",
+            "updated_at": "2025-01-01T00:00:00",
+            "participants": [AGENT],
+            "messages": [{"type": "user", "content": "a"}, {"type": "user", "content": "b"}],
+        })
+
+        [summary] = run(async_service.list_conversations())
+
+        assert summary["message_count"] == 2
+        assert summary["participant_count"] == 1
+        assert summary["last_message_preview"]["content"] == "b"
+        assert async_service.conversations.sync.find_one({"conversation_id": "legacy"})["message_count"] == 2
+
+
+def test_backfill_runs_once_per_process(service):
+    service.conversations.insert_one({"conversation_id": "legacy", "messages": [{"type": "user"}]})
+
+    with patch("src.core.services.conversation_service.MongoClient", return_value=service.client), \
+            patch.object(ConversationService, "_backfill_summary_counters") as backfill:
+        ConversationService()
+        ConversationService()
+
+    backfill.assert_not_called()
+    assert "message_count" not in service.conversations.find_one({"conversation_id": "legacy"})
+
+
+def test_sync_service_reads_messages(service):
+    service.conversations.insert_one({
+        "conversation_id": "c1",
+        "messages": [{"type": "user", "content": "a"}, {"type": "bot", "content": "b"}],
+    })
+
+    assert [m["content"] for m in service.get_conversation_messages("c1", limit=1)] == ["b"]
+    assert service.get_conversation_messages("missing") == []
+
+
+class TestConversationListing:
+    """Listagem por sumário com keyset pagination."""
+
+    def _seed(self, async_service, count, screenplay_id=None):
+        for i in range(count):
+            async_service.conversations.sync.insert_one({
+                "conversation_id": f"c{i:02d}",
+                "title": f"Conversation {i}",
+                "created_at": "2025-01-01T00:00:00",
+                # Pares com o mesmo updated_at exercitam o desempate por conversation_id
+                "updated_at": f"2025-01-01T00:00:{i // 2:02d}",
+                "participants": [],
+                "messages": [{"type": "user", "content": "m"}],
+                "message_count": 1,
+                "participant_count": 0,
+                "last_message_preview": None,
+                "screenplay_id": screenplay_id,
+            })
+
+    def test_listing_does_not_return_message_arrays(self, async_service):
+        self._seed(async_service, 1)
+
+        [summary] = run(async_service.list_conversations())
+
+        assert "messages" not in summary and "participants" not in summary
+
+    def test_cursor_walks_all_pages_without_gaps(self, async_service):
+        self._seed(async_service, 7)
+
+        seen, cursor = [], None
+        while True:
+            page = run(async_service.list_conversations(limit=3, cursor=cursor))
+            seen.extend(c["conversation_id"] for c in page)
+            if len(page) < 3:
+                break
+            cursor = encode_cursor(page[-1])
+
+        assert seen == [f"c{i:02d}" for i in reversed(range(7))]
+
+    def test_cursor_respects_screenplay_filter(self, async_service):
+        self._seed(async_service, 4, screenplay_id="s1")
+        run(async_service.create_conversation(title="Other screenplay", screenplay_id="s2"))
+
+        first = run(async_service.list_conversations(limit=2, screenplay_id="s1"))
+        rest = run(async_service.list_conversations(limit=10, screenplay_id="s1", cursor=encode_cursor(first[-1])))
+
+        assert [c["conversation_id"] for c in first + rest] == ["c03", "c02", "c01", "c00"]
+
+    def test_invalid_cursor_raises(self, async_service):
+        with pytest.raises(ValueError):
+            run(async_service.list_conversations(cursor="not-a-cursor"))
+
+
+class TestAddMessage:
+    """Append de mensagens em um único update."""
+
+    def test_returns_sequence_number(self, async_service):
+        conversation_id = run(async_service.create_conversation(title="Sequence"))["conversation_id"]
+
+        assert run(async_service.add_message(conversation_id, user_input="a", agent_response="b", agent_info=AGENT)) == 2
+        assert run(async_service.add_message(conversation_id, user_input="c")) == 3
+
+    def test_unknown_conversation_returns_none(self, async_service):
+        assert run(async_service.add_message("missing", user_input="a")) is None
+
+
+class TestAsyncConversationService:
+    """Operações das rotas sobre a API async do PyMongo."""
+
+    def test_create_append_and_read(self, async_service):
+        conversation = run(async_service.create_conversation(title="Async", screenplay_id="s1"))
+        conversation_id = conversation["conversation_id"]
+        second = run(async_service.create_conversation(title="Async 2", screenplay_id="s1"))
+
+        assert "_id" not in conversation
+        assert second["display_order"] == conversation["display_order"] + 1
+        assert run(async_service.add_message(conversation_id, user_input="a", agent_response="b", agent_info=AGENT)) == 2
+        assert run(async_service.add_message("missing", user_input="a")) is None
+
+        doc = run(async_service.get_conversation_by_id(conversation_id))
+        assert doc["message_count"] == 2 and doc["participants"] == [AGENT]
+        assert [m["content"] for m in run(async_service.get_conversation_messages(conversation_id, limit=1))] == ["b"]
+        assert run(async_service.conversation_exists(conversation_id))
+
+    def test_invalid_title_raises(self, async_service):
+        with pytest.raises(ValueError):
+            run(async_service.create_conversation(title="ab"))
+
+    def test_list_pages_and_backfills_legacy_counters(self, async_service):
+        conversations = async_service.conversations.sync
+        for i in range(3):
+            conversations.insert_one({
+                "conversation_id": f"c{i}",
+                "title": f"Conversation {i}",
+                "created_at": "2025-01-01T00:00:00",
+                "updated_at": f"2025-01-01T00:00:0{i}",
+                "participants": [],
+                "messages": [{"type": "user", "content": "m"}],
+            })
+
+        first = run(async_service.list_conversations(limit=2))
+        rest = run(async_service.list_conversations(limit=2, cursor=encode_cursor(first[-1])))
+
+        assert [c["conversation_id"] for c in first + rest] == ["c2", "c1", "c0"]
+        assert first[0]["message_count"] == 1
+        assert conversations.find_one({"conversation_id": "c2"})["message_count"] == 1
+
+    def test_updates_report_missing_conversations(self, async_service):
+        conversation_id = run(async_service.create_conversation(title="Updates"))["conversation_id"]
+
+        assert run(async_service.set_active_agent(conversation_id, AGENT))
+        assert run(async_service.update_conversation_settings(conversation_id, max_chain_depth=0))
+        assert not run(async_service.update_conversation_title("missing", "New title"))
+        assert run(async_service.update_conversation_order([
+            {"conversation_id": conversation_id, "display_order": 5},
+            {"conversation_id": "missing", "display_order": 6},
+            {"display_order": 7},
+        ])) == 1
+
+        doc = run(async_service.get_conversation_by_id(conversation_id))
+        assert doc["active_agent"] == AGENT
+        assert doc["max_chain_depth"] is None
+        assert doc["display_order"] == 5
+        assert run(async_service.delete_conversation(conversation_id))
+        assert not run(async_service.delete_conversation(conversation_id))
@@ -0,0 +1,128 @@
+# tests/core/services/test_mcp_registry_index.py
+"""
+Tests for the in-memory MCP registry index (resolve, heartbeats, staleness).
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.services.mcp_registry_index import MCPRegistryIndex
+from tests.mongomock_compat import compatible_bulk_write
+
+
+@pytest.fixture
+def registry():
+    mongomock = pytest.importorskip("mongomock")
+    collection = compatible_bulk_write(mongomock.MongoClient().db.mcp_registry)
+    now = datetime.utcnow()
+    collection.insert_many([
+        {"name": "crm", "url": "http://crm:9000/sse", "host_url": "http://localhost:13001/sse",
+         "auth": "tok", "status": "healthy", "tools_count": 3, "last_heartbeat": now},
+        {"name": "billing", "url": "http://billing:9000/sse?v=1", "auth": "t2",
+         "status": "healthy", "tools_count": 1, "last_heartbeat": now},
+        {"name": "down", "url": "http://down:9000/sse", "status": "unhealthy", "last_heartbeat": now},
+    ])
+    return collection
+
+
+@pytest.fixture
+def index(registry):
+    index = MCPRegistryIndex()
+    index._collection = registry
+    index.reload()
+    return index
+
+
+class TestResolve:
+    def test_resolve_is_served_from_memory(self, index, registry):
+        registry.find_one = MagicMock(side_effect=AssertionError("no per-name lookups"))
+
+        result = index.resolve(["crm", "billing", "down", "missing"])
+
+        assert result["resolved"] == {
+            "crm": "http://localhost:13001/sse?auth=tok",
+            "billing": "http://billing:9000/sse?v=1&auth=t2",
+        }
+        assert result["not_found"] == ["down", "missing"]
+
+    def test_refresh_applies_route_writes(self, index, registry):
+        registry.update_one({"name": "down"}, {"$set": {"status": "healthy"}})
+        registry.delete_one({"name": "crm"})
+
+        index.refresh("down")
+        index.refresh("crm")
+
+        assert index.resolve(["down", "crm"]) == {
+            "resolved": {"down": "http://down:9000/sse"},
+            "not_found": ["crm"],
+        }
+
+
+class TestHeartbeats:
+    def test_heartbeats_are_coalesced_into_one_bulk_write(self, index, registry):
+        index._running = True
+        bulk_write = registry.bulk_write
+        registry.bulk_write = MagicMock(side_effect=bulk_write)
+
+        for _ in range(3):
+            assert index.record_heartbeat("crm", tools_count=7)
+        assert index.record_heartbeat("down")
+        assert registry.find_one({"name": "down"})["status"] == "unhealthy"
+
+        assert index.flush() == 2
+        assert registry.bulk_write.call_count == 1
+        assert registry.find_one({"name": "crm"})["tools_count"] == 7
+        assert registry.find_one({"name": "down"})["status"] == "healthy"
+        assert index.flush() == 0
+
+    def test_heartbeat_is_written_through_when_not_running(self, index, registry):
+        assert index.record_heartbeat("down", tools_count=2)
+
+        doc = registry.find_one({"name": "down"})
+        assert doc["status"] == "healthy" and doc["tools_count"] == 2
+
+    def test_unknown_mcp(self, index):
+        assert index.record_heartbeat("missing") is False
+        assert index.health("missing") is None
+
+    def test_unflushed_heartbeat_survives_stream_update(self, index):
+        index._running = True
+        index.record_heartbeat("crm", tools_count=9)
+
+        stored = index.get("crm")
+        index._apply_change({
+            "operationType": "update",
+            "documentKey": {"_id": stored["_id"]},
+            "fullDocument": {**stored, "tools_count": 3, "metadata": {"category": "sales"}},
+        })
+
+        entry = index.get("crm")
+        assert entry["tools_count"] == 9
+        assert entry["metadata"] == {"category": "sales"}
+
+    def test_stream_delete_removes_entry(self, index):
+        index._apply_change({"operationType": "delete", "documentKey": {"_id": index.get("crm")["_id"]}})
+        index._streaming = True
+
+        assert index.get("crm") is None
+
+
+class TestStaleness:
+    def test_health_reports_stale_without_writing(self, index, registry):
+        registry.update_one = MagicMock(side_effect=AssertionError("health must not write"))
+
+        health = index.health("crm", now=datetime.utcnow() + timedelta(seconds=120))
+
+        assert health["is_stale"] is True
+        assert health["status"] == "unhealthy"
+        assert health["tools_count"] == 3
+
+    def test_sweeper_flips_stale_entries_once(self, index, registry):
+        later = datetime.utcnow() + timedelta(seconds=120)
+
+        assert index.mark_stale(now=later) == ["crm", "billing"]
+        assert index.mark_stale(now=later) == []
+
+        assert registry.find_one({"name": "crm"})["status"] == "unhealthy"
+        assert index.resolve(["crm"])["not_found"] == ["crm"]
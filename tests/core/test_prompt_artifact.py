@@ -0,0 +1,104 @@
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.prompt_artifact import artifact_cache, agent_version, PromptArtifactCache, CompiledAgentPrompt
+from src.core.prompt_engine import PromptEngine
+
+
+class TestCompiledStaticPrefix:
+    """Prefixo estático compilado por versão do agente."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        artifact_cache.clear()
+        yield
+        artifact_cache.clear()
+
+    @pytest.fixture
+    def agent_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            agent_path = Path(tmp_dir)
+            with open(agent_path / "definition.yaml", "w") as f:
+                yaml.dump({"name": "CacheAgent", "description": "Caches things", "prompt": "Be brief"}, f)
+            with open(agent_path / "persona.md", "w") as f:
+                f.write("# Persona: Cache Agent\n\nI am {{agent_name}}.")
+            with open(agent_path / "playbook.yaml", "w") as f:
+                yaml.dump({"best_practices": [{"id": "BP1", "title": "Reuse", "description": "Reuse prefixes"}]}, f)
+            yield agent_path
+
+    def _engine(self, agent_dir, screenplay="", conversation_context=""):
+        engine = PromptEngine(agent_dir)
+        engine.load_context()
+        engine.screenplay_content = screenplay
+        engine.conversation_context = conversation_context
+        return engine
+
+    def test_prefix_is_byte_identical_across_tasks(self, agent_dir):
+        first = self._engine(agent_dir, "Screenplay A", "Context A").build_xml_prompt([], "task one")
+        second = self._engine(agent_dir).build_xml_prompt([], "task two")
+
+        prefix_end = first.index("</system_context>") + len("</system_context>")
+        assert first[:prefix_end] == second[:prefix_end]
+        assert "Screenplay A" in first[prefix_end:]
+        assert "<session_context>" in first and "<session_context>" not in second
+
+    def test_volatile_sections_follow_static_prefix(self, agent_dir):
+        prompt = self._engine(agent_dir, "Screenplay A", "Context A").build_xml_prompt([], "hi")
+
+        assert prompt.index("</system_context>") < prompt.index("<screenplay>")
+        assert prompt.index("</session_context>") < prompt.index("<conversation_history>")
+        assert "I am Cache." in prompt
+        assert "Reuse prefixes" in prompt
+
+    def test_second_load_reuses_compiled_artifact(self, agent_dir):
+        self._engine(agent_dir)
+
+        with patch.object(PromptEngine, "_format_playbook_for_prompt") as format_playbook, \
+                patch.object(PromptEngine, "_resolve_persona_placeholders") as resolve:
+            engine = self._engine(agent_dir)
+
+        format_playbook.assert_not_called()
+        resolve.assert_not_called()
+        assert "Reuse prefixes" in engine.playbook_content
+        assert artifact_cache.hits == 1
+
+    def test_persona_change_produces_new_version(self, agent_dir):
+        before = self._engine(agent_dir).compiled_prompt.version
+        with open(agent_dir / "persona.md", "w") as f:
+            f.write("# Persona: Cache Agent\n\nChanged.")
+        after = self._engine(agent_dir)
+
+        assert after.compiled_prompt.version != before
+        assert "Changed." in after.build_xml_prompt([], "hi")
+
+    def test_manual_attribute_changes_bypass_stale_artifact(self, agent_dir):
+        engine = self._engine(agent_dir)
+        engine.persona_content = "Overridden persona"
+
+        assert "Overridden persona" in engine.get_static_prefix()
+
+
+class TestPromptArtifactCache:
+    """LRU em memória com persistência opcional."""
+
+    def test_lru_evicts_oldest(self):
+        cache = PromptArtifactCache(max_size=2)
+        for version in ("a", "b", "c"):
+            cache.put(CompiledAgentPrompt(version, "p", "i", "", "<system_context/>"))
+
+        assert cache.get("a") is None
+        assert cache.get("c").static_prefix == "<system_context/>"
+
+    def test_mongo_backed_cache_shares_artifacts(self):
+        mongomock = pytest.importorskip("mongomock")
+        collection = mongomock.MongoClient()["artifact_test"]["prompt_artifacts"]
+        writer = PromptArtifactCache(collection_factory=lambda: collection)
+        reader = PromptArtifactCache(collection_factory=lambda: collection)
+
+        version = agent_version({"name": "A"}, "persona", {})
+        writer.put(CompiledAgentPrompt(version, "persona", "i", "", "<prefix/>"), agent="A")
+
+        assert reader.get(version).static_prefix == "<prefix/>"
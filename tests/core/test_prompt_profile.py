@@ -0,0 +1,81 @@
+import pytest
+import tempfile
+import yaml
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.prompt_engine import PromptEngine
+from src.core.prompt_profile import PromptProfile, aggregate_profiles
+
+
+class TestPromptProfile:
+    """Tempos por etapa e bytes por seção da construção do prompt."""
+
+    @pytest.fixture
+    def agent_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            agent_path = Path(tmp_dir)
+            with open(agent_path / "definition.yaml", "w") as f:
+                yaml.dump({"name": "ProfiledAgent", "description": "Profiles things", "prompt": "Be brief"}, f)
+            with open(agent_path / "persona.md", "w") as f:
+                f.write("# Persona: Profiled Agent\n\nI am {{agent_name}}.")
+            yield agent_path
+
+    def test_engine_records_stages_and_sections(self, agent_dir):
+        profile = PromptProfile("ProfiledAgent")
+        engine = PromptEngine(agent_dir, profile=profile)
+        with patch.object(PromptEngine, "_load_task_state_context"), \
+                patch.object(PromptEngine, "_save_prompt_to_disk"):
+            engine.load_context()
+            engine.screenplay_content = "Roteiro çom acentos"
+            prompt = engine.build_xml_prompt(
+                [{"type": "user", "content": "oi"}, {"type": "bot", "content": "olá"}], "próximo passo"
+            )
+
+        assert {"load_config", "load_persona", "load_history", "load_world_state",
+                "build_static", "build_history", "save_prompt"} <= set(profile.stages)
+        assert profile.prompt_bytes == len(prompt.encode("utf-8"))
+        assert profile.sections["screenplay"] > len("Roteiro çom acentos")
+        assert profile.sections["request"] == len("próximo passo".encode("utf-8"))
+        assert "delegation" not in profile.sections
+
+        compact = profile.compact()
+        assert all("." not in key for key in [*compact["stages"], *compact["bytes"]])
+        assert "playbook" not in compact["bytes"]  # empty sections are left out
+        api = profile.to_dict()
+        assert api["stages"][0]["stage"] == max(profile.stages, key=profile.stages.get)
+        assert [s["section"] for s in api["sections"]][:2] == ["persona", "instructions"]
+
+    def test_aggregate_ranks_agents_stages_and_sections(self):
+        mongomock = pytest.importorskip("mongomock")
+        tasks = mongomock.MongoClient().db.tasks
+        now = datetime.now(timezone.utc)
+
+        def task(agent_id, total, history_ms, history_bytes, age_hours=1):
+            return {
+                "agent_id": agent_id,
+                "created_at": now - timedelta(hours=age_hours),
+                "prompt_profile": {
+                    "total_ms": total,
+                    "stages": {"load_history": history_ms, "load_config": 1.0},
+                    "bytes": {"history": history_bytes, "persona": 100},
+                    "prompt_bytes": history_bytes + 100,
+                },
+            }
+
+        tasks.insert_many([
+            task("Slow_Agent", 900.0, 800.0, 50_000),
+            task("Slow_Agent", 700.0, 600.0, 40_000),
+            task("Fast_Agent", 10.0, 2.0, 1_000),
+            task("Old_Agent", 5000.0, 4000.0, 1, age_hours=48),
+            {"agent_id": "Unprofiled", "created_at": now},
+        ])
+
+        view = aggregate_profiles(tasks, since_hours=24, limit=5)
+
+        assert view["tasks"] == 3
+        assert [row["agent_id"] for row in view["agents_ms"]] == ["Slow_Agent", "Fast_Agent"]
+        assert view["agents_ms"][0] == {"agent_id": "Slow_Agent", "count": 2, "avg": 800.0, "max": 900.0}
+        assert view["stages_ms"][0]["stage"] == "load_history"
+        assert view["sections_bytes"][0] == {"section": "history", "count": 3, "avg": 30333.33, "max": 50000}
@@ -0,0 +1,30 @@
+# tests/infrastructure/test_agent_name_projection.py
+"""
+Tests for the agent_id -> name projection backing the agent name index.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+
+
+def test_filesystem_projection_skips_agents_without_definition(tmp_path):
+    repo = FileSystemStateRepository(base_path=str(tmp_path))
+    repo.save_definition("Named_Agent", {"name": "Named Agent"})
+    repo.save_definition("Unnamed_Agent", {"version": "1.0"})
+    repo.save_persona("Persona_Only", "# Persona")
+
+    assert repo.list_agent_names() == {"Named_Agent": "Named Agent", "Unnamed_Agent": "Unnamed_Agent"}
+
+
+def test_mongo_projection_does_not_load_definitions():
+    mongomock = pytest.importorskip("mongomock")
+    with patch("src.infrastructure.storage.mongo_repository.MongoClient", mongomock.MongoClient):
+        from src.infrastructure.storage.mongo_repository import MongoStateRepository
+        repo = MongoStateRepository("mongodb://localhost:27017", db_name="name_projection_test")
+    repo.save_definition("Named_Agent", {"name": "Named Agent", "prompt": "x" * 1000})
+    repo.save_persona("Persona_Only", "# Persona")
+    repo.append_to_history("History_Only", {"user_input": "q", "ai_response": "a"})
+
+    assert repo.list_agent_names() == {"Named_Agent": "Named Agent"}
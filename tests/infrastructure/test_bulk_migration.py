@@ -0,0 +1,119 @@
+# tests/infrastructure/test_bulk_migration.py
+"""
+Tests for the bulk storage migration engine (filesystem <-> MongoDB).
+"""
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.storage.bulk_migration import BulkMigrationEngine, history_created_at
+from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+from tests.mongomock_compat import compatible_bulk_write
+
+
+@pytest.fixture
+def mongo_repo():
+    mongomock = pytest.importorskip("mongomock")
+    with patch("src.infrastructure.storage.mongo_repository.MongoClient", mongomock.MongoClient):
+        from src.infrastructure.storage.mongo_repository import MongoStateRepository
+        repo = MongoStateRepository("mongodb://localhost:27017", db_name="migration_test")
+    for collection in (repo.agents_collection, repo.sessions_collection):
+        compatible_bulk_write(collection)
+    yield repo
+
+
+@pytest.fixture
+def fs_repo(tmp_path):
+    repo = FileSystemStateRepository(base_path=str(tmp_path / "source"))
+    for i in range(5):
+        agent_id = f"Agent_{i}"
+        repo.save_definition(agent_id, {"name": agent_id, "version": 1})
+        repo.save_persona(agent_id, f"# Persona {i}")
+        repo.save_session(agent_id, {"current_task_id": f"t{i}", "state": {"step": i}})
+        for n in range(i * 3):
+            repo.append_to_history(agent_id, {"user_input": f"q{n}", "ai_response": f"a{n}"})
+    return repo
+
+
+class TestBulkMigrationEngine:
+    """Chunked copy, resume, dry-run and verify."""
+
+    def test_filesystem_to_mongo_copies_agents_and_history(self, fs_repo, mongo_repo):
+        result = BulkMigrationEngine(fs_repo, mongo_repo, chunk_size=2, history_batch_size=4).run(verify=True)
+
+        assert result["agents_migrated"] == 5
+        assert result["history_entries"] == 30
+        assert result["verified"] is True
+        assert mongo_repo.load_definition("Agent_3") == {"name": "Agent_3", "version": 1}
+        assert mongo_repo.load_persona("Agent_3") == "# Persona 3"
+        assert mongo_repo.load_session("Agent_3")["state"] == {"step": 3}
+        assert len(mongo_repo.load_history("Agent_4")) == 12
+
+    def test_mongo_to_filesystem_roundtrip(self, fs_repo, mongo_repo, tmp_path):
+        BulkMigrationEngine(fs_repo, mongo_repo).run()
+        dest = FileSystemStateRepository(base_path=str(tmp_path / "restore"))
+
+        result = BulkMigrationEngine(mongo_repo, dest, chunk_size=3).run(verify=True)
+
+        assert result["verified"] is True
+        assert dest.load_definition("Agent_2") == fs_repo.load_definition("Agent_2")
+        assert len(dest.load_history("Agent_2")) == 6
+
+    def test_rerun_is_idempotent(self, fs_repo, mongo_repo):
+        BulkMigrationEngine(fs_repo, mongo_repo).run()
+        BulkMigrationEngine(fs_repo, mongo_repo).run(resume=False)
+
+        assert mongo_repo.history_collection.count_documents({}) == 30
+
+    def test_checkpoint_skips_completed_agents(self, fs_repo, mongo_repo, tmp_path):
+        checkpoint = tmp_path / "migration.json"
+        checkpoint.write_text(json.dumps({
+            "key": "filesystem->mongodb", "completed": ["Agent_0", "Agent_1"], "history_entries": 3,
+        }))
+
+        result = BulkMigrationEngine(fs_repo, mongo_repo, checkpoint_path=str(checkpoint)).run()
+
+        assert result["agents_skipped"] == 2
+        assert result["agents_migrated"] == 3
+        assert mongo_repo.load_definition("Agent_1") == {}
+        assert json.loads(checkpoint.read_text())["completed"] == [f"Agent_{i}" for i in range(5)]
+
+    def test_dry_run_writes_nothing_and_verify_reports_mismatches(self, fs_repo, mongo_repo):
+        result = BulkMigrationEngine(fs_repo, mongo_repo).run(dry_run=True, verify=True)
+
+        assert result["agents_scanned"] == 5
+        assert result["agents_migrated"] == 0
+        assert result["bytes"] > 0
+        assert mongo_repo.agents_collection.count_documents({}) == 0
+        assert result["verified"] is False
+        assert {m["agent_id"] for m in result["mismatches"]} == {f"Agent_{i}" for i in range(5)}
+
+
+class TestHistoryCreatedAt:
+    """createdAt das entradas vindas do filesystem preserva a ordem do arquivo."""
+
+    def test_created_at_follows_timestamps_and_file_order(self):
+        fallback = datetime(2025, 6, 1)
+        entries = [
+            {"user_input": "legacy"},
+            {"timestamp": 1735689600.0},  # 2025-01-01
+            {"timestamp": 1735689600.0002},  # same millisecond
+            {},
+            {"timestamp": "2025-01-02T00:00:00Z"},
+        ]
+
+        created = history_created_at(entries, fallback)
+
+        assert created == sorted(set(created))
+        assert created[1] == datetime(2025, 1, 1)
+        assert created[4] == datetime(2025, 1, 2)
+        assert all(moment.microsecond % 1000 == 0 for moment in created)
+        assert history_created_at([{}, {}], fallback)[-1] == fallback
+
+    def test_migrated_tail_keeps_the_file_order(self, fs_repo, mongo_repo):
+        BulkMigrationEngine(fs_repo, mongo_repo, history_batch_size=4).run()
+
+        assert [e["user_input"] for e in mongo_repo.load_history_tail("Agent_4", 3)] == ["q9", "q10", "q11"]
+        assert [e["user_input"] for e in mongo_repo.load_history("Agent_4")] == [f"q{n}" for n in range(12)]
@@ -0,0 +1,77 @@
+# tests/infrastructure/test_conversation_writes.py
+"""
+Tests for single-round-trip conversation writes (conversation_writes).
+"""
+import pytest
+
+from src.infrastructure.conversation_writes import (
+    PREVIEW_LENGTH,
+    append_messages,
+    append_operation,
+    append_pipeline,
+    apply_operations,
+    placeholder_operations,
+)
+from tests.mongomock_compat import compatible_bulk_write
+
+
+AGENT = {"agent_id": "a1", "instance_id": "i1", "name": "Agent One", "emoji": "🤖"}
+
+
+@pytest.fixture
+def conversations():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.conversations
+    collection.insert_one({
+        "conversation_id": "c1",
+        "messages": [],
+        "participants": [],
+        "message_count": 0,
+        "participant_count": 0,
+    })
+    return compatible_bulk_write(collection)
+
+
+class TestAppendPipeline:
+    def test_client_values_are_literals(self):
+        stage = append_pipeline([{"type": "user", "content": "$messages"}], "now", AGENT)[0]["$set"]
+
+        assert stage["messages"]["$concatArrays"][1] == {"$literal": [{"type": "user", "content": "$messages"}]}
+        assert stage["updated_at"] == {"$literal": "now"}
+
+    def test_participant_stage_only_when_given(self):
+        stage = append_pipeline([{"type": "user", "content": "x"}], "now")[0]["$set"]
+
+        assert "participants" not in stage
+
+
+class TestAppendMessages:
+    def test_returns_sequence_of_last_message(self, conversations):
+        assert append_messages(conversations, "c1", [{"type": "user", "content": "a"}], "t1") == 1
+        assert append_messages(conversations, "c1", [{"type": "user"}, {"type": "bot"}], "t2", AGENT) == 3
+
+    def test_participant_is_added_once(self, conversations):
+        for _ in range(3):
+            append_messages(conversations, "c1", [{"type": "bot", "content": "r"}], "t", AGENT)
+
+        doc = conversations.find_one({"conversation_id": "c1"})
+        assert [p["agent_id"] for p in doc["participants"]] == ["a1"]
+        assert doc["participant_count"] == 1
+
+    def test_missing_conversation_returns_none(self, conversations):
+        assert append_messages(conversations, "nope", [{"type": "user"}], "t") is None
+
+
+class TestBulkOperations:
+    def test_append_then_fill_placeholder(self, conversations):
+        placeholder = {"type": "bot", "content": "...", "task_id": "t1", "delegated": True, "status": "pending"}
+        apply_operations(conversations, [append_operation("c1", [placeholder], "t0")])
+
+        apply_operations(conversations, placeholder_operations("c1", "t1", "y" * 500, "completed", "t1"))
+
+        doc = conversations.find_one({"conversation_id": "c1"})
+        assert doc["messages"][0]["status"] == "completed"
+        assert len(doc["last_message_preview"]["content"]) == PREVIEW_LENGTH
+
+    def test_empty_batch_is_noop(self, conversations):
+        assert apply_operations(conversations, []) is None
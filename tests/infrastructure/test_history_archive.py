@@ -0,0 +1,168 @@
+# tests/infrastructure/test_history_archive.py
+"""
+Tests for history retention: compaction into the cold archive, lookup and restore.
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+from src.infrastructure.storage.history_archive import (
+    FileSystemHistoryArchive,
+    HistoryCompactor,
+    MongoHistoryArchive,
+    RetentionPolicy,
+)
+from tests.mongomock_compat import compatible_bulk_write
+
+NOW = datetime(2025, 6, 1)
+
+
+@pytest.fixture
+def fs_repo(tmp_path):
+    repo = FileSystemStateRepository(base_path=str(tmp_path))
+    start = (NOW - timedelta(days=20) - datetime(1970, 1, 1)).total_seconds()
+    for n in range(20):
+        repo.append_to_history("Agent", {"user_input": f"q{n}", "timestamp": start + n * 86400})
+    return repo
+
+
+@pytest.fixture
+def mongo_repo():
+    mongomock = pytest.importorskip("mongomock")
+    with patch("src.infrastructure.storage.mongo_repository.MongoClient", mongomock.MongoClient):
+        from src.infrastructure.storage.mongo_repository import MongoStateRepository
+        repo = MongoStateRepository("mongodb://localhost:27017", db_name="history_archive_test")
+    compatible_bulk_write(repo.history_collection)
+    repo.history_collection.insert_many([
+        {"_id": f"h{n}", "agent_id": "Agent", "user_input": f"q{n}",
+         "createdAt": NOW - timedelta(days=20 - n)}
+        for n in range(20)
+    ])
+    return repo
+
+
+def _inputs(entries):
+    return [entry["user_input"] for entry in entries]
+
+
+class TestRetentionPolicy:
+    def test_override_and_invalid_values(self):
+        policy = RetentionPolicy(max_age_days=30).override({"max_entries": "50", "max_age_days": "x"})
+
+        assert policy == RetentionPolicy(max_age_days=30, max_entries=50)
+        assert not RetentionPolicy.from_dict({"max_entries": -1}).active
+
+
+class TestFileSystemArchive:
+    def test_compact_keeps_newest_entries_and_restores_in_order(self, fs_repo):
+        archive = FileSystemHistoryArchive(fs_repo, segment_size=4)
+
+        assert archive.compact("Agent", RetentionPolicy(max_entries=5), NOW) == 15
+        assert _inputs(fs_repo.load_history("Agent")) == [f"q{n}" for n in range(15, 20)]
+        assert [s["count"] for s in archive.segments("Agent")] == [4, 4, 4, 3]
+        assert _inputs(archive.read("Agent")) == [f"q{n}" for n in range(15)]
+
+        segment_ids = [s["segment_id"] for s in archive.segments("Agent")[-2:]]
+        assert archive.restore("Agent", segment_ids=segment_ids) == 7
+        assert _inputs(fs_repo.load_history("Agent"))[:3] == ["q8", "q9", "q10"]
+        assert len(archive.segments("Agent")) == 2
+        assert len(os.listdir(archive._archive_dir("Agent"))) == 3  # 2 segments + index
+
+    @pytest.mark.parametrize("key", ["..", "../Agent", "/etc", "a\\b", ""])
+    def test_keys_cannot_leave_the_agents_directory(self, fs_repo, key):
+        archive = FileSystemHistoryArchive(fs_repo)
+
+        with pytest.raises(ValueError):
+            archive.segments(key)
+
+    def test_compact_by_age_and_range_lookup(self, fs_repo):
+        archive = FileSystemHistoryArchive(fs_repo)
+
+        assert archive.compact("Agent", RetentionPolicy(max_age_days=7.5), NOW) == 13
+        assert archive.compact("Agent", RetentionPolicy(max_age_days=7.5), NOW) == 0
+
+        since = NOW - timedelta(days=10, hours=1)
+        assert _inputs(archive.read("Agent", since=since)) == ["q10", "q11", "q12"]
+
+
+    @pytest.mark.skipif(os.name != "posix", reason="flock")
+    def test_appends_wait_for_compaction(self, fs_repo):
+        archive = FileSystemHistoryArchive(fs_repo)
+        appender = threading.Thread(target=fs_repo.append_to_history, args=("Agent", {"user_input": "late"}))
+        save_index = archive._save_index
+
+        def append_mid_compaction(agent_id, segments):
+            save_index(agent_id, segments)
+            appender.start()
+            appender.join(0.2)
+            assert appender.is_alive()  # blocked on the history lock until os.replace
+
+        with patch.object(archive, "_save_index", append_mid_compaction):
+            assert archive.compact("Agent", RetentionPolicy(max_entries=5), NOW) == 15
+        appender.join()
+
+        assert _inputs(fs_repo.load_history("Agent")) == [f"q{n}" for n in range(15, 20)] + ["late"]
+
+
+class TestMongoArchive:
+    def test_compact_moves_oldest_entries_into_segments(self, mongo_repo):
+        archive = MongoHistoryArchive(mongo_repo, segment_size=4)
+
+        assert archive.compact("Agent", RetentionPolicy(max_entries=5), NOW) == 15
+        assert mongo_repo.history_collection.count_documents({"agent_id": "Agent"}) == 5
+        segments = archive.segments("Agent")
+        assert [s["count"] for s in segments] == [4, 4, 4, 3]
+        assert "data" not in segments[0]
+        assert segments[0]["first_at"] == NOW - timedelta(days=20)
+
+        assert archive.restore("Agent") == 15
+        assert mongo_repo.history_collection.count_documents({"agent_id": "Agent"}) == 20
+        assert mongo_repo.history_collection.find_one({"_id": "h0"})["createdAt"] == NOW - timedelta(days=20)
+        assert archive.segments("Agent") == []
+
+    def test_compact_by_age_and_read(self, mongo_repo):
+        archive = MongoHistoryArchive(mongo_repo)
+
+        assert archive.compact("Agent", RetentionPolicy(max_age_days=3), NOW) == 17
+        assert _inputs(mongo_repo.load_history_tail("Agent", 10)) == ["q17", "q18", "q19"]
+        assert _inputs(archive.read("Agent", until=NOW - timedelta(days=19))) == ["q0", "q1"]
+
+    def test_legacy_conversation_arrays_are_trimmed(self, mongo_repo):
+        legacy = mongo_repo.db["agent_conversations"]
+        messages = [{"role": "user", "content": f"m{n}", "timestamp": (NOW - timedelta(hours=10 - n)).isoformat()}
+                    for n in range(10)]
+        legacy.insert_one({"instance_id": "inst-1", "agent_name": "Agent",
+                           "conversation_history": messages, "metadata": {"total_messages": 10}})
+        archive = MongoHistoryArchive(mongo_repo)
+
+        assert archive.compact_legacy(lambda agent: RetentionPolicy(max_entries=4), NOW) == 6
+        doc = legacy.find_one({"instance_id": "inst-1"})
+        assert [m["content"] for m in doc["conversation_history"]] == ["m6", "m7", "m8", "m9"]
+
+        assert archive.restore("inst-1", source="agent_conversations") == 6
+        doc = legacy.find_one({"instance_id": "inst-1"})
+        assert [m["content"] for m in doc["conversation_history"]] == [f"m{n}" for n in range(10)]
+
+
+class TestHistoryCompactor:
+    def test_per_agent_policy_overrides_global(self, fs_repo):
+        fs_repo.save_definition("Agent", {"name": "Agent", "history_retention": {"max_entries": 2}})
+        for n in range(5):
+            fs_repo.append_to_history("Other", {"user_input": f"o{n}"})
+
+        result = HistoryCompactor(fs_repo, RetentionPolicy(max_entries=10)).run(now=NOW)
+
+        assert result["history_archived"] == 18
+        assert result["agents"] == 1
+        assert len(fs_repo.load_history("Agent")) == 2
+        assert len(fs_repo.load_history("Other")) == 5
+
+    def test_no_policy_archives_nothing(self, fs_repo):
+        result = HistoryCompactor(fs_repo, RetentionPolicy()).run(now=NOW)
+
+        assert result["history_archived"] == 0
+        assert len(fs_repo.load_history("Agent")) == 20
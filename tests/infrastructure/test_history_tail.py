@@ -0,0 +1,76 @@
+# tests/infrastructure/test_history_tail.py
+"""
+Tests for bounded history tail reads (filesystem reverse reader, Mongo index).
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.storage import filesystem_repository
+from src.infrastructure.storage.filesystem_repository import FileSystemStateRepository
+
+
+@pytest.fixture
+def fs_repo(tmp_path):
+    repo = FileSystemStateRepository(base_path=str(tmp_path))
+    for n in range(50):
+        repo.append_to_history("Agent", {
+            "user_input": f"pergunta {n} çãé", "ai_response": "r" * (n * 7),
+            "instance_id": "even" if n % 2 == 0 else "odd",
+        })
+    return repo
+
+
+class TestFileSystemTail:
+    def test_tail_matches_full_history_across_blocks(self, fs_repo):
+        with patch.object(filesystem_repository, "HISTORY_TAIL_BLOCK_SIZE", 64):
+            tail = fs_repo.load_history_tail("Agent", 7)
+
+        assert tail == fs_repo.load_history("Agent")[-7:]
+
+    def test_tail_filters_by_instance(self, fs_repo):
+        tail = fs_repo.load_history_tail("Agent", 3, instance_id="odd")
+
+        assert [entry["user_input"][:12] for entry in tail] == ["pergunta 45 ", "pergunta 47 ", "pergunta 49 "]
+
+    def test_tail_larger_than_history_and_missing_agent(self, fs_repo):
+        assert len(fs_repo.load_history_tail("Agent", 500)) == 50
+        assert fs_repo.load_history_tail("Agent", 0) == []
+        assert fs_repo.load_history_tail("Nobody", 10) == []
+
+    def test_tail_reads_only_the_window(self, fs_repo):
+        reads = []
+        real_iter = filesystem_repository._iter_lines_reversed
+
+        def counting_iter(path, *args):
+            for line in real_iter(path, *args):
+                reads.append(line)
+                yield line
+
+        with patch.object(filesystem_repository, "_iter_lines_reversed", counting_iter):
+            fs_repo.load_history_tail("Agent", 5)
+
+        # trailing newline yields one empty line before the five entries
+        assert len(reads) == 6
+
+
+class TestMongoTail:
+    def test_tail_is_chronological_and_bounded(self):
+        mongomock = pytest.importorskip("mongomock")
+        with patch("src.infrastructure.storage.mongo_repository.MongoClient", mongomock.MongoClient):
+            from src.infrastructure.storage.mongo_repository import MongoStateRepository
+            repo = MongoStateRepository("mongodb://localhost:27017", db_name="history_tail_test")
+        start = datetime(2025, 1, 1)
+        repo.history_collection.insert_many([
+            {"_id": f"id-{9 - n}", "agent_id": "Agent", "instance_id": "i1" if n < 6 else "i2",
+             "user_input": f"q{n}", "createdAt": start + timedelta(minutes=n)}
+            for n in range(10)
+        ])
+
+        tail = repo.load_history_tail("Agent", 3)
+        scoped = repo.load_history_tail("Agent", 2, instance_id="i1")
+
+        assert [entry["user_input"] for entry in tail] == ["q7", "q8", "q9"]
+        assert [entry["user_input"] for entry in scoped] == ["q4", "q5"]
+        assert "_id" not in tail[0] and "createdAt" not in tail[0]
@@ -0,0 +1,93 @@
+# tests/infrastructure/test_http_clients.py
+"""
+Tests for the managed outbound HTTP client registry.
+"""
+import asyncio
+
+import pytest
+
+from src.infrastructure.http_clients import (
+    HttpClientRegistry,
+    UpstreamConfig,
+    _build_transports,
+    upstream_config,
+)
+from src.infrastructure.metrics import HTTP_CLIENT_SECONDS
+
+httpx = pytest.importorskip("httpx")
+
+
+class TestUpstreamConfig:
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.setenv("HTTP_MCP_MAX_PER_HOST", "3")
+        monkeypatch.setenv("HTTP_MCP_TIMEOUT", "2.5")
+
+        config = upstream_config("mcp")
+
+        assert config.max_per_host == 3
+        assert config.timeout == 2.5
+
+    def test_unknown_upstream_uses_default(self):
+        assert upstream_config("nope") == UpstreamConfig()
+
+
+class TestInstrumentedTransport:
+    def test_per_host_concurrency_limit_and_stats(self):
+        in_flight, peak = 0, 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"ok": True})
+
+        async def scenario():
+            transport_cls, _ = _build_transports()
+            transport = transport_cls("test", UpstreamConfig(max_per_host=2), httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                await asyncio.gather(*(client.get("http://svc-a:9000/health") for _ in range(6)))
+            return transport
+
+        transport = asyncio.get_event_loop().run_until_complete(scenario())
+
+        assert peak == 2
+        stats = transport.hosts["svc-a:9000"].to_dict()
+        assert stats == {"requests": 6, "errors": 0, "in_flight": 0, "waiting": 0}
+        assert HTTP_CLIENT_SECONDS.labels(upstream="test", host="svc-a:9000").count >= 6
+
+    def test_transport_errors_are_counted(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        _, transport_cls = _build_transports()
+        transport = transport_cls("test", UpstreamConfig(), httpx.MockTransport(handler))
+        with httpx.Client(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                client.get("http://down:1/")
+
+        assert transport.hosts["down:1"].errors == 1
+
+
+class TestHttpClientRegistry:
+    def test_client_is_reused_within_a_loop(self):
+        registry = HttpClientRegistry()
+
+        async def scenario():
+            first = registry.async_client("mcp")
+            second = registry.async_client("mcp")
+            await registry.aclose()
+            return first is second
+
+        assert asyncio.get_event_loop().run_until_complete(scenario())
+
+    def test_stats_lists_created_clients(self):
+        registry = HttpClientRegistry()
+        registry.sync_client("conductor")
+
+        stats = registry.stats()
+
+        assert stats["conductor"]["clients"][0]["type"] == "sync"
+        assert stats["conductor"]["config"]["max_per_host"] == upstream_config("conductor").max_per_host
+        asyncio.get_event_loop().run_until_complete(registry.aclose())
@@ -0,0 +1,104 @@
+# tests/infrastructure/test_metrics.py
+"""
+Tests for the shared metrics registry (counters, gauges, HDR-style histograms).
+"""
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infrastructure.metrics import BYTES, MetricsRegistry
+
+
+class TestHistogram:
+    """Log-linear histogram recording and percentiles."""
+
+    def test_percentiles_within_bucket_precision(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("latency_seconds", "test", ("stage",))
+        for ms in range(1, 1001):
+            hist.observe(ms / 1000, stage="pickup")
+
+        child = hist.labels(stage="pickup")
+        assert child.count == 1000
+        assert abs(child.quantile(0.5) - 0.5) / 0.5 < 0.07
+        assert abs(child.quantile(0.99) - 0.99) / 0.99 < 0.07
+        assert child.quantile(1.0) <= 1.0
+
+    def test_byte_histogram_small_values_are_exact(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("prompt_bytes", "test", scale=BYTES)
+        for size in (3, 3, 7):
+            hist.observe(size)
+
+        assert hist.labels().quantile(0.5) == 3
+        assert hist.labels().quantile(1.0) == 7
+
+    def test_snapshots_merge_across_processes(self):
+        watcher_a, watcher_b = MetricsRegistry(), MetricsRegistry()
+        for registry, value in ((watcher_a, 0.1), (watcher_b, 2.0)):
+            registry.histogram("stage_seconds", "test", ("agent_id",)).observe(value, agent_id="a")
+            registry.counter("tasks_total", "test", ("outcome",)).inc(outcome="completed")
+
+        merged = MetricsRegistry.from_snapshots([watcher_a.snapshot(), watcher_b.snapshot()])
+        data = merged.to_json()
+
+        hist = data["stage_seconds"]["series"][0]
+        assert hist["count"] == 2
+        assert abs(hist["max"] - 2.0) < 1e-6
+        assert data["tasks_total"]["series"][0]["value"] == 2
+
+
+class TestPrometheusRendering:
+    """Prometheus text exposition."""
+
+    def test_render_counter_gauge_and_summary(self):
+        registry = MetricsRegistry()
+        registry.counter("tasks_total", "Tasks", ("outcome",)).inc(outcome="ok")
+        registry.gauge("active_tasks", "Active").set(3)
+        registry.histogram("stage_seconds", "Stage", ("stage",)).observe(0.25, stage="total")
+
+        text = registry.render_prometheus()
+
+        assert '# TYPE tasks_total counter' in text
+        assert 'tasks_total{outcome="ok"} 1' in text
+        assert 'active_tasks 3' in text
+        assert '# TYPE stage_seconds summary' in text
+        assert 'stage_seconds{stage="total",quantile="0.5"}' in text
+        assert 'stage_seconds_count{stage="total"} 1' in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("c", "test", ("agent_id",)).inc(agent_id='a"b')
+
+        assert 'c{agent_id="a\\"b"} 1' in registry.render_prometheus()
+
+
+class TestSystemMetricsEndpoint:
+    """GET /system/metrics merges local metrics with watcher heartbeats."""
+
+    def _make_client(self):
+        from src.api.routes.system import router
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_json_includes_watcher_snapshots(self):
+        watcher = MetricsRegistry()
+        watcher.histogram("watcher_only_seconds", "test", ("provider",)).observe(1.5, provider="claude")
+
+        with patch("src.api.routes.system._watcher_telemetry", return_value=[watcher.snapshot()]):
+            resp = self._make_client().get("/system/metrics", params={"format": "json"})
+
+        assert resp.status_code == 200
+        series = resp.json()["watcher_only_seconds"]["series"][0]
+        assert series["labels"] == {"provider": "claude"}
+        assert series["count"] == 1
+
+    def test_prometheus_is_default(self):
+        with patch("src.api.routes.system._watcher_telemetry", return_value=[]):
+            resp = self._make_client().get("/system/metrics")
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert "# TYPE conductor_task_stage_seconds summary" in resp.text
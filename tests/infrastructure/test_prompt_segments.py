@@ -0,0 +1,154 @@
+# tests/infrastructure/test_prompt_segments.py
+"""
+Tests for content-addressed prompt storage (prompt_segments).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.infrastructure import prompt_segments
+from src.infrastructure.prompt_segments import (
+    SEGMENT_TTL_SECONDS,
+    TASK_TTL_SECONDS,
+    PromptSegmentMissing,
+    PromptSegmentStore,
+    segments_enabled,
+    split_prompt,
+)
+from tests.mongomock_compat import compatible_bulk_write
+
+
+def _prompt(turns, request="do it", screenplay="Screenplay"):
+    history = "\n".join(
+        f"""    <turn>
+            <user><![CDATA[q{i}]]></user>
+            <assistant><![CDATA[a{i}]]></assistant>
+        </turn>"""
+        for i in range(turns)
+    )
+    return f"""<prompt>
+    <system_context>
+        <persona>
+            <![CDATA[{"persona " * 500}]]>
+        </persona>
+    </system_context>
+    <session_context>
+        <screenplay>
+            <![CDATA[{screenplay}]]>
+        </screenplay>
+    </session_context>
+    <conversation_history>
+{history}
+    </conversation_history>
+    <user_request>
+        <![CDATA[{request}]]>
+    </user_request>
+</prompt>"""
+
+
+@pytest.fixture
+def store():
+    mongomock = pytest.importorskip("mongomock")
+    segment_store = PromptSegmentStore(mongomock.MongoClient()["segments_test"])
+    compatible_bulk_write(segment_store.collection)
+    return segment_store
+
+
+class TestSplitPrompt:
+
+    def test_split_is_lossless_and_isolates_user_request(self):
+        prompt = _prompt(3)
+        pieces = split_prompt(prompt)
+
+        assert "".join(pieces) == prompt
+        assert pieces[-1].lstrip().startswith("<user_request>")
+        assert sum(1 for p in pieces if p.lstrip().startswith("<turn")) == 3
+
+    def test_plain_text_prompt_is_a_single_tail(self):
+        assert split_prompt("just text") == ["just text"]
+
+
+def test_segmented_storage_is_opt_in(monkeypatch):
+    monkeypatch.delenv("TASK_PROMPT_STORAGE", raising=False)
+    assert not segments_enabled()
+
+    monkeypatch.setenv("TASK_PROMPT_STORAGE", "segments")
+    assert segments_enabled()
+
+
+class TestPromptSegmentStore:
+
+    def test_store_and_assemble_roundtrip(self, store):
+        prompt = _prompt(2)
+        fields = store.store(prompt)
+
+        assert fields["prompt_size"] == len(prompt)
+        assert "<user_request>" in fields["prompt_tail"]
+        assert store.assemble(fields) == prompt
+
+    def test_shared_sections_are_stored_once(self, store):
+        first = store.store(_prompt(2, request="first"))
+        second = store.store(_prompt(3, request="second"))
+
+        shared = set(first["prompt_segments"]) & set(second["prompt_segments"])
+        system_hash = first["prompt_segments"][1]
+        assert system_hash in shared
+        # Only the new history turn and nothing else was added by the second prompt
+        assert store.collection.count_documents({}) == len(set(first["prompt_segments"])) + 1
+
+    def test_assemble_reads_from_collection_when_not_cached(self, store):
+        prompt = _prompt(1)
+        fields = store.store(prompt)
+        fresh = PromptSegmentStore(store.collection.database)
+
+        assert fresh.assemble(fields) == prompt
+
+    def test_inline_prompt_is_returned_as_is(self, store):
+        assert store.assemble({"prompt": "<prompt>legacy</prompt>"}) == "<prompt>legacy</prompt>"
+
+    def test_missing_segment_raises(self, store):
+        with pytest.raises(PromptSegmentMissing):
+            store.assemble({"prompt_segments": ["deadbeef"], "prompt_tail": ""})
+
+    def test_segments_outlive_every_task_that_references_them(self, store, monkeypatch):
+        """Full lifecycle: tasks and segments both expire by TTL, on their own clocks."""
+        clock = {"now": datetime(2025, 1, 1, tzinfo=timezone.utc)}
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock["now"]
+
+        monkeypatch.setattr(prompt_segments, "datetime", FrozenDatetime)
+        tasks = {}
+
+        def submit(name, prompt):
+            tasks[name] = {"created_at": clock["now"], **store.store(prompt)}
+
+        def run_ttl_monitors():
+            now = clock["now"]
+            for name in [n for n, t in tasks.items() if t["created_at"] + timedelta(seconds=TASK_TTL_SECONDS) < now]:
+                del tasks[name]
+            store.collection.delete_many(
+                {"last_used_at": {"$lt": now - timedelta(seconds=SEGMENT_TTL_SECONDS)}}
+            )
+
+        submit("a", _prompt(1, screenplay="A"))
+        for hour in range(1, 24 * 5):
+            clock["now"] += timedelta(hours=1)
+            if hour < 30:
+                submit(f"t{hour}", _prompt(1 + hour % 3, request=f"r{hour}"))  # shares the system context
+            run_ttl_monitors()
+            store._cache.clear()
+            for task in tasks.values():
+                store.assemble(task)  # never PromptSegmentMissing
+
+        assert tasks == {}
+        assert store.collection.count_documents({}) == 0
+
+    def test_ttl_index_outlives_task_ttl(self, store):
+        store.ensure_indexes()
+
+        indexes = store.collection.index_information()
+        (ttl,) = [i for i in indexes.values() if i.get("key") == [("last_used_at", 1)]]
+        assert ttl["expireAfterSeconds"] > TASK_TTL_SECONDS
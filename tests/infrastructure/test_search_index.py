@@ -0,0 +1,216 @@
+# tests/infrastructure/test_search_index.py
+"""
+Tests for the full-text search index: snippets, incremental indexing and search.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.infrastructure.search_index import (
+    SEARCH_COLLECTION,
+    SearchIndex,
+    make_snippet,
+    search_filter,
+    search_terms,
+)
+from tests.mongomock_compat import AsyncCollection, AsyncCursor, AsyncDatabase
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def _message(n, content, **extra):
+    return dict({"id": f"m{n}", "type": "user", "content": content,
+                 "timestamp": f"2025-06-01T10:{n:02d}:00"}, **extra)
+
+
+class TextSearchCollection(AsyncCollection):
+    """mongomock has no $text: match any query word against content/title."""
+
+    def find(self, query_filter=None, projection=None, **kwargs):
+        query_filter = dict(query_filter or {})
+        text = query_filter.pop("$text", None)
+        if text is None:
+            return super().find(query_filter, projection, **kwargs)
+        words = set(search_terms(text["$search"]))
+        docs = []
+        for doc in self.sync.find(query_filter):
+            found = set((doc.get("content", "") + " " + doc.get("title", "")).lower().split())
+            score = len(words & found)
+            if score:
+                docs.append(dict(doc, score=score))
+        return _ScoredCursor(docs)
+
+
+class _ScoredCursor(AsyncCursor):
+    def sort(self, *args, **kwargs):
+        self._cursor = sorted(self._cursor, key=lambda doc: (-doc["score"], -doc["timestamp"].timestamp()))
+        return self
+
+    def skip(self, count):
+        self._cursor = self._cursor[count:]
+        return self
+
+    def limit(self, count):
+        self._cursor = self._cursor[:count]
+        return self
+
+
+class TextSearchDatabase(AsyncDatabase):
+    def __getitem__(self, name):
+        if name == SEARCH_COLLECTION:
+            return TextSearchCollection(self.sync[name])
+        return super().__getitem__(name)
+
+
+@pytest.fixture
+def db():
+    mongomock = pytest.importorskip("mongomock")
+    database = mongomock.MongoClient().db
+    database["conversations"].insert_one({
+        "conversation_id": "c1", "title": "Deploy", "screenplay_id": "s1",
+        "updated_at": "2025-06-01T10:05:00",
+        "messages": [
+            _message(1, "como fazer o deploy da api"),
+            _message(2, "Use o pipeline de deploy", type="bot",
+                     agent={"agent_id": "DevOps_Agent", "name": "DevOps", "instance_id": "i1"}),
+        ],
+    })
+    database["history"].insert_one({
+        "_id": "h1", "agent_id": "DevOps_Agent", "user_input": "rollback do deploy",
+        "ai_response": "feito", "createdAt": datetime(2025, 6, 1, 9),
+    })
+    return database
+
+
+@pytest.fixture
+def index(db):
+    return SearchIndex(TextSearchDatabase(db), batch_size=2)
+
+
+class TestSnippets:
+    def test_short_content_is_highlighted_accent_insensitively(self):
+        result = make_snippet("Revisar a Ação de deploy", search_terms("acao"))
+
+        assert result == {"snippet": "Revisar a Ação de deploy", "highlights": [[10, 14]]}
+
+    def test_long_content_is_cut_around_the_matches(self):
+        content = "intro " * 100 + "o erro de timeout no deploy" + " fim" * 100
+        result = make_snippet(content, search_terms('"erro de timeout" -fim'), width=60)
+
+        assert result["snippet"].startswith("…") and result["snippet"].endswith("…")
+        start, end = result["highlights"][0]
+        assert result["snippet"][start:end] == "erro de timeout"
+        assert len(result["snippet"]) <= 62
+
+    def test_filter_combines_text_and_scopes(self):
+        since = datetime(2025, 1, 1)
+
+        assert search_filter("deploy", agent_id="A", since=since, kinds=["message"]) == {
+            "$text": {"$search": "deploy"}, "agent_id": "A",
+            "timestamp": {"$gte": since}, "kind": {"$in": ["message"]},
+        }
+
+
+class TestIncrementalIndexing:
+    def test_first_pass_indexes_everything(self, index, db):
+        stats = run(index.update())
+
+        assert stats == {"conversations": 1, "messages": 2, "history": 1}
+        entry = db[SEARCH_COLLECTION].find_one({"_id": "message:c1:2"})
+        assert entry["agent_id"] == "DevOps_Agent" and entry["screenplay_id"] == "s1"
+        assert entry["timestamp"] == datetime(2025, 6, 1, 10, 2)
+        assert db[SEARCH_COLLECTION].find_one({"_id": "history:h1"})["content"] == "rollback do deploy\n\nfeito"
+
+    def test_next_passes_only_read_new_messages(self, index, db):
+        run(index.update())
+        db["conversations"].update_one({"conversation_id": "c1"}, {
+            "$push": {"messages": _message(3, "e o rollback?")},
+            "$set": {"updated_at": "2025-06-01T10:06:00"},
+        })
+
+        assert run(index.update()) == {"conversations": 1, "messages": 1, "history": 0}
+        assert run(index.update()) == {"conversations": 0, "messages": 0, "history": 0}
+        assert db[SEARCH_COLLECTION].count_documents({"kind": "message"}) == 3
+
+    def test_pending_placeholders_are_reindexed_once_filled(self, index, db):
+        db["conversations"].update_one({"conversation_id": "c1"}, {"$push": {"messages": _message(
+            3, "Executando delegação...", type="bot", status="pending", task_id="t1", delegated=True)}})
+        run(index.update())
+        # filled in place, updated_at untouched
+        db["conversations"].update_one(
+            {"conversation_id": "c1", "messages.task_id": "t1"},
+            {"$set": {"messages.$.content": "migração concluída", "messages.$.status": "completed"}},
+        )
+
+        run(index.update())
+
+        entry = db[SEARCH_COLLECTION].find_one({"_id": "message:c1:3"})
+        assert entry["content"] == "migração concluída" and not entry["pending"]
+        assert db[SEARCH_COLLECTION].count_documents({"pending": True}) == 0
+
+    def test_watermark_survives_restarts_and_batches(self, db):
+        for n in range(5):
+            db["conversations"].insert_one({"conversation_id": f"x{n}", "updated_at": "2025-06-02T00:00:00",
+                                            "messages": [_message(1, f"texto {n}")]})
+        assert run(SearchIndex(AsyncDatabase(db), batch_size=2).update())["conversations"] == 6
+
+        assert run(SearchIndex(AsyncDatabase(db), batch_size=2).update())["conversations"] == 0
+
+
+class TestSearch:
+    def test_ranked_filtered_and_paginated(self, index):
+        run(index.update())
+
+        page = run(index.search("deploy pipeline", limit=1))
+        assert page["has_more"] and page["next_offset"] == 1
+        assert page["results"][0]["message_id"] == "m2"
+        assert page["results"][0]["highlights"] == [[6, 14], [18, 24]]
+
+        scoped = run(index.search("deploy", agent_id="DevOps_Agent", kinds=["history"]))
+        assert [hit["kind"] for hit in scoped["results"]] == ["history"]
+        assert not scoped["has_more"]
+
+    def test_deleted_conversations_are_purged_from_results(self, index, db):
+        run(index.update())
+        db["conversations"].delete_one({"conversation_id": "c1"})
+
+        results = run(index.search("deploy"))["results"]
+
+        assert [hit["kind"] for hit in results] == ["history"]
+        assert db[SEARCH_COLLECTION].count_documents({"conversation_id": "c1"}) == 0
+
+
+class TestService:
+    def test_starts_while_mongo_is_down_and_retries_index_creation(self, db, monkeypatch):
+        from src.core.services.search_index_service import SearchIndexService
+
+        attempts = []
+        ensure_indexes = SearchIndex.ensure_indexes
+
+        async def flaky_ensure_indexes(self):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("mongo down")
+            await ensure_indexes(self)
+
+        monkeypatch.setattr(SearchIndex, "ensure_indexes", flaky_ensure_indexes)
+        service = SearchIndexService(TextSearchDatabase(db))
+        service.RETRY_MIN_SECONDS = 0
+        service.INTERVAL = 0
+
+        async def scenario():
+            await service.start()
+            assert service._running
+            for _ in range(50):
+                if service.last_result is not None:
+                    break
+                await asyncio.sleep(0.01)
+            await service.stop()
+
+        run(scenario())
+
+        assert len(attempts) == 3 and service.indexes_ready
+        assert db[SEARCH_COLLECTION].count_documents({"conversation_id": "c1"}) > 0
@@ -0,0 +1,121 @@
+# tests/infrastructure/test_structured_logging.py
+"""
+Tests for the structured logging events, detail sampling and production mode.
+"""
+import io
+import json
+import logging
+
+import pytest
+
+from src.infrastructure import structured_logging
+from src.infrastructure.structured_logging import (
+    configure_log_mode,
+    detail_sampled,
+    log_event,
+    log_mode,
+    shutdown_log_mode,
+)
+
+
+class _Explodes:
+    def __repr__(self):
+        raise AssertionError("formatted while the level is disabled")
+
+
+@pytest.fixture
+def root_stream():
+    """Root logger writing to a buffer; log mode and handlers restored afterwards."""
+    root = logging.getLogger()
+    saved = (root.level, list(root.handlers))
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    yield stream
+    shutdown_log_mode()
+    configure_log_mode("default", 1.0)
+    root.setLevel(saved[0])
+    root.handlers = saved[1]
+
+
+class TestLogEvent:
+    def test_renders_schema_fields_in_order(self, root_stream):
+        log_event(logging.getLogger("test.events"), "provider.resolved",
+                  source="agent", agent_id="A", provider="gemini")
+
+        assert root_stream.getvalue() == "provider.resolved agent_id='A' provider='gemini' source='agent'\n"
+
+    def test_unknown_fields_and_events_are_rejected(self, root_stream):
+        logger = logging.getLogger("test.events")
+        with pytest.raises(KeyError):
+            log_event(logger, "provider.resolved", agent_id="A", model="x")
+        with pytest.raises(KeyError):
+            log_event(logger, "no.such.event")
+
+    def test_nothing_is_formatted_below_the_level(self, root_stream):
+        logging.getLogger().setLevel(logging.WARNING)
+        log_event(logging.getLogger("test.events"), "provider.resolved", agent_id=_Explodes())
+
+        assert root_stream.getvalue() == ""
+
+
+class TestDetailSampling:
+    def test_sampling_is_deterministic_per_key(self, root_stream):
+        configure_log_mode("default", 0.25)
+        keys = [f"task-{i}" for i in range(2000)]
+        first = [detail_sampled(key) for key in keys]
+
+        assert first == [detail_sampled(key) for key in keys]
+        assert 0.2 < sum(first) / len(keys) < 0.3
+        assert not detail_sampled(None)
+
+    def test_rate_bounds(self, root_stream):
+        configure_log_mode("default", 1.0)
+        assert detail_sampled("any")
+        configure_log_mode("default", 0.0)
+        assert not detail_sampled("any")
+
+
+class TestProductionMode:
+    def test_events_are_written_as_json_by_the_listener(self, root_stream, monkeypatch):
+        monkeypatch.setenv(structured_logging.LOG_MODE_ENV, "production")
+        monkeypatch.delenv(structured_logging.DETAIL_SAMPLE_ENV, raising=False)
+
+        assert configure_log_mode() == "production"
+        assert structured_logging._state["detail_rate"] == 0.01
+        root = logging.getLogger()
+        assert isinstance(root.handlers[0], structured_logging.DeferredQueueHandler)
+
+        logger = logging.getLogger("test.production")
+        log_event(logger, "task.submitted", task_id="t1", agent_id="A", prompt_segmented=True)
+        logger.warning("plain %s", "message")
+        shutdown_log_mode()
+
+        lines = [json.loads(line) for line in root_stream.getvalue().splitlines()]
+        assert lines[0]["event"] == "task.submitted"
+        assert lines[0]["task_id"] == "t1" and lines[0]["prompt_segmented"] is True
+        assert lines[0]["screenplay_id"] is None and lines[0]["logger"] == "test.production"
+        assert lines[1]["message"] == "plain message" and lines[1]["level"] == "WARNING"
+
+        # Handlers and their formatters are back; the mode is reset
+        assert log_mode() == "default"
+        assert isinstance(root.handlers[0], logging.StreamHandler)
+        assert root.handlers[0].formatter._fmt == "%(message)s"
+
+    def test_only_event_records_skip_formatting_on_the_caller(self):
+        handler = structured_logging.DeferredQueueHandler(None)
+        state = {"step": 1}
+        plain = logging.LogRecord("test", logging.INFO, __file__, 1, "state %s", (state,), None)
+        event = logging.LogRecord("test", logging.INFO, __file__, 1, "%s task_id=%r", ("task.submitted", "t1"), None)
+        event.event, event.fields = "task.submitted", ("task_id",)
+
+        prepared = handler.prepare(plain)
+        state["step"] = 2
+
+        assert prepared.getMessage() == "state {'step': 1}" and not prepared.args
+        assert handler.prepare(event) is event and event.args == ("task.submitted", "t1")
+
+    def test_unknown_mode_falls_back_to_default(self, root_stream):
+        assert configure_log_mode("verbose") == "default"
@@ -0,0 +1,103 @@
+# tests/infrastructure/test_task_ordering.py
+"""
+Tests for the task claim order: priority fields, deadlines and aging.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.infrastructure.task_ordering import (
+    CLAIM_SORT,
+    NO_DEADLINE,
+    age_pending,
+    aging_ceiling,
+    backfill_ordering_fields,
+    ordering_fields,
+    parse_deadline,
+    priority_class,
+)
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestOrderingFields:
+    def test_priority_is_clamped_and_kept_as_base(self):
+        fields = ordering_fields(12, None, NOW)
+
+        assert fields == {"priority": 9, "base_priority": 9, "aged_at": NOW, "due_at": NO_DEADLINE}
+        assert ordering_fields(None, None, NOW)["priority"] == 5
+
+    def test_deadline_sets_due_at(self):
+        deadline = parse_deadline("2025-01-01T14:00:00+02:00")
+
+        fields = ordering_fields(5, deadline, NOW)
+        assert fields["deadline"] == fields["due_at"] == datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    def test_parse_deadline(self):
+        assert parse_deadline("2025-01-01T12:00:00") == NOW  # naive is UTC
+        assert parse_deadline(None) is None and parse_deadline("") is None
+        with pytest.raises(ValueError):
+            parse_deadline("tomorrow")
+
+    def test_priority_classes(self):
+        assert [priority_class(p) for p in (0, 3, 4, 6, 7, 9)] == ["low", "low", "normal", "normal", "high", "high"]
+
+
+def test_aging_bumps_each_waiting_task_once_per_period():
+    mongomock = pytest.importorskip("mongomock")
+    tasks = mongomock.MongoClient().db.tasks
+
+    def insert(name, priority, waited_s, status="pending"):
+        created = NOW - timedelta(seconds=waited_s)
+        tasks.insert_one({"_id": name, "status": status, "created_at": created,
+                          **ordering_fields(priority, None, created)})
+
+    insert("waited", 3, 90)
+    insert("fresh", 3, 10)
+    insert("top", 9, 600)
+    insert("running", 3, 600, status="processing")
+
+    assert age_pending(tasks, aging_seconds=60, now=NOW) == 1
+    assert age_pending(tasks, aging_seconds=60, now=NOW) == 0  # bumped: waits another period
+    assert age_pending(tasks, aging_seconds=60, now=NOW + timedelta(seconds=60)) == 2
+    assert age_pending(tasks, aging_seconds=0, now=NOW + timedelta(hours=1)) == 0
+
+    priorities = {doc["_id"]: doc["priority"] for doc in tasks.find()}
+    assert priorities == {"waited": 5, "fresh": 4, "top": 9, "running": 3}
+
+    order = [doc["_id"] for doc in tasks.find({"status": "pending"}, sort=CLAIM_SORT)]
+    assert order == ["top", "waited", "fresh"]
+
+
+def test_aged_backlog_never_overtakes_a_fresh_escalation():
+    mongomock = pytest.importorskip("mongomock")
+    tasks = mongomock.MongoClient().db.tasks
+    started = NOW - timedelta(minutes=30)
+    for n in range(5):
+        created = started + timedelta(seconds=n)
+        tasks.insert_one({"_id": f"chain{n}", "status": "pending", "created_at": created,
+                          **ordering_fields(5, None, created)})
+
+    # A pass every 15 s for 30 minutes
+    for tick in range(120):
+        age_pending(tasks, aging_seconds=60, now=started + timedelta(seconds=15 * (tick + 1)))
+    tasks.insert_one({"_id": "pulse", "status": "pending", "created_at": NOW, **ordering_fields(8, None, NOW)})
+
+    assert {doc["priority"] for doc in tasks.find({"_id": {"$ne": "pulse"}})} == {6}
+    order = [doc["_id"] for doc in tasks.find({"status": "pending"}, sort=CLAIM_SORT)]
+    assert order == ["pulse", "chain0", "chain1", "chain2", "chain3", "chain4"]
+    assert [aging_ceiling(p) for p in (0, 3, 5, 6, 7, 8, 9)] == [2, 5, 6, 6, 9, 9, 9]
+
+
+def test_backfill_gives_legacy_tasks_the_default_order():
+    mongomock = pytest.importorskip("mongomock")
+    tasks = mongomock.MongoClient().db.tasks
+    tasks.insert_one({"_id": "legacy", "status": "pending", "created_at": NOW - timedelta(minutes=5)})
+    tasks.insert_one({"_id": "done", "status": "completed", "created_at": NOW})
+    tasks.insert_one({"_id": "new", "status": "pending", "created_at": NOW, **ordering_fields(5, None, NOW)})
+
+    assert backfill_ordering_fields(tasks, now=NOW) == 1
+    assert "priority" not in tasks.find_one({"_id": "done"})
+    order = [doc["_id"] for doc in tasks.find({"status": "pending"}, sort=CLAIM_SORT)]
+    assert order == ["legacy", "new"]
+    assert age_pending(tasks, aging_seconds=60, now=NOW + timedelta(seconds=60)) == 2
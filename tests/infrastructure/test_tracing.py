@@ -0,0 +1,152 @@
+# tests/infrastructure/test_tracing.py
+"""
+Tests for task tracing (traceparent propagation, exporters, trace endpoint).
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infrastructure.tracing import OTLPFileExporter, SpanContext, Tracer
+
+
+class _ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class TestSpanContext:
+    """W3C traceparent encoding."""
+
+    def test_traceparent_roundtrip(self):
+        ctx = SpanContext.new_root()
+        parsed = SpanContext.from_traceparent(ctx.to_traceparent())
+        assert (parsed.trace_id, parsed.span_id) == (ctx.trace_id, ctx.span_id)
+
+    @pytest.mark.parametrize("value", [None, "", "garbage", "00-abc-def-01", "00-" + "z" * 32 + "-" + "1" * 16 + "-01"])
+    def test_invalid_traceparent_is_ignored(self, value):
+        assert SpanContext.from_traceparent(value) is None
+
+
+class TestTracer:
+    """Span creation and export."""
+
+    def test_child_span_shares_trace_and_links_parent(self):
+        exporter = _ListExporter()
+        tracer = Tracer(service="test", exporter=exporter)
+
+        with tracer.span("api.enqueue") as parent:
+            child = tracer.start_span("queue.consume", parent.context, {"task_id": "t1"})
+            child.end()
+        tracer.flush()
+
+        by_name = {s.name: s for s in exporter.spans}
+        assert by_name["queue.consume"].context.trace_id == by_name["api.enqueue"].context.trace_id
+        assert by_name["queue.consume"].parent_span_id == by_name["api.enqueue"].context.span_id
+        assert by_name["api.enqueue"].parent_span_id is None
+        assert by_name["queue.consume"].to_document()["attributes"] == {"task_id": "t1"}
+
+    def test_exception_marks_span_as_error(self):
+        exporter = _ListExporter()
+        tracer = Tracer(service="test", exporter=exporter)
+
+        with pytest.raises(RuntimeError):
+            with tracer.span("llm.execute"):
+                raise RuntimeError("boom")
+        tracer.flush()
+
+        assert exporter.spans[0].status == "error"
+
+    def test_otlp_file_exporter_writes_resource_spans(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(service="conductor-watcher", exporter=OTLPFileExporter(str(path)))
+        tracer.record_span("watcher.pickup_wait", SpanContext.new_root(), 100.0, 100.5, {"task_id": "t1"})
+        tracer.flush()
+
+        payload = json.loads(path.read_text().splitlines()[0])
+        resource = payload["resourceSpans"][0]
+        assert resource["resource"]["attributes"][0]["value"]["stringValue"] == "conductor-watcher"
+        span = resource["scopeSpans"][0]["spans"][0]
+        assert span["name"] == "watcher.pickup_wait"
+        assert span["startTimeUnixNano"] == str(100 * 10**9)
+        assert len(span["traceId"]) == 32 and len(span["parentSpanId"]) == 16
+
+
+class TestTaskTraceEndpoint:
+    """GET /tasks/{task_id}/trace."""
+
+    def _make_client(self, db):
+        from src.api.routes.traces import router
+        app = FastAPI()
+        app.include_router(router)
+        self._patcher = patch("src.api.routes.traces._get_mongo_db", return_value=db)
+        self._patcher.start()
+        return TestClient(app)
+
+    def teardown_method(self):
+        if getattr(self, "_patcher", None):
+            self._patcher.stop()
+
+    def test_returns_delegation_tree_with_spans_and_latencies(self):
+        mongomock = pytest.importorskip("mongomock")
+        db = mongomock.MongoClient()["trace_test"]
+        t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        parent_id, child_id = ObjectId(), ObjectId()
+        trace = {"trace_id": "a" * 32, "span_id": "b" * 16}
+        db.tasks.insert_many([
+            {"_id": parent_id, "agent_id": "planner", "status": "completed", "trace": trace,
+             "prompt": "big", "enqueued_at": t0, "created_at": t0 + timedelta(milliseconds=20),
+             "started_at": t0 + timedelta(milliseconds=120), "completed_at": t0 + timedelta(seconds=2)},
+            {"_id": child_id, "agent_id": "coder", "status": "completed", "parent_task_id": str(parent_id),
+             "trace": {"trace_id": "a" * 32, "span_id": "c" * 16},
+             "enqueued_at": t0 + timedelta(seconds=2, milliseconds=50),
+             "created_at": t0 + timedelta(seconds=2, milliseconds=60),
+             "started_at": t0 + timedelta(seconds=2, milliseconds=100),
+             "completed_at": t0 + timedelta(seconds=3)},
+        ])
+        db.spans.insert_one({
+            "trace_id": "a" * 32, "span_id": "d" * 16, "parent_span_id": "c" * 16,
+            "name": "watcher.execute", "start": t0, "end": t0, "duration_ms": 1.0,
+            "status": "ok", "attributes": {"task_id": str(child_id)},
+        })
+
+        resp = self._make_client(db).get(f"/tasks/{child_id}/trace")
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["root_task_id"] == str(parent_id)
+        assert data["tasks_in_chain"] == 2
+        root = data["tree"]
+        assert root["latencies"]["pickup_ms"] == 100.0
+        assert root["latencies"]["total_ms"] == 2000.0
+        assert "prompt" not in root
+        child = root["children"][0]
+        assert child["task_id"] == str(child_id)
+        assert child["latencies"]["delegation_handoff_ms"] == 50.0
+        assert [s["name"] for s in child["spans"]] == ["watcher.execute"]
+
+    def test_unknown_and_invalid_task_ids(self):
+        mongomock = pytest.importorskip("mongomock")
+        client = self._make_client(mongomock.MongoClient()["trace_test"])
+
+        assert client.get(f"/tasks/{ObjectId()}/trace").status_code == 404
+        assert client.get("/tasks/not-an-id/trace").status_code == 400
+
+    def test_delegation_chain_lookup_is_indexed(self):
+        mongomock = pytest.importorskip("mongomock")
+        from src.core.services.mongo_task_client import MongoTaskClient
+
+        with patch.dict("os.environ", {"MONGO_URI": "mongodb://trace-test"}), \
+                patch("src.core.services.mongo_task_client.MongoClient", lambda *a, **k: mongomock.MongoClient()):
+            task_client = MongoTaskClient()
+        task_client.ensure_task_queue_indexes()
+
+        keys = [index["key"] for index in task_client.collection.index_information().values()]
+        assert [("parent_task_id", 1)] in keys
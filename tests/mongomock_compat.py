@@ -0,0 +1,80 @@
+# tests/mongomock_compat.py
+"""
+Async adapters over mongomock for code written against
+``src.infrastructure.async_mongo``. ``compatible_bulk_write`` lives in
+benchmarks/mongomock_compat.py, shared with the offline benchmarks.
+"""
+
+from benchmarks.mongomock_compat import compatible_bulk_write  # noqa: F401  (re-exported)
+
+
+class AsyncCursor:
+    """Awaitable facade over a mongomock cursor (or a list, for aggregate)."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, count):
+        self._cursor = self._cursor.skip(count)
+        return self
+
+    def limit(self, count):
+        self._cursor = self._cursor.limit(count)
+        return self
+
+    async def to_list(self, length=None):
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+    def __aiter__(self):
+        self._iterator = iter(self._cursor)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncCollection:
+    """
+    PyMongo ``AsyncCollection`` look-alike backed by a mongomock collection.
+
+    mongomock has no async API; tests of code written against
+    ``src.infrastructure.async_mongo`` run it on this adapter.
+    """
+
+    def __init__(self, collection):
+        self.sync = compatible_bulk_write(collection)
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self.sync.find(*args, **kwargs))
+
+    async def aggregate(self, pipeline, **kwargs):
+        return AsyncCursor(list(self.sync.aggregate(pipeline, **kwargs)))
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class AsyncDatabase:
+    """``AsyncDatabase`` look-alike over a mongomock database."""
+
+    def __init__(self, database):
+        self.sync = database
+
+    def __getitem__(self, name):
+        return AsyncCollection(self.sync[name])
+
+    def __getattr__(self, name):
+        return self[name]
@@ -0,0 +1,63 @@
+# tests/test_benchmarks.py
+"""
+Tests for the benchmark suite: statistics, baseline comparison and a
+smoke run of every benchmark at the smallest size.
+"""
+import json
+
+import pytest
+
+from benchmarks import harness, synthetic
+
+
+def _stats(p50):
+    return {"p50_ms": p50, "p95_ms": p50, "ops_per_s": 1000 / p50}
+
+
+class TestHarness:
+    def test_summary_uses_nearest_rank_percentiles(self):
+        stats = harness.summarize([n / 1000 for n in range(1, 101)])
+
+        assert stats["p50_ms"] == 50 and stats["p95_ms"] == 95
+        assert stats["runs"] == 100 and stats["min_ms"] == 1
+
+    def test_compare_flags_regressions_past_threshold_and_noise(self):
+        baseline = {
+            "results": {"a[n=10]": _stats(10), "b[n=10]": _stats(10), "c[n=10]": _stats(0.01)},
+            "thresholds": {"b": 0.5},
+        }
+        results = {"a[n=10]": _stats(13), "b[n=10]": _stats(13), "c[n=10]": _stats(0.04), "new[n=10]": _stats(1)}
+
+        rows = {row["name"]: row for row in harness.compare(results, baseline, threshold=0.25)}
+
+        assert rows["a[n=10]"]["regression"]
+        assert not rows["b[n=10]"]["regression"]  # per-benchmark threshold
+        assert not rows["c[n=10]"]["regression"]  # +300% but below the noise floor
+        assert "new[n=10]" not in rows
+
+    def test_synthetic_data_is_deterministic(self):
+        assert synthetic.messages(50) == synthetic.messages(50)
+        assert [m["type"] for m in synthetic.messages(4)] == ["user", "bot", "user", "bot"]
+
+
+def test_runner_smoke(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("mongomock")
+    pytest.importorskip("requests")  # watcher dependency
+    monkeypatch.delenv("BENCH_MONGO_URI", raising=False)
+    monkeypatch.setenv("CONDUCTOR_TRACE_EXPORTER", "none")
+    from benchmarks.__main__ import parse_args, run
+
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "10", "--repeat", "2", "--warmup", "0", "--baseline", str(baseline)]
+
+    assert run(parse_args(args + ["--update-baseline"])) == 0
+    assert run(parse_args(args + ["--output", str(output)])) in (0, 1)
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {
+        f"{name}[n=10]" for name in
+        ("prompt_build", "history_format", "queue_admission", "message_append", "watcher_pickup")
+    } | {f"task_logging[mode={mode}]" for mode in ("disabled", "default", "production")}
+    assert json.loads(baseline.read_text())["environment"]["backend"] == "mongomock"
+    assert "vs base" in capsys.readouterr().out
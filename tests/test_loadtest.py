@@ -0,0 +1,104 @@
+# tests/test_loadtest.py
+"""
+Tests for the load-test tooling: the fake provider CLI honours the
+contracts the watcher parses, and the load generator's report.
+"""
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+LOADTEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "loadtest")
+FAKE_LLM = os.path.join(LOADTEST_DIR, "fake_llm.py")
+
+# Same pattern as UniversalMongoWatcher._DELEGATE_RE
+DELEGATE_RE = re.compile(
+    r'\[DELEGATE\]\s*'
+    r'target_agent_id:\s*([^\n]+?)\s*\n'
+    r'(?:instance_id:\s*([^\n]+?)\s*\n)?'
+    r'input:\s*(.*?)\s*'
+    r'\[/DELEGATE\]',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(f"loadtest_{name}", os.path.join(LOADTEST_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run(args, prompt="", **env):
+    environment = {**os.environ, "FAKE_LLM_LATENCY_MS": "0", **env}
+    return subprocess.run([sys.executable, FAKE_LLM, *args], input=prompt, capture_output=True,
+                          text=True, env=environment, timeout=30)
+
+
+class TestFakeLLM:
+    def test_stream_json_events_match_the_watcher_contract(self):
+        prompt = "Faça o deploy. [fake-llm tokens=40 chunks=4 delegate=Agent_B>Agent_C]"
+        result = _run(["--as", "claude", "--print", "--verbose", "--output-format", "stream-json"], prompt)
+
+        assert result.returncode == 0
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [e["type"] for e in events] == ["system", "assistant", "assistant", "assistant", "assistant", "result"]
+        assert events[-1]["usage"] == {"input_tokens": len(prompt) // 4, "output_tokens": 40}
+
+        # The watcher joins the assistant text blocks with newlines
+        text = "\n".join(e["message"]["content"][0]["text"] for e in events if e["type"] == "assistant")
+        match = DELEGATE_RE.search(text)
+        assert match.group(1) == "Agent_B"
+        assert "[fake-llm delegate=Agent_C]" in match.group(3)
+
+    def test_last_directive_wins_and_chain_ends(self):
+        prompt = "[fake-llm delegate=A>B] history ... Continue. [fake-llm delegate=B]"
+        result = _run(["--as", "gemini", "-p", prompt])
+
+        match = DELEGATE_RE.search(result.stdout)
+        assert match.group(1) == "B" and "[fake-llm" not in match.group(3)
+
+    def test_failure_rate_and_version(self):
+        failed = _run(["--as", "cursor-agent", "--print"], "x", FAKE_LLM_FAIL_RATE="1")
+        assert failed.returncode == 1 and "simulated failure" in failed.stderr
+
+        assert "fake-llm" in _run(["--as", "gemini", "--version"]).stdout
+
+
+def test_loadgen_report_stages_and_throughput():
+    loadgen = _load("loadgen")
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def at(ms):
+        return t0 + timedelta(milliseconds=ms)
+
+    requests = [
+        {"conversation_id": "c1", "sent_at": at(0), "api_s": 0.01, "http_status": 200},
+        {"conversation_id": "c2", "sent_at": at(100), "api_s": 0.02, "http_status": 200},
+        {"conversation_id": "c3", "sent_at": at(200), "api_s": 0.5, "http_status": 429},
+    ]
+    root = {"_id": "r1", "status": "completed", "enqueued_at": at(5), "created_at": at(15),
+            "started_at": at(25), "completed_at": at(525)}
+    child = {"_id": "k1", "parent_task_id": "r1", "status": "completed", "enqueued_at": at(545),
+             "created_at": at(555), "started_at": at(565), "completed_at": at(1000)}
+    lone = {"_id": "r2", "status": "error", "enqueued_at": at(105), "created_at": at(115),
+            "started_at": at(125), "completed_at": at(200)}
+
+    report = loadgen.build_report(requests, {"c1": [root, child], "c2": [lone]}, expected_tasks=2)
+
+    assert report["http_errors"] == 1
+    assert report["chains_complete"] == 1 and report["chains_incomplete"] == 1
+    assert report["task_statuses"] == {"completed": 2, "error": 1}
+    assert report["stages"]["e2e"]["p50_ms"] == 1000
+    assert report["stages"]["handoff"]["p50_ms"] == 20
+    assert report["stages"]["queue"]["count"] == 3 and report["stages"]["api"]["count"] == 3
+    assert report["throughput"]["chains_per_s"] == 1.0
+    assert "e2e" in loadgen.format_report(report)
+
+    now = at(10_000)
+    assert loadgen.chain_finished([lone], 2, settle_s=5, now=now)
+    assert not loadgen.chain_finished([lone], 2, settle_s=5, now=at(300))
+    assert not loadgen.chain_finished([{**root, "status": "processing"}], 1, settle_s=5, now=now)
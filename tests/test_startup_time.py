@@ -0,0 +1,66 @@
+"""
+CLI startup budget.
+
+Runs ``python -X importtime -c "import src.cli.conductor"`` in a fresh
+interpreter and checks the cumulative import time of the CLI module against
+a budget (``CONDUCTOR_STARTUP_BUDGET_MS``, default 1000ms — generous enough
+for slow CI machines while still catching an eager import of pymongo,
+prompt_toolkit or docker), and that those heavy modules are not imported at
+all until a command needs them.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_MS = float(os.getenv("CONDUCTOR_STARTUP_BUDGET_MS", "1000"))
+DEFERRED_MODULES = ("pymongo", "prompt_toolkit", "docker")
+
+
+def _run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def import_time_ms(module):
+    """Cumulative ``-X importtime`` figure of ``module``, in milliseconds."""
+    result = _run(f"import {module}", "-X", "importtime")
+    assert result.returncode == 0, result.stderr
+    pattern = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*" + re.escape(module) + r"$")
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+class TestCLIStartup:
+    def test_heavy_modules_are_deferred(self):
+        code = (
+            "import sys, src.cli.conductor;"
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        )
+        result = _run(code)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ""
+
+    @pytest.mark.slow
+    def test_import_time_within_budget(self):
+        # Best of three: the first run also pays for cold .pyc and disk caches
+        elapsed = min(import_time_ms("src.cli.conductor") for _ in range(3))
+
+        assert elapsed < STARTUP_BUDGET_MS, (
+            f"CLI import took {elapsed:.0f}ms (budget {STARTUP_BUDGET_MS:.0f}ms); "
+            "run `python -X importtime -c 'import src.cli.conductor'` to find the culprit"
+        )
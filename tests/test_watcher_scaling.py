@@ -0,0 +1,281 @@
+# tests/test_watcher_scaling.py
+"""
+Harness de escala horizontal do watcher: simula N watchers consumindo a
+mesma collection `tasks`.
+
+Usa mongomock por padrão. Para rodar contra um mongod local, defina
+WATCHER_TEST_MONGO_URI (ex: mongodb://localhost:27017).
+"""
+import logging
+import os
+import sys
+import importlib.util
+from concurrent.futures import Future
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+WATCHER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "poc", "container_to_host",
+)
+TEST_DATABASE = "conductor_watcher_scaling_test"
+
+
+def _load_watcher_module():
+    """Carrega claude-mongo-watcher.py (nome com hífen) como módulo."""
+    pytest.importorskip("requests")
+    if WATCHER_DIR not in sys.path:
+        sys.path.insert(0, WATCHER_DIR)
+    spec = importlib.util.spec_from_file_location(
+        "claude_mongo_watcher", os.path.join(WATCHER_DIR, "claude-mongo-watcher.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _InlineExecutor:
+    """Executor síncrono: torna a simulação determinística."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def mongo_client():
+    uri = os.environ.get("WATCHER_TEST_MONGO_URI")
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri)
+    else:
+        mongomock = pytest.importorskip("mongomock")
+        client = mongomock.MongoClient()
+    client.drop_database(TEST_DATABASE)
+    yield client
+    client.drop_database(TEST_DATABASE)
+
+
+@pytest.fixture
+def watcher_module():
+    return _load_watcher_module()
+
+
+@pytest.fixture
+def make_watchers(watcher_module, mongo_client):
+    """Cria N watchers compartilhando o mesmo MongoDB, com LLM simulado."""
+
+    def _make(n, fifo_mode="relaxed", max_workers=3):
+        watchers = []
+        for i in range(n):
+            watcher = watcher_module.UniversalMongoWatcher(
+                database=TEST_DATABASE,
+                max_workers=max_workers,
+                fifo_mode=fifo_mode,
+                worker_id=f"watcher-{i}",
+                client=mongo_client,
+            )
+            watcher.executor.shutdown(wait=False)
+            watcher.executor = _InlineExecutor()
+            watcher.mcp_service = None
+            watcher.executed = []
+            watcher.execute_llm_request = (
+                lambda w=watcher, **kw: (w.executed.append(kw["task_id"]) or ("ok", 0, 0.01))
+            )
+            watcher.emit_task_event = lambda *a, **kw: None
+            watcher.update_agent_statistics = lambda *a, **kw: True
+            watchers.append(watcher)
+        return watchers
+
+    return _make
+
+
+def _insert_tasks(client, count, agent_ids=None, cwd="/tmp"):
+    collection = client[TEST_DATABASE]["tasks"]
+    now = datetime.now(timezone.utc)
+    agent_ids = agent_ids or [f"agent_{i}" for i in range(count)]
+    docs = [
+        {
+            "agent_id": agent_ids[i % len(agent_ids)],
+            "prompt": f"<prompt>{i}</prompt>",
+            "cwd": cwd,
+            "status": "pending",
+            "created_at": now + timedelta(milliseconds=i),
+        }
+        for i in range(count)
+    ]
+    return collection.insert_many(docs).inserted_ids
+
+
+class TestWatcherScaling:
+    """Simulação de N watchers sobre a mesma collection."""
+
+    def test_each_task_processed_exactly_once(self, make_watchers, mongo_client):
+        task_ids = _insert_tasks(mongo_client, 40)
+        watchers = make_watchers(4)
+
+        for _ in range(20):
+            for watcher in watchers:
+                watcher.poll_once()
+
+        executed = [tid for w in watchers for tid in w.executed]
+        assert sorted(executed) == sorted(str(t) for t in task_ids)
+        assert all(len(w.executed) > 0 for w in watchers)
+
+        tasks = mongo_client[TEST_DATABASE]["tasks"]
+        assert tasks.count_documents({"status": "completed"}) == 40
+        assert set(tasks.distinct("worker_id")) <= {w.worker_id for w in watchers}
+
+    def test_expired_lease_is_reclaimed(self, make_watchers, mongo_client):
+        tasks = mongo_client[TEST_DATABASE]["tasks"]
+        task_id = tasks.insert_one({
+            "agent_id": "agent_a",
+            "prompt": "<prompt/>",
+            "cwd": "/tmp",
+            "status": "processing",
+            "worker_id": "crashed-watcher",
+            "lease_until": datetime.now(timezone.utc) - timedelta(seconds=5),
+            "created_at": datetime.now(timezone.utc),
+        }).inserted_id
+        (watcher,) = make_watchers(1)
+
+        assert watcher.poll_once() == 1
+        doc = tasks.find_one({"_id": task_id})
+        assert doc["status"] == "completed"
+        assert doc["worker_id"] == watcher.worker_id
+
+    def test_live_lease_is_not_reclaimed(self, make_watchers, mongo_client):
+        tasks = mongo_client[TEST_DATABASE]["tasks"]
+        tasks.insert_one({
+            "agent_id": "agent_a",
+            "prompt": "<prompt/>",
+            "status": "processing",
+            "worker_id": "busy-watcher",
+            "lease_until": datetime.now(timezone.utc) + timedelta(seconds=60),
+            "created_at": datetime.now(timezone.utc),
+        })
+        (watcher,) = make_watchers(1)
+
+        assert watcher.poll_once() == 0
+        assert watcher.executed == []
+
+    def test_per_agent_key_excludes_across_watchers(self, make_watchers, mongo_client):
+        _insert_tasks(mongo_client, 1, agent_ids=["agent_x"], cwd="/work")
+        holder, other = make_watchers(2, fifo_mode="per_agent")
+
+        assert holder.registry.acquire_key("fifo:agent:agent_x:/work", 60)
+        assert other.poll_once() == 0
+
+        holder.registry.release_key("fifo:agent:agent_x:/work")
+        assert other.poll_once() == 1
+
+    def test_held_key_burst_does_not_block_other_agents(self, make_watchers, mongo_client):
+        _insert_tasks(mongo_client, 20, agent_ids=["agent_x"], cwd="/work")
+        (other_id,) = _insert_tasks(mongo_client, 1, agent_ids=["agent_y"], cwd="/work")
+        holder, other = make_watchers(2, fifo_mode="per_agent", max_workers=1)
+        assert holder.registry.acquire_key("fifo:agent:agent_x:/work", 60)
+
+        assert other.poll_once() == 1
+        assert other.executed == [str(other_id)]
+
+        # Com o escopo gravado na chave, a varredura já nasce sem o burst
+        assert holder.registry.acquire_key("fifo:agent:agent_x:/work", 60,
+                                           scope={"agent_id": "agent_x", "cwd": "/work"})
+        assert other.registry.held_scopes() == [{"agent_id": "agent_x", "cwd": "/work"}]
+        assert other.get_pending_requests(exclude_scopes=other.registry.held_scopes()) == []
+
+    def test_registry_aggregates_metrics(self, make_watchers, mongo_client):
+        _insert_tasks(mongo_client, 6)
+        watchers = make_watchers(2)
+        for _ in range(3):
+            for watcher in watchers:
+                watcher.poll_once()
+        for watcher in watchers:
+            watcher.send_heartbeat()
+
+        cluster = watchers[0].registry.aggregate_metrics()
+        assert cluster["watchers"] == 2
+        assert cluster["capacity"] == 6
+        assert cluster["total_tasks_processed"] == 6
+        assert sum(cluster["tasks_by_agent"].values()) == 6
+
+    def test_dead_watcher_not_counted(self, make_watchers, mongo_client):
+        alive, dead = make_watchers(2)
+        mongo_client[TEST_DATABASE]["watchers"].update_one(
+            {"_id": dead.worker_id},
+            {"$set": {"last_heartbeat": datetime.now(timezone.utc) - timedelta(minutes=5)}},
+        )
+
+        live_ids = [w["_id"] for w in alive.registry.live_watchers()]
+        assert live_ids == [alive.worker_id]
+
+
+class TestClaimOrder:
+    """Ordem de claim: prioridade (com aging), deadline, created_at."""
+
+    def _insert(self, client, name, priority, created_at, deadline=None):
+        from src.infrastructure.task_ordering import ordering_fields
+
+        return client[TEST_DATABASE]["tasks"].insert_one({
+            "agent_id": f"agent_{name}", "prompt": f"<prompt>{name}</prompt>", "cwd": "/tmp",
+            "status": "pending", "created_at": created_at,
+            **ordering_fields(priority, deadline, created_at),
+        }).inserted_id
+
+    def test_priority_then_deadline_then_fifo(self, make_watchers, mongo_client):
+        from src.infrastructure.metrics import TASK_QUEUE_WAIT_SECONDS
+
+        now = datetime.now(timezone.utc)
+        ids = {
+            "chain_1": self._insert(mongo_client, "chain_1", 5, now - timedelta(seconds=3)),
+            "chain_2": self._insert(mongo_client, "chain_2", 5, now - timedelta(seconds=2)),
+            "due_late": self._insert(mongo_client, "due_late", 5, now, deadline=now + timedelta(hours=2)),
+            "due_soon": self._insert(mongo_client, "due_soon", 5, now, deadline=now + timedelta(hours=1)),
+            "pulse": self._insert(mongo_client, "pulse", 8, now),
+        }
+        (watcher,) = make_watchers(1, max_workers=1)
+        watcher.aging_seconds = 0
+        high_before = TASK_QUEUE_WAIT_SECONDS.labels(priority_class="high").count
+
+        for _ in ids:
+            assert watcher.poll_once() == 1
+
+        order = ["pulse", "due_soon", "due_late", "chain_1", "chain_2"]
+        assert watcher.executed == [str(ids[name]) for name in order]
+        assert TASK_QUEUE_WAIT_SECONDS.labels(priority_class="high").count == high_before + 1
+
+    def test_aging_lets_old_low_priority_task_through(self, make_watchers, mongo_client):
+        now = datetime.now(timezone.utc)
+        old = self._insert(mongo_client, "old", 4, now - timedelta(minutes=10))
+        burst = self._insert(mongo_client, "burst", 5, now)
+        (watcher,) = make_watchers(1, max_workers=1)
+        watcher.aging_seconds = 60
+
+        assert watcher.poll_once() == 1
+        assert watcher.executed == [str(old)]
+
+        tasks = mongo_client[TEST_DATABASE]["tasks"]
+        doc = tasks.find_one({"_id": old})
+        assert (doc["base_priority"], doc["priority"]) == (4, 5)
+        assert tasks.find_one({"_id": burst})["priority"] == 5
+
+
+def test_task_logs_one_started_and_one_completed_event(make_watchers, mongo_client, caplog):
+    (task_id,) = _insert_tasks(mongo_client, 1)
+    (watcher,) = make_watchers(1)
+    caplog.set_level(logging.INFO)
+
+    assert watcher.poll_once() == 1
+
+    events = [record.event for record in caplog.records if getattr(record, "event", None)]
+    assert events.count("watcher.task_started") == 1
+    assert events.count("watcher.task_completed") == 1
+    started = next(r for r in caplog.records if getattr(r, "event", None) == "watcher.task_started")
+    assert str(task_id) in started.getMessage()
+    # Sem banners de várias linhas por task
+    assert not [r for r in caplog.records if r.getMessage().startswith("=" * 20)]